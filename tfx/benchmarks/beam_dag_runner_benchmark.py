@@ -0,0 +1,77 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark for the orchestration overhead of the BeamDagRunner."""
+
+import tempfile
+import time
+
+from absl import flags
+import tfx
+from tfx.benchmarks import noop_pipelines
+from tfx.orchestration.beam import beam_dag_runner
+
+from tensorflow.python.platform import test  # pylint: disable=g-direct-tensorflow-import
+
+FLAGS = flags.FLAGS
+flags.DEFINE_integer("beam_dag_runner_num_nodes", 20,
+                     "Number of no-op nodes in the benchmark pipelines.")
+flags.DEFINE_integer(
+    "beam_dag_runner_num_workers", 4,
+    "Number of DirectRunner workers of the BeamDagRunner in parallel mode.")
+
+
+def _flag_value(name):
+  return getattr(FLAGS, name) if FLAGS.is_parsed() else FLAGS[name].default
+
+
+class BeamDagRunnerBenchmark(test.Benchmark):
+  """Measures the orchestration overhead per node of no-op pipelines."""
+
+  def _run(self, name, shape, num_workers):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      test_pipeline = noop_pipelines.create_pipeline(
+          shape, _flag_value("beam_dag_runner_num_nodes"), name, tmp_dir)
+      num_nodes = len(test_pipeline.components)
+      start = time.time()
+      beam_dag_runner.BeamDagRunner(num_workers=num_workers).run(test_pipeline)
+      delta = time.time() - start
+    self.report_benchmark(
+        name=name,
+        iters=num_nodes,
+        wall_time=delta / num_nodes,
+        extras={
+            "num_nodes": num_nodes,
+            "num_workers": num_workers,
+            "commit_tfx": (getattr(tfx, "GIT_COMMIT_ID", None) or
+                           getattr(tfx, "__version__", None)),
+        })
+
+  def benchmarkWidePipeline(self):
+    """Overhead per node of independent nodes run one at a time."""
+    self._run("beam_dag_runner_wide", noop_pipelines.WIDE, num_workers=1)
+
+  def benchmarkWidePipelineInParallelMode(self):
+    """Overhead per node of independent nodes run concurrently."""
+    self._run(
+        "beam_dag_runner_wide_parallel",
+        noop_pipelines.WIDE,
+        num_workers=_flag_value("beam_dag_runner_num_workers"))
+
+  def benchmarkDeepPipeline(self):
+    """Overhead per node of a chain of nodes."""
+    self._run("beam_dag_runner_deep", noop_pipelines.DEEP, num_workers=1)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -0,0 +1,113 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for compiling large synthetic pipelines to IR."""
+
+import os
+import tempfile
+import time
+
+from absl import flags
+import tfx
+from tfx.benchmarks import noop_pipelines
+from tfx.dsl.compiler import compiler
+
+from tensorflow.python.platform import test  # pylint: disable=g-direct-tensorflow-import
+
+FLAGS = flags.FLAGS
+flags.DEFINE_integer("compiler_num_nodes", 301,
+                     "Number of no-op nodes in the benchmark pipelines.")
+flags.DEFINE_integer("compiler_num_iters", 10,
+                     "Number of compilations of each benchmark pipeline.")
+
+
+def _flag_value(name):
+  return getattr(FLAGS, name) if FLAGS.is_parsed() else FLAGS[name].default
+
+
+class CompilerBenchmark(test.Benchmark):
+  """Measures the time to compile pipelines, with and without cached nodes."""
+
+  def _run(self, shape, warm, persisted=False):
+    """Compiles a newly defined pipeline of the given shape repeatedly.
+
+    Args:
+      shape: Shape of the pipeline, one of `noop_pipelines.SHAPES`.
+      warm: If `True`, the nodes compiled by previous iterations are reused,
+        as when a pipeline is recompiled after being defined again. Otherwise
+        every iteration compiles all the nodes.
+      persisted: If `True`, the nodes are reused from a node cache directory
+        only, as when each compilation runs in a new process (e.g. a CLI
+        invocation).
+    """
+    name = "compiler_%s_%s" % (
+        shape, "persisted" if persisted else "warm" if warm else "cold")
+    num_iters = _flag_value("compiler_num_iters")
+    compiler.clear_compiled_node_cache()
+    total_secs = 0.0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      dsl_compiler = compiler.Compiler(
+          node_cache_dir=(os.path.join(tmp_dir, "node_cache")
+                          if persisted else None))
+      if warm or persisted:
+        dsl_compiler.compile(
+            noop_pipelines.create_pipeline(
+                shape, _flag_value("compiler_num_nodes"), name, tmp_dir))
+      for _ in range(num_iters):
+        tfx_pipeline = noop_pipelines.create_pipeline(
+            shape, _flag_value("compiler_num_nodes"), name, tmp_dir)
+        if not warm:
+          compiler.clear_compiled_node_cache()
+        start = time.time()
+        dsl_compiler.compile(tfx_pipeline)
+        total_secs += time.time() - start
+    self.report_benchmark(
+        name=name,
+        iters=num_iters,
+        wall_time=total_secs / num_iters,
+        extras={
+            "num_nodes": len(tfx_pipeline.components),
+            "commit_tfx": (getattr(tfx, "GIT_COMMIT_ID", None) or
+                           getattr(tfx, "__version__", None)),
+        })
+
+  def benchmarkCompileWidePipeline(self):
+    self._run(noop_pipelines.WIDE, warm=False)
+
+  def benchmarkRecompileWidePipeline(self):
+    self._run(noop_pipelines.WIDE, warm=True)
+
+  def benchmarkRecompileWidePipelineFromNodeCacheDir(self):
+    self._run(noop_pipelines.WIDE, warm=False, persisted=True)
+
+  def benchmarkCompileDeepPipeline(self):
+    self._run(noop_pipelines.DEEP, warm=False)
+
+  def benchmarkRecompileDeepPipeline(self):
+    self._run(noop_pipelines.DEEP, warm=True)
+
+  def benchmarkRecompileDeepPipelineFromNodeCacheDir(self):
+    self._run(noop_pipelines.DEEP, warm=False, persisted=True)
+
+  def benchmarkCompileDiamondPipeline(self):
+    self._run(noop_pipelines.DIAMOND, warm=False)
+
+  def benchmarkRecompileDiamondPipeline(self):
+    self._run(noop_pipelines.DIAMOND, warm=True)
+
+  def benchmarkRecompileDiamondPipelineFromNodeCacheDir(self):
+    self._run(noop_pipelines.DIAMOND, warm=False, persisted=True)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -0,0 +1,132 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of the CSV to tf.Example conversion of CsvExampleGen."""
+
+import os
+import random
+import tempfile
+import time
+
+from absl import flags
+import apache_beam as beam
+import tfx
+from tfx.benchmarks import benchmark_base
+from tfx.components.example_gen import utils
+from tfx.components.example_gen.csv_example_gen import executor
+from tfx.proto import example_gen_pb2
+from tfx.utils import proto_utils
+
+from tensorflow.python.platform import test  # pylint: disable=g-direct-tensorflow-import
+
+FLAGS = flags.FLAGS
+flags.DEFINE_string(
+    "csv_dir", None,
+    "Directory of the CSV file to convert. If it holds no 'data.csv', a "
+    "synthetic file of num_csv_rows rows and num_csv_columns columns is "
+    "written there first. Defaults to a temporary directory.")
+flags.DEFINE_integer("num_csv_rows", 2000000,
+                     "Number of rows of the synthetic CSV file.")
+flags.DEFINE_integer(
+    "num_csv_columns", 200,
+    "Number of columns of the synthetic CSV file, a third of each of int, "
+    "float and string type. The defaults make a file of about 2.5GB.")
+flags.DEFINE_integer(
+    "type_inference_sample_size", 10000,
+    "Number of lines the column types are inferred from in the sampled mode.")
+
+
+def _flag_value(name):
+  return getattr(FLAGS, name) if FLAGS.is_parsed() else FLAGS[name].default
+
+
+def _write_csv(path, num_rows, num_columns):
+  """Writes a CSV file of int, float and string columns with missing cells."""
+  rng = random.Random(0)
+  cell_fns = [
+      lambda: str(rng.randint(0, 1000000)),
+      lambda: "%.4f" % rng.random(),
+      lambda: "value_%d" % rng.randint(0, 1000),
+  ]
+  with open(path, "w") as f:
+    f.write(",".join("column_%d" % i for i in range(num_columns)) + "\n")
+    for _ in range(num_rows):
+      f.write(",".join(
+          cell_fns[i % 3]() if rng.random() > 0.05 else ""
+          for i in range(num_columns)) + "\n")
+
+
+class CsvExampleGenBenchmark(benchmark_base.BenchmarkBase):
+  """Measures the conversion of a wide CSV file to tf.Examples."""
+
+  def _csv_dir(self):
+    csv_dir = _flag_value("csv_dir") or os.path.join(
+        tempfile.gettempdir(), "csv_example_gen_benchmark")
+    csv_path = os.path.join(csv_dir, "data.csv")
+    if not os.path.exists(csv_path):
+      os.makedirs(csv_dir, exist_ok=True)
+      _write_csv(csv_path, _flag_value("num_csv_rows"),
+                 _flag_value("num_csv_columns"))
+    return csv_dir
+
+  def _run(self, name, csv_config=None):
+    exec_properties = {utils.INPUT_BASE_KEY: self._csv_dir()}
+    if csv_config is not None:
+      custom_config = example_gen_pb2.CustomConfig()
+      custom_config.custom_config.Pack(csv_config)
+      exec_properties["custom_config"] = proto_utils.proto_to_json(
+          custom_config)
+
+    pipeline = self._create_beam_pipeline()
+    _ = (
+        pipeline
+        | "CsvToExample" >> executor._CsvToExample(  # pylint: disable=protected-access, no-value-for-parameter
+            exec_properties=exec_properties,
+            split_pattern="data.csv")
+        | "CountExamples" >> beam.combiners.Count.Globally())
+    start = time.time()
+    result = pipeline.run()
+    result.wait_until_finish()
+    delta = time.time() - start
+
+    self.report_benchmark(
+        name=name,
+        iters=1,
+        wall_time=delta,
+        extras={
+            "csv_size_bytes": os.path.getsize(
+                os.path.join(self._csv_dir(), "data.csv")),
+            "commit_tfx": (getattr(tfx, "GIT_COMMIT_ID", None) or
+                           getattr(tfx, "__version__", None)),
+        })
+
+  def benchmarkPerLine(self):
+    """Builds a tf.Example per line after a full type inference pass."""
+    self._run("per_line")
+
+  def benchmarkBatched(self):
+    """Encodes RecordBatches after a full type inference pass."""
+    self._run("batched", example_gen_pb2.CsvConfig(batched=True))
+
+  def benchmarkBatchedWithSampledTypeInference(self):
+    """Encodes RecordBatches with the types inferred from the first lines."""
+    self._run(
+        "batched_sampled_type_inference",
+        example_gen_pb2.CsvConfig(
+            batched=True,
+            type_inference_sample_size=_flag_value(
+                "type_inference_sample_size")))
+
+
+if __name__ == "__main__":
+  test.main()
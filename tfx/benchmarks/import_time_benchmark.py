@@ -0,0 +1,73 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark for the import time of TFX entry points."""
+
+from absl import flags
+import tfx
+from tfx.utils import import_time_utils
+
+from tensorflow.python.platform import test  # pylint: disable=g-direct-tensorflow-import
+
+FLAGS = flags.FLAGS
+flags.DEFINE_integer(
+    "import_time_iters", 5,
+    "Number of fresh interpreters to measure the import time of each entry "
+    "point in.")
+
+# Number of top level packages, by import time, to report.
+_NUM_REPORTED_PACKAGES = 10
+
+
+class ImportTimeBenchmark(test.Benchmark):
+  """Measures the import time of TFX entry points in fresh interpreters."""
+
+  def _iters(self):
+    return (FLAGS.import_time_iters
+            if FLAGS.is_parsed() else FLAGS["import_time_iters"].default)
+
+  def _benchmark_import(self, module_name):
+    reports = [
+        import_time_utils.measure_import_time(module_name)
+        for _ in range(self._iters())
+    ]
+    wall_times = sorted(r.total_secs for r in reports)
+    packages = sorted(
+        reports[0].top_level_packages().items(), key=lambda kv: -kv[1])
+    extras = {
+        "import_us_%s" % name: us
+        for name, us in packages[:_NUM_REPORTED_PACKAGES]
+    }
+    extras["num_imported_modules"] = len(reports[0].modules)
+    extras["budget_secs"] = import_time_utils.STARTUP_TIME_BUDGETS.get(
+        module_name, 0.0)
+    extras["commit_tfx"] = (getattr(tfx, "GIT_COMMIT_ID", None) or
+                            getattr(tfx, "__version__", None))
+    self.report_benchmark(
+        name="import_%s" % module_name,
+        iters=len(reports),
+        wall_time=wall_times[len(wall_times) // 2],
+        extras=extras)
+
+  def benchmarkCliMainImport(self):
+    self._benchmark_import("tfx.tools.cli.cli_main")
+
+  def benchmarkPortableLauncherImport(self):
+    self._benchmark_import("tfx.orchestration.portable.launcher")
+
+  def benchmarkPipelineImport(self):
+    self._benchmark_import("tfx.orchestration.pipeline")
+
+
+if __name__ == "__main__":
+  test.main()
@@ -0,0 +1,122 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Synthetic pipelines of no-op components for orchestration benchmarks."""
+
+import os
+from typing import List, Text
+
+from tfx.dsl.compiler import compiler
+from tfx.dsl.compiler import constants
+from tfx.dsl.component.experimental.annotations import OutputDict
+from tfx.dsl.component.experimental.decorators import component
+from tfx.dsl.components.base import base_node
+from tfx.orchestration import metadata
+from tfx.orchestration import pipeline
+from tfx.orchestration.portable import runtime_parameter_utils
+from tfx.proto.orchestration import pipeline_pb2
+
+WIDE = "wide"
+DEEP = "deep"
+DIAMOND = "diamond"
+SHAPES = (WIDE, DEEP, DIAMOND)
+
+
+@component
+def _noop_source() -> OutputDict(value=int):
+  return {"value": 0}
+
+
+@component
+def _noop(value: int) -> OutputDict(value=int):
+  return {"value": value}
+
+
+@component
+def _noop_join(left: int, right: int) -> OutputDict(value=int):
+  return {"value": left + right}
+
+
+def _wide_components(num_nodes: int) -> List[base_node.BaseNode]:
+  """A source node followed by independent nodes."""
+  source = _noop_source().with_id("source")
+  return [source] + [
+      _noop(value=source.outputs["value"]).with_id("noop_%d" % i)
+      for i in range(num_nodes - 1)
+  ]
+
+
+def _deep_components(num_nodes: int) -> List[base_node.BaseNode]:
+  """A chain of nodes."""
+  components = [_noop_source().with_id("source")]
+  for i in range(num_nodes - 1):
+    components.append(
+        _noop(value=components[-1].outputs["value"]).with_id("noop_%d" % i))
+  return components
+
+
+def _diamond_components(num_nodes: int) -> List[base_node.BaseNode]:
+  """A chain of diamonds, each made of two branches joined by a node."""
+  components = [_noop_source().with_id("source")]
+  for i in range((num_nodes - 1) // 3):
+    head = components[-1]
+    left = _noop(value=head.outputs["value"]).with_id("left_%d" % i)
+    right = _noop(value=head.outputs["value"]).with_id("right_%d" % i)
+    join = _noop_join(
+        left=left.outputs["value"],
+        right=right.outputs["value"]).with_id("join_%d" % i)
+    components.extend([left, right, join])
+  return components
+
+
+def create_pipeline(shape: Text, num_nodes: int, pipeline_name: Text,
+                    root_dir: Text) -> pipeline.Pipeline:
+  """Creates a pipeline of no-op components on a SQLite MLMD.
+
+  Args:
+    shape: Shape of the pipeline DAG, one of `SHAPES`. `WIDE` is a source node
+      followed by independent nodes, `DEEP` a chain of nodes and `DIAMOND` a
+      chain of diamonds.
+    num_nodes: Approximate number of nodes of the pipeline.
+    pipeline_name: Name of the pipeline.
+    root_dir: Directory holding the pipeline root and the MLMD database.
+
+  Returns:
+    The pipeline.
+
+  Raises:
+    ValueError: If `shape` is unknown.
+  """
+  if shape == WIDE:
+    components = _wide_components(num_nodes)
+  elif shape == DEEP:
+    components = _deep_components(num_nodes)
+  elif shape == DIAMOND:
+    components = _diamond_components(num_nodes)
+  else:
+    raise ValueError("Unknown pipeline shape: {}".format(shape))
+  return pipeline.Pipeline(
+      pipeline_name=pipeline_name,
+      pipeline_root=os.path.join(root_dir, "pipeline_root"),
+      metadata_connection_config=metadata.sqlite_metadata_connection_config(
+          os.path.join(root_dir, "metadata.db")),
+      components=components)
+
+
+def compile_pipeline(tfx_pipeline: pipeline.Pipeline,
+                     run_id: Text) -> pipeline_pb2.Pipeline:
+  """Compiles the pipeline to IR with a concrete run id."""
+  pipeline_ir = compiler.Compiler().compile(tfx_pipeline)
+  runtime_parameter_utils.substitute_runtime_parameter(
+      pipeline_ir, {constants.PIPELINE_RUN_ID_PARAMETER_NAME: run_id})
+  return pipeline_ir
@@ -0,0 +1,201 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for the orchestration overhead of the portable orchestrators.
+
+Runs synthetic pipelines of no-op components (see `noop_pipelines`) on a SQLite
+MLMD and reports the time spent in each phase of `Launcher.launch`, the time
+per tick of `SyncPipelineTaskGenerator.generate` and the MLMD calls recorded by
+`metadata_instrumentation`.
+"""
+
+import collections
+import contextlib
+import functools
+import tempfile
+import time
+
+from absl import flags
+import mock
+import tfx
+from tfx.benchmarks import noop_pipelines
+from tfx.orchestration import metadata
+from tfx.orchestration import metadata_instrumentation
+from tfx.orchestration.experimental.core import sync_pipeline_task_gen
+from tfx.orchestration.portable import execution_publish_utils
+from tfx.orchestration.portable import launcher
+from tfx.proto.orchestration import executable_spec_pb2
+from tfx.proto.orchestration import pipeline_pb2
+
+from tensorflow.python.platform import test  # pylint: disable=g-direct-tensorflow-import
+
+FLAGS = flags.FLAGS
+flags.DEFINE_integer("orchestration_num_nodes", 31,
+                     "Number of no-op nodes in the benchmark pipelines.")
+
+# Functions called by `Launcher.launch`, by launch phase. The functions are
+# patched in the modules `launcher` imports them from.
+_LAUNCH_PHASES = collections.OrderedDict([
+    ("context_prep", [(launcher.context_lib, "prepare_contexts")]),
+    ("input_resolution", [(launcher.inputs_utils, "resolve_input_artifacts")]),
+    ("registration",
+     [(launcher.execution_publish_utils, "register_execution")]),
+    ("cache_lookup", [(launcher.cache_utils, "get_cache_context"),
+                      (launcher.cache_utils, "get_cached_outputs")]),
+    ("publish", [(launcher.execution_publish_utils,
+                  "publish_succeeded_execution")]),
+])
+
+
+def _flag_value(name):
+  return getattr(FLAGS, name) if FLAGS.is_parsed() else FLAGS[name].default
+
+
+def _commit_tfx():
+  return getattr(tfx, "GIT_COMMIT_ID", None) or getattr(tfx, "__version__",
+                                                        None)
+
+
+@contextlib.contextmanager
+def _timed_phases(phases):
+  """Accumulates the wall time spent in the functions of each phase.
+
+  Args:
+    phases: Dict of phase name to the (module, function name) pairs to time.
+
+  Yields:
+    A `collections.Counter` of phase name to seconds spent in the phase.
+  """
+  secs = collections.Counter()
+
+  def timed(phase, fn):
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+      start = time.time()
+      try:
+        return fn(*args, **kwargs)
+      finally:
+        secs[phase] += time.time() - start
+
+    return wrapper
+
+  with contextlib.ExitStack() as stack:
+    for phase, functions in phases.items():
+      for module, name in functions:
+        stack.enter_context(
+            mock.patch.object(module, name, timed(phase,
+                                                  getattr(module, name))))
+    yield secs
+
+
+class OrchestrationBenchmark(test.Benchmark):
+  """Measures the orchestration overhead of no-op pipelines."""
+
+  def _report(self, name, num_iters, wall_time, num_nodes, phase_secs,
+              mlmd_calls):
+    extras = {
+        "num_nodes": num_nodes,
+        "mlmd_calls": mlmd_calls.total_calls,
+        "mlmd_secs": mlmd_calls.total_secs,
+        "commit_tfx": _commit_tfx(),
+    }
+    for phase, secs in phase_secs.items():
+      extras["%s_secs_per_iter" % phase] = secs / num_iters
+    for method, stats in mlmd_calls.methods.items():
+      extras["mlmd_calls_%s" % method] = stats.calls
+      extras["mlmd_response_bytes_%s" % method] = stats.response_bytes
+    self.report_benchmark(
+        name=name, iters=num_iters, wall_time=wall_time, extras=extras)
+
+  def _benchmark_launcher(self, shape):
+    """Launches every node of the pipeline in topological order."""
+    name = "launcher_%s" % shape
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      tfx_pipeline = noop_pipelines.create_pipeline(
+          shape, _flag_value("orchestration_num_nodes"), name, tmp_dir)
+      pipeline_ir = noop_pipelines.compile_pipeline(tfx_pipeline, "run_0")
+      deployment_config = pipeline_pb2.IntermediateDeploymentConfig()
+      pipeline_ir.deployment_config.Unpack(deployment_config)
+      mlmd_connection = metadata.Metadata(
+          tfx_pipeline.metadata_connection_config, instrument=True)
+      with _timed_phases(_LAUNCH_PHASES) as phase_secs:
+        start = time.time()
+        for node in pipeline_ir.nodes:
+          pipeline_node = node.pipeline_node
+          executor_spec = executable_spec_pb2.PythonClassExecutableSpec()
+          deployment_config.executor_specs[pipeline_node.node_info.id].Unpack(
+              executor_spec)
+          launcher.Launcher(
+              pipeline_node=pipeline_node,
+              mlmd_connection=mlmd_connection,
+              pipeline_info=pipeline_ir.pipeline_info,
+              pipeline_runtime_spec=pipeline_ir.runtime_spec,
+              executor_spec=executor_spec).launch()
+        delta = time.time() - start
+    num_nodes = len(pipeline_ir.nodes)
+    self._report(name, num_nodes, delta / num_nodes, num_nodes, phase_secs,
+                 mlmd_connection.stats)
+
+  def _benchmark_sync_task_generation(self, shape):
+    """Generates tasks until the pipeline is done, faking node executions."""
+    name = "sync_pipeline_task_gen_%s" % shape
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      tfx_pipeline = noop_pipelines.create_pipeline(
+          shape, _flag_value("orchestration_num_nodes"), name, tmp_dir)
+      pipeline_ir = noop_pipelines.compile_pipeline(tfx_pipeline, "run_0")
+      num_ticks = 0
+      generate_secs = 0.0
+      with metadata.Metadata(
+          tfx_pipeline.metadata_connection_config, instrument=True) as m:
+        task_gen = sync_pipeline_task_gen.SyncPipelineTaskGenerator(
+            m, pipeline_ir, lambda _: False)
+        # MLMD calls of the task generator, excluding the faked executions.
+        mlmd_calls = metadata_instrumentation.CallStats()
+        while True:
+          with metadata_instrumentation.record_calls() as tick_mlmd_calls:
+            start = time.time()
+            tasks = task_gen.generate()
+            generate_secs += time.time() - start
+          mlmd_calls.merge(tick_mlmd_calls)
+          num_ticks += 1
+          if not tasks:
+            break
+          for task in tasks:
+            execution_publish_utils.publish_succeeded_execution(
+                m, task.execution.id, task.contexts, task.output_artifacts)
+    num_nodes = len(pipeline_ir.nodes)
+    self._report(name, num_ticks, generate_secs / num_ticks, num_nodes, {},
+                 mlmd_calls)
+
+  def benchmarkLauncherWidePipeline(self):
+    self._benchmark_launcher(noop_pipelines.WIDE)
+
+  def benchmarkLauncherDeepPipeline(self):
+    self._benchmark_launcher(noop_pipelines.DEEP)
+
+  def benchmarkLauncherDiamondPipeline(self):
+    self._benchmark_launcher(noop_pipelines.DIAMOND)
+
+  def benchmarkSyncTaskGenerationWidePipeline(self):
+    self._benchmark_sync_task_generation(noop_pipelines.WIDE)
+
+  def benchmarkSyncTaskGenerationDeepPipeline(self):
+    self._benchmark_sync_task_generation(noop_pipelines.DEEP)
+
+  def benchmarkSyncTaskGenerationDiamondPipeline(self):
+    self._benchmark_sync_task_generation(noop_pipelines.DIAMOND)
+
+
+if __name__ == "__main__":
+  test.main()
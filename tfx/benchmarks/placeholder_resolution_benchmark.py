@@ -0,0 +1,148 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Micro-benchmark for resolving placeholder expressions."""
+
+import time
+
+from absl import flags
+import tfx
+from tfx.dsl.compiler import placeholder_utils
+from tfx.orchestration.portable import data_types
+from tfx.proto import infra_validator_pb2
+from tfx.proto.orchestration import pipeline_pb2
+from tfx.proto.orchestration import placeholder_pb2
+from tfx.types import artifact_utils
+from tfx.types import standard_artifacts
+from tfx.utils import proto_utils
+
+from google.protobuf import text_format
+from tensorflow.python.platform import test  # pylint: disable=g-direct-tensorflow-import
+
+FLAGS = flags.FLAGS
+flags.DEFINE_integer(
+    "num_placeholders", 50,
+    "Number of command line placeholders resolved per execution.")
+flags.DEFINE_integer("num_executions", 200,
+                     "Number of executions to resolve the placeholders for.")
+
+# "--examples_<i>=" + input("examples")[0].split_uri("train")
+_URI_EXPRESSION = """
+operator {
+  concat_op {
+    expressions { value { string_value: "--examples_%d=" } }
+    expressions {
+      operator {
+        artifact_uri_op {
+          expression {
+            operator {
+              index_op {
+                expression {
+                  placeholder { type: INPUT_ARTIFACT key: "examples" }
+                }
+                index: 0
+              }
+            }
+          }
+          split: "train"
+        }
+      }
+    }
+  }
+}
+"""
+
+# exec_property("serving_spec").tensorflow_serving.tags[0]
+_PROTO_EXPRESSION = """
+operator {
+  proto_op {
+    expression {
+      placeholder { type: EXEC_PROPERTY key: "serving_spec" }
+    }
+    proto_schema {
+      message_type: "tfx.components.infra_validator.ServingSpec"
+    }
+    proto_field_path: ".tensorflow_serving"
+    proto_field_path: ".tags"
+    proto_field_path: "[0]"
+  }
+}
+"""
+
+
+def _flag_value(name):
+  return getattr(FLAGS, name) if FLAGS.is_parsed() else FLAGS[name].default
+
+
+class PlaceholderResolutionBenchmark(test.Benchmark):
+  """Measures the cost of resolving the placeholders of a container node."""
+
+  def _expressions(self):
+    result = []
+    for i in range(_flag_value("num_placeholders")):
+      template = _URI_EXPRESSION % i if i % 2 == 0 else _PROTO_EXPRESSION
+      result.append(
+          text_format.Parse(template, placeholder_pb2.PlaceholderExpression()))
+    return result
+
+  def _context(self, execution_id):
+    examples = standard_artifacts.Examples()
+    examples.uri = "/tmp/examples/%d" % execution_id
+    examples.split_names = artifact_utils.encode_split_names(["train", "eval"])
+    serving_spec = infra_validator_pb2.ServingSpec()
+    serving_spec.tensorflow_serving.tags.append("latest")
+    return placeholder_utils.ResolutionContext(
+        exec_info=data_types.ExecutionInfo(
+            execution_id=execution_id,
+            input_dict={"examples": [examples]},
+            output_dict={"model": [standard_artifacts.Model()]},
+            exec_properties={
+                "serving_spec": proto_utils.proto_to_json(serving_spec)
+            },
+            pipeline_node=pipeline_pb2.PipelineNode(),
+            pipeline_info=pipeline_pb2.PipelineInfo(id="benchmark")))
+
+  def _run(self, name, clear_cache):
+    expressions = self._expressions()
+    contexts = [
+        self._context(i) for i in range(_flag_value("num_executions"))
+    ]
+    placeholder_utils.clear_compiled_expression_cache()
+    start = time.time()
+    for context in contexts:
+      if clear_cache:
+        placeholder_utils.clear_compiled_expression_cache()
+      for expression in expressions:
+        placeholder_utils.resolve_placeholder_expression(expression, context)
+    delta = time.time() - start
+    self.report_benchmark(
+        name=name,
+        iters=len(contexts),
+        wall_time=delta / len(contexts),
+        extras={
+            "num_placeholders": len(expressions),
+            "commit_tfx": (getattr(tfx, "GIT_COMMIT_ID", None) or
+                           getattr(tfx, "__version__", None)),
+        })
+
+  def benchmarkResolveCompiled(self):
+    """Resolution cost per execution when compiled expressions are reused."""
+    self._run("resolve_compiled", clear_cache=False)
+
+  def benchmarkResolveUncompiled(self):
+    """Resolution cost per execution when expressions are compiled each time."""
+    self._run("resolve_uncompiled", clear_cache=True)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -0,0 +1,150 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark for resolvers on an MLMD with many historical artifacts."""
+
+import os
+import tempfile
+import time
+
+from absl import flags
+import tfx
+from tfx import types
+from tfx.components.evaluator import constants as evaluator
+from tfx.dsl.experimental import latest_artifacts_resolver
+from tfx.dsl.experimental import latest_blessed_model_resolver
+from tfx.orchestration import data_types
+from tfx.orchestration import metadata
+from tfx.types import standard_artifacts
+
+from tensorflow.python.platform import test  # pylint: disable=g-direct-tensorflow-import
+
+FLAGS = flags.FLAGS
+flags.DEFINE_integer(
+    "resolver_num_artifacts", 10000,
+    "Total number of Model and ModelBlessing artifacts in the synthetic MLMD.")
+flags.DEFINE_integer(
+    "resolver_artifacts_per_run", 100,
+    "Number of artifacts published by each synthetic pipeline run.")
+
+_COMPONENT_ID = "Evaluator"
+
+
+def _flag_value(name):
+  return getattr(FLAGS, name) if FLAGS.is_parsed() else FLAGS[name].default
+
+
+class ResolverBenchmark(test.Benchmark):
+  """Measures resolvers against a synthetic MLMD with many artifacts."""
+
+  def _populate(self, m, pipeline_name):
+    """Publishes runs each producing Models and their ModelBlessings."""
+    num_runs = max(
+        1,
+        _flag_value("resolver_num_artifacts") //
+        _flag_value("resolver_artifacts_per_run"))
+    models_per_run = _flag_value("resolver_artifacts_per_run") // 2
+    for run in range(num_runs):
+      pipeline_info = data_types.PipelineInfo(
+          pipeline_name=pipeline_name,
+          pipeline_root="/tmp",
+          run_id="run_%d" % run)
+      component_info = data_types.ComponentInfo(
+          component_type="Evaluator",
+          component_id=_COMPONENT_ID,
+          pipeline_info=pipeline_info)
+      models = []
+      for i in range(models_per_run):
+        model = standard_artifacts.Model()
+        model.uri = "/tmp/model/%d/%d" % (run, i)
+        models.append(model)
+      m.publish_artifacts(models)
+      blessings = []
+      for i, model in enumerate(models):
+        blessing = standard_artifacts.ModelBlessing()
+        blessing.uri = "/tmp/blessing/%d/%d" % (run, i)
+        blessing.set_int_custom_property(
+            evaluator.ARTIFACT_PROPERTY_CURRENT_MODEL_ID_KEY, model.id)
+        blessing.set_int_custom_property(
+            evaluator.ARTIFACT_PROPERTY_BLESSED_KEY, i % 2)
+        blessings.append(blessing)
+      m.publish_artifacts(blessings)
+      contexts = m.register_pipeline_contexts_if_not_exists(pipeline_info)
+      m.register_execution(
+          exec_properties={},
+          pipeline_info=pipeline_info,
+          component_info=component_info,
+          contexts=contexts)
+      m.publish_execution(
+          component_info=component_info,
+          output_artifacts={
+              "model": models,
+              "blessing": blessings
+          })
+    return pipeline_info
+
+  def _run(self, name, resolver, source_channels):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      connection_config = metadata.sqlite_metadata_connection_config(
+          os.path.join(tmp_dir, "metadata.db"))
+      with metadata.Metadata(connection_config) as m:
+        pipeline_info = self._populate(m, "resolver_benchmark")
+        start = time.time()
+        result = resolver.resolve(
+            pipeline_info=pipeline_info,
+            metadata_handler=m,
+            source_channels=source_channels)
+        delta = time.time() - start
+    assert result.has_complete_result
+    self.report_benchmark(
+        name=name,
+        iters=1,
+        wall_time=delta,
+        extras={
+            "num_artifacts": _flag_value("resolver_num_artifacts"),
+            "commit_tfx": (getattr(tfx, "GIT_COMMIT_ID", None) or
+                           getattr(tfx, "__version__", None)),
+        })
+
+  def benchmarkLatestArtifactsResolver(self):
+    self._run(
+        "latest_artifacts_resolver",
+        latest_artifacts_resolver.LatestArtifactsResolver(),
+        {
+            "model":
+                types.Channel(
+                    type=standard_artifacts.Model,
+                    producer_component_id=_COMPONENT_ID,
+                    output_key="model")
+        })
+
+  def benchmarkLatestBlessedModelResolver(self):
+    self._run(
+        "latest_blessed_model_resolver",
+        latest_blessed_model_resolver.LatestBlessedModelResolver(),
+        {
+            "model":
+                types.Channel(
+                    type=standard_artifacts.Model,
+                    producer_component_id=_COMPONENT_ID,
+                    output_key="model"),
+            "model_blessing":
+                types.Channel(
+                    type=standard_artifacts.ModelBlessing,
+                    producer_component_id=_COMPONENT_ID,
+                    output_key="blessing"),
+        })
+
+
+if __name__ == "__main__":
+  test.main()
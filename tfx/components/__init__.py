@@ -14,19 +14,31 @@
 # limitations under the License.
 """Subpackage for TFX components."""
 # For component user to direct use tfx.components.[...] as an alias.
-from tfx.components.bulk_inferrer.component import BulkInferrer
-from tfx.components.common_nodes.importer_node import ImporterNode
-from tfx.components.common_nodes.resolver_node import ResolverNode
-from tfx.components.evaluator.component import Evaluator
-from tfx.components.example_gen.component import FileBasedExampleGen
-from tfx.components.example_gen.csv_example_gen.component import CsvExampleGen
-from tfx.components.example_gen.import_example_gen.component import ImportExampleGen
-from tfx.components.example_validator.component import ExampleValidator
-from tfx.components.infra_validator.component import InfraValidator
-from tfx.components.model_validator.component import ModelValidator
-from tfx.components.pusher.component import Pusher
-from tfx.components.schema_gen.component import SchemaGen
-from tfx.components.statistics_gen.component import StatisticsGen
-from tfx.components.trainer.component import Trainer
-from tfx.components.transform.component import Transform
-from tfx.components.tuner.component import Tuner
+#
+# Component modules are imported on first access, as importing them pulls in
+# TensorFlow, Beam and the libraries backing each component.
+from tfx.utils import import_utils
+
+_COMPONENT_MODULES = {
+    'BulkInferrer': 'tfx.components.bulk_inferrer.component',
+    'ImporterNode': 'tfx.components.common_nodes.importer_node',
+    'ResolverNode': 'tfx.components.common_nodes.resolver_node',
+    'Evaluator': 'tfx.components.evaluator.component',
+    'FileBasedExampleGen': 'tfx.components.example_gen.component',
+    'CsvExampleGen': 'tfx.components.example_gen.csv_example_gen.component',
+    'ImportExampleGen':
+        'tfx.components.example_gen.import_example_gen.component',
+    'ExampleValidator': 'tfx.components.example_validator.component',
+    'InfraValidator': 'tfx.components.infra_validator.component',
+    'ModelValidator': 'tfx.components.model_validator.component',
+    'Pusher': 'tfx.components.pusher.component',
+    'SchemaGen': 'tfx.components.schema_gen.component',
+    'StatisticsGen': 'tfx.components.statistics_gen.component',
+    'Trainer': 'tfx.components.trainer.component',
+    'Transform': 'tfx.components.transform.component',
+    'Tuner': 'tfx.components.tuner.component',
+}
+
+__all__ = sorted(_COMPONENT_MODULES)
+
+import_utils.install_lazy_attributes(__name__, _COMPONENT_MODULES)
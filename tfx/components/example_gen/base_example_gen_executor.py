@@ -22,10 +22,14 @@ import abc
 import bisect
 import hashlib
 import os
-from typing import Any, Dict, List, Text, Union
+from typing import Any, Dict, Iterable, List, Optional, Text, Union
 
 from absl import logging
 import apache_beam as beam
+from apache_beam.io import filebasedsink
+from apache_beam.io import filesystem
+import pyarrow as pa
+from pyarrow import parquet as pq
 from six import with_metaclass
 import tensorflow as tf
 from tfx import types
@@ -35,9 +39,15 @@ from tfx.dsl.components.base import base_executor
 from tfx.proto import example_gen_pb2
 from tfx.types import artifact_utils
 from tfx.utils import proto_utils
+from tfx_bsl.coders import example_coder
 
 # Default file name for TFRecord output file prefix.
 DEFAULT_FILE_NAME = 'data_tfrecord'
+# Default file name for Parquet output file prefix.
+DEFAULT_PARQUET_FILE_NAME = 'data_parquet'
+# Approximate size in bytes of the RecordBatches buffered into a row group of
+# the Parquet files.
+_PARQUET_ROW_GROUP_BUFFER_SIZE = 64 * 1024 * 1024
 
 
 def _GeneratePartitionKey(record: Union[tf.train.Example,
@@ -91,27 +101,253 @@ def _PartitionFn(
   return bisect.bisect(buckets, bucket)
 
 
+# File name suffix and Beam compression type of TFRecord output files, by
+# example_gen_pb2.Output.Compression.
+_COMPRESSION_FORMATS = {
+    example_gen_pb2.Output.GZIP: ('.gz',
+                                  beam.io.filesystem.CompressionTypes.GZIP),
+    example_gen_pb2.Output.UNCOMPRESSED:
+        ('', beam.io.filesystem.CompressionTypes.UNCOMPRESSED),
+}
+
+
 @beam.ptransform_fn
 @beam.typehints.with_input_types(Union[tf.train.Example,
                                        tf.train.SequenceExample, bytes])
 @beam.typehints.with_output_types(beam.pvalue.PDone)
-def _WriteSplit(example_split: beam.pvalue.PCollection,
-                output_split_path: Text) -> beam.pvalue.PDone:
-  """Shuffles and writes output split as serialized records in TFRecord."""
+def _WriteSplit(
+    example_split: beam.pvalue.PCollection,
+    output_split_path: Text,
+    output_config: Optional[example_gen_pb2.Output] = None
+) -> beam.pvalue.PDone:
+  """Shuffles and writes output split as serialized records in TFRecord.
+
+  Args:
+    example_split: PCollection of the records of the split.
+    output_split_path: Directory to write the files of the split to.
+    output_config: Output config with the compression, number of files and
+      shuffling of the written files. Defaults to shuffled, gzip compressed
+      files sharded by the Beam runner.
+
+  Returns:
+    PDone.
+  """
+  output_config = output_config or example_gen_pb2.Output()
+  file_name_suffix, compression_type = _COMPRESSION_FORMATS[
+      output_config.compression]
 
   def _MaybeSerialize(x):
     if isinstance(x, (tf.train.Example, tf.train.SequenceExample)):
       return x.SerializeToString()
     return x
 
-  return (example_split
-          # TODO(jyzhao): make shuffle optional.
-          | 'MaybeSerialize' >> beam.Map(_MaybeSerialize)
-          | 'Shuffle' >> beam.transforms.Reshuffle()
+  serialized_split = example_split | 'MaybeSerialize' >> beam.Map(
+      _MaybeSerialize)
+  if not output_config.disable_shuffle:
+    serialized_split |= 'Shuffle' >> beam.transforms.Reshuffle()
+  return (serialized_split
           # TODO(jyzhao): multiple output format.
           | 'Write' >> beam.io.WriteToTFRecord(
               os.path.join(output_split_path, DEFAULT_FILE_NAME),
-              file_name_suffix='.gz'))
+              file_name_suffix=file_name_suffix,
+              num_shards=output_config.num_shards,
+              compression_type=compression_type))
+
+
+# Parquet compression codec by example_gen_pb2.Output.Compression.
+_PARQUET_COMPRESSION_CODECS = {
+    example_gen_pb2.Output.GZIP: 'gzip',
+    example_gen_pb2.Output.UNCOMPRESSED: 'none',
+}
+
+
+def _MergeArrowSchemas(schemas: Iterable[pa.Schema]) -> pa.Schema:
+  """Merges the schemas of RecordBatches decoded from tf.Examples.
+
+  A feature missing from some batches, or only holding nulls in some batches
+  (null typed), takes its type from the other batches.
+
+  Args:
+    schemas: Arrow schemas to merge.
+
+  Returns:
+    The merged schema, with the fields sorted by name.
+
+  Raises:
+    RuntimeError: If a feature has different types in different batches.
+  """
+  fields = {}
+  for schema in schemas:
+    for field in schema:
+      existing_field = fields.get(field.name)
+      if existing_field is None or pa.types.is_null(existing_field.type):
+        fields[field.name] = field
+      elif (not pa.types.is_null(field.type) and
+            field.type != existing_field.type):
+        raise RuntimeError(
+            'Feature `{}` has inconsistent types {} and {}.'.format(
+                field.name, existing_field.type, field.type))
+  return pa.schema([fields[name] for name in sorted(fields)])
+
+
+def _AlignRecordBatch(record_batch: pa.RecordBatch,
+                      schema: pa.Schema) -> pa.RecordBatch:
+  """Returns `record_batch` with the columns of `schema`, filling nulls."""
+  columns = []
+  for field in schema:
+    index = record_batch.schema.get_field_index(field.name)
+    if index < 0 or pa.types.is_null(record_batch.schema.field(index).type):
+      columns.append(pa.nulls(record_batch.num_rows, type=field.type))
+    else:
+      columns.append(record_batch.column(index))
+  return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+class _DecodeExamplesDoFn(beam.DoFn):
+  """Decodes batches of serialized tf.Examples into RecordBatches."""
+
+  def __init__(self):
+    self._decoder = None
+
+  def setup(self):
+    self._decoder = example_coder.ExamplesToRecordBatchDecoder()
+
+  def process(self, examples: List[bytes]) -> Iterable[pa.RecordBatch]:
+    yield self._decoder.DecodeBatch(examples)
+
+
+class _ParquetFileWriter(object):
+  """Writes RecordBatches of the same schema to a Parquet file.
+
+  The RecordBatches are buffered into row groups of about
+  `row_group_buffer_size` bytes. The Parquet writer is created with the schema
+  of the first row group, so a file without any RecordBatch has no column.
+  """
+
+  def __init__(self, file_handle: Any, codec: Text,
+               row_group_buffer_size: int):
+    self._file_handle = file_handle
+    self._codec = codec
+    self._row_group_buffer_size = row_group_buffer_size
+    self._writer = None
+    self._buffer = []
+    self._buffer_size = 0
+
+  def write(self, record_batch: pa.RecordBatch) -> None:
+    self._buffer.append(record_batch)
+    self._buffer_size += record_batch.nbytes
+    if self._buffer_size >= self._row_group_buffer_size:
+      self._flush()
+
+  def _flush(self) -> None:
+    if not self._buffer:
+      return
+    table = pa.Table.from_batches(self._buffer)
+    if self._writer is None:
+      self._writer = pq.ParquetWriter(
+          self._file_handle, table.schema, compression=self._codec)
+    self._writer.write_table(table, row_group_size=table.num_rows)
+    self._buffer = []
+    self._buffer_size = 0
+
+  def close(self) -> None:
+    self._flush()
+    if self._writer is None:
+      self._writer = pq.ParquetWriter(
+          self._file_handle, pa.schema([]), compression=self._codec)
+    self._writer.close()
+    self._file_handle.close()
+
+
+class _ParquetRecordBatchSink(filebasedsink.FileBasedSink):
+  """A Beam file sink writing RecordBatches of the same schema to Parquet.
+
+  As with the other Beam file sinks, each bundle is written to a temporary file
+  which is renamed when the write is finalized, and at least one file is
+  written, even if there is no RecordBatch.
+  """
+
+  def __init__(self,
+               file_path_prefix: Text,
+               codec: Text,
+               num_shards: int,
+               row_group_buffer_size: int = _PARQUET_ROW_GROUP_BUFFER_SIZE):
+    super(_ParquetRecordBatchSink, self).__init__(
+        file_path_prefix,
+        coder=None,
+        file_name_suffix='.parquet',
+        num_shards=num_shards,
+        mime_type='application/x-parquet',
+        compression_type=filesystem.CompressionTypes.UNCOMPRESSED)
+    self._codec = codec
+    self._row_group_buffer_size = row_group_buffer_size
+
+  def open(self, temp_path: Text) -> _ParquetFileWriter:
+    return _ParquetFileWriter(
+        super(_ParquetRecordBatchSink, self).open(temp_path), self._codec,
+        self._row_group_buffer_size)
+
+  def write_record(self, file_handle: _ParquetFileWriter,
+                   value: pa.RecordBatch) -> None:
+    file_handle.write(value)
+
+  def close(self, file_handle: _ParquetFileWriter) -> None:
+    file_handle.close()
+
+
+@beam.ptransform_fn
+@beam.typehints.with_input_types(Union[tf.train.Example, bytes])
+@beam.typehints.with_output_types(None)
+def _WriteParquetSplit(
+    example_split: beam.pvalue.PCollection,
+    output_split_path: Text,
+    output_config: Optional[example_gen_pb2.Output] = None
+) -> beam.pvalue.PCollection:
+  """Decodes tf.Examples into RecordBatches and writes them in Parquet.
+
+  All the files of the split share one Arrow schema, merged from the schemas of
+  the decoded batches, so that they can be read with a single schema. The
+  files are written by Beam's file sink machinery, one per bundle unless the
+  output config sets the number of files, and at least one file is written even
+  if the split is empty. A feature without any value in the split keeps the
+  Arrow null type, which readers take from their TFMD schema.
+
+  Args:
+    example_split: PCollection of the tf.Examples of the split.
+    output_split_path: Directory to write the files of the split to.
+    output_config: Output config with the compression, number of files and
+      shuffling of the written files.
+
+  Returns:
+    An empty PCollection, once the files are written.
+  """
+  output_config = output_config or example_gen_pb2.Output()
+
+  def _MaybeSerialize(x):
+    if isinstance(x, tf.train.Example):
+      return x.SerializeToString()
+    return x
+
+  serialized_split = example_split | 'MaybeSerialize' >> beam.Map(
+      _MaybeSerialize)
+  if not output_config.disable_shuffle:
+    serialized_split |= 'Shuffle' >> beam.transforms.Reshuffle()
+  record_batches = (
+      serialized_split
+      | 'BatchExamples' >> beam.BatchElements()
+      | 'DecodeExamples' >> beam.ParDo(_DecodeExamplesDoFn()))
+  schema = (
+      record_batches
+      | 'GetSchemas' >> beam.Map(lambda record_batch: record_batch.schema)
+      | 'MergeSchemas' >> beam.CombineGlobally(_MergeArrowSchemas))
+  return (record_batches
+          | 'AlignRecordBatches' >> beam.Map(
+              _AlignRecordBatch, schema=beam.pvalue.AsSingleton(schema))
+          | 'Write' >> beam.io.Write(
+              _ParquetRecordBatchSink(
+                  os.path.join(output_split_path, DEFAULT_PARQUET_FILE_NAME),
+                  _PARQUET_COMPRESSION_CODECS[output_config.compression],
+                  output_config.num_shards)))
 
 
 class BaseExampleGenExecutor(
@@ -253,11 +489,14 @@ class BaseExampleGenExecutor(
     """Take input data source and generates serialized data splits.
 
     The output is intended to be serialized tf.train.Examples or
-    tf.train.SequenceExamples protocol buffer in gzipped TFRecord format,
-    but subclasses can choose to override to write to any serialized records
-    payload into gzipped TFRecord as specified, so long as downstream
-    component can consume it. The format of payload is added to
-    `payload_format` custom property of the output Example artifact.
+    tf.train.SequenceExamples protocol buffer in TFRecord format, gzipped
+    unless the output config specifies otherwise, but subclasses can choose to
+    override to write to any serialized records payload into TFRecord as
+    specified, so long as downstream component can consume it. The format of
+    payload is added to `payload_format` custom property of the output Example
+    artifact, and the compression of the files to `compression`. If the
+    payload format is FORMAT_PARQUET, the tf.train.Examples are decoded into
+    Arrow RecordBatches and written in Parquet files instead.
 
     Args:
       input_dict: Input dict from input key to a list of Artifacts. Depends on
@@ -296,16 +535,22 @@ class BaseExampleGenExecutor(
       example_splits = self.GenerateExamplesByBeam(pipeline, exec_properties)
 
       # pylint: disable=expression-not-assigned, no-value-for-parameter
+      output_payload_format = exec_properties.get(utils.OUTPUT_DATA_FORMAT_KEY)
+      if output_payload_format == example_gen_pb2.PayloadFormat.FORMAT_PARQUET:
+        write_split = _WriteParquetSplit
+      else:
+        write_split = _WriteSplit
       for split_name, example_split in example_splits.items():
         (example_split
-         | 'WriteSplit[{}]'.format(split_name) >> _WriteSplit(
+         | 'WriteSplit[{}]'.format(split_name) >> write_split(
              artifact_utils.get_split_uri(output_dict[utils.EXAMPLES_KEY],
-                                          split_name)))
+                                          split_name), output_config))
       # pylint: enable=expression-not-assigned, no-value-for-parameter
 
-    output_payload_format = exec_properties.get(utils.OUTPUT_DATA_FORMAT_KEY)
-    if output_payload_format:
-      for output_examples_artifact in output_dict[utils.EXAMPLES_KEY]:
+    for output_examples_artifact in output_dict[utils.EXAMPLES_KEY]:
+      if output_payload_format:
         examples_utils.set_payload_format(
             output_examples_artifact, output_payload_format)
+      examples_utils.set_compression(output_examples_artifact,
+                                     output_config.compression)
     logging.info('Examples generated.')
@@ -20,6 +20,8 @@ from __future__ import print_function
 
 import os
 import apache_beam as beam
+import pyarrow as pa
+from pyarrow import parquet as pq
 import tensorflow as tf
 
 from tfx.components.example_gen import base_example_gen_executor
@@ -130,6 +132,10 @@ class BaseExampleGenExecutorTest(tf.test.TestCase):
     # Check example gen outputs.
     self.assertTrue(fileio.exists(self._train_output_file))
     self.assertTrue(fileio.exists(self._eval_output_file))
+    self.assertEqual(
+        'GZIP',
+        self._examples.get_string_custom_property(
+            utils.COMPRESSION_PROPERTY_NAME))
 
     # Output split ratio: train:eval=2:1.
     self.assertGreater(
@@ -167,6 +173,105 @@ class BaseExampleGenExecutorTest(tf.test.TestCase):
 
     self._testDo()
 
+  def testDoOutputSplitWithWriteOptions(self):
+    # Update exec proterties.
+    output_config = proto_utils.json_to_proto(
+        self._exec_properties[utils.OUTPUT_CONFIG_KEY],
+        example_gen_pb2.Output())
+    output_config.compression = example_gen_pb2.Output.UNCOMPRESSED
+    output_config.num_shards = 2
+    output_config.disable_shuffle = True
+    self._exec_properties[utils.OUTPUT_CONFIG_KEY] = proto_utils.proto_to_json(
+        output_config)
+
+    example_gen = TestExampleGenExecutor()
+    example_gen.Do({}, self._output_dict, self._exec_properties)
+
+    for split in ('train', 'eval'):
+      self.assertCountEqual(
+          ['data_tfrecord-00000-of-00002', 'data_tfrecord-00001-of-00002'],
+          fileio.listdir(os.path.join(self._examples.uri, split)))
+    # Uncompressed files can be read without specifying a compression type.
+    train_examples = list(
+        tf.compat.v1.io.tf_record_iterator(
+            os.path.join(self._examples.uri, 'train',
+                         'data_tfrecord-00000-of-00002')))
+    self.assertNotEmpty(train_examples)
+    self.assertEqual(
+        'UNCOMPRESSED',
+        self._examples.get_string_custom_property(
+            utils.COMPRESSION_PROPERTY_NAME))
+
+  def testDoOutputSplitWithParquet(self):
+    # Update exec proterties.
+    self._exec_properties[utils.OUTPUT_DATA_FORMAT_KEY] = (
+        example_gen_pb2.PayloadFormat.FORMAT_PARQUET)
+
+    example_gen = TestExampleGenExecutor()
+    example_gen.Do({}, self._output_dict, self._exec_properties)
+
+    num_rows = {}
+    for split in ('train', 'eval'):
+      output_files = fileio.glob(
+          os.path.join(self._examples.uri, split, 'data_parquet-*.parquet'))
+      self.assertNotEmpty(output_files)
+      tables = [pq.read_table(output_file) for output_file in output_files]
+      for table in tables:
+        self.assertEqual(['f', 'i', 's'], table.schema.names)
+        self.assertEqual(pa.large_list(pa.int64()),
+                         table.schema.field('i').type)
+      num_rows[split] = sum(table.num_rows for table in tables)
+    self.assertEqual(6000, num_rows['train'] + num_rows['eval'])
+    # Output split ratio: train:eval=2:1.
+    self.assertGreater(num_rows['train'], num_rows['eval'])
+    self.assertEqual(
+        'FORMAT_PARQUET',
+        self._examples.get_string_custom_property(
+            utils.PAYLOAD_FORMAT_PROPERTY_NAME))
+
+  def testWriteParquetSplitWithNumShards(self):
+    output_split_path = os.path.join(self.get_temp_dir(), 'sharded')
+    examples = [
+        tf.train.Example(
+            features=tf.train.Features(
+                feature={
+                    'i':
+                        tf.train.Feature(
+                            int64_list=tf.train.Int64List(value=[i])),
+                })) for i in range(3)
+    ]
+    # pylint: disable=no-value-for-parameter
+    with beam.Pipeline() as pipeline:
+      _ = (
+          pipeline
+          | beam.Create(examples)
+          | base_example_gen_executor._WriteParquetSplit(
+              output_split_path, example_gen_pb2.Output(num_shards=5)))
+    # pylint: enable=no-value-for-parameter
+
+    # All the shards are written, including the empty ones.
+    output_files = fileio.glob(
+        os.path.join(output_split_path, 'data_parquet-*.parquet'))
+    self.assertLen(output_files, 5)
+    self.assertEqual(
+        3, sum(pq.read_table(output_file).num_rows
+               for output_file in output_files))
+
+  def testWriteParquetSplitWithEmptySplit(self):
+    output_split_path = os.path.join(self.get_temp_dir(), 'empty')
+    # pylint: disable=no-value-for-parameter
+    with beam.Pipeline() as pipeline:
+      _ = (
+          pipeline
+          | beam.Create([], reshuffle=False).with_output_types(bytes)
+          | base_example_gen_executor._WriteParquetSplit(output_split_path))
+    # pylint: enable=no-value-for-parameter
+
+    output_files = fileio.glob(
+        os.path.join(output_split_path, 'data_parquet-*.parquet'))
+    self.assertLen(output_files, 1)
+    self.assertEqual(0, pq.ParquetFile(output_files[0]).metadata.num_rows)
+
   def _testFeatureBasedPartition(self, partition_feature_name):
     self._exec_properties[utils.OUTPUT_CONFIG_KEY] = proto_utils.proto_to_json(
         example_gen_pb2.Output(
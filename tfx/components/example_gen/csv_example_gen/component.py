@@ -76,7 +76,8 @@ class CsvExampleGen(component.FileBasedExampleGen):  # pylint: disable=protected
       range_config: Optional[Union[range_config_pb2.RangeConfig,
                                    Dict[Text, Any]]] = None,
       example_artifacts: Optional[types.Channel] = None,
-      instance_name: Optional[Text] = None):
+      instance_name: Optional[Text] = None,
+      csv_config: Optional[example_gen_pb2.CsvConfig] = None):
     """Construct a CsvExampleGen component.
 
     Args:
@@ -101,6 +102,9 @@ class CsvExampleGen(component.FileBasedExampleGen):  # pylint: disable=protected
         eval examples.
       instance_name: Optional unique instance name. Necessary if multiple
         CsvExampleGen components are declared in the same pipeline.
+      csv_config: An optional example_gen_pb2.CsvConfig instance. If its
+        `batched` is set, CSV lines are converted to tf.Examples in batches,
+        with the column types optionally inferred from the first lines.
     """
     if input:
       logging.warning(
@@ -108,10 +112,15 @@ class CsvExampleGen(component.FileBasedExampleGen):  # pylint: disable=protected
           'deprecated by "input_base". Please update your usage as support for '
           'this argument will be removed soon.')
       input_base = artifact_utils.get_single_uri(list(input.get()))
+    custom_config = None
+    if csv_config is not None:
+      custom_config = example_gen_pb2.CustomConfig()
+      custom_config.custom_config.Pack(csv_config)
     super(CsvExampleGen, self).__init__(
         input_base=input_base,
         input_config=input_config,
         output_config=output_config,
+        custom_config=custom_config,
         range_config=range_config,
         example_artifacts=example_artifacts,
         instance_name=instance_name)
@@ -20,7 +20,9 @@ from __future__ import print_function
 
 import tensorflow as tf
 from tfx.components.example_gen.csv_example_gen import component
+from tfx.proto import example_gen_pb2
 from tfx.types import standard_artifacts
+from tfx.utils import proto_utils
 
 
 class ComponentTest(tf.test.TestCase):
@@ -30,6 +32,18 @@ class ComponentTest(tf.test.TestCase):
     self.assertEqual(standard_artifacts.Examples.TYPE_NAME,
                      csv_example_gen.outputs['examples'].type_name)
 
+  def testConstructWithCsvConfig(self):
+    csv_config = example_gen_pb2.CsvConfig(
+        batched=True, type_inference_sample_size=1000)
+    csv_example_gen = component.CsvExampleGen(
+        input_base='path', csv_config=csv_config)
+    custom_config = example_gen_pb2.CustomConfig()
+    proto_utils.json_to_proto(csv_example_gen.exec_properties['custom_config'],
+                              custom_config)
+    unpacked_csv_config = example_gen_pb2.CsvConfig()
+    custom_config.custom_config.Unpack(unpacked_csv_config)
+    self.assertEqual(csv_config, unpacked_csv_config)
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -18,8 +18,9 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import csv
 import os
-from typing import Any, Dict, Iterable, List, Text
+from typing import Any, Dict, Iterable, List, Text, Tuple, Union
 
 from absl import logging
 import apache_beam as beam
@@ -28,8 +29,11 @@ import tensorflow as tf
 from tfx.components.example_gen import utils
 from tfx.components.example_gen.base_example_gen_executor import BaseExampleGenExecutor
 from tfx.dsl.io import fileio
+from tfx.proto import example_gen_pb2
 from tfx.utils import io_utils
+from tfx_bsl.coders import batch_util
 from tfx_bsl.coders import csv_decoder
+from tfx_bsl.coders import example_coder
 
 
 def _int_handler(cell: csv_decoder.CSVCell) -> tf.train.Feature:
@@ -99,9 +103,89 @@ class _ParsedCsvToTfExample(beam.DoFn):
     yield tf.train.Example(features=tf.train.Features(feature=feature))
 
 
+def _InferColumnTypesFromHead(
+    csv_files: List[Text], column_names: List[Text],
+    num_lines: int) -> List[csv_decoder.ColumnInfo]:
+  """Infers the column types from the first lines of the CSV files.
+
+  The lines are read in order of the files, skipping their header lines, until
+  `num_lines` lines are read.
+
+  Args:
+    csv_files: CSV files of a split, which share the same header.
+    column_names: Names of the CSV columns.
+    num_lines: Number of lines to infer the column types from.
+
+  Returns:
+    A list of the inferred csv_decoder.ColumnInfo of the columns.
+  """
+  type_inferrer = csv_decoder.ColumnTypeInferrer(
+      column_names, skip_blank_lines=True)
+  accumulator = type_inferrer.create_accumulator()
+  for csv_file in csv_files:
+    with fileio.open(csv_file) as f:
+      # Skips the header line.
+      f.readline()
+      for line in f:
+        if not num_lines:
+          break
+        num_lines -= 1
+        cells = next(csv.reader([line], delimiter=','), [])
+        accumulator = type_inferrer.add_input(
+            accumulator, [cell.encode() for cell in cells])
+    if not num_lines:
+      break
+  return type_inferrer.extract_output(accumulator)
+
+
+@beam.ptransform_fn
+@beam.typehints.with_input_types(Tuple[List[csv_decoder.CSVCell],
+                                       csv_decoder.CSVLine])
+@beam.typehints.with_output_types(bytes)
+def _ParsedCsvToSerializedExamples(  # pylint: disable=invalid-name
+    parsed_csv_lines: beam.pvalue.PCollection,
+    csv_files: List[Text],
+    column_names: List[Text],
+    type_inference_sample_size: int) -> beam.pvalue.PCollection:
+  """Converts batches of parsed CSV lines to serialized TF examples.
+
+  Args:
+    parsed_csv_lines: PCollection of parsed CSV lines and the raw lines.
+    csv_files: CSV files the lines are read from.
+    column_names: Names of the CSV columns.
+    type_inference_sample_size: Number of first lines to infer the column
+      types from, or 0 to infer them from all the lines.
+
+  Returns:
+    PCollection of serialized TF examples.
+  """
+  if type_inference_sample_size:
+    # The first lines are read when the pipeline is constructed, like the
+    # header, so that the types are not inferred by a global combine over the
+    # whole split.
+    column_infos = _InferColumnTypesFromHead(csv_files, column_names,
+                                             type_inference_sample_size)
+  else:
+    column_infos = beam.pvalue.AsSingleton(
+        parsed_csv_lines
+        | 'ExtractParsedCSVLines' >> beam.Keys()
+        | 'InferColumnTypes' >> beam.CombineGlobally(
+            csv_decoder.ColumnTypeInferrer(
+                column_names, skip_blank_lines=True)))
+
+  return (parsed_csv_lines
+          | 'BatchCSVLines' >> beam.BatchElements(
+              **batch_util.GetBatchElementsKwargs(None))
+          | 'BatchedCSVRowsToRecordBatch' >> beam.ParDo(
+              csv_decoder.BatchedCSVRowsToRecordBatch(skip_blank_lines=True),
+              column_infos)
+          | 'EncodeExamples' >> beam.FlatMap(
+              example_coder.RecordBatchToExamples))
+
+
 @beam.ptransform_fn
 @beam.typehints.with_input_types(beam.Pipeline)
-@beam.typehints.with_output_types(tf.train.Example)
+@beam.typehints.with_output_types(Union[tf.train.Example, bytes])
 def _CsvToExample(  # pylint: disable=invalid-name
     pipeline: beam.Pipeline, exec_properties: Dict[Text, Any],
     split_pattern: Text) -> beam.pvalue.PCollection:
@@ -113,11 +197,13 @@ def _CsvToExample(  # pylint: disable=invalid-name
     pipeline: beam pipeline.
     exec_properties: A dict of execution properties.
       - input_base: input dir that contains CSV data. CSV must have header line.
+      - custom_config: Optional JSON string of example_gen_pb2.CustomConfig
+        instance, holding an example_gen_pb2.CsvConfig.
     split_pattern: Split.pattern in Input config, glob relative file pattern
       that maps to input files with root directory given by input_base.
 
   Returns:
-    PCollection of TF examples.
+    PCollection of TF examples, serialized in batched mode.
 
   Raises:
     RuntimeError: if split is empty or csv headers are not equal.
@@ -141,8 +227,18 @@ def _CsvToExample(  # pylint: disable=invalid-name
       pipeline
       | 'ReadFromText' >> beam.io.ReadFromText(
           file_pattern=csv_pattern, skip_header_lines=1)
-      | 'ParseCSVLine' >> beam.ParDo(csv_decoder.ParseCSVLine(delimiter=','))
-      | 'ExtractParsedCSVLines' >> beam.Keys())
+      | 'ParseCSVLine' >> beam.ParDo(csv_decoder.ParseCSVLine(delimiter=',')))
+
+  csv_config = utils.get_custom_config(exec_properties,
+                                       example_gen_pb2.CsvConfig)
+  if csv_config.batched:
+    # pylint: disable=no-value-for-parameter
+    return (parsed_csv_lines
+            | 'ToSerializedTFExample' >> _ParsedCsvToSerializedExamples(
+                csv_files, column_names,
+                csv_config.type_inference_sample_size))
+
+  parsed_csv_lines |= 'ExtractParsedCSVLines' >> beam.Keys()
   column_infos = beam.pvalue.AsSingleton(
       parsed_csv_lines
       | 'InferColumnTypes' >> beam.CombineGlobally(
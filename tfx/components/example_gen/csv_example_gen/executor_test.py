@@ -30,6 +30,7 @@ from tfx.proto import example_gen_pb2
 from tfx.types import artifact_utils
 from tfx.types import standard_artifacts
 from tfx.utils import proto_utils
+from tfx_bsl.coders import csv_decoder
 
 
 class ExecutorTest(tf.test.TestCase):
@@ -80,6 +81,73 @@ class ExecutorTest(tf.test.TestCase):
 
       util.assert_that(examples, check_results)
 
+  def _BatchedExecProperties(self, type_inference_sample_size=0):
+    custom_config = example_gen_pb2.CustomConfig()
+    custom_config.custom_config.Pack(
+        example_gen_pb2.CsvConfig(
+            batched=True,
+            type_inference_sample_size=type_inference_sample_size))
+    return {
+        utils.INPUT_BASE_KEY: self._input_data_dir,
+        utils.CUSTOM_CONFIG_KEY: proto_utils.proto_to_json(custom_config),
+    }
+
+  def testCsvToExampleBatched(self):
+    with beam.Pipeline() as pipeline:
+      examples = (
+          pipeline
+          | 'ToTFExample' >> executor._CsvToExample(
+              exec_properties=self._BatchedExecProperties(
+                  type_inference_sample_size=1000),
+              split_pattern='csv/*'))
+
+      def check_results(results):
+        # We use Python assertion here to avoid Beam serialization error in
+        # pickling tf.test.TestCase.
+        assert (15000 == len(results)), 'Unexpected example count.'
+        feature_names = set()
+        for serialized_example in results:
+          feature_names.update(
+              tf.train.Example.FromString(
+                  serialized_example).features.feature.keys())
+        assert (18 == len(feature_names)), 'Example not match.'
+
+      util.assert_that(examples, check_results)
+
+  def testCsvToExampleBatchedWithEmptyColumn(self):
+    with beam.Pipeline() as pipeline:
+      examples = (
+          pipeline
+          | 'ToTFExample' >> executor._CsvToExample(
+              exec_properties=self._BatchedExecProperties(),
+              split_pattern='csv_empty/*'))
+
+      def check_results(results):
+        # We use Python assertion here to avoid Beam serialization error in
+        # pickling tf.test.TestCase.
+        assert (3 == len(results)), 'Unexpected example count.'
+        for serialized_example in results:
+          example = tf.train.Example.FromString(serialized_example)
+          assert (example.features.feature['A'].HasField('int64_list')
+                 ), 'Column A should be int64 type.'
+          assert ('B' not in example.features.feature
+                 ), 'Column B should be dropped.'
+          assert (example.features.feature['D'].HasField('float_list')
+                 ), 'Column D should be float type.'
+
+      util.assert_that(examples, check_results)
+
+  def testInferColumnTypesFromHead(self):
+    csv_file = os.path.join(self._input_data_dir, 'csv_empty', 'data.csv')
+    column_infos = executor._InferColumnTypesFromHead(
+        [csv_file], ['A', 'B', 'C', 'D'], num_lines=2)
+    self.assertEqual([
+        csv_decoder.ColumnInfo('A', csv_decoder.ColumnType.INT),
+        csv_decoder.ColumnInfo('B', csv_decoder.ColumnType.UNKNOWN),
+        csv_decoder.ColumnInfo('C', csv_decoder.ColumnType.STRING),
+        csv_decoder.ColumnInfo('D', csv_decoder.ColumnType.FLOAT),
+    ], column_infos)
+
   def testDo(self):
     output_data_dir = os.path.join(
         os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
@@ -54,7 +54,8 @@ class ImportExampleGen(component.FileBasedExampleGen):  # pylint: disable=protec
                                    Dict[Text, Any]]] = None,
       payload_format: Optional[int] = example_gen_pb2.FORMAT_TF_EXAMPLE,
       example_artifacts: Optional[types.Channel] = None,
-      instance_name: Optional[Text] = None):
+      instance_name: Optional[Text] = None,
+      import_config: Optional[example_gen_pb2.ImportConfig] = None):
     """Construct an ImportExampleGen component.
 
     Args:
@@ -82,6 +83,10 @@ class ImportExampleGen(component.FileBasedExampleGen):  # pylint: disable=protec
         eval examples.
       instance_name: Optional unique instance name. Necessary if multiple
         ImportExampleGen components are declared in the same pipeline.
+      import_config: An optional example_gen_pb2.ImportConfig instance. If its
+        `passthrough` is set, the input files are registered as the output
+        splits without being rewritten, in which case output_config must not
+        specify splits.
     """
     if input:
       logging.warning(
@@ -89,10 +94,18 @@ class ImportExampleGen(component.FileBasedExampleGen):  # pylint: disable=protec
           'deprecated by "input_base". Please update your usage as support for '
           'this argument will be removed soon.')
       input_base = artifact_utils.get_single_uri(list(input.get()))
+    custom_config = None
+    if import_config is not None:
+      custom_config = example_gen_pb2.CustomConfig()
+      custom_config.custom_config.Pack(import_config)
+      if import_config.passthrough and not output_config:
+        # Keep the input splits instead of the default 'train' and 'eval'.
+        output_config = example_gen_pb2.Output()
     super(ImportExampleGen, self).__init__(
         input_base=input_base,
         input_config=input_config,
         output_config=output_config,
+        custom_config=custom_config,
         range_config=range_config,
         example_artifacts=example_artifacts,
         output_data_format=payload_format,
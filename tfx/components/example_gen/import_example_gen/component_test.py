@@ -20,7 +20,9 @@ from __future__ import print_function
 
 import tensorflow as tf
 from tfx.components.example_gen.import_example_gen import component
+from tfx.proto import example_gen_pb2
 from tfx.types import standard_artifacts
+from tfx.utils import proto_utils
 
 
 class ComponentTest(tf.test.TestCase):
@@ -30,6 +32,19 @@ class ComponentTest(tf.test.TestCase):
     self.assertEqual(standard_artifacts.Examples.TYPE_NAME,
                      import_example_gen.outputs['examples'].type_name)
 
+  def testConstructWithPassthrough(self):
+    import_config = example_gen_pb2.ImportConfig(passthrough=True)
+    import_example_gen = component.ImportExampleGen(
+        input_base='path', import_config=import_config)
+    custom_config = example_gen_pb2.CustomConfig()
+    proto_utils.json_to_proto(
+        import_example_gen.exec_properties['custom_config'], custom_config)
+    unpacked_import_config = example_gen_pb2.ImportConfig()
+    custom_config.custom_config.Unpack(unpacked_import_config)
+    self.assertEqual(import_config, unpacked_import_config)
+    self.assertEqual(
+        '{}', import_example_gen.exec_properties['output_config'])
+
 
 if __name__ == '__main__':
   tf.test.main()
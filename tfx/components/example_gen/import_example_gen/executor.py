@@ -19,15 +19,29 @@ from __future__ import division
 from __future__ import print_function
 
 import os
-from typing import Any, Dict, Text, Union
+import random
+from typing import Any, Dict, List, Text, Union
 
 from absl import logging
 import apache_beam as beam
 import tensorflow as tf
 
+from tfx import types
 from tfx.components.example_gen import base_example_gen_executor
 from tfx.components.example_gen import utils
+from tfx.components.util import examples_utils
+from tfx.dsl.io import fileio
 from tfx.proto import example_gen_pb2
+from tfx.types import artifact_utils
+from tfx.utils import proto_utils
+
+
+# Proto message parsing the records of a payload format, for validation.
+_PAYLOAD_FORMAT_MESSAGES = {
+    example_gen_pb2.PayloadFormat.FORMAT_TF_EXAMPLE: tf.train.Example,
+    example_gen_pb2.PayloadFormat.FORMAT_TF_SEQUENCE_EXAMPLE:
+        tf.train.SequenceExample,
+}
 
 
 @beam.ptransform_fn
@@ -61,9 +75,185 @@ def _ImportSerializedRecord(  # pylint: disable=invalid-name
           beam.io.ReadFromTFRecord(file_pattern=input_split_pattern))
 
 
+def _GetCompression(split_name: Text, input_files: List[Text]) -> int:
+  """Returns the compression of the files of an input split.
+
+  Args:
+    split_name: Name of the input split.
+    input_files: Files of the input split.
+
+  Returns:
+    One of the enums in example_gen_pb2.Output.Compression.
+
+  Raises:
+    ValueError: If the split has no file, a directory, or both files with and
+      without the '.gz' suffix.
+  """
+  if not input_files:
+    raise ValueError('Input split {} has no file.'.format(split_name))
+  for input_file in input_files:
+    if fileio.isdir(input_file):
+      raise ValueError('Input split {} has a directory {}, only files can be '
+                       'imported in passthrough mode.'.format(
+                           split_name, input_file))
+  num_gzip_files = sum(f.endswith('.gz') for f in input_files)
+  if num_gzip_files == len(input_files):
+    return example_gen_pb2.Output.GZIP
+  if not num_gzip_files:
+    return example_gen_pb2.Output.UNCOMPRESSED
+  raise ValueError(
+      'Input split {} mixes files with and without the .gz suffix, which '
+      'cannot be imported in passthrough mode.'.format(split_name))
+
+
+def _LinkOrCopy(src: Text, dst: Text) -> None:
+  """Hard links `src` to `dst` if possible, copies it otherwise."""
+  if '://' not in src and '://' not in dst:
+    try:
+      os.link(src, dst)
+      return
+    except OSError as e:
+      logging.info('Copying %s as it cannot be hard linked: %s', src, e)
+  fileio.copy(src, dst)
+
+
+def _ValidateRecords(split_name: Text, input_files: List[Text],
+                     compression: int, payload_format: int,
+                     num_records: int) -> None:
+  """Parses records read from files chosen at random.
+
+  Args:
+    split_name: Name of the input split.
+    input_files: Files of the input split.
+    compression: Compression of the files, one of the enums in
+      example_gen_pb2.Output.Compression.
+    payload_format: Payload format of the records, one of the enums in
+      example_gen_pb2.PayloadFormat.
+    num_records: Maximum number of records to read.
+
+  Raises:
+    ValueError: If a record can't be read or parsed.
+  """
+  message_cls = _PAYLOAD_FORMAT_MESSAGES.get(payload_format)
+  options = tf.io.TFRecordOptions(
+      'GZIP' if compression == example_gen_pb2.Output.GZIP else '')
+  num_read = 0
+  for input_file in random.sample(input_files, len(input_files)):
+    try:
+      for record in tf.compat.v1.io.tf_record_iterator(input_file, options):
+        if message_cls is not None:
+          message_cls.FromString(record)
+        num_read += 1
+        if num_read >= num_records:
+          break
+    except Exception as e:  # pylint: disable=broad-except
+      raise ValueError('Invalid record in {} of input split {}: {}'.format(
+          input_file, split_name, e))
+    if num_read >= num_records:
+      break
+  logging.info('Validated %d records of input split %s.', num_read, split_name)
+
+
 class Executor(base_example_gen_executor.BaseExampleGenExecutor):
   """Generic TFX import example gen executor."""
 
+  def Do(
+      self,
+      input_dict: Dict[Text, List[types.Artifact]],
+      output_dict: Dict[Text, List[types.Artifact]],
+      exec_properties: Dict[Text, Any],
+  ) -> None:
+    """Imports the input TFRecord files.
+
+    Unless the ImportConfig packed in the `custom_config` exec property enables
+    passthrough, the records are read, split and written as by any ExampleGen.
+
+    Args:
+      input_dict: Input dict from input key to a list of Artifacts.
+      output_dict: Output dict from output key to a list of Artifacts.
+        - examples: splits of serialized records.
+      exec_properties: A dict of execution properties.
+        - input_base: an external directory containing the data files.
+        - input_config: JSON string of example_gen_pb2.Input instance,
+          providing input configuration.
+        - output_config: JSON string of example_gen_pb2.Output instance,
+          providing output configuration.
+        - output_data_format: Payload format of generated data in output
+          artifact, one of example_gen_pb2.PayloadFormat enum.
+        - custom_config: Optional JSON string of example_gen_pb2.CustomConfig
+          instance, holding an example_gen_pb2.ImportConfig.
+
+    Returns:
+      None
+    """
+    import_config = utils.get_custom_config(exec_properties,
+                                            example_gen_pb2.ImportConfig)
+    if not import_config.passthrough:
+      super(Executor, self).Do(input_dict, output_dict, exec_properties)
+      return
+
+    self._log_startup(input_dict, output_dict, exec_properties)
+    input_config = example_gen_pb2.Input()
+    proto_utils.json_to_proto(exec_properties[utils.INPUT_CONFIG_KEY],
+                              input_config)
+    output_config = example_gen_pb2.Output()
+    proto_utils.json_to_proto(exec_properties[utils.OUTPUT_CONFIG_KEY],
+                              output_config)
+    if output_config.split_config.splits:
+      raise ValueError('Output splits cannot be specified in passthrough mode, '
+                       'the output splits are the input splits.')
+    if (output_config.compression != example_gen_pb2.Output.GZIP or
+        output_config.num_shards or output_config.disable_shuffle):
+      raise ValueError('Output compression, num_shards and disable_shuffle '
+                       'cannot be specified in passthrough mode, the input '
+                       'files are imported as they are.')
+    output_payload_format = exec_properties.get(utils.OUTPUT_DATA_FORMAT_KEY)
+    if output_payload_format == example_gen_pb2.PayloadFormat.FORMAT_PARQUET:
+      raise ValueError('FORMAT_PARQUET cannot be imported in passthrough mode.')
+
+    input_base_uri = exec_properties[utils.INPUT_BASE_KEY]
+    input_files_by_split = {}
+    compressions = set()
+    for split in input_config.splits:
+      input_files = sorted(
+          fileio.glob(os.path.join(input_base_uri, split.pattern)))
+      compressions.add(_GetCompression(split.name, input_files))
+      input_files_by_split[split.name] = input_files
+    if len(compressions) != 1:
+      raise ValueError('All the input splits must have the same compression in '
+                       'passthrough mode.')
+    compression = compressions.pop()
+
+    if import_config.num_validation_records:
+      for split_name, input_files in input_files_by_split.items():
+        _ValidateRecords(split_name, input_files, compression,
+                         output_payload_format,
+                         import_config.num_validation_records)
+
+    examples_artifact = artifact_utils.get_single_instance(
+        output_dict[utils.EXAMPLES_KEY])
+    examples_artifact.split_names = artifact_utils.encode_split_names(
+        list(input_files_by_split))
+    suffix = '.gz' if compression == example_gen_pb2.Output.GZIP else ''
+    for split_name, input_files in input_files_by_split.items():
+      output_split_path = artifact_utils.get_split_uri(
+          output_dict[utils.EXAMPLES_KEY], split_name)
+      fileio.makedirs(output_split_path)
+      for index, input_file in enumerate(input_files):
+        output_file = os.path.join(
+            output_split_path, '{}-{:05d}-of-{:05d}{}'.format(
+                base_example_gen_executor.DEFAULT_FILE_NAME, index,
+                len(input_files), suffix))
+        _LinkOrCopy(input_file, output_file)
+      logging.info('Imported %d files of split %s.', len(input_files),
+                   split_name)
+
+    for output_examples_artifact in output_dict[utils.EXAMPLES_KEY]:
+      if output_payload_format:
+        examples_utils.set_payload_format(output_examples_artifact,
+                                          output_payload_format)
+      examples_utils.set_compression(output_examples_artifact, compression)
+
   def GetInputSourceToExamplePTransform(self) -> beam.PTransform:
     """Returns PTransform for importing records."""
 
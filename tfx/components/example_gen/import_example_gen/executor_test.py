@@ -21,6 +21,7 @@ from __future__ import print_function
 import os
 import apache_beam as beam
 from apache_beam.testing import util
+import mock
 import tensorflow as tf
 
 from tfx.components.example_gen import utils
@@ -141,6 +142,82 @@ class ExecutorTest(tf.test.TestCase):
         self.examples.get_string_custom_property(
             utils.PAYLOAD_FORMAT_PROPERTY_NAME))
 
+  def _testDoPassthrough(self, num_validation_records=0, output_config=None):
+    custom_config = example_gen_pb2.CustomConfig()
+    custom_config.custom_config.Pack(
+        example_gen_pb2.ImportConfig(
+            passthrough=True, num_validation_records=num_validation_records))
+    exec_properties = {
+        utils.INPUT_BASE_KEY: self._input_data_dir,
+        utils.INPUT_CONFIG_KEY: self._input_config,
+        utils.OUTPUT_CONFIG_KEY: proto_utils.proto_to_json(
+            output_config or example_gen_pb2.Output()),
+        utils.OUTPUT_DATA_FORMAT_KEY:
+            example_gen_pb2.PayloadFormat.FORMAT_TF_EXAMPLE,
+        utils.CUSTOM_CONFIG_KEY: proto_utils.proto_to_json(custom_config),
+    }
+    self.examples = standard_artifacts.Examples()
+    self.examples.uri = os.path.join(self.get_temp_dir(), self._testMethodName)
+    output_dict = {utils.EXAMPLES_KEY: [self.examples]}
+
+    executor.Executor().Do({}, output_dict, exec_properties)
+
+  def testDoPassthrough(self):
+    with mock.patch.object(executor.beam, 'Pipeline') as mock_pipeline:
+      self._testDoPassthrough(num_validation_records=10)
+    mock_pipeline.assert_not_called()
+
+    self.assertEqual(
+        artifact_utils.encode_split_names(['tfrecord']),
+        self.examples.split_names)
+    output_files = sorted(
+        fileio.listdir(os.path.join(self.examples.uri, 'tfrecord')))
+    self.assertEqual(
+        ['data_tfrecord-00000-of-00002.gz', 'data_tfrecord-00001-of-00002.gz'],
+        output_files)
+    for output_file in output_files:
+      with fileio.open(
+          os.path.join(self.examples.uri, 'tfrecord', output_file), 'rb') as f:
+        output_content = f.read()
+      with fileio.open(
+          os.path.join(self._input_data_dir, 'tfrecord', output_file),
+          'rb') as f:
+        self.assertEqual(f.read(), output_content)
+    self.assertEqual(
+        'GZIP',
+        self.examples.get_string_custom_property(
+            utils.COMPRESSION_PROPERTY_NAME))
+
+  def testDoPassthroughInvalidRecords(self):
+    input_dir = os.path.join(self.get_temp_dir(), 'invalid', 'tfrecord')
+    fileio.makedirs(input_dir)
+    with tf.io.TFRecordWriter(os.path.join(input_dir, 'data')) as writer:
+      writer.write(b'not a tf.Example')
+    self._input_data_dir = os.path.dirname(input_dir)
+
+    with self.assertRaisesRegex(ValueError, 'Invalid record'):
+      self._testDoPassthrough(num_validation_records=10)
+
+  def testDoPassthroughWithMixedCompression(self):
+    input_dir = os.path.join(self.get_temp_dir(), 'mixed', 'tfrecord')
+    fileio.makedirs(input_dir)
+    for file_name in ('data.gz', 'data'):
+      with fileio.open(os.path.join(input_dir, file_name), 'wb') as f:
+        f.write(b'')
+    self._input_data_dir = os.path.dirname(input_dir)
+
+    with self.assertRaisesRegex(ValueError, 'mixes files'):
+      self._testDoPassthrough()
+
+  def testDoPassthroughWithOutputOptions(self):
+    for output_config in (
+        example_gen_pb2.Output(
+            compression=example_gen_pb2.Output.UNCOMPRESSED),
+        example_gen_pb2.Output(num_shards=2),
+        example_gen_pb2.Output(disable_shuffle=True)):
+      with self.assertRaisesRegex(ValueError, 'cannot be specified'):
+        self._testDoPassthrough(output_config=output_config)
+
 
 if __name__ == '__main__':
   tf.test.main()
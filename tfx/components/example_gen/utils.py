@@ -21,7 +21,7 @@ from __future__ import print_function
 import datetime
 import os
 import re
-from typing import Any, Dict, Iterable, List, Optional, Text, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Text, Tuple, Type, Union
 
 from absl import logging
 import six
@@ -31,6 +31,7 @@ from tfx.dsl.io import fileio
 from tfx.proto import example_gen_pb2
 from tfx.proto import range_config_pb2
 from tfx.utils import io_utils
+from tfx.utils import proto_utils
 from google.protobuf import json_format
 
 # Key for `input_base` in executor exec_properties.
@@ -43,12 +44,16 @@ OUTPUT_CONFIG_KEY = 'output_config'
 RANGE_CONFIG_KEY = 'range_config'
 # Key for the `output_data_format` in executor exec_properties.
 OUTPUT_DATA_FORMAT_KEY = 'output_data_format'
+# Key for `custom_config` in executor exec_properties.
+CUSTOM_CONFIG_KEY = 'custom_config'
 
 # Key for output examples in executor output_dict.
 EXAMPLES_KEY = 'examples'
 
 # Key for the `payload_format` custom property of output examples artifact.
 PAYLOAD_FORMAT_PROPERTY_NAME = 'payload_format'
+# Key for the `compression` custom property of output examples artifact.
+COMPRESSION_PROPERTY_NAME = 'compression'
 # Key for the `input_fingerprint` custom property of output examples artifact.
 FINGERPRINT_PROPERTY_NAME = 'input_fingerprint'
 # Key for the `span` custom property of output examples artifact.
@@ -225,6 +230,31 @@ def make_default_output_config(
         ]))
 
 
+def get_custom_config(
+    exec_properties: Dict[Text, Any],
+    message_cls: Type[proto_utils.ProtoMessage]) -> proto_utils.ProtoMessage:
+  """Returns the config of the given type packed in the custom config.
+
+  Args:
+    exec_properties: A dict of execution properties, with an optional JSON
+      string of example_gen_pb2.CustomConfig instance.
+    message_cls: Type of the config packed in the custom config.
+
+  Returns:
+    The unpacked config, or a default instance of `message_cls` if there is no
+    custom config or it packs a config of another type.
+  """
+  config = message_cls()
+  if exec_properties.get(CUSTOM_CONFIG_KEY):
+    custom_config = example_gen_pb2.CustomConfig()
+    proto_utils.json_to_proto(
+        exec_properties[CUSTOM_CONFIG_KEY],
+        custom_config)
+    if custom_config.custom_config.Is(config.DESCRIPTOR):
+      custom_config.custom_config.Unpack(config)
+  return config
+
+
 def _glob_to_regex(glob_pattern: Text) -> Text:
   """Changes glob pattern to regex pattern."""
   regex_pattern = glob_pattern
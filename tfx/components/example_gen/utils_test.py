@@ -32,6 +32,7 @@ from tfx.proto import example_gen_pb2
 from tfx.proto import range_config_pb2
 from tfx.utils import io_utils
 from tfx.utils import json_utils
+from tfx.utils import proto_utils
 
 
 class UtilsTest(tf.test.TestCase):
@@ -210,6 +211,23 @@ class UtilsTest(tf.test.TestCase):
     })
     self.assertEqual(0, len(output_config.split_config.splits))
 
+  def testGetCustomConfig(self):
+    custom_config = example_gen_pb2.CustomConfig()
+    custom_config.custom_config.Pack(
+        example_gen_pb2.CsvConfig(batched=True, type_inference_sample_size=10))
+    exec_properties = {
+        utils.CUSTOM_CONFIG_KEY: proto_utils.proto_to_json(custom_config)
+    }
+    self.assertEqual(
+        example_gen_pb2.CsvConfig(batched=True, type_inference_sample_size=10),
+        utils.get_custom_config(exec_properties, example_gen_pb2.CsvConfig))
+    # A config of another type or no config at all gives the default config.
+    self.assertEqual(
+        example_gen_pb2.ImportConfig(),
+        utils.get_custom_config(exec_properties, example_gen_pb2.ImportConfig))
+    self.assertEqual(example_gen_pb2.CsvConfig(),
+                     utils.get_custom_config({}, example_gen_pb2.CsvConfig))
+
   def testGlobToRegex(self):
     glob_pattern = 'a(b)c'
     self.assertEqual(1, re.compile(glob_pattern).groups)
@@ -67,7 +67,8 @@ class ExampleValidator(base_component.BaseComponent):
                schema: types.Channel = None,
                exclude_splits: Optional[List[Text]] = None,
                anomalies: Optional[Text] = None,
-               instance_name: Optional[Text] = None):
+               instance_name: Optional[Text] = None,
+               num_workers: Optional[int] = None):
     """Construct an ExampleValidator component.
 
     Args:
@@ -81,6 +82,9 @@ class ExampleValidator(base_component.BaseComponent):
         ExampleValidator. Required only if multiple ExampleValidator components
         are declared in the same pipeline.  Either `stats` or `statistics` must
         be present in the arguments.
+      num_workers: Optional number of splits validated concurrently, each in a
+        separate process. Default behavior (when num_workers is set to None) is
+        validating the splits sequentially.
     """
     if exclude_splits is None:
       exclude_splits = []
@@ -91,6 +95,7 @@ class ExampleValidator(base_component.BaseComponent):
         statistics=statistics,
         schema=schema,
         exclude_splits=json_utils.dumps(exclude_splits),
+        num_workers=num_workers,
         anomalies=anomalies)
     super(ExampleValidator, self).__init__(
         spec=spec, instance_name=instance_name)
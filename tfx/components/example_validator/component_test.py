@@ -25,6 +25,7 @@ from tfx.types import channel_utils
 from tfx.types import standard_artifacts
 from tfx.types.standard_component_specs import ANOMALIES_KEY
 from tfx.types.standard_component_specs import EXCLUDE_SPLITS_KEY
+from tfx.types.standard_component_specs import NUM_WORKERS_KEY
 
 
 class ExampleValidatorTest(tf.test.TestCase):
@@ -44,6 +45,17 @@ class ExampleValidatorTest(tf.test.TestCase):
     self.assertEqual(
         example_validator.spec.exec_properties[EXCLUDE_SPLITS_KEY], '["eval"]')
 
+  def testConstructWithNumWorkers(self):
+    statistics_artifact = standard_artifacts.ExampleStatistics()
+    statistics_artifact.split_names = artifact_utils.encode_split_names(
+        ['train', 'eval'])
+    example_validator = component.ExampleValidator(
+        statistics=channel_utils.as_channel([statistics_artifact]),
+        schema=channel_utils.as_channel([standard_artifacts.Schema()]),
+        num_workers=2)
+    self.assertEqual(
+        example_validator.spec.exec_properties[NUM_WORKERS_KEY], 2)
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -25,21 +25,48 @@ from absl import logging
 import tensorflow_data_validation as tfdv
 from tfx import types
 from tfx.components.example_validator import labels
+from tfx.components.util import statistics_utils
 from tfx.components.util import value_utils
 from tfx.dsl.components.base import base_executor
 from tfx.types import artifact_utils
 from tfx.types.standard_component_specs import ANOMALIES_KEY
 from tfx.types.standard_component_specs import EXCLUDE_SPLITS_KEY
+from tfx.types.standard_component_specs import NUM_WORKERS_KEY
 from tfx.types.standard_component_specs import SCHEMA_KEY
 from tfx.types.standard_component_specs import STATISTICS_KEY
 from tfx.utils import io_utils
 from tfx.utils import json_utils
 
+from tensorflow_metadata.proto.v0 import schema_pb2
+from tensorflow_metadata.proto.v0 import statistics_pb2
+
 
 # Default file name for anomalies output.
 DEFAULT_FILE_NAME = 'anomalies.pbtxt'
 
 
+def _ValidateStatistics(stats: statistics_pb2.DatasetFeatureStatisticsList,
+                        schema: schema_pb2.Schema,
+                        schema_diff_path: Text) -> None:
+  """Validates statistics against the schema and writes the anomalies."""
+  anomalies = tfdv.validate_statistics(stats, schema)
+  io_utils.write_pbtxt_file(
+      os.path.join(schema_diff_path, DEFAULT_FILE_NAME), anomalies)
+
+
+def _ValidateSplit(stats_uri: Text, sample_rate: float,
+                   schema: schema_pb2.Schema, output_uri: Text) -> None:
+  """Loads the statistics of a split and validates them against the schema.
+
+  The statistics of a split sampled by StatisticsGen are scaled to the whole
+  split first, so that checks of absolute counts are not failed by sampling.
+  Only takes picklable args, as it runs in a worker process.
+  """
+  _ValidateStatistics(
+      statistics_utils.scale_to_sample_rate(
+          tfdv.load_statistics(stats_uri), sample_rate), schema, output_uri)
+
+
 class Executor(base_executor.BaseExecutor):
   """TensorFlow ExampleValidator component executor."""
 
@@ -63,6 +90,8 @@ class Executor(base_executor.BaseExecutor):
       exec_properties: A dict of execution properties.
         - exclude_splits: JSON-serialized list of names of splits that the
           example validator should not validate.
+        - num_workers: Optionally, the number of splits validated concurrently
+          in separate processes. Splits are validated sequentially by default.
 
     Returns:
       None
@@ -93,25 +122,40 @@ class Executor(base_executor.BaseExecutor):
             artifact_utils.get_single_uri(
                 input_dict[SCHEMA_KEY])))
 
-    for split in artifact_utils.decode_split_names(stats_artifact.split_names):
-      if split in exclude_splits:
-        continue
-
+    args_per_split = []
+    for split in split_names:
       logging.info(
           'Validating schema against the computed statistics for '
           'split %s.', split)
-      label_inputs = {
-          STATISTICS_KEY:
-              tfdv.load_statistics(
-                  io_utils.get_only_uri_in_dir(
-                      os.path.join(stats_artifact.uri, split))),
-          SCHEMA_KEY:
-              schema
-      }
+      sample_rate = statistics_utils.get_sample_rate(stats_artifact, split)
+      if sample_rate < 1.0:
+        logging.info(
+            'Statistics of split %s were generated on a sample of rate %s of '
+            'its records, their counts are scaled accordingly.', split,
+            sample_rate)
+      stats_uri = io_utils.get_only_uri_in_dir(
+          os.path.join(stats_artifact.uri, split))
       output_uri = artifact_utils.get_split_uri(
           output_dict[ANOMALIES_KEY], split)
-      label_outputs = {labels.SCHEMA_DIFF_PATH: output_uri}
-      self._Validate(label_inputs, label_outputs)
+      args_per_split.append((stats_uri, sample_rate, schema, output_uri))
+
+    num_workers = exec_properties.get(NUM_WORKERS_KEY)
+    if num_workers is None or num_workers == 1:
+      # Validates through _Validate, which subclasses may override.
+      for stats_uri, sample_rate, _, output_uri in args_per_split:
+        label_inputs = {
+            STATISTICS_KEY:
+                statistics_utils.scale_to_sample_rate(
+                    tfdv.load_statistics(stats_uri), sample_rate),
+            SCHEMA_KEY:
+                schema
+        }
+        label_outputs = {labels.SCHEMA_DIFF_PATH: output_uri}
+        self._Validate(label_inputs, label_outputs)
+    else:
+      statistics_utils.run_per_split(_ValidateSplit, args_per_split,
+                                     num_workers)
+    for split, (_, _, _, output_uri) in zip(split_names, args_per_split):
       logging.info(
           'Validation complete for split %s. Anomalies written to '
           '%s.', split, output_uri)
@@ -147,6 +191,4 @@ class Executor(base_executor.BaseExecutor):
     stats = value_utils.GetSoleValue(inputs, STATISTICS_KEY)
     schema_diff_path = value_utils.GetSoleValue(
         outputs, labels.SCHEMA_DIFF_PATH)
-    anomalies = tfdv.validate_statistics(stats, schema)
-    io_utils.write_pbtxt_file(
-        os.path.join(schema_diff_path, DEFAULT_FILE_NAME), anomalies)
+    _ValidateStatistics(stats, schema, schema_diff_path)
@@ -19,6 +19,8 @@ from __future__ import division
 from __future__ import print_function
 
 import os
+
+import mock
 import tensorflow as tf
 
 from tfx.components.example_validator import executor
@@ -27,6 +29,7 @@ from tfx.types import artifact_utils
 from tfx.types import standard_artifacts
 from tfx.types.standard_component_specs import ANOMALIES_KEY
 from tfx.types.standard_component_specs import EXCLUDE_SPLITS_KEY
+from tfx.types.standard_component_specs import NUM_WORKERS_KEY
 from tfx.types.standard_component_specs import SCHEMA_KEY
 from tfx.types.standard_component_specs import STATISTICS_KEY
 from tfx.utils import io_utils
@@ -36,7 +39,7 @@ from tensorflow_metadata.proto.v0 import anomalies_pb2
 
 class ExecutorTest(tf.test.TestCase):
 
-  def testDo(self):
+  def _testDo(self, num_workers=None):
     source_data_dir = os.path.join(
         os.path.dirname(os.path.dirname(__file__)), 'testdata')
 
@@ -64,6 +67,8 @@ class ExecutorTest(tf.test.TestCase):
         # List needs to be serialized before being passed into Do function.
         EXCLUDE_SPLITS_KEY: json_utils.dumps(['test'])
     }
+    if num_workers is not None:
+      exec_properties[NUM_WORKERS_KEY] = num_workers
 
     output_dict = {
         ANOMALIES_KEY: [validation_output],
@@ -96,6 +101,23 @@ class ExecutorTest(tf.test.TestCase):
     self.assertFalse(fileio.exists(train_file_path))
     # TODO(zhitaoli): Add comparison to expected anomolies.
 
+  def testDo(self):
+    self._testDo()
+
+  def testDoCallsValidate(self):
+    # pylint: disable=protected-access
+    with mock.patch.object(
+        executor.Executor,
+        '_Validate',
+        autospec=True,
+        side_effect=executor.Executor._Validate) as mock_validate:
+      self._testDo()
+    # pylint: enable=protected-access
+    self.assertEqual(2, mock_validate.call_count)
+
+  def testDoWithNumWorkers(self):
+    self._testDo(num_workers=2)
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -25,6 +25,7 @@ from absl import logging
 import tensorflow_data_validation as tfdv
 
 from tfx import types
+from tfx.components.util import statistics_utils
 from tfx.dsl.components.base import base_executor
 from tfx.types import artifact_utils
 from tfx.utils import io_utils
@@ -93,14 +94,19 @@ class Executor(base_executor.BaseExecutor):
         continue
 
       logging.info('Processing schema from statistics for split %s.', split)
-      stats_uri = io_utils.get_only_uri_in_dir(
-          os.path.join(stats_artifact.uri, split))
+      stats = tfdv.load_statistics(
+          io_utils.get_only_uri_in_dir(os.path.join(stats_artifact.uri, split)))
+      sample_rate = statistics_utils.get_sample_rate(stats_artifact, split)
+      if sample_rate < 1.0:
+        logging.info(
+            'Statistics of split %s were generated on a sample of rate %s of '
+            'its records, their counts are scaled accordingly.', split,
+            sample_rate)
+        stats = statistics_utils.scale_to_sample_rate(stats, sample_rate)
       if not schema:
-        schema = tfdv.infer_schema(
-            tfdv.load_statistics(stats_uri), infer_feature_shape)
+        schema = tfdv.infer_schema(stats, infer_feature_shape)
       else:
-        schema = tfdv.update_schema(schema, tfdv.load_statistics(stats_uri),
-                                    infer_feature_shape)
+        schema = tfdv.update_schema(schema, stats, infer_feature_shape)
 
     output_uri = os.path.join(
         artifact_utils.get_single_uri(output_dict[SCHEMA_KEY]),
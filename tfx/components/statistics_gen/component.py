@@ -20,6 +20,7 @@ from tfx import types
 from tfx.components.statistics_gen import executor
 from tfx.dsl.components.base import base_component
 from tfx.dsl.components.base import executor_spec
+from tfx.proto import statistics_gen_pb2
 from tfx.types import standard_artifacts
 from tfx.types.standard_component_specs import StatisticsGenSpec
 from tfx.utils import json_utils
@@ -40,6 +41,19 @@ class StatisticsGen(base_component.BaseComponent):
     # Computes statistics over data for visualization and example validation.
     statistics_gen = StatisticsGen(examples=example_gen.outputs['examples'])
   ```
+
+  The statistics of the last spans can also be merged into window statistics
+  without reading the spans again, e.g.:
+  ```
+    latest_statistics = ResolverNode(
+        instance_name='latest_statistics',
+        resolver_class=latest_artifacts_resolver.LatestArtifactsResolver,
+        resolver_configs={'desired_num_of_artifacts': 7},
+        statistics=statistics_gen.outputs['statistics'])
+    window_statistics_gen = StatisticsGen(
+        span_statistics=latest_statistics.outputs['statistics'],
+        instance_name='window_statistics_gen')
+  ```
   """
 
   SPEC_CLASS = StatisticsGenSpec
@@ -52,7 +66,10 @@ class StatisticsGen(base_component.BaseComponent):
                exclude_splits: Optional[List[Text]] = None,
                output: Optional[types.Channel] = None,
                input_data: Optional[types.Channel] = None,
-               instance_name: Optional[Text] = None):
+               instance_name: Optional[Text] = None,
+               sampling_config: Optional[
+                   statistics_gen_pb2.SamplingConfig] = None,
+               span_statistics: Optional[types.Channel] = None):
     """Construct a StatisticsGen component.
 
     Args:
@@ -75,6 +92,19 @@ class StatisticsGen(base_component.BaseComponent):
       instance_name: Optional name assigned to this specific instance of
         StatisticsGen.  Required only if multiple StatisticsGen components are
         declared in the same pipeline.
+      sampling_config: Optionally, a statistics_gen_pb2.SamplingConfig instance
+        to generate approximate statistics of a sample of the records of each
+        split. The rate of the sample of each split is recorded on the output
+        `ExampleStatistics` artifact.
+      span_statistics: A Channel of `ExampleStatistics` type of disjoint spans,
+        e.g. the latest statistics of a StatisticsGen resolved from MLMD by a
+        ResolverNode, provided instead of `examples`. The statistics of the
+        spans are merged without reading any example. Only the statistics which
+        can be merged are output, see `merge_util`.
+
+    Raises:
+      ValueError: When both or neither of examples and span_statistics are
+        provided.
     """
     if input_data:
       logging.warning(
@@ -82,6 +112,9 @@ class StatisticsGen(base_component.BaseComponent):
           'been renamed to "examples" and is deprecated. Please update your '
           'usage as support for this argument will be removed soon.')
       examples = input_data
+    if bool(examples) == bool(span_statistics):
+      raise ValueError(
+          'Exactly one of examples and span_statistics must be provided.')
     if exclude_splits is None:
       exclude_splits = []
       logging.info('Excluding no splits because exclude_splits is not set.')
@@ -94,5 +127,7 @@ class StatisticsGen(base_component.BaseComponent):
         schema=schema,
         stats_options_json=stats_options_json,
         exclude_splits=json_utils.dumps(exclude_splits),
+        sampling_config=sampling_config,
+        span_statistics=span_statistics,
         statistics=output)
     super(StatisticsGen, self).__init__(spec=spec, instance_name=instance_name)
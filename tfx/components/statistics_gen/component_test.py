@@ -15,6 +15,7 @@
 import tensorflow as tf
 import tensorflow_data_validation as tfdv
 from tfx.components.statistics_gen import component
+from tfx.proto import statistics_gen_pb2
 from tfx.types import artifact_utils
 from tfx.types import channel_utils
 from tfx.types import standard_artifacts
@@ -53,6 +54,33 @@ class ComponentTest(tf.test.TestCase):
     self.assertEqual(standard_artifacts.ExampleStatistics.TYPE_NAME,
                      statistics_gen.outputs['statistics'].type_name)
 
+  def testConstructWithSamplingConfig(self):
+    examples = standard_artifacts.Examples()
+    examples.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+    sampling_config = statistics_gen_pb2.SamplingConfig(
+        max_num_records=1000, seed=1)
+    statistics_gen = component.StatisticsGen(
+        examples=channel_utils.as_channel([examples]),
+        sampling_config=sampling_config)
+    self.assertEqual(sampling_config,
+                     statistics_gen.spec.exec_properties['sampling_config'])
+
+  def testConstructWithSpanStatistics(self):
+    statistics = standard_artifacts.ExampleStatistics()
+    statistics_gen = component.StatisticsGen(
+        span_statistics=channel_utils.as_channel([statistics]))
+    self.assertEqual(standard_artifacts.ExampleStatistics.TYPE_NAME,
+                     statistics_gen.outputs['statistics'].type_name)
+
+  def testConstructWithoutExamplesOrSpanStatistics(self):
+    with self.assertRaises(ValueError):
+      component.StatisticsGen()
+    with self.assertRaises(ValueError):
+      component.StatisticsGen(
+          examples=channel_utils.as_channel([standard_artifacts.Examples()]),
+          span_statistics=channel_utils.as_channel(
+              [standard_artifacts.ExampleStatistics()]))
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -12,28 +12,39 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """TFX statistics_gen executor."""
+import hashlib
 import os
-from typing import Any, Dict, List, Text
+from typing import Any, Dict, List, Optional, Text
 
 from absl import logging
+import apache_beam as beam
+import tensorflow_data_validation as tfdv
 from tensorflow_data_validation.api import stats_api
 from tensorflow_data_validation.statistics import stats_options as options
 from tfx import types
+from tfx.components.statistics_gen import merge_util
+from tfx.components.util import statistics_utils
 from tfx.components.util import tfxio_utils
 from tfx.dsl.components.base import base_executor
+from tfx.proto import statistics_gen_pb2
 from tfx.types import artifact_utils
 from tfx.utils import io_utils
 from tfx.utils import json_utils
+from tfx.utils import proto_utils
 
 # Key for examples in executor input_dict.
 EXAMPLES_KEY = 'examples'
 # Key for statistics in executor input_dict.
 SCHEMA_KEY = 'schema'
+# Key for the statistics of spans to merge in executor input_dict.
+SPAN_STATISTICS_KEY = 'span_statistics'
 
 # Key for stats options json in executor exec_properties dict.
 STATS_OPTIONS_JSON_KEY = 'stats_options_json'
 # Key for exclude splits in executor exec_properties dict.
 EXCLUDE_SPLITS_KEY = 'exclude_splits'
+# Key for sampling config in executor exec_properties dict.
+SAMPLING_CONFIG_KEY = 'sampling_config'
 
 # Key for statistics in executor output_dict.
 STATISTICS_KEY = 'statistics'
@@ -43,6 +54,51 @@ _DEFAULT_FILE_NAME = 'stats_tfrecord'
 
 _TELEMETRY_DESCRIPTORS = ['StatisticsGen']
 
+# Temp directory in the statistics output where the number of records of each
+# split is written when sampling a fixed number of records.
+_TEMP_DIR_IN_STATISTICS_OUTPUT = '.temp_path'
+
+
+def _SampleKey(record: bytes, seed: bytes) -> int:
+  """Returns a pseudo-random 64 bits key of `record`, deterministic by seed."""
+  return int.from_bytes(
+      hashlib.md5(seed + record).digest()[:8], byteorder='little')
+
+
+@beam.ptransform_fn
+@beam.typehints.with_input_types(bytes)
+@beam.typehints.with_output_types(bytes)
+def _SampleRecords(
+    records: beam.pvalue.PCollection,
+    sampling_config: statistics_gen_pb2.SamplingConfig,
+    num_records: Optional[beam.pvalue.PCollection] = None
+) -> beam.pvalue.PCollection:
+  """Samples serialized records according to `sampling_config`.
+
+  Args:
+    records: PCollection of serialized records.
+    sampling_config: Config of the sample.
+    num_records: Singleton PCollection of the number of records, required to
+      sample a fixed number of records.
+
+  Returns:
+    PCollection of the sampled records.
+  """
+  seed = str(sampling_config.seed).encode('utf-8')
+  if sampling_config.WhichOneof('sampling') == 'sample_rate':
+    threshold = int(sampling_config.sample_rate * 2**64)
+    return (records
+            | 'SampleAtRate' >> beam.Filter(
+                lambda record: _SampleKey(record, seed) < threshold))
+  # Keeps each record at the rate of max_num_records over the number of
+  # records, which samples about max_num_records records without gathering
+  # them on a single worker, and the same for every run with the same seed.
+  return (records
+          | 'SampleAtMaxNumRecords' >> beam.Filter(
+              lambda record, num_records: _SampleKey(record, seed) <
+              sampling_config.max_num_records / num_records * 2**64,
+              num_records=beam.pvalue.AsSingleton(num_records)))
+
 
 class Executor(base_executor.BaseExecutor):
   """Computes statistics over input training data for example validation.
@@ -67,6 +123,10 @@ class Executor(base_executor.BaseExecutor):
         - schema: Optionally, a list of type `standard_artifacts.Schema`. When
           the stats_options exec_property also contains a schema, this input
           should not be provided.
+        - span_statistics: Optionally, a list of type
+          `standard_artifacts.ExampleStatistics` of disjoint spans, provided
+          instead of input_data. The output statistics are then the merge of
+          the statistics of the spans, without reading any example.
       output_dict: Output dict from output key to a list of Artifacts.
         - output: A list of type `standard_artifacts.ExampleStatistics`. This
           should contain both the 'train' and 'eval' splits.
@@ -76,10 +136,14 @@ class Executor(base_executor.BaseExecutor):
           not also contain a schema.
         - exclude_splits: JSON-serialized list of names of splits where
           statistics and sample should not be generated.
+        - sampling_config: Optionally, a JSON representation of
+          statistics_gen_pb2.SamplingConfig. If set, the statistics of each
+          split are generated on a sample of its records, and the rate of the
+          sample is recorded on the output artifact.
 
     Raises:
       ValueError when a schema is provided both as an input and as part of the
-      StatsOptions exec_property.
+      StatsOptions exec_property, or when the sampling config is invalid.
 
     Returns:
       None
@@ -92,6 +156,11 @@ class Executor(base_executor.BaseExecutor):
     if not isinstance(exclude_splits, list):
       raise ValueError('exclude_splits in execution properties needs to be a '
                        'list. Got %s instead.' % type(exclude_splits))
+    if input_dict.get(SPAN_STATISTICS_KEY):
+      self._MergeSpanStatistics(input_dict[SPAN_STATISTICS_KEY],
+                                output_dict[STATISTICS_KEY], exclude_splits)
+      return
+
     # Setup output splits.
     examples = artifact_utils.get_single_instance(input_dict[EXAMPLES_KEY])
     examples_split_names = artifact_utils.decode_split_names(
@@ -121,6 +190,15 @@ class Executor(base_executor.BaseExecutor):
                 artifact_utils.get_single_uri(input_dict[SCHEMA_KEY])))
         stats_options.schema = schema
 
+    sampling_config = statistics_gen_pb2.SamplingConfig()
+    if exec_properties.get(SAMPLING_CONFIG_KEY):
+      proto_utils.json_to_proto(exec_properties[SAMPLING_CONFIG_KEY],
+                                sampling_config)
+    sampling = sampling_config.WhichOneof('sampling')
+    if sampling == 'sample_rate' and not 0 < sampling_config.sample_rate <= 1:
+      raise ValueError('sample_rate must be in (0, 1], got %s.' %
+                       sampling_config.sample_rate)
+
     split_and_tfxio = []
     tfxio_factory = tfxio_utils.get_tfxio_factory_from_artifact(
         examples=[examples],
@@ -132,13 +210,39 @@ class Executor(base_executor.BaseExecutor):
       uri = os.path.join(examples.uri, split)
       split_and_tfxio.append(
           (split, tfxio_factory(io_utils.all_files_pattern(uri))))
+    temp_path = os.path.join(statistics_artifact.uri,
+                             _TEMP_DIR_IN_STATISTICS_OUTPUT)
     with self._make_beam_pipeline() as p:
       for split, tfxio in split_and_tfxio:
         logging.info('Generating statistics for split %s.', split)
         output_uri = artifact_utils.get_split_uri(output_dict[STATISTICS_KEY],
                                                   split)
         output_path = os.path.join(output_uri, _DEFAULT_FILE_NAME)
-        data = p | 'TFXIORead[%s]' % split >> tfxio.BeamSource()
+        if sampling:
+          # Samples the serialized records so that only the sampled records
+          # are decoded.
+          records = (
+              p
+              | 'TFXIOReadRawRecords[%s]' % split >>
+              tfxio.RawRecordBeamSource())
+          num_records = None
+          if sampling == 'max_num_records':
+            num_records = (
+                records
+                | 'CountRecords[%s]' % split >>
+                beam.combiners.Count.Globally())
+            _ = (
+                num_records
+                | 'WriteNumRecords[%s]' % split >> beam.Map(
+                    lambda n, path: io_utils.write_string_file(path, str(n)),
+                    os.path.join(temp_path, split)))
+          data = (
+              records
+              | 'SampleRecords[%s]' % split >> _SampleRecords(
+                  sampling_config, num_records)
+              | 'TFXIODecode[%s]' % split >> tfxio.RawRecordToRecordBatch())
+        else:
+          data = p | 'TFXIORead[%s]' % split >> tfxio.BeamSource()
         _ = (
             data
             | 'GenerateStatistics[%s]' % split >>
@@ -147,3 +251,77 @@ class Executor(base_executor.BaseExecutor):
             stats_api.WriteStatisticsToTFRecord(output_path))
         logging.info('Statistics for split %s written to %s.', split,
                      output_uri)
+
+    if sampling == 'sample_rate':
+      statistics_utils.set_sample_rates(
+          statistics_artifact,
+          {split: sampling_config.sample_rate for split in split_names})
+    elif sampling == 'max_num_records':
+      sample_rates = {}
+      for split in split_names:
+        num_records = int(
+            io_utils.read_string_file(os.path.join(temp_path, split)))
+        sample_rates[split] = min(
+            1.0, sampling_config.max_num_records / max(num_records, 1))
+      statistics_utils.set_sample_rates(statistics_artifact, sample_rates)
+      io_utils.delete_dir(temp_path)
+
+  def _MergeSpanStatistics(self, span_statistics: List[types.Artifact],
+                           statistics: List[types.Artifact],
+                           exclude_splits: List[Text]) -> None:
+    """Merges the statistics of the splits of disjoint spans.
+
+    Args:
+      span_statistics: ExampleStatistics artifacts of the spans to merge.
+      statistics: ExampleStatistics artifact to write the merged statistics in.
+      exclude_splits: Names of splits whose statistics are not merged.
+    """
+    split_names = [
+        split for split in artifact_utils.decode_split_names(
+            span_statistics[0].split_names) if split not in exclude_splits
+    ]
+    for artifact in span_statistics[1:]:
+      artifact_split_names = artifact_utils.decode_split_names(
+          artifact.split_names)
+      split_names = [
+          split for split in split_names if split in artifact_split_names
+      ]
+    statistics_artifact = artifact_utils.get_single_instance(statistics)
+    statistics_artifact.split_names = artifact_utils.encode_split_names(
+        split_names)
+
+    sample_rates = {}
+    for split in split_names:
+      logging.info('Merging statistics of %d spans for split %s.',
+                   len(span_statistics), split)
+      statistics_lists = [
+          tfdv.load_statistics(
+              io_utils.get_only_uri_in_dir(
+                  artifact_utils.get_split_uri([artifact], split)))
+          for artifact in span_statistics
+      ]
+      output_path = os.path.join(
+          artifact_utils.get_split_uri(statistics, split), _DEFAULT_FILE_NAME)
+      io_utils.write_tfrecord_file(
+          output_path, merge_util.merge_statistics(statistics_lists))
+      logging.info('Statistics for split %s written to %s.', split,
+                   output_path)
+
+      # The rate of the merged sample is the number of sampled examples over
+      # the estimated number of examples of the spans.
+      span_sample_rates = [
+          statistics_utils.get_sample_rate(artifact, split)
+          for artifact in span_statistics
+      ]
+      if any(rate < 1.0 for rate in span_sample_rates):
+        num_examples = [
+            sum(d.num_examples for d in statistics_list.datasets[:1])
+            for statistics_list in statistics_lists
+        ]
+        num_estimated_examples = sum(
+            n / rate for n, rate in zip(num_examples, span_sample_rates))
+        sample_rates[split] = (
+            sum(num_examples) / num_estimated_examples
+            if num_estimated_examples else 1.0)
+    if sample_rates:
+      statistics_utils.set_sample_rates(statistics_artifact, sample_rates)
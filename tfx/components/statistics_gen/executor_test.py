@@ -20,10 +20,13 @@ from absl.testing import absltest
 import tensorflow_data_validation as tfdv
 
 from tfx.components.statistics_gen import executor
+from tfx.components.util import statistics_utils
 from tfx.dsl.io import fileio
+from tfx.proto import statistics_gen_pb2
 from tfx.types import artifact_utils
 from tfx.types import standard_artifacts
 from tfx.utils import json_utils
+from tfx.utils import proto_utils
 from tensorflow_metadata.proto.v0 import schema_pb2
 
 
@@ -92,6 +95,121 @@ class ExecutorTest(absltest.TestCase):
     self.assertFalse(
         fileio.exists(os.path.join(stats.uri, 'test', 'stats_tfrecord')))
 
+  def _testDoWithSampling(self, sampling_config):
+    source_data_dir = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'testdata')
+    output_data_dir = os.path.join(
+        os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
+        self._testMethodName)
+    fileio.makedirs(output_data_dir)
+
+    # Create input dict.
+    examples = standard_artifacts.Examples()
+    examples.uri = os.path.join(source_data_dir, 'csv_example_gen')
+    examples.split_names = artifact_utils.encode_split_names(['train', 'eval'])
+
+    input_dict = {
+        executor.EXAMPLES_KEY: [examples],
+    }
+
+    exec_properties = {
+        executor.EXCLUDE_SPLITS_KEY:
+            json_utils.dumps([]),
+        executor.SAMPLING_CONFIG_KEY:
+            proto_utils.proto_to_json(sampling_config),
+    }
+
+    # Create output dict.
+    stats = standard_artifacts.ExampleStatistics()
+    stats.uri = output_data_dir
+    output_dict = {
+        executor.STATISTICS_KEY: [stats],
+    }
+
+    # Run executor.
+    stats_gen_executor = executor.Executor()
+    stats_gen_executor.Do(input_dict, output_dict, exec_properties)
+    return stats
+
+  def testDoWithSampleRate(self):
+    stats = self._testDoWithSampling(
+        statistics_gen_pb2.SamplingConfig(sample_rate=0.5, seed=1))
+
+    self._validate_stats_output(
+        os.path.join(stats.uri, 'train', 'stats_tfrecord'))
+    self._validate_stats_output(
+        os.path.join(stats.uri, 'eval', 'stats_tfrecord'))
+    self.assertEqual(0.5, statistics_utils.get_sample_rate(stats, 'train'))
+    self.assertEqual(0.5, statistics_utils.get_sample_rate(stats, 'eval'))
+
+  def testDoWithMaxNumRecords(self):
+    stats = self._testDoWithSampling(
+        statistics_gen_pb2.SamplingConfig(max_num_records=100, seed=1))
+
+    for split in ('train', 'eval'):
+      stats_path = os.path.join(stats.uri, split, 'stats_tfrecord')
+      self._validate_stats_output(stats_path)
+      # Records are sampled at a rate, so about max_num_records are kept.
+      num_examples = tfdv.load_statistics(stats_path).datasets[0].num_examples
+      self.assertBetween(num_examples, 50, 150)
+      self.assertLess(statistics_utils.get_sample_rate(stats, split), 1.0)
+    self.assertFalse(fileio.exists(os.path.join(stats.uri, '.temp_path')))
+
+  def testDoWithInvalidSampleRate(self):
+    with self.assertRaises(ValueError):
+      self._testDoWithSampling(
+          statistics_gen_pb2.SamplingConfig(sample_rate=1.5))
+
+  def testDoWithSpanStatistics(self):
+    source_data_dir = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'testdata')
+    output_data_dir = os.path.join(
+        os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
+        self._testMethodName)
+    fileio.makedirs(output_data_dir)
+
+    # Create input dict with the same statistics as two spans.
+    span_statistics = []
+    for sample_rate in (1.0, 0.5):
+      span_stats = standard_artifacts.ExampleStatistics()
+      span_stats.uri = os.path.join(source_data_dir, 'statistics_gen')
+      span_stats.split_names = artifact_utils.encode_split_names(
+          ['train', 'eval'])
+      statistics_utils.set_sample_rates(span_stats, {'train': sample_rate})
+      span_statistics.append(span_stats)
+    input_dict = {
+        executor.SPAN_STATISTICS_KEY: span_statistics,
+    }
+
+    exec_properties = {
+        executor.EXCLUDE_SPLITS_KEY: json_utils.dumps(['eval']),
+    }
+
+    # Create output dict.
+    stats = standard_artifacts.ExampleStatistics()
+    stats.uri = output_data_dir
+    output_dict = {
+        executor.STATISTICS_KEY: [stats],
+    }
+
+    # Run executor.
+    stats_gen_executor = executor.Executor()
+    stats_gen_executor.Do(input_dict, output_dict, exec_properties)
+
+    self.assertEqual(
+        artifact_utils.encode_split_names(['train']), stats.split_names)
+    stats_path = os.path.join(stats.uri, 'train', 'stats_tfrecord')
+    self._validate_stats_output(stats_path)
+    span_num_examples = tfdv.load_statistics(
+        os.path.join(source_data_dir, 'statistics_gen', 'train',
+                     'stats_tfrecord')).datasets[0].num_examples
+    self.assertEqual(
+        2 * span_num_examples,
+        tfdv.load_statistics(stats_path).datasets[0].num_examples)
+    # 2 sampled spans of estimated sizes 1 and 2.
+    self.assertAlmostEqual(2 / 3,
+                           statistics_utils.get_sample_rate(stats, 'train'))
+
   def testDoWithSchemaAndStatsOptions(self):
     source_data_dir = os.path.join(
         os.path.dirname(os.path.dirname(__file__)), 'testdata')
@@ -0,0 +1,211 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Merges the statistics of disjoint sets of examples, e.g. of several spans.
+
+Only the statistics which can be derived from the statistics of each set are
+kept: counts, number of values, min, max, mean and standard deviation are
+exact, while the number of unique values is a lower bound and the top values
+and rank histograms only count the occurrences of each value within the sets it
+is a top value of. Quantiles, histograms and custom statistics are dropped.
+"""
+
+import collections
+import math
+from typing import Dict, Hashable, List, Optional, Sequence, Text, Tuple
+
+from tensorflow_metadata.proto.v0 import statistics_pb2
+
+
+def _feature_key(feature: statistics_pb2.FeatureNameStatistics) -> Hashable:
+  if feature.HasField('path'):
+    return tuple(feature.path.step)
+  return feature.name
+
+
+def _merge_weighted_common_stats(
+    stats_list: Sequence[statistics_pb2.WeightedCommonStatistics],
+    merged: statistics_pb2.WeightedCommonStatistics) -> None:
+  merged.num_non_missing = sum(s.num_non_missing for s in stats_list)
+  merged.num_missing = sum(s.num_missing for s in stats_list)
+  merged.tot_num_values = sum(s.tot_num_values for s in stats_list)
+  merged.avg_num_values = (
+      merged.tot_num_values / merged.num_non_missing
+      if merged.num_non_missing else 0.0)
+
+
+def _merge_common_stats(stats_list: Sequence[statistics_pb2.CommonStatistics],
+                        num_missing_examples: int,
+                        merged: statistics_pb2.CommonStatistics) -> None:
+  """Merges the common stats of a feature.
+
+  Args:
+    stats_list: Common stats of the feature in the sets it is present in.
+    num_missing_examples: Number of examples of the sets the feature is absent
+      from.
+    merged: Common stats to merge into.
+  """
+  merged.num_non_missing = sum(s.num_non_missing for s in stats_list)
+  merged.num_missing = (
+      sum(s.num_missing for s in stats_list) + num_missing_examples)
+  merged.tot_num_values = sum(s.tot_num_values for s in stats_list)
+  present_stats_list = [s for s in stats_list if s.num_non_missing]
+  if present_stats_list:
+    merged.min_num_values = min(s.min_num_values for s in present_stats_list)
+    merged.max_num_values = max(s.max_num_values for s in present_stats_list)
+    merged.avg_num_values = merged.tot_num_values / merged.num_non_missing
+  if any(s.HasField('weighted_common_stats') for s in stats_list):
+    _merge_weighted_common_stats([s.weighted_common_stats for s in stats_list],
+                                 merged.weighted_common_stats)
+
+
+def _merge_numeric_stats(stats_list: Sequence[statistics_pb2.NumericStatistics],
+                         merged: statistics_pb2.NumericStatistics) -> None:
+  """Merges the stats of a numeric feature, except its common stats."""
+  merged.num_zeros = sum(s.num_zeros for s in stats_list)
+  stats_list = [s for s in stats_list if s.common_stats.tot_num_values]
+  num_values = sum(s.common_stats.tot_num_values for s in stats_list)
+  if not num_values:
+    return
+  merged.min = min(s.min for s in stats_list)
+  merged.max = max(s.max for s in stats_list)
+  merged.mean = sum(
+      s.common_stats.tot_num_values * s.mean for s in stats_list) / num_values
+  mean_of_squares = sum(
+      s.common_stats.tot_num_values * (s.std_dev**2 + s.mean**2)
+      for s in stats_list) / num_values
+  merged.std_dev = math.sqrt(max(mean_of_squares - merged.mean**2, 0.0))
+
+
+def _merge_value_counts(counts_list: Sequence[Dict[Text, float]],
+                        max_num_values: int) -> List[Tuple[Text, float]]:
+  """Returns the `max_num_values` most frequent (value, count) pairs."""
+  merged_counts = collections.defaultdict(float)
+  for counts in counts_list:
+    for value, count in counts.items():
+      merged_counts[value] += count
+  return sorted(
+      merged_counts.items(), key=lambda kv: (-kv[1], kv[0]))[:max_num_values]
+
+
+def _merge_string_stats(stats_list: Sequence[statistics_pb2.StringStatistics],
+                        merged: statistics_pb2.StringStatistics) -> None:
+  """Merges the stats of a string feature, except its common stats."""
+  merged.unique = max(s.unique for s in stats_list)
+  merged.invalid_utf8_count = sum(s.invalid_utf8_count for s in stats_list)
+  num_values = sum(s.common_stats.tot_num_values for s in stats_list)
+  if num_values:
+    merged.avg_length = sum(s.common_stats.tot_num_values * s.avg_length
+                            for s in stats_list) / num_values
+
+  # Values are counted only in the sets they are a top value of.
+  top_values = _merge_value_counts(
+      [{v.value: v.frequency for v in s.top_values} for s in stats_list],
+      max(len(s.top_values) for s in stats_list))
+  for value, frequency in top_values:
+    merged.top_values.add(value=value, frequency=frequency)
+
+  rank_histogram = _merge_value_counts(
+      [{b.label: b.sample_count for b in s.rank_histogram.buckets}
+       for s in stats_list],
+      max(len(s.rank_histogram.buckets) for s in stats_list))
+  for rank, (label, sample_count) in enumerate(rank_histogram):
+    merged.rank_histogram.buckets.add(
+        low_rank=rank, high_rank=rank, label=label, sample_count=sample_count)
+
+
+def _merge_bytes_stats(stats_list: Sequence[statistics_pb2.BytesStatistics],
+                       merged: statistics_pb2.BytesStatistics) -> None:
+  """Merges the stats of a bytes feature, except its common stats."""
+  merged.unique = max(s.unique for s in stats_list)
+  stats_list = [s for s in stats_list if s.common_stats.tot_num_values]
+  num_values = sum(s.common_stats.tot_num_values for s in stats_list)
+  if not num_values:
+    return
+  merged.min_num_bytes = min(s.min_num_bytes for s in stats_list)
+  merged.max_num_bytes = max(s.max_num_bytes for s in stats_list)
+  merged.avg_num_bytes = sum(s.common_stats.tot_num_values * s.avg_num_bytes
+                             for s in stats_list) / num_values
+
+
+def _merge_feature_stats(
+    features: Sequence[statistics_pb2.FeatureNameStatistics],
+    num_missing_examples: int) -> statistics_pb2.FeatureNameStatistics:
+  """Merges the stats of a feature in the sets it is present in."""
+  merged = statistics_pb2.FeatureNameStatistics()
+  if features[0].HasField('path'):
+    merged.path.CopyFrom(features[0].path)
+  else:
+    merged.name = features[0].name
+  merged.type = features[0].type
+  stats_field = features[0].WhichOneof('stats')
+  if stats_field is None:
+    return merged
+  stats_list = [getattr(f, stats_field) for f in features
+                if f.WhichOneof('stats') == stats_field]
+  merged_stats = getattr(merged, stats_field)
+  _merge_common_stats([s.common_stats for s in stats_list],
+                      num_missing_examples, merged_stats.common_stats)
+  if stats_field == 'num_stats':
+    _merge_numeric_stats(stats_list, merged_stats)
+  elif stats_field == 'string_stats':
+    _merge_string_stats(stats_list, merged_stats)
+  elif stats_field == 'bytes_stats':
+    _merge_bytes_stats(stats_list, merged_stats)
+  return merged
+
+
+def _merge_datasets(
+    datasets: Sequence[statistics_pb2.DatasetFeatureStatistics]
+) -> statistics_pb2.DatasetFeatureStatistics:
+  """Merges the stats of a dataset computed on disjoint sets of examples."""
+  merged = statistics_pb2.DatasetFeatureStatistics(
+      name=datasets[0].name,
+      num_examples=sum(d.num_examples for d in datasets),
+      weighted_num_examples=sum(d.weighted_num_examples for d in datasets))
+  features = collections.OrderedDict()
+  for dataset in datasets:
+    for feature in dataset.features:
+      features.setdefault(_feature_key(feature), []).append((dataset, feature))
+  for dataset_and_features in features.values():
+    present_datasets = set(id(d) for d, _ in dataset_and_features)
+    num_missing_examples = sum(
+        d.num_examples for d in datasets if id(d) not in present_datasets)
+    merged.features.add().CopyFrom(
+        _merge_feature_stats([f for _, f in dataset_and_features],
+                             num_missing_examples))
+  return merged
+
+
+def merge_statistics(
+    statistics_lists: Sequence[statistics_pb2.DatasetFeatureStatisticsList]
+) -> Optional[statistics_pb2.DatasetFeatureStatisticsList]:
+  """Merges statistics computed on disjoint sets of examples.
+
+  Args:
+    statistics_lists: Statistics of each set of examples. Datasets (i.e.
+      slices) are matched by name.
+
+  Returns:
+    The statistics of the union of the sets, or None if `statistics_lists` is
+    empty.
+  """
+  if not statistics_lists:
+    return None
+  datasets_by_name = collections.OrderedDict()
+  for statistics_list in statistics_lists:
+    for dataset in statistics_list.datasets:
+      datasets_by_name.setdefault(dataset.name, []).append(dataset)
+  return statistics_pb2.DatasetFeatureStatisticsList(datasets=[
+      _merge_datasets(datasets) for datasets in datasets_by_name.values()
+  ])
@@ -0,0 +1,174 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.components.statistics_gen.merge_util."""
+
+import tensorflow as tf
+from tfx.components.statistics_gen import merge_util
+
+from google.protobuf import text_format
+from tensorflow_metadata.proto.v0 import statistics_pb2
+
+
+class MergeUtilTest(tf.test.TestCase):
+
+  def testMergeStatistics(self):
+    span_1 = text_format.Parse(
+        """
+        datasets {
+          num_examples: 2
+          features {
+            path { step: "x" }
+            type: FLOAT
+            num_stats {
+              common_stats {
+                num_non_missing: 2
+                min_num_values: 1
+                max_num_values: 1
+                avg_num_values: 1.0
+                tot_num_values: 2
+              }
+              mean: 1.0
+              std_dev: 1.0
+              min: 0.0
+              max: 2.0
+              num_zeros: 1
+              median: 2.0
+            }
+          }
+          features {
+            path { step: "s" }
+            type: STRING
+            string_stats {
+              common_stats {
+                num_non_missing: 2
+                min_num_values: 1
+                max_num_values: 2
+                avg_num_values: 1.5
+                tot_num_values: 3
+              }
+              unique: 2
+              top_values { value: "a" frequency: 2 }
+              top_values { value: "b" frequency: 1 }
+              avg_length: 1.0
+            }
+          }
+        }
+        """, statistics_pb2.DatasetFeatureStatisticsList())
+    span_2 = text_format.Parse(
+        """
+        datasets {
+          num_examples: 2
+          features {
+            path { step: "x" }
+            type: FLOAT
+            num_stats {
+              common_stats {
+                num_non_missing: 1
+                num_missing: 1
+                min_num_values: 2
+                max_num_values: 2
+                avg_num_values: 2.0
+                tot_num_values: 2
+              }
+              mean: 3.0
+              std_dev: 1.0
+              min: 2.0
+              max: 4.0
+            }
+          }
+        }
+        """, statistics_pb2.DatasetFeatureStatisticsList())
+    expected = text_format.Parse(
+        """
+        datasets {
+          num_examples: 4
+          features {
+            path { step: "x" }
+            type: FLOAT
+            num_stats {
+              common_stats {
+                num_non_missing: 3
+                num_missing: 1
+                min_num_values: 1
+                max_num_values: 2
+                tot_num_values: 4
+              }
+              mean: 2.0
+              min: 0.0
+              max: 4.0
+              num_zeros: 1
+            }
+          }
+          features {
+            path { step: "s" }
+            type: STRING
+            string_stats {
+              common_stats {
+                num_non_missing: 2
+                num_missing: 2
+                min_num_values: 1
+                max_num_values: 2
+                avg_num_values: 1.5
+                tot_num_values: 3
+              }
+              unique: 2
+              top_values { value: "a" frequency: 2 }
+              top_values { value: "b" frequency: 1 }
+              avg_length: 1.0
+            }
+          }
+        }
+        """, statistics_pb2.DatasetFeatureStatisticsList())
+
+    merged = merge_util.merge_statistics([span_1, span_2])
+    num_stats = merged.datasets[0].features[0].num_stats
+    self.assertAlmostEqual(4 / 3, num_stats.common_stats.avg_num_values,
+                           places=5)
+    self.assertAlmostEqual(2**0.5, num_stats.std_dev)
+    num_stats.common_stats.ClearField('avg_num_values')
+    num_stats.ClearField('std_dev')
+    self.assertProtoEquals(expected, merged)
+
+  def testMergeTopValues(self):
+    spans = [
+        text_format.Parse(
+            """
+            datasets {
+              num_examples: 3
+              features {
+                name: "s"
+                type: STRING
+                string_stats {
+                  common_stats { num_non_missing: 3 tot_num_values: 3 }
+                  unique: 2
+                  top_values { value: "%s" frequency: 2 }
+                  top_values { value: "c" frequency: 1 }
+                }
+              }
+            }
+            """ % value, statistics_pb2.DatasetFeatureStatisticsList())
+        for value in ('a', 'b', 'b')
+    ]
+    string_stats = merge_util.merge_statistics(
+        spans).datasets[0].features[0].string_stats
+    self.assertEqual(2, string_stats.unique)
+    self.assertEqual([('b', 4.0), ('c', 3.0)],
+                     [(v.value, v.frequency) for v in string_stats.top_values])
+
+  def testMergeNoStatistics(self):
+    self.assertIsNone(merge_util.merge_statistics([]))
+
+
+if __name__ == '__main__':
+  tf.test.main()
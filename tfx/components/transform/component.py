@@ -80,7 +80,8 @@ class Transform(base_component.BaseComponent):
       materialize: bool = True,
       disable_analyzer_cache: bool = False,
       force_tf_compat_v1: bool = True,
-      custom_config: Optional[Dict[Text, Any]] = None):
+      custom_config: Optional[Dict[Text, Any]] = None,
+      compute_pre_transform_stats: bool = False):
     """Construct a Transform component.
 
     Args:
@@ -143,6 +144,12 @@ class Transform(base_component.BaseComponent):
         future release.
       custom_config: A dict which contains additional parameters that will be
         passed to preprocessing_fn.
+      compute_pre_transform_stats: If True, output the statistics of the
+        examples of each transform split as a `pre_transform_stats` channel of
+        type `standard_artifacts.ExampleStatistics`, like the output of
+        StatisticsGen. The statistics are computed while the examples are read
+        for the transformation, so a pipeline does not need to read and decode
+        them again in a separate StatisticsGen.
 
     Raises:
       ValueError: When both or neither of 'module_file' and 'preprocessing_fn'
@@ -179,6 +186,11 @@ class Transform(base_component.BaseComponent):
       updated_analyzer_cache = types.Channel(
           type=standard_artifacts.TransformCache)
 
+    pre_transform_stats = None
+    if compute_pre_transform_stats:
+      pre_transform_stats = types.Channel(
+          type=standard_artifacts.ExampleStatistics)
+
     spec = TransformSpec(
         examples=examples,
         schema=schema,
@@ -190,5 +202,6 @@ class Transform(base_component.BaseComponent):
         transformed_examples=transformed_examples,
         analyzer_cache=analyzer_cache,
         updated_analyzer_cache=updated_analyzer_cache,
+        pre_transform_stats=pre_transform_stats,
         custom_config=json_utils.dumps(custom_config))
     super(Transform, self).__init__(spec=spec, instance_name=instance_name)
@@ -107,6 +107,16 @@ class ComponentTest(tf.test.TestCase):
         disable_analyzer_cache=True)
     self._verify_outputs(transform, disable_analyzer_cache=True)
 
+  def test_construct_with_pre_transform_stats(self):
+    transform = component.Transform(
+        examples=self.examples,
+        schema=self.schema,
+        preprocessing_fn='my_preprocessing_fn',
+        compute_pre_transform_stats=True)
+    self._verify_outputs(transform)
+    self.assertEqual(standard_artifacts.ExampleStatistics.TYPE_NAME,
+                     transform.outputs['pre_transform_stats'].type_name)
+
   def test_construct_from_preprocessing_fn_with_custom_config(self):
     preprocessing_fn = 'path.to.my_preprocessing_fn'
     custom_config = {'param': 1}
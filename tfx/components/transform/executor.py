@@ -18,6 +18,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
 import functools
 import hashlib
 import os
@@ -74,6 +75,8 @@ TRANSFORM_GRAPH_KEY = 'transform_graph'
 TRANSFORMED_EXAMPLES_KEY = 'transformed_examples'
 # Key for updated analyzer cache in executor output_dict.
 UPDATED_ANALYZER_CACHE_KEY = 'updated_analyzer_cache'
+# Key for pre-transform statistics in executor output_dict.
+PRE_TRANSFORM_STATS_KEY = 'pre_transform_stats'
 
 RAW_EXAMPLE_KEY = 'raw_example'
 
@@ -87,6 +90,10 @@ _TRANSFORM_INTERNAL_FEATURE_FOR_KEY = '__TFT_PASS_KEY__'
 # Default file name prefix for transformed_examples.
 _DEFAULT_TRANSFORMED_EXAMPLES_PREFIX = 'transformed_examples'
 
+# File name of the statistics of each split of pre_transform_stats, the same as
+# in the output of StatisticsGen.
+_DEFAULT_PRE_TRANSFORM_STATS_FILE_NAME = 'stats_tfrecord'
+
 # Temporary path inside transform_output used for tft.beam
 # TODO(b/125451545): Provide a safe temp path from base executor instead.
 _TEMP_DIR_IN_TRANSFORM_OUTPUT = '.temp_path'
@@ -137,7 +144,8 @@ class _Dataset(object):
                data_format: int,
                data_view_uri: Optional[Text],
                stats_output_path: Optional[Text] = None,
-               materialize_output_path: Optional[Text] = None):
+               materialize_output_path: Optional[Text] = None,
+               pre_transform_stats_output_path: Optional[Text] = None):
     """Initialize a Dataset.
 
     Args:
@@ -148,6 +156,8 @@ class _Dataset(object):
       data_view_uri: URI to the DataView used to parse the data.
       stats_output_path: The file path where to write stats for the dataset.
       materialize_output_path: The file path where to write the dataset.
+      pre_transform_stats_output_path: The file path where to write the
+        pre-transform stats of the dataset, if any.
     """
     self._file_pattern = file_pattern
     file_pattern_suffix = os.path.join(
@@ -160,6 +170,7 @@ class _Dataset(object):
     self._data_view_uri = data_view_uri
     self._stats_output_path = stats_output_path
     self._materialize_output_path = materialize_output_path
+    self._pre_transform_stats_output_path = pre_transform_stats_output_path
     self._index = None
     self._standardized = None
     self._transformed = None
@@ -182,6 +193,10 @@ class _Dataset(object):
     assert self._materialize_output_path
     return self._materialize_output_path
 
+  @property
+  def pre_transform_stats_output_path(self):
+    return self._pre_transform_stats_output_path
+
   @property
   def index(self):
     assert self._index is not None
@@ -275,6 +290,12 @@ def _GetSchemaProto(
   return getattr(schema, '_schema_proto', schema)
 
 
+def _ExtractRawExampleBatches(record_batch: pa.RecordBatch) -> List[bytes]:
+  return record_batch.column(
+      record_batch.schema.get_field_index(
+          RAW_EXAMPLE_KEY)).flatten().to_pylist()
+
+
 def _InvokeStatsOptionsUpdaterFn(
     stats_options_updater_fn: Callable[
         [stats_options_util.StatsType, tfdv.StatsOptions], tfdv.StatsOptions],
@@ -338,6 +359,9 @@ class Executor(base_executor.BaseExecutor):
           splits.
         - updated_analyzer_cache: Cache output of 'tf.Transform', where
           cached information for analyzed examples will be written.
+        - pre_transform_stats: Optionally, statistics of the examples of each
+          transform split as in the output of StatisticsGen, computed while
+          the examples are read for the transformation.
       exec_properties: A dict of execution properties, including:
         - module_file: The file path to a python module file, from which the
           'preprocessing_fn' function will be loaded.
@@ -402,8 +426,15 @@ class Executor(base_executor.BaseExecutor):
 
     transform_data_paths = []
     materialize_output_paths = []
-    if output_dict.get(TRANSFORMED_EXAMPLES_KEY) is not None:
-      for transformed_example_artifact in output_dict[TRANSFORMED_EXAMPLES_KEY]:
+    pre_transform_stats_output_paths = []
+    if output_dict.get(PRE_TRANSFORM_STATS_KEY):
+      for pre_transform_stats_artifact in output_dict[PRE_TRANSFORM_STATS_KEY]:
+        pre_transform_stats_artifact.split_names = (
+            artifact_utils.encode_split_names(list(splits_config.transform)))
+    if (output_dict.get(TRANSFORMED_EXAMPLES_KEY) is not None or
+        output_dict.get(PRE_TRANSFORM_STATS_KEY)):
+      for transformed_example_artifact in output_dict.get(
+          TRANSFORMED_EXAMPLES_KEY) or []:
         transformed_example_artifact.split_names = (
             artifact_utils.encode_split_names(list(splits_config.transform)))
 
@@ -412,12 +443,20 @@ class Executor(base_executor.BaseExecutor):
                                                   split)
         for data_uri in data_uris:
           transform_data_paths.append(io_utils.all_files_pattern(data_uri))
-
-        transformed_example_uris = artifact_utils.get_split_uris(
-            output_dict[TRANSFORMED_EXAMPLES_KEY], split)
-        for output_uri in transformed_example_uris:
-          materialize_output_paths.append(
-              os.path.join(output_uri, _DEFAULT_TRANSFORMED_EXAMPLES_PREFIX))
+          if output_dict.get(PRE_TRANSFORM_STATS_KEY):
+            # The statistics of all the input artifacts are computed together.
+            pre_transform_stats_output_paths.append(
+                os.path.join(
+                    artifact_utils.get_split_uri(
+                        output_dict[PRE_TRANSFORM_STATS_KEY], split),
+                    _DEFAULT_PRE_TRANSFORM_STATS_FILE_NAME))
+
+        if output_dict.get(TRANSFORMED_EXAMPLES_KEY) is not None:
+          transformed_example_uris = artifact_utils.get_split_uris(
+              output_dict[TRANSFORMED_EXAMPLES_KEY], split)
+          for output_uri in transformed_example_uris:
+            materialize_output_paths.append(
+                os.path.join(output_uri, _DEFAULT_TRANSFORMED_EXAMPLES_PREFIX))
 
     def _GetCachePath(label, params_dict):
       if params_dict.get(label) is None:
@@ -469,6 +508,8 @@ class Executor(base_executor.BaseExecutor):
         labels.TRANSFORM_METADATA_OUTPUT_PATH_LABEL: transform_output,
         labels.TRANSFORM_MATERIALIZE_OUTPUT_PATHS_LABEL:
             materialize_output_paths,
+        labels.PRE_TRANSFORM_STATS_OUTPUT_PATHS_LABEL:
+            pre_transform_stats_output_paths,
         labels.TEMP_OUTPUT_LABEL: str(temp_path),
     }
     cache_output = _GetCachePath(UPDATED_ANALYZER_CACHE_KEY, output_dict)
@@ -582,6 +623,7 @@ class Executor(base_executor.BaseExecutor):
       pcoll: beam.pvalue.PCollection,
       stats_output_path: Text,
       stats_options: tfdv.StatsOptions,
+      as_example_statistics: bool = False,
   ) -> beam.pvalue.PDone:
     """Generates statistics.
 
@@ -590,6 +632,8 @@ class Executor(base_executor.BaseExecutor):
       stats_output_path: path where statistics is written to.
       stats_options: An instance of `tfdv.StatsOptions()` used when computing
         statistics.
+      as_example_statistics: If True, writes the statistics as a TFRecord file
+        without the schema, as in an ExampleStatistics artifact.
 
     Returns:
       beam.pvalue.PDone.
@@ -604,11 +648,29 @@ class Executor(base_executor.BaseExecutor):
       return pa.RecordBatch.from_arrays(filtered_columns, filtered_column_names)
 
     pcoll |= 'FilterInternalColumn' >> beam.Map(_FilterInternalColumn)
+    stats = pcoll | 'GenerateStatistics' >> tfdv.GenerateStatistics(
+        stats_options)
+    if as_example_statistics:
+      return stats | 'WriteStats' >> tfdv.WriteStatisticsToTFRecord(
+          stats_output_path)
     # pylint: disable=no-value-for-parameter
-    return (pcoll
-            | 'GenerateStatistics' >> tfdv.GenerateStatistics(stats_options)
-            | 'WriteStats' >> Executor._WriteStats(stats_output_path,
-                                                   stats_options.schema))
+    return stats | 'WriteStats' >> Executor._WriteStats(stats_output_path,
+                                                         stats_options.schema)
+
+  def _GetStatsInput(
+      self, dataset: _Dataset, infix: Text, raw_examples_data_format: int,
+      schema_proto: Optional[schema_pb2.Schema]) -> beam.pvalue.PCollection:
+    """Returns the RecordBatches to compute the stats of `dataset` on."""
+    if not self._IsDataFormatSequenceExample(raw_examples_data_format):
+      return dataset.standardized
+    # Make use of the fact that tf.SequenceExample is wire-format
+    # compatible with tf.Example
+    return (dataset.standardized
+            | 'ExtractRawExampleBatches[{}]'.format(infix) >> beam.Map(
+                _ExtractRawExampleBatches)
+            | 'DecodeSequenceExamplesAsExamplesIntoRecordBatches[{}]'.format(
+                infix) >> beam.ParDo(
+                    self._ToArrowRecordBatchesFn(schema_proto)))
 
   @beam.typehints.with_input_types(List[bytes])
   @beam.typehints.with_output_types(pa.RecordBatch)
@@ -927,6 +989,9 @@ class Executor(base_executor.BaseExecutor):
       outputs: A dictionary of labelled output values, including:
         - labels.PER_SET_STATS_OUTPUT_PATHS_LABEL: Paths to statistics output,
           optional.
+        - labels.PRE_TRANSFORM_STATS_OUTPUT_PATHS_LABEL: Paths to write the
+          pre-transform statistics of each transform data path to, as in an
+          ExampleStatistics artifact, optional.
         - labels.TRANSFORM_METADATA_OUTPUT_PATH_LABEL: A path to
           TFTransformOutput output.
         - labels.TRANSFORM_MATERIALIZE_OUTPUT_PATHS_LABEL: Paths to transform
@@ -970,6 +1035,13 @@ class Executor(base_executor.BaseExecutor):
         outputs, labels.CACHE_OUTPUT_PATH_LABEL, strict=False)
     per_set_stats_output_paths = value_utils.GetValues(
         outputs, labels.PER_SET_STATS_OUTPUT_PATHS_LABEL)
+    pre_transform_stats_output_paths = value_utils.GetValues(
+        outputs, labels.PRE_TRANSFORM_STATS_OUTPUT_PATHS_LABEL)
+    # StatsGen would treat any input as tf.Example.
+    if (pre_transform_stats_output_paths and
+        self._IsDataFormatProto(raw_examples_data_format)):
+      raise ValueError('Pre-transform statistics cannot be computed on '
+                       'examples of payload format FORMAT_PROTO.')
     temp_path = value_utils.GetSoleValue(outputs, labels.TEMP_OUTPUT_LABEL)
     data_view_uri = value_utils.GetSoleValue(
         inputs, labels.DATA_VIEW_LABEL, strict=False)
@@ -1005,15 +1077,14 @@ class Executor(base_executor.BaseExecutor):
     if not analyze_data_list:
       raise ValueError('Analyze data list must not be empty.')
 
-    can_process_transform_jointly = not bool(per_set_stats_output_paths or
-                                             materialize_output_paths)
-    transform_data_list = self._MakeDatasetList(transform_data_paths,
-                                                transform_paths_file_formats,
-                                                raw_examples_data_format,
-                                                data_view_uri,
-                                                can_process_transform_jointly,
-                                                per_set_stats_output_paths,
-                                                materialize_output_paths)
+    can_process_transform_jointly = not bool(
+        per_set_stats_output_paths or materialize_output_paths or
+        pre_transform_stats_output_paths)
+    transform_data_list = self._MakeDatasetList(
+        transform_data_paths, transform_paths_file_formats,
+        raw_examples_data_format, data_view_uri, can_process_transform_jointly,
+        per_set_stats_output_paths, materialize_output_paths,
+        pre_transform_stats_output_paths)
 
     all_datasets = analyze_data_list + transform_data_list
     for d in all_datasets:
@@ -1027,6 +1098,7 @@ class Executor(base_executor.BaseExecutor):
         preprocessing_fn, typespecs, force_tf_compat_v1=force_tf_compat_v1)
 
     if (not compute_statistics and not materialize_output_paths and
+        not pre_transform_stats_output_paths and
         stats_options_updater_fn is None):
       if analyze_input_columns:
         absl.logging.warning(
@@ -1125,8 +1197,13 @@ class Executor(base_executor.BaseExecutor):
     analyze_data_tensor_adapter_config = (
         analyze_data_list[0].tfxio.TensorAdapterConfig())
 
-    for d in transform_data_list:
-      d.tfxio = d.tfxio.Project(transform_input_columns)
+    # The pre-transform stats of the transform datasets are computed on all
+    # the columns, as StatisticsGen would.
+    compute_pre_transform_stats_per_set = any(
+        d.pre_transform_stats_output_path for d in transform_data_list)
+    if not compute_pre_transform_stats_per_set:
+      for d in transform_data_list:
+        d.tfxio = d.tfxio.Project(transform_input_columns)
 
     desired_batch_size = self._GetDesiredBatchSize(raw_examples_data_format)
 
@@ -1229,47 +1306,36 @@ class Executor(base_executor.BaseExecutor):
                  sink=self._GetCacheSink(),
                  dataset_keys=full_analyze_dataset_keys_list))
 
-        if compute_statistics or materialization_format is not None:
+        if (compute_statistics or materialization_format is not None or
+            compute_pre_transform_stats_per_set):
           # Do not compute pre-transform stats if the input format is raw proto,
           # as StatsGen would treat any input as tf.Example. Note that
           # tf.SequenceExamples are wire-format compatible with tf.Examples.
-          if (compute_statistics and
+          if ((compute_statistics or compute_pre_transform_stats_per_set) and
               not self._IsDataFormatProto(raw_examples_data_format)):
-            # Aggregated feature stats before transformation.
-            pre_transform_feature_stats_path = os.path.join(
-                transform_output_path,
-                tft.TFTransformOutput.PRE_TRANSFORM_FEATURE_STATS_PATH)
-
             if self._IsDataFormatSequenceExample(raw_examples_data_format):
               schema_proto = None
             else:
               schema_proto = _GetSchemaProto(input_dataset_metadata)
 
-            if self._IsDataFormatSequenceExample(raw_examples_data_format):
-              def _ExtractRawExampleBatches(record_batch):
-                return record_batch.column(
-                    record_batch.schema.get_field_index(
-                        RAW_EXAMPLE_KEY)).flatten().to_pylist()
-              # Make use of the fact that tf.SequenceExample is wire-format
-              # compatible with tf.Example
-              stats_input = []
-              for dataset in analyze_data_list:
-                infix = 'AnalysisIndex{}'.format(dataset.index)
-                stats_input.append(
-                    dataset.standardized
-                    | 'ExtractRawExampleBatches[{}]'.format(infix) >> beam.Map(
-                        _ExtractRawExampleBatches)
-                    | 'DecodeSequenceExamplesAsExamplesIntoRecordBatches[{}]'
-                    .format(infix) >> beam.ParDo(
-                        self._ToArrowRecordBatchesFn(schema_proto)))
-            else:
-              stats_input = [
-                  dataset.standardized for dataset in analyze_data_list]
-
             pre_transform_stats_options = _InvokeStatsOptionsUpdaterFn(
                 stats_options_updater_fn,
                 stats_options_util.StatsType.PRE_TRANSFORM, schema_proto)
 
+          if (compute_statistics and
+              not self._IsDataFormatProto(raw_examples_data_format)):
+            # Aggregated feature stats before transformation.
+            pre_transform_feature_stats_path = os.path.join(
+                transform_output_path,
+                tft.TFTransformOutput.PRE_TRANSFORM_FEATURE_STATS_PATH)
+
+            stats_input = [
+                self._GetStatsInput(dataset,
+                                    'AnalysisIndex{}'.format(dataset.index),
+                                    raw_examples_data_format, schema_proto)
+                for dataset in analyze_data_list
+            ]
+
             (stats_input
              | 'FlattenAnalysisDatasets' >> beam.Flatten(pipeline=pipeline)
              | 'GenerateStats[FlattenedAnalysisDataset]' >> self._GenerateStats(
@@ -1284,6 +1350,34 @@ class Executor(base_executor.BaseExecutor):
             dataset.standardized = (
                 pipeline | 'TFXIOReadAndDecode[{}]'.format(infix) >>
                 dataset.tfxio.BeamSource(desired_batch_size))
+
+          if compute_pre_transform_stats_per_set:
+            # Stats of each split as StatisticsGen would compute them, from the
+            # data read for the transformation.
+            stats_input_by_output_path = collections.OrderedDict()
+            for dataset in transform_data_list:
+              stats_input_by_output_path.setdefault(
+                  dataset.pre_transform_stats_output_path, []).append(
+                      self._GetStatsInput(
+                          dataset, 'TransformIndex{}'.format(dataset.index),
+                          raw_examples_data_format, schema_proto))
+            for index, (output_path, stats_input) in enumerate(
+                stats_input_by_output_path.items()):
+              infix = 'PreTransformStatsIndex{}'.format(index)
+              (stats_input
+               | 'FlattenTransformDatasets[{}]'.format(infix) >> beam.Flatten(
+                   pipeline=pipeline)
+               | 'GenerateStats[{}]'.format(infix) >> self._GenerateStats(
+                   output_path,
+                   stats_options=pre_transform_stats_options,
+                   as_example_statistics=True))
+
+          if not compute_statistics and materialization_format is None:
+            # The transform datasets were only read for their statistics.
+            return _Status.OK()
+
+          for dataset in transform_data_list:
+            infix = 'TransformIndex{}'.format(dataset.index)
             (dataset.transformed, metadata) = (
                 ((dataset.standardized, dataset.tfxio.TensorAdapterConfig()),
                  transform_fn)
@@ -1406,6 +1500,7 @@ class Executor(base_executor.BaseExecutor):
       can_process_jointly: bool,
       stats_output_paths: Optional[Sequence[Text]] = None,
       materialize_output_paths: Optional[Sequence[Text]] = None,
+      pre_transform_stats_output_paths: Optional[Sequence[Text]] = None,
   ) -> List[_Dataset]:
     """Makes a list of Dataset from the given `file_patterns`.
 
@@ -1420,6 +1515,8 @@ class Executor(base_executor.BaseExecutor):
       can_process_jointly: Whether paths can be processed jointly, unused.
       stats_output_paths: The statistics output paths, if applicable.
       materialize_output_paths: The materialization output paths, if applicable.
+      pre_transform_stats_output_paths: The pre-transform statistics output
+        paths, if applicable.
 
     Returns:
       A list of `_Dataset` sorted by their dataset_key property.
@@ -1433,11 +1530,16 @@ class Executor(base_executor.BaseExecutor):
       assert len(file_patterns) == len(materialize_output_paths)
     else:
       materialize_output_paths = [None] * len(file_patterns)
+    if pre_transform_stats_output_paths:
+      assert len(file_patterns) == len(pre_transform_stats_output_paths)
+    else:
+      pre_transform_stats_output_paths = [None] * len(file_patterns)
 
     datasets = [
-        _Dataset(p, f, data_format, data_view_uri, s, m)
-        for p, f, s, m in zip(file_patterns, file_formats, stats_output_paths,
-                              materialize_output_paths)
+        _Dataset(p, f, data_format, data_view_uri, s, m, ps)
+        for p, f, s, m, ps in zip(file_patterns, file_formats,
+                                  stats_output_paths, materialize_output_paths,
+                                  pre_transform_stats_output_paths)
     ]
     result = sorted(datasets, key=lambda dataset: dataset.dataset_key)
     for index, dataset in enumerate(result):
@@ -24,6 +24,7 @@ import os
 import tempfile
 
 import tensorflow as tf
+import tensorflow_data_validation as tfdv
 import tensorflow_transform as tft
 from tensorflow_transform.beam import tft_unit
 from tfx import types
@@ -162,9 +163,22 @@ class ExecutorTest(tft_unit.TransformTestCase):
   def _verify_transform_outputs(self,
                                 materialize=True,
                                 store_cache=True,
-                                multiple_example_inputs=False):
+                                multiple_example_inputs=False,
+                                pre_transform_stats=False):
     expected_outputs = ['transformed_graph']
 
+    if pre_transform_stats:
+      expected_outputs.append('pre_transform_stats')
+      self.assertEqual(['train', 'eval'],
+                       artifact_utils.decode_split_names(
+                           self._pre_transform_stats_artifact.split_names))
+      for split in ('train', 'eval'):
+        stats = tfdv.load_statistics(
+            os.path.join(self._pre_transform_stats_artifact.uri, split,
+                         'stats_tfrecord'))
+        self.assertLen(stats.datasets, 1)
+        self.assertGreater(stats.datasets[0].num_examples, 0)
+
     if store_cache:
       expected_outputs.append('CACHE')
       self.assertNotEqual(
@@ -263,6 +277,29 @@ class ExecutorTest(tft_unit.TransformTestCase):
                                 self._exec_properties)
     self._verify_transform_outputs(store_cache=False)
 
+  def _add_pre_transform_stats_output(self):
+    self._pre_transform_stats_artifact = standard_artifacts.ExampleStatistics()
+    self._pre_transform_stats_artifact.uri = os.path.join(
+        self._output_data_dir, 'pre_transform_stats')
+    self._output_dict[executor.PRE_TRANSFORM_STATS_KEY] = [
+        self._pre_transform_stats_artifact
+    ]
+
+  def test_do_with_pre_transform_stats(self):
+    self._exec_properties['preprocessing_fn'] = self._preprocessing_fn
+    self._add_pre_transform_stats_output()
+    self._transform_executor.Do(self._input_dict, self._output_dict,
+                                self._exec_properties)
+    self._verify_transform_outputs(pre_transform_stats=True)
+
+  def test_do_with_pre_transform_stats_and_materialization_disabled(self):
+    self._exec_properties['preprocessing_fn'] = self._preprocessing_fn
+    del self._output_dict[executor.TRANSFORMED_EXAMPLES_KEY]
+    self._add_pre_transform_stats_output()
+    self._transform_executor.Do(self._input_dict, self._output_dict,
+                                self._exec_properties)
+    self._verify_transform_outputs(materialize=False, pre_transform_stats=True)
+
   def test_do_with_preprocessing_fn_custom_config(self):
     self._exec_properties['preprocessing_fn'] = '%s.%s' % (
         transform_module.preprocessing_fn.__module__,
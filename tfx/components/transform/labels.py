@@ -39,6 +39,10 @@ FORCE_TF_COMPAT_V1_LABEL = 'force_tf_compat_v1'
 # should be output labels, but they require multiple values. Change this if/when
 # we can add multiple outputs to a single processor label.
 PER_SET_STATS_OUTPUT_PATHS_LABEL = 'per_set_stats_output_paths'
+# Paths to write the pre-transform statistics of each transform data path to,
+# as in an ExampleStatistics artifact. Statistics of the data paths with the
+# same output path are computed together.
+PRE_TRANSFORM_STATS_OUTPUT_PATHS_LABEL = 'pre_transform_stats_output_paths'
 TRANSFORM_MATERIALIZE_OUTPUT_PATHS_LABEL = (
     'transform_materialize_output_paths')
 TRANSFORM_METADATA_OUTPUT_PATH_LABEL = 'transform_output_path'
@@ -28,6 +28,7 @@ from tfx.proto import example_gen_pb2
 from tfx.types import standard_artifacts
 
 _DEFAULT_PAYLOAD_FORMAT = example_gen_pb2.PayloadFormat.FORMAT_TF_EXAMPLE
+_DEFAULT_COMPRESSION = example_gen_pb2.Output.GZIP
 
 
 def get_payload_format(examples: types.Artifact) -> int:
@@ -75,3 +76,39 @@ def set_payload_format(examples: types.Artifact, payload_format: int):
   examples.set_string_custom_property(
       example_gen_utils.PAYLOAD_FORMAT_PROPERTY_NAME,
       example_gen_pb2.PayloadFormat.Name(payload_format))
+
+
+def get_compression(examples: types.Artifact) -> int:
+  """Returns the compression of the files of Examples artifact.
+
+  If Examples artifact does not contain the "compression" custom property, it
+  is made before tfx supports uncompressed examples, and its files are gzip
+  compressed.
+
+  Args:
+    examples: A standard_artifacts.Examples artifact.
+
+  Returns:
+    compression: One of the enums in example_gen_pb2.Output.Compression.
+  """
+  assert examples.type_name == standard_artifacts.Examples.TYPE_NAME, (
+      'examples must be of type standard_artifacts.Examples')
+  if examples.has_custom_property(example_gen_utils.COMPRESSION_PROPERTY_NAME):
+    return example_gen_pb2.Output.Compression.Value(
+        examples.get_string_custom_property(
+            example_gen_utils.COMPRESSION_PROPERTY_NAME))
+  return _DEFAULT_COMPRESSION
+
+
+def set_compression(examples: types.Artifact, compression: int):
+  """Sets the compression custom property for `examples`.
+
+  Args:
+    examples: A standard_artifacts.Examples artifact.
+    compression: One of the enums in example_gen_pb2.Output.Compression.
+  """
+  assert examples.type_name == standard_artifacts.Examples.TYPE_NAME, (
+      'examples must be of type standard_artifacts.Examples')
+  examples.set_string_custom_property(
+      example_gen_utils.COMPRESSION_PROPERTY_NAME,
+      example_gen_pb2.Output.Compression.Name(compression))
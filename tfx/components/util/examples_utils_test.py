@@ -61,6 +61,24 @@ class ExamplesUtilsTest(tf.test.TestCase):
       examples_utils.set_payload_format(
           artifact, example_gen_pb2.PayloadFormat.FORMAT_PROTO)
 
+  def test_get_compression(self):
+    examples = standard_artifacts.Examples()
+    self.assertEqual(examples_utils.get_compression(examples),
+                     example_gen_pb2.Output.GZIP)
+
+    examples.set_string_custom_property(utils.COMPRESSION_PROPERTY_NAME,
+                                        'UNCOMPRESSED')
+    self.assertEqual(examples_utils.get_compression(examples),
+                     example_gen_pb2.Output.UNCOMPRESSED)
+
+  def test_set_compression(self):
+    examples = standard_artifacts.Examples()
+    examples_utils.set_compression(examples,
+                                   example_gen_pb2.Output.UNCOMPRESSED)
+    self.assertEqual(
+        examples.get_string_custom_property(utils.COMPRESSION_PROPERTY_NAME),
+        'UNCOMPRESSED')
+
 
 if __name__ == '__main__':
   tf.test.main()
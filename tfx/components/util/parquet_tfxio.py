@@ -0,0 +1,463 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""TFXIO for Examples written in Parquet files (FORMAT_PARQUET).
+
+The Parquet files written by ExampleGen hold the Arrow RecordBatches that
+decoding the tf.Examples would produce, i.e. one column of type
+large_list<int64|float32|large_binary> per feature. Reading them requires no
+proto decoding, and only the columns of the features in the (projected) schema
+are read. A feature without any value in the files written by ExampleGen has
+the Arrow null type, and is read with the type of the feature in the schema.
+"""
+
+import itertools
+import random
+from typing import Iterable, Iterator, List, Optional, Text, Union
+
+import apache_beam as beam
+from apache_beam.io.filesystems import FileSystems
+import numpy as np
+import pyarrow as pa
+from pyarrow import parquet as pq
+import tensorflow as tf
+from tfx_bsl.coders import batch_util
+from tfx_bsl.coders import example_coder
+from tfx_bsl.tfxio import dataset_options
+from tfx_bsl.tfxio import record_based_tfxio
+from tfx_bsl.tfxio import telemetry
+from tfx_bsl.tfxio import tensor_adapter
+from tfx_bsl.tfxio import tensor_representation_util
+from tfx_bsl.tfxio import tfxio
+
+from tensorflow_metadata.proto.v0 import schema_pb2
+
+_PARQUET_FORMAT = 'parquet'
+_TF_EXAMPLE_FORMAT = 'tf_example'
+# Number of files whose row groups are interleaved when shuffling.
+_SHUFFLE_CYCLE_LENGTH = 10
+
+
+class ParquetTFXIO(record_based_tfxio.RecordBasedTFXIO):
+  """TFXIO implementation for tf.Examples written as Arrow in Parquet files.
+
+  The raw records of this TFXIO are the tf.Examples encoded from the rows of
+  the Parquet files, so that components which need them (e.g. to feed a model
+  taking serialized tf.Examples) can still attach a raw record column.
+  """
+
+  def __init__(self,
+               file_pattern: Union[List[Text], Text],
+               schema: Optional[schema_pb2.Schema] = None,
+               raw_record_column_name: Optional[Text] = None,
+               telemetry_descriptors: Optional[List[Text]] = None):
+    """Initializes a ParquetTFXIO.
+
+    Args:
+      file_pattern: One or a list of glob patterns of the Parquet files.
+      schema: TFMD schema. If provided, only the columns of the features in the
+        schema are read. Otherwise the Arrow schema is read from the files.
+      raw_record_column_name: If provided, the RecordBatches will contain a
+        column of the given name with the rows encoded as tf.Examples.
+      telemetry_descriptors: A set of descriptors that identify the component
+        that is instantiating this TFXIO.
+    """
+    super(ParquetTFXIO, self).__init__(
+        telemetry_descriptors=telemetry_descriptors,
+        logical_format=_TF_EXAMPLE_FORMAT,
+        physical_format=_PARQUET_FORMAT,
+        raw_record_column_name=raw_record_column_name)
+    self._file_patterns = (
+        file_pattern if isinstance(file_pattern, list) else [file_pattern])
+    self._schema = schema
+
+  def SupportAttachingRawRecords(self) -> bool:
+    return True
+
+  def _ColumnNames(self) -> Optional[List[Text]]:
+    if self._schema is None:
+      return None
+    return [f.name for f in self._schema.feature]
+
+  def _AlignedArrowSchema(self) -> Optional[pa.Schema]:
+    """Returns the Arrow schema the read tables are aligned to, if any."""
+    if self._schema is None:
+      return None
+    return self._ArrowSchemaNoRawRecordColumn()
+
+  def _ReadRecordBatches(self, batch_size: Optional[int]) -> beam.PTransform:
+    """Returns a PTransform reading the columns of the schema as batches."""
+
+    @beam.typehints.with_input_types(beam.Pipeline)
+    @beam.typehints.with_output_types(pa.RecordBatch)
+    def _PTransformFn(pipeline: beam.Pipeline):
+      tables = [
+          pipeline
+          | 'ReadFromParquet[{}]'.format(i) >> beam.io.ReadFromParquetBatched(
+              file_pattern, columns=self._ColumnNames())
+          for i, file_pattern in enumerate(self._file_patterns)
+      ]
+      tables = tables | 'FlattenTables' >> beam.Flatten(pipeline=pipeline)
+      arrow_schema = self._AlignedArrowSchema()
+      if arrow_schema is not None:
+        tables |= 'AlignTables' >> beam.Map(_AlignTable, arrow_schema)
+      return (tables
+              | 'ToRecordBatches' >>
+              beam.FlatMap(lambda table: table.to_batches(batch_size)))
+
+    return beam.ptransform_fn(_PTransformFn)()
+
+  def _RawRecordBeamSourceInternal(self) -> beam.PTransform:
+
+    @beam.typehints.with_input_types(beam.Pipeline)
+    @beam.typehints.with_output_types(bytes)
+    def _PTransformFn(pipeline: beam.Pipeline):
+      return (pipeline
+              | 'ReadRecordBatches' >> self._ReadRecordBatches(None)
+              | 'EncodeExamples' >> beam.FlatMap(
+                  example_coder.RecordBatchToExamples))
+
+    return beam.ptransform_fn(_PTransformFn)()
+
+  def _RawRecordToRecordBatchInternal(self,
+                                      batch_size: Optional[int] = None
+                                     ) -> beam.PTransform:
+
+    @beam.typehints.with_input_types(bytes)
+    @beam.typehints.with_output_types(pa.RecordBatch)
+    def _PTransformFn(raw_records: beam.pvalue.PCollection):
+      return (raw_records
+              | 'Batch' >> beam.BatchElements(
+                  **batch_util.GetBatchElementsKwargs(batch_size))
+              | 'Decode' >> beam.ParDo(_DecodeBatchExamplesDoFn(
+                  self._schema, self.raw_record_column_name)))
+
+    return beam.ptransform_fn(_PTransformFn)()
+
+  def BeamSource(self, batch_size: Optional[int] = None) -> beam.PTransform:
+    # Reads the columns directly rather than decoding the raw records.
+
+    @beam.typehints.with_input_types(beam.Pipeline)
+    @beam.typehints.with_output_types(pa.RecordBatch)
+    def _PTransformFn(pipeline: beam.Pipeline):
+      record_batches = (
+          pipeline
+          | 'ReadRecordBatches' >> self._ReadRecordBatches(batch_size))
+      if self.raw_record_column_name is not None:
+        record_batches |= 'AppendRawRecordColumn' >> beam.Map(
+            _AppendExamplesColumn, self.raw_record_column_name)
+      return (record_batches
+              | 'CollectRecordBatchTelemetry' >>
+              telemetry.ProfileRecordBatches(self.telemetry_descriptors,
+                                             _TF_EXAMPLE_FORMAT,
+                                             _PARQUET_FORMAT))
+
+    return beam.ptransform_fn(_PTransformFn)()
+
+  def RecordBatches(
+      self, options: dataset_options.RecordBatchesOptions
+  ) -> Iterator[pa.RecordBatch]:
+    """Yields batches of the rows of the files.
+
+    If `options.shuffle` is set, the order of the files is shuffled in each
+    epoch, the row groups of several files are interleaved, and the rows are
+    shuffled with a buffer of `options.shuffle_buffer_size` rows.
+
+    Args:
+      options: Options of the RecordBatches.
+
+    Yields:
+      RecordBatches of `options.batch_size` rows, except the last one.
+
+    Raises:
+      ValueError: If no file matches the file patterns.
+    """
+    file_paths = [
+        metadata.path for match_result in FileSystems.match(
+            self._file_patterns) for metadata in match_result.metadata_list
+    ]
+    if not file_paths:
+      raise ValueError(
+          'No Parquet file matches {}.'.format(self._file_patterns))
+    record_batches = self._ReadEpochs(file_paths, options)
+    if options.shuffle:
+      record_batches = _ShuffleRows(
+          record_batches,
+          max(options.shuffle_buffer_size, options.batch_size),
+          np.random.RandomState(options.shuffle_seed))
+
+    pending = []
+    num_pending_rows = 0
+    for record_batch in record_batches:
+      pending.append(record_batch)
+      num_pending_rows += record_batch.num_rows
+      while num_pending_rows >= options.batch_size:
+        pending_table = pa.Table.from_batches(pending)
+        yield self._MaybeAppendExamplesColumn(
+            _CombineChunks(pending_table.slice(0, options.batch_size)))
+        pending = pending_table.slice(options.batch_size).to_batches()
+        num_pending_rows -= options.batch_size
+    if num_pending_rows and not options.drop_final_batch:
+      yield self._MaybeAppendExamplesColumn(
+          _CombineChunks(pa.Table.from_batches(pending)))
+
+  def _ReadEpochs(
+      self, file_paths: List[Text],
+      options: dataset_options.RecordBatchesOptions
+  ) -> Iterator[pa.RecordBatch]:
+    """Yields the RecordBatches of the files for each epoch."""
+    arrow_schema = self._AlignedArrowSchema()
+    rng = random.Random(options.shuffle_seed)
+    epoch = 0
+    while options.num_epochs is None or epoch < options.num_epochs:
+      if options.shuffle:
+        rng.shuffle(file_paths)
+      file_record_batches = [
+          _ReadParquetFile(file_path, self._ColumnNames(), arrow_schema)
+          for file_path in file_paths
+      ]
+      cycle_length = _SHUFFLE_CYCLE_LENGTH if options.shuffle else 1
+      has_rows = False
+      for record_batch in _Interleave(file_record_batches, cycle_length):
+        has_rows = True
+        yield record_batch
+      if not has_rows:
+        # All the files are empty, which would otherwise never end without a
+        # number of epochs.
+        return
+      epoch += 1
+
+  def _MaybeAppendExamplesColumn(
+      self, record_batch: pa.RecordBatch) -> pa.RecordBatch:
+    if self.raw_record_column_name is None:
+      return record_batch
+    return _AppendExamplesColumn(record_batch, self.raw_record_column_name)
+
+  def TensorFlowDataset(
+      self,
+      options: dataset_options.TensorFlowDatasetOptions) -> tf.data.Dataset:
+    """Returns a Dataset of the batches of RecordBatches() as tensors.
+
+    The batches are converted by the TensorAdapter, so the Dataset yields the
+    same tensors as that of a TFExampleRecord with the same schema. Rows are
+    shuffled as in RecordBatches(); the reader and parser threads options have
+    no effect.
+
+    Args:
+      options: Options of the Dataset.
+
+    Returns:
+      A Dataset of dicts of tensors, or of (dict of tensors, label tensor)
+      tuples if `options.label_key` is set.
+    """
+    record_batches_options = dataset_options.RecordBatchesOptions(
+        batch_size=options.batch_size,
+        drop_final_batch=options.drop_final_batch,
+        num_epochs=options.num_epochs,
+        shuffle=options.shuffle,
+        shuffle_buffer_size=options.shuffle_buffer_size,
+        shuffle_seed=options.shuffle_seed)
+    adapter = self.TensorAdapter()
+
+    def _Generator():
+      for record_batch in self.RecordBatches(record_batches_options):
+        yield adapter.ToBatchTensors(record_batch, produce_eager_tensors=True)
+
+    dataset = tf.data.Dataset.from_generator(
+        _Generator, output_signature=adapter.TypeSpecs())
+    label_key = options.label_key
+    if label_key is not None:
+      if label_key not in adapter.TypeSpecs():
+        raise ValueError(
+            'The `label_key` provided ({}) must be one of the following tensors'
+            ': {}'.format(label_key, list(adapter.TypeSpecs())))
+      dataset = dataset.map(lambda tensors: (  # pylint: disable=g-long-lambda
+          {k: v for k, v in tensors.items() if k != label_key},
+          tensors[label_key]))
+    return dataset.prefetch(options.prefetch_buffer_size)
+
+  def _ArrowSchemaNoRawRecordColumn(self) -> pa.Schema:
+    if self._schema is not None:
+      return example_coder.ExamplesToRecordBatchDecoder(
+          self._schema.SerializeToString()).ArrowSchema()
+    # Files of empty shards have no column, unless all the files are empty.
+    arrow_schema = None
+    match_results = FileSystems.match(self._file_patterns)
+    for match_result in match_results:
+      for metadata in match_result.metadata_list:
+        with FileSystems.open(metadata.path) as f:
+          arrow_schema = pq.read_schema(f)
+        if arrow_schema.names:
+          return arrow_schema
+    if arrow_schema is None:
+      raise ValueError(
+          'No Parquet file matches {}.'.format(self._file_patterns))
+    return arrow_schema
+
+  def TensorRepresentations(self) -> tensor_adapter.TensorRepresentations:
+    result = (
+        tensor_representation_util.GetTensorRepresentationsFromSchema(
+            self._schema))
+    if result is None:
+      result = (
+          tensor_representation_util.InferTensorRepresentationsFromSchema(
+              self._schema))
+    return result
+
+  def _ProjectImpl(self, tensor_names: List[Text]) -> tfxio.TFXIO:
+    projected_schema = (
+        tensor_representation_util.ProjectTensorRepresentationsInSchema(
+            self._schema, tensor_names))
+    return ParquetTFXIO(
+        file_pattern=self._file_patterns,
+        schema=projected_schema,
+        raw_record_column_name=self.raw_record_column_name,
+        telemetry_descriptors=self.telemetry_descriptors)
+
+
+def _ReadParquetFile(file_path: Text, column_names: Optional[List[Text]],
+                     arrow_schema: Optional[pa.Schema]
+                    ) -> Iterator[pa.RecordBatch]:
+  """Reads the non-empty row groups of a Parquet file as RecordBatches.
+
+  Args:
+    file_path: Path of the Parquet file.
+    column_names: Names of the columns to read, or None to read all of them.
+      Columns missing from the file are not read.
+    arrow_schema: If provided, the schema the RecordBatches are aligned to.
+
+  Yields:
+    The RecordBatches of the row groups of the file.
+  """
+  with FileSystems.open(file_path) as f:
+    parquet_file = pq.ParquetFile(f)
+    if column_names is not None:
+      file_column_names = set(parquet_file.schema_arrow.names)
+      column_names = [
+          name for name in column_names if name in file_column_names
+      ]
+    for i in range(parquet_file.num_row_groups):
+      table = parquet_file.read_row_group(i, columns=column_names)
+      if not table.num_rows:
+        continue
+      if arrow_schema is not None:
+        table = _AlignTable(table, arrow_schema)
+      for record_batch in table.to_batches():
+        yield record_batch
+
+
+def _Interleave(iterators: Iterable[Iterator[pa.RecordBatch]],
+                cycle_length: int) -> Iterator[pa.RecordBatch]:
+  """Yields the items of `cycle_length` iterators at a time in turn."""
+  iterators = iter(iterators)
+  active = list(itertools.islice(iterators, cycle_length))
+  while active:
+    for iterator in list(active):
+      try:
+        yield next(iterator)
+      except StopIteration:
+        active.remove(iterator)
+        active.extend(itertools.islice(iterators, 1))
+
+
+def _ShuffleRows(record_batches: Iterable[pa.RecordBatch], buffer_size: int,
+                 random_state: np.random.RandomState
+                ) -> Iterator[pa.RecordBatch]:
+  """Shuffles the rows of `record_batches` with a buffer of rows.
+
+  Once the buffer holds `buffer_size` rows, its rows are shuffled and half of
+  them are yielded, so that each row is copied about twice.
+
+  Args:
+    record_batches: RecordBatches of the same schema.
+    buffer_size: Number of rows of the shuffle buffer.
+    random_state: Random state to shuffle the rows with.
+
+  Yields:
+    RecordBatches of the shuffled rows.
+  """
+  buffered = []
+  num_rows = 0
+  for record_batch in record_batches:
+    buffered.append(record_batch)
+    num_rows += record_batch.num_rows
+    if num_rows >= buffer_size:
+      table = pa.Table.from_batches(buffered).take(
+          pa.array(random_state.permutation(num_rows)))
+      num_yielded = num_rows - buffer_size // 2
+      for shuffled in table.slice(0, num_yielded).to_batches():
+        yield shuffled
+      buffered = table.slice(num_yielded).to_batches()
+      num_rows -= num_yielded
+  if num_rows:
+    for shuffled in pa.Table.from_batches(buffered).take(
+        pa.array(random_state.permutation(num_rows))).to_batches():
+      yield shuffled
+
+
+def _AlignTable(table: pa.Table, arrow_schema: pa.Schema) -> pa.Table:
+  """Returns `table` with the columns of `arrow_schema`, filling nulls.
+
+  Columns missing from `table`, or only holding nulls (null typed), are
+  replaced by null columns of the type of `arrow_schema`.
+
+  Args:
+    table: A Table read from Parquet files.
+    arrow_schema: The Arrow schema of the TFMD schema of the features.
+
+  Returns:
+    The aligned Table.
+  """
+  columns = []
+  for field in arrow_schema:
+    index = table.schema.get_field_index(field.name)
+    if index < 0 or pa.types.is_null(table.schema.field(index).type):
+      columns.append(pa.nulls(table.num_rows, type=field.type))
+    else:
+      columns.append(table.column(index))
+  return pa.Table.from_arrays(columns, schema=arrow_schema)
+
+
+def _CombineChunks(table: pa.Table) -> pa.RecordBatch:
+  """Returns the rows of a non-empty `table` as a single RecordBatch."""
+  return table.combine_chunks().to_batches()[0]
+
+
+def _AppendExamplesColumn(record_batch: pa.RecordBatch,
+                          column_name: Text) -> pa.RecordBatch:
+  """Appends a column of the rows of `record_batch` encoded as tf.Examples."""
+  return record_based_tfxio.AppendRawRecordColumn(
+      record_batch, column_name,
+      example_coder.RecordBatchToExamples(record_batch))
+
+
+class _DecodeBatchExamplesDoFn(beam.DoFn):
+  """Decodes batches of serialized tf.Examples into RecordBatches."""
+
+  def __init__(self, schema: Optional[schema_pb2.Schema],
+               raw_record_column_name: Optional[Text]):
+    self._serialized_schema = (
+        schema.SerializeToString() if schema is not None else None)
+    self._raw_record_column_name = raw_record_column_name
+    self._decoder = None
+
+  def setup(self):
+    self._decoder = example_coder.ExamplesToRecordBatchDecoder(
+        self._serialized_schema)
+
+  def process(self, examples: List[bytes]) -> Iterator[pa.RecordBatch]:
+    record_batch = self._decoder.DecodeBatch(examples)
+    if self._raw_record_column_name is not None:
+      record_batch = record_based_tfxio.AppendRawRecordColumn(
+          record_batch, self._raw_record_column_name, examples)
+    yield record_batch
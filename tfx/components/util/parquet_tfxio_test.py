@@ -0,0 +1,224 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.components.util.parquet_tfxio."""
+
+import os
+
+import apache_beam as beam
+from apache_beam.testing import util as beam_test_util
+import numpy as np
+import pyarrow as pa
+from pyarrow import parquet as pq
+import tensorflow as tf
+from tfx.components.util import parquet_tfxio
+from tfx_bsl.tfxio import dataset_options
+
+from google.protobuf import text_format
+from tensorflow_metadata.proto.v0 import schema_pb2
+
+_SCHEMA = text_format.Parse(
+    """
+    feature {
+      name: "int_feature"
+      type: INT
+    }
+    feature {
+      name: "bytes_feature"
+      type: BYTES
+    }
+    """, schema_pb2.Schema())
+
+_RECORD_BATCH = pa.RecordBatch.from_arrays([
+    pa.array([[1], None, [3, 4]], type=pa.large_list(pa.int64())),
+    pa.array([[b'a'], [b'b'], None], type=pa.large_list(pa.large_binary())),
+], ['int_feature', 'bytes_feature'])
+
+
+class ParquetTFXIOTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(ParquetTFXIOTest, self).setUp()
+    self._file_pattern = os.path.join(self.get_temp_dir(), 'data-*.parquet')
+    for i in range(2):
+      pq.write_table(
+          pa.Table.from_batches([_RECORD_BATCH]),
+          os.path.join(self.get_temp_dir(), 'data-{}.parquet'.format(i)))
+
+  def testArrowSchema(self):
+    tfxio = parquet_tfxio.ParquetTFXIO(self._file_pattern)
+    self.assertTrue(tfxio.ArrowSchema().equals(_RECORD_BATCH.schema))
+
+    tfxio = parquet_tfxio.ParquetTFXIO(
+        self._file_pattern, raw_record_column_name='raw_record')
+    self.assertEqual(['int_feature', 'bytes_feature', 'raw_record'],
+                     tfxio.ArrowSchema().names)
+
+  def testBeamSource(self):
+    tfxio = parquet_tfxio.ParquetTFXIO(
+        self._file_pattern,
+        schema=_SCHEMA,
+        raw_record_column_name='raw_record').Project(['int_feature'])
+
+    def _AssertFn(record_batches):
+      self.assertLen(record_batches, 2)
+      for record_batch in record_batches:
+        self.assertEqual(['int_feature', 'raw_record'],
+                         record_batch.schema.names)
+        self.assertEqual(_RECORD_BATCH.column(0).to_pylist(),
+                         record_batch.column(0).to_pylist())
+        example = tf.train.Example.FromString(
+            record_batch.column(1).flatten()[0].as_py())
+        self.assertEqual([1], example.features.feature['int_feature']
+                         .int64_list.value)
+
+    with beam.Pipeline() as p:
+      record_batches = p | tfxio.BeamSource()
+      beam_test_util.assert_that(record_batches, _AssertFn)
+
+  def testRawRecordBeamSource(self):
+    tfxio = parquet_tfxio.ParquetTFXIO(self._file_pattern, schema=_SCHEMA)
+
+    def _AssertFn(record_batches):
+      self.assertEqual(6, sum(rb.num_rows for rb in record_batches))
+      for record_batch in record_batches:
+        self.assertTrue(record_batch.schema.equals(tfxio.ArrowSchema()))
+
+    with beam.Pipeline() as p:
+      record_batches = (
+          p
+          | tfxio.RawRecordBeamSource()
+          | tfxio.RawRecordToRecordBatch())
+      beam_test_util.assert_that(record_batches, _AssertFn)
+
+  def testRecordBatches(self):
+    tfxio = parquet_tfxio.ParquetTFXIO(self._file_pattern, schema=_SCHEMA)
+    record_batches = list(
+        tfxio.RecordBatches(
+            dataset_options.RecordBatchesOptions(
+                batch_size=4, shuffle=False, num_epochs=1)))
+    self.assertEqual([4, 2], [rb.num_rows for rb in record_batches])
+
+    record_batches = list(
+        tfxio.RecordBatches(
+            dataset_options.RecordBatchesOptions(
+                batch_size=4, drop_final_batch=True, shuffle=False,
+                num_epochs=2)))
+    self.assertEqual([4, 4, 4], [rb.num_rows for rb in record_batches])
+
+  def testRecordBatchesWithShuffle(self):
+    tfxio = parquet_tfxio.ParquetTFXIO(self._file_pattern, schema=_SCHEMA)
+    record_batches = list(
+        tfxio.RecordBatches(
+            dataset_options.RecordBatchesOptions(
+                batch_size=4,
+                shuffle=True,
+                shuffle_buffer_size=3,
+                shuffle_seed=1,
+                num_epochs=1)))
+    self.assertEqual([4, 2], [rb.num_rows for rb in record_batches])
+    self.assertCountEqual(
+        _RECORD_BATCH.column(0).to_pylist() * 2,
+        [v for rb in record_batches for v in rb.column(0).to_pylist()])
+
+  def testRecordBatchesWithoutMatchingFiles(self):
+    tfxio = parquet_tfxio.ParquetTFXIO(
+        os.path.join(self.get_temp_dir(), 'missing-*.parquet'), schema=_SCHEMA)
+    with self.assertRaisesRegex(ValueError, 'No Parquet file matches'):
+      next(
+          tfxio.RecordBatches(
+              dataset_options.RecordBatchesOptions(batch_size=4)))
+
+  def testShuffleRows(self):
+    record_batch = pa.RecordBatch.from_arrays([pa.array(range(100))], ['x'])
+    # pylint: disable=protected-access
+    shuffled_record_batches = parquet_tfxio._ShuffleRows(
+        [record_batch], 50, np.random.RandomState(0))
+    # pylint: enable=protected-access
+    shuffled = [
+        value for rb in shuffled_record_batches
+        for value in rb.column(0).to_pylist()
+    ]
+    self.assertCountEqual(range(100), shuffled)
+    self.assertNotEqual(list(range(100)), shuffled)
+
+  def testReadNullTypedColumnsAndEmptyFiles(self):
+    file_dir = os.path.join(self.get_temp_dir(), 'null_typed')
+    os.makedirs(file_dir)
+    pq.write_table(
+        pa.Table.from_batches([_RECORD_BATCH]),
+        os.path.join(file_dir, 'data-0.parquet'))
+    # A shard where bytes_feature has no value.
+    pq.write_table(
+        pa.Table.from_arrays([
+            pa.array([[5], [6]], type=pa.large_list(pa.int64())),
+            pa.nulls(2)
+        ], ['int_feature', 'bytes_feature']),
+        os.path.join(file_dir, 'data-1.parquet'))
+    # An empty shard, without any column.
+    pq.ParquetWriter(os.path.join(file_dir, 'data-2.parquet'),
+                     pa.schema([])).close()
+    file_pattern = os.path.join(file_dir, 'data-*.parquet')
+
+    tfxio = parquet_tfxio.ParquetTFXIO(file_pattern, schema=_SCHEMA)
+    record_batches = list(
+        tfxio.RecordBatches(
+            dataset_options.RecordBatchesOptions(
+                batch_size=10, shuffle=False, num_epochs=1)))
+    self.assertLen(record_batches, 1)
+    self.assertEqual(5, record_batches[0].num_rows)
+    self.assertTrue(record_batches[0].schema.equals(tfxio.ArrowSchema()))
+
+    def _AssertFn(record_batches):
+      self.assertEqual(5, sum(rb.num_rows for rb in record_batches))
+      for record_batch in record_batches:
+        self.assertTrue(record_batch.schema.equals(tfxio.ArrowSchema()))
+
+    with beam.Pipeline() as p:
+      beam_test_util.assert_that(p | tfxio.BeamSource(), _AssertFn)
+
+    # Without a schema, the Arrow schema is read from a non-empty file.
+    self.assertEqual(['int_feature', 'bytes_feature'],
+                     parquet_tfxio.ParquetTFXIO(file_pattern).ArrowSchema()
+                     .names)
+
+  def testTensorFlowDataset(self):
+    tfxio = parquet_tfxio.ParquetTFXIO(self._file_pattern, schema=_SCHEMA)
+    batches = list(
+        tfxio.TensorFlowDataset(
+            dataset_options.TensorFlowDatasetOptions(
+                batch_size=4, shuffle=False, num_epochs=1)))
+    self.assertLen(batches, 2)
+    self.assertCountEqual(['int_feature', 'bytes_feature'], batches[0].keys())
+    self.assertIsInstance(batches[0]['int_feature'], tf.SparseTensor)
+    self.assertAllEqual([1, 3, 4, 1],
+                        batches[0]['int_feature'].values.numpy())
+    self.assertAllEqual([4, 2], batches[0]['int_feature'].dense_shape.numpy())
+    self.assertAllEqual([2, 2], batches[1]['int_feature'].dense_shape.numpy())
+
+  def testTensorFlowDatasetWithLabelKey(self):
+    tfxio = parquet_tfxio.ParquetTFXIO(self._file_pattern, schema=_SCHEMA)
+    features, label = next(
+        iter(
+            tfxio.TensorFlowDataset(
+                dataset_options.TensorFlowDatasetOptions(
+                    batch_size=3,
+                    shuffle=False,
+                    num_epochs=1,
+                    label_key='int_feature'))))
+    self.assertCountEqual(['bytes_feature'], features.keys())
+    self.assertAllEqual([1, 3, 4], label.values.numpy())
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -0,0 +1,155 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Utility functions related to ExampleStatistics artifact."""
+
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional, Sequence, Text, Tuple
+
+from tfx import types
+from tfx.types import standard_artifacts
+from tfx.utils import json_utils
+
+from tensorflow_metadata.proto.v0 import statistics_pb2
+
+# Custom property of the ExampleStatistics artifact holding the JSON dict of
+# split name to the rate of the sample the statistics of the split were
+# generated on.
+SAMPLE_RATES_PROPERTY_NAME = 'sample_rates'
+
+
+def get_sample_rate(statistics: types.Artifact, split: Text) -> float:
+  """Returns the rate of the sample the statistics of `split` were made on.
+
+  If the ExampleStatistics artifact does not contain the "sample_rates" custom
+  property, or the property has no rate for `split`, the statistics were
+  generated on all the records of the split.
+
+  Args:
+    statistics: A standard_artifacts.ExampleStatistics artifact.
+    split: Name of a split of `statistics`.
+
+  Returns:
+    The sample rate, in (0, 1].
+  """
+  assert statistics.type_name == (
+      standard_artifacts.ExampleStatistics.TYPE_NAME), (
+          'statistics must be of type standard_artifacts.ExampleStatistics')
+  if not statistics.has_custom_property(SAMPLE_RATES_PROPERTY_NAME):
+    return 1.0
+  sample_rates = json_utils.loads(
+      statistics.get_string_custom_property(SAMPLE_RATES_PROPERTY_NAME))
+  return sample_rates.get(split, 1.0)
+
+
+def set_sample_rates(statistics: types.Artifact,
+                     sample_rates: Dict[Text, float]):
+  """Sets the sample rates custom property for `statistics`.
+
+  Args:
+    statistics: A standard_artifacts.ExampleStatistics artifact.
+    sample_rates: Dict of split name to the rate of the sample the statistics
+      of the split were generated on.
+  """
+  assert statistics.type_name == (
+      standard_artifacts.ExampleStatistics.TYPE_NAME), (
+          'statistics must be of type standard_artifacts.ExampleStatistics')
+  statistics.set_string_custom_property(SAMPLE_RATES_PROPERTY_NAME,
+                                        json_utils.dumps(sample_rates))
+
+
+def scale_to_sample_rate(
+    stats: statistics_pb2.DatasetFeatureStatisticsList,
+    sample_rate: float) -> statistics_pb2.DatasetFeatureStatisticsList:
+  """Estimates the statistics of a split from those of a sample of the split.
+
+  The counts of the statistics (numbers of examples, of present, missing and
+  total values, value frequencies and histogram counts) are divided by the
+  sample rate, so that checks of absolute counts, e.g. the `min_count` of a
+  feature presence or the `min_examples_count` of a dataset constraint, apply
+  to the whole split. Ratios and value distributions are left as is, and so are
+  the numbers of unique values, which can't be estimated by scaling.
+
+  Args:
+    stats: Statistics generated on a sample of a split.
+    sample_rate: Rate of the sample, in (0, 1].
+
+  Returns:
+    The estimated statistics of the split. `stats` itself if the rate is 1.
+  """
+  if sample_rate >= 1.0:
+    return stats
+  scale = 1.0 / sample_rate
+  result = statistics_pb2.DatasetFeatureStatisticsList()
+  result.CopyFrom(stats)
+  for dataset in result.datasets:
+    dataset.num_examples = int(round(dataset.num_examples * scale))
+    dataset.weighted_num_examples *= scale
+    for feature in dataset.features:
+      stats_type = feature.WhichOneof('stats')
+      if stats_type is None or stats_type == 'custom_stats':
+        continue
+      feature_stats = getattr(feature, stats_type)
+      _scale_common_stats(feature_stats.common_stats, scale)
+      if stats_type == 'num_stats':
+        feature_stats.num_zeros = int(round(feature_stats.num_zeros * scale))
+        for histogram in feature_stats.histograms:
+          for bucket in histogram.buckets:
+            bucket.sample_count *= scale
+      elif stats_type == 'string_stats':
+        for top_value in feature_stats.top_values:
+          top_value.frequency *= scale
+        for bucket in feature_stats.rank_histogram.buckets:
+          bucket.sample_count *= scale
+  return result
+
+
+def _scale_common_stats(common_stats: statistics_pb2.CommonStatistics,
+                        scale: float) -> None:
+  for field in ('num_non_missing', 'num_missing', 'tot_num_values'):
+    setattr(common_stats, field,
+            int(round(getattr(common_stats, field) * scale)))
+    weighted_value = getattr(common_stats.weighted_common_stats, field)
+    if weighted_value:
+      setattr(common_stats.weighted_common_stats, field,
+              weighted_value * scale)
+
+
+def run_per_split(fn: Callable[..., Any], args_per_split: Sequence[Tuple],
+                  num_workers: Optional[int] = None) -> List[Any]:
+  """Applies `fn` to the args of each split, in parallel if requested.
+
+  With more than one worker, the splits are processed in a pool of 'spawn'ed
+  processes, as forking a process with TensorFlow state is not safe. `fn` and
+  its args must then be picklable, e.g. `fn` must be a module-level function.
+
+  Args:
+    fn: Function processing a split, e.g. loading and validating its
+      statistics.
+    args_per_split: The args of `fn` for each split.
+    num_workers: Maximum number of splits processed concurrently. If unset or
+      1, the splits are processed sequentially in the current process.
+
+  Returns:
+    The results of `fn` for each split, in the order of `args_per_split`.
+
+  Raises:
+    ValueError: if num_workers is not positive.
+  """
+  if num_workers is not None and num_workers <= 0:
+    raise ValueError('num_workers must be positive, got %d.' % num_workers)
+  if not num_workers or num_workers == 1 or len(args_per_split) <= 1:
+    return [fn(*args) for args in args_per_split]
+  with multiprocessing.get_context('spawn').Pool(
+      processes=min(num_workers, len(args_per_split))) as pool:
+    return pool.starmap(fn, args_per_split)
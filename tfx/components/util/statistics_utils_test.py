@@ -0,0 +1,123 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.components.util.statistics_utils."""
+
+import tensorflow as tf
+from tfx.components.util import statistics_utils
+from tfx.types import standard_artifacts
+
+from google.protobuf import text_format
+from tensorflow_metadata.proto.v0 import statistics_pb2
+
+
+class StatisticsUtilsTest(tf.test.TestCase):
+
+  def test_get_sample_rate(self):
+    statistics = standard_artifacts.ExampleStatistics()
+    self.assertEqual(statistics_utils.get_sample_rate(statistics, 'train'), 1.0)
+
+    statistics.set_string_custom_property(
+        statistics_utils.SAMPLE_RATES_PROPERTY_NAME, '{"train": 0.25}')
+    self.assertEqual(
+        statistics_utils.get_sample_rate(statistics, 'train'), 0.25)
+    self.assertEqual(statistics_utils.get_sample_rate(statistics, 'eval'), 1.0)
+
+  def test_set_sample_rates(self):
+    statistics = standard_artifacts.ExampleStatistics()
+    statistics_utils.set_sample_rates(statistics, {'train': 0.5, 'eval': 1.0})
+    self.assertEqual(
+        statistics_utils.get_sample_rate(statistics, 'train'), 0.5)
+    self.assertEqual(statistics_utils.get_sample_rate(statistics, 'eval'), 1.0)
+
+  def test_invalid_artifact_type(self):
+    artifact = standard_artifacts.Examples()
+    with self.assertRaises(AssertionError):
+      statistics_utils.get_sample_rate(artifact, 'train')
+    with self.assertRaises(AssertionError):
+      statistics_utils.set_sample_rates(artifact, {'train': 0.5})
+
+  def test_scale_to_sample_rate(self):
+    stats = text_format.Parse(
+        """
+        datasets {
+          num_examples: 10
+          features {
+            path { step: "x" }
+            num_stats {
+              common_stats {
+                num_non_missing: 8
+                num_missing: 2
+                min_num_values: 1
+                max_num_values: 2
+                tot_num_values: 12
+              }
+              num_zeros: 3
+              mean: 1.5
+            }
+          }
+          features {
+            path { step: "s" }
+            string_stats {
+              common_stats { num_non_missing: 10 tot_num_values: 10 }
+              unique: 2
+              top_values { value: "a" frequency: 6 }
+            }
+          }
+        }
+        """, statistics_pb2.DatasetFeatureStatisticsList())
+    expected = text_format.Parse(
+        """
+        datasets {
+          num_examples: 40
+          features {
+            path { step: "x" }
+            num_stats {
+              common_stats {
+                num_non_missing: 32
+                num_missing: 8
+                min_num_values: 1
+                max_num_values: 2
+                tot_num_values: 48
+              }
+              num_zeros: 12
+              mean: 1.5
+            }
+          }
+          features {
+            path { step: "s" }
+            string_stats {
+              common_stats { num_non_missing: 40 tot_num_values: 40 }
+              unique: 2
+              top_values { value: "a" frequency: 24 }
+            }
+          }
+        }
+        """, statistics_pb2.DatasetFeatureStatisticsList())
+    self.assertProtoEquals(
+        expected, statistics_utils.scale_to_sample_rate(stats, 0.25))
+    self.assertIs(stats, statistics_utils.scale_to_sample_rate(stats, 1.0))
+
+  def test_run_per_split(self):
+    args_per_split = [(2, 3), (3, 2), (4, 1)]
+    self.assertEqual([8, 9, 4],
+                     statistics_utils.run_per_split(pow, args_per_split))
+    self.assertEqual(
+        [8, 9, 4],
+        statistics_utils.run_per_split(pow, args_per_split, num_workers=2))
+    with self.assertRaises(ValueError):
+      statistics_utils.run_per_split(pow, args_per_split, num_workers=0)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -19,12 +19,15 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from typing import Callable, List, Iterator, Optional, Text, Tuple, Union
+import collections
+import threading
+from typing import Any, Callable, Hashable, List, Iterator, Optional, Text, Tuple, Union
 
 import pyarrow as pa
 import tensorflow as tf
 from tfx.components.experimental.data_view import constants
 from tfx.components.util import examples_utils
+from tfx.components.util import parquet_tfxio
 from tfx.proto import example_gen_pb2
 from tfx.types import artifact
 from tfx.types import standard_artifacts
@@ -40,6 +43,46 @@ from tensorflow_metadata.proto.v0 import schema_pb2
 # post-0.22 is released.
 OneOrMorePatterns = Union[Text, List[Text]]
 
+# Maximum number of entries kept in each of the caches below.
+_MAX_CACHED_ENTRIES = 256
+
+# Resolved (payload format, DataView URI) pairs keyed by the ids and URIs of the
+# Examples artifacts, in LRU order.
+_RESOLVED_EXAMPLES = collections.OrderedDict()
+# TFXIO instances keyed by the arguments of make_tfxio(), in LRU order. Reusing
+# them avoids reloading the DataView decoder and re-deriving the Arrow schema
+# and TensorRepresentations of the same data in every component of a process.
+_TFXIOS = collections.OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(cache: 'collections.OrderedDict[Hashable, Any]',
+               key: Hashable) -> Any:
+  with _CACHE_LOCK:
+    value = cache.get(key)
+    if value is not None:
+      cache.move_to_end(key)
+    return value
+
+
+def _cache_put(cache: 'collections.OrderedDict[Hashable, Any]',
+               key: Hashable, value: Any) -> None:
+  with _CACHE_LOCK:
+    cache[key] = value
+    while len(cache) > _MAX_CACHED_ENTRIES:
+      cache.popitem(last=False)
+
+
+def clear_tfxio_cache() -> None:
+  """Drops the resolved DataViews and the TFXIOs cached in this process.
+
+  Needed if a registered Examples artifact gets a different payload format or
+  DataView attached, or if the DataView at a given URI is rewritten.
+  """
+  with _CACHE_LOCK:
+    _RESOLVED_EXAMPLES.clear()
+    _TFXIOS.clear()
+
 
 def resolve_payload_format_and_data_view_uri(
     examples: List[artifact.Artifact]) -> Tuple[int, Optional[Text]]:
@@ -64,6 +107,22 @@ def resolve_payload_format_and_data_view_uri(
       have a DataView attached.
   """
   assert examples, 'At least one Examples artifact is needed.'
+  # Only artifacts registered in MLMD have an id identifying their properties.
+  cache_key = None
+  if all(e.id for e in examples):
+    cache_key = tuple((e.id, e.uri) for e in examples)
+    resolved = _cache_get(_RESOLVED_EXAMPLES, cache_key)
+    if resolved is not None:
+      return resolved
+  resolved = _resolve_payload_format_and_data_view_uri(examples)
+  if cache_key is not None:
+    _cache_put(_RESOLVED_EXAMPLES, cache_key, resolved)
+  return resolved
+
+
+def _resolve_payload_format_and_data_view_uri(
+    examples: List[artifact.Artifact]) -> Tuple[int, Optional[Text]]:
+  """Implements resolve_payload_format_and_data_view_uri without caching."""
   payload_format = _get_payload_format(examples)
 
   if payload_format != example_gen_pb2.PayloadFormat.FORMAT_PROTO:
@@ -246,11 +305,38 @@ def make_tfxio(file_pattern: OneOrMorePatterns,
       read_as_raw_records == True.
 
   Returns:
-    a TFXIO instance.
+    a TFXIO instance. TFXIOs are cached in the process, so the same instance
+    is returned for the same arguments until clear_tfxio_cache() is called.
   """
   if not isinstance(payload_format, int):
     payload_format = example_gen_pb2.PayloadFormat.Value(payload_format)
 
+  cache_key = (
+      file_pattern if isinstance(file_pattern, str) else tuple(file_pattern),
+      tuple(telemetry_descriptors or ()),
+      payload_format,
+      data_view_uri,
+      (schema.SerializeToString(deterministic=True)
+       if schema is not None else None),
+      read_as_raw_records,
+      raw_record_column_name)
+  result = _cache_get(_TFXIOS, cache_key)
+  if result is None:
+    result = _make_tfxio(file_pattern, telemetry_descriptors, payload_format,
+                         data_view_uri, schema, read_as_raw_records,
+                         raw_record_column_name)
+    _cache_put(_TFXIOS, cache_key, result)
+  return result
+
+
+def _make_tfxio(file_pattern: OneOrMorePatterns,
+                telemetry_descriptors: List[Text],
+                payload_format: int,
+                data_view_uri: Optional[Text],
+                schema: Optional[schema_pb2.Schema],
+                read_as_raw_records: bool,
+                raw_record_column_name: Optional[Text]) -> tfxio.TFXIO:
+  """Implements make_tfxio without caching."""
   if read_as_raw_records:
     assert raw_record_column_name is not None, (
         'read_as_raw_records is specified - '
@@ -284,6 +370,13 @@ def make_tfxio(file_pattern: OneOrMorePatterns,
         telemetry_descriptors=telemetry_descriptors,
         raw_record_column_name=raw_record_column_name)
 
+  if payload_format == example_gen_pb2.PayloadFormat.FORMAT_PARQUET:
+    return parquet_tfxio.ParquetTFXIO(
+        file_pattern=file_pattern,
+        schema=schema,
+        raw_record_column_name=raw_record_column_name,
+        telemetry_descriptors=telemetry_descriptors)
+
   raise NotImplementedError(
       'Unsupport payload format: {}'.format(payload_format))
 
@@ -28,6 +28,7 @@ import tensorflow as tf
 
 from tfx.components.experimental.data_view import constants
 from tfx.components.util import examples_utils
+from tfx.components.util import parquet_tfxio
 from tfx.components.util import tfxio_utils
 from tfx.proto import example_gen_pb2
 from tfx.types import standard_artifacts
@@ -64,6 +65,15 @@ _MAKE_TFXIO_TEST_CASES = [
         payload_format=example_gen_pb2.PayloadFormat.FORMAT_PROTO,
         provide_data_view_uri=True,
         expected_tfxio_type=record_to_tensor_tfxio.TFRecordToTensorTFXIO),
+    dict(
+        testcase_name='parquet',
+        payload_format=example_gen_pb2.PayloadFormat.FORMAT_PARQUET,
+        expected_tfxio_type=parquet_tfxio.ParquetTFXIO),
+    dict(
+        testcase_name='parquet_also_read_raw_records',
+        payload_format=example_gen_pb2.PayloadFormat.FORMAT_PARQUET,
+        raw_record_column_name=_RAW_RECORD_COLUMN_NAME,
+        expected_tfxio_type=parquet_tfxio.ParquetTFXIO),
     dict(
         testcase_name='tf_example_raw_record',
         payload_format=example_gen_pb2.PayloadFormat.FORMAT_TF_EXAMPLE,
@@ -153,6 +163,10 @@ class _SimpleTfGraphRecordDecoder(tf_graph_record_decoder.TFGraphRecordDecoder):
 
 class TfxioUtilsTest(tf.test.TestCase, parameterized.TestCase):
 
+  def setUp(self):
+    super(TfxioUtilsTest, self).setUp()
+    tfxio_utils.clear_tfxio_cache()
+
   @parameterized.named_parameters(*_MAKE_TFXIO_TEST_CASES)
   def test_make_tfxio(self, payload_format, expected_tfxio_type,
                       raw_record_column_name=None,
@@ -251,6 +265,64 @@ class TfxioUtilsTest(tf.test.TestCase, parameterized.TestCase):
           expected_error_type, expected_error_msg_regex):
         _ = tfxio_utils.resolve_payload_format_and_data_view_uri(examples)
 
+  def test_make_tfxio_is_cached(self):
+    tfxio = tfxio_utils.make_tfxio(
+        _FAKE_FILE_PATTERN, _TELEMETRY_DESCRIPTORS, 'FORMAT_TF_EXAMPLE',
+        schema=_SCHEMA)
+    self.assertIs(
+        tfxio,
+        tfxio_utils.make_tfxio(
+            _FAKE_FILE_PATTERN, _TELEMETRY_DESCRIPTORS,
+            example_gen_pb2.PayloadFormat.FORMAT_TF_EXAMPLE,
+            schema=schema_pb2.Schema.FromString(_SCHEMA.SerializeToString())))
+    self.assertIsNot(
+        tfxio,
+        tfxio_utils.make_tfxio(
+            _FAKE_FILE_PATTERN, _TELEMETRY_DESCRIPTORS, 'FORMAT_TF_EXAMPLE'))
+
+    tfxio_utils.clear_tfxio_cache()
+    self.assertIsNot(
+        tfxio,
+        tfxio_utils.make_tfxio(
+            _FAKE_FILE_PATTERN, _TELEMETRY_DESCRIPTORS, 'FORMAT_TF_EXAMPLE',
+            schema=_SCHEMA))
+
+  def test_resolve_payload_format_and_data_view_uri_is_cached(self):
+    examples = standard_artifacts.Examples()
+    examples.id = 1
+    examples_utils.set_payload_format(
+        examples, example_gen_pb2.PayloadFormat.FORMAT_PROTO)
+    examples.set_string_custom_property(
+        constants.DATA_VIEW_URI_PROPERTY_KEY, 'dataview1')
+    self.assertEqual(
+        (example_gen_pb2.PayloadFormat.FORMAT_PROTO, 'dataview1'),
+        tfxio_utils.resolve_payload_format_and_data_view_uri([examples]))
+
+    # The resolution of a registered artifact is reused until invalidated.
+    examples.set_string_custom_property(
+        constants.DATA_VIEW_URI_PROPERTY_KEY, 'dataview2')
+    self.assertEqual(
+        (example_gen_pb2.PayloadFormat.FORMAT_PROTO, 'dataview1'),
+        tfxio_utils.resolve_payload_format_and_data_view_uri([examples]))
+    tfxio_utils.clear_tfxio_cache()
+    self.assertEqual(
+        (example_gen_pb2.PayloadFormat.FORMAT_PROTO, 'dataview2'),
+        tfxio_utils.resolve_payload_format_and_data_view_uri([examples]))
+
+  def test_resolve_payload_format_and_data_view_uri_not_cached_without_id(
+      self):
+    examples = standard_artifacts.Examples()
+    examples_utils.set_payload_format(
+        examples, example_gen_pb2.PayloadFormat.FORMAT_PROTO)
+    examples.set_string_custom_property(
+        constants.DATA_VIEW_URI_PROPERTY_KEY, 'dataview1')
+    tfxio_utils.resolve_payload_format_and_data_view_uri([examples])
+    examples.set_string_custom_property(
+        constants.DATA_VIEW_URI_PROPERTY_KEY, 'dataview2')
+    self.assertEqual(
+        (example_gen_pb2.PayloadFormat.FORMAT_PROTO, 'dataview2'),
+        tfxio_utils.resolve_payload_format_and_data_view_uri([examples]))
+
   def test_get_tf_dataset_factory_from_artifact(self):
     examples = standard_artifacts.Examples()
     examples_utils.set_payload_format(
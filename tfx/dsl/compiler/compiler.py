@@ -12,12 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Compiles a TFX pipeline into a TFX DSL IR proto."""
+import collections
+import hashlib
 import json
+import os
 import re
+import threading
+import uuid
 
-from typing import cast, List, Mapping, Iterable
+from typing import Any, cast, Dict, List, Mapping, Iterable, Optional
 
+from absl import logging
 from tfx import types
+from tfx import version
 from tfx.components.common_nodes import importer_node
 from tfx.components.common_nodes import resolver_node as resolver_consts
 from tfx.dsl.compiler import compiler_utils
@@ -25,6 +32,7 @@ from tfx.dsl.compiler import constants
 from tfx.dsl.components.base import base_component
 from tfx.dsl.components.base import base_driver
 from tfx.dsl.components.base import base_node
+from tfx.dsl.io import fileio
 from tfx.orchestration import data_types
 from tfx.orchestration import data_types_utils
 from tfx.orchestration import pipeline
@@ -33,6 +41,35 @@ from tfx.proto.orchestration import pipeline_pb2
 from tfx.utils import json_utils
 from ml_metadata.proto import metadata_store_pb2
 
+# Maximum number of compiled nodes kept in `_COMPILED_NODE_CACHE`.
+_COMPILED_NODE_CACHE_MAX_SIZE = 4096
+
+# Environment variable with the default directory where `Compiler` persists the
+# nodes it compiles, so that they are reused by later processes.
+COMPILED_NODE_CACHE_DIR_ENV = "TFX_COMPILED_NODE_CACHE_DIR"
+
+
+class _CompiledNode(object):
+  """A compiled node along with its entries in the deployment config."""
+
+  def __init__(self, node_pb: pipeline_pb2.PipelineNode,
+               deployment_config: pipeline_pb2.IntermediateDeploymentConfig):
+    self.node_pb = node_pb
+    self.deployment_config = deployment_config
+
+
+# LRU cache of the nodes compiled by `Compiler`, by fingerprint of everything
+# their compilation depends on. See `Compiler._node_fingerprint`.
+_COMPILED_NODE_CACHE = collections.OrderedDict(
+)  # type: collections.OrderedDict[str, _CompiledNode]
+_compiled_node_cache_lock = threading.Lock()
+
+
+def clear_compiled_node_cache() -> None:
+  """Clears the nodes compiled by any `Compiler`."""
+  with _compiled_node_cache_lock:
+    _COMPILED_NODE_CACHE.clear()
+
 
 class _CompilerContext(object):
   """Encapsulates resources needed to compile a pipeline."""
@@ -70,6 +107,27 @@ class _CompilerContext(object):
 class Compiler(object):
   """Compiles a TFX pipeline or a component into a uDSL IR proto."""
 
+  def __init__(self,
+               use_node_cache: bool = True,
+               node_cache_dir: Optional[str] = None):
+    """Initializes the compiler.
+
+    Args:
+      use_node_cache: Whether to reuse the result of compiling a node whose
+        spec, executor spec and upstream channels are identical to those of a
+        node compiled earlier, instead of compiling it again.
+      node_cache_dir: Directory where compiled nodes are also persisted, so that
+        they are reused across processes, e.g. by every CLI invocation
+        compiling the same pipeline. Defaults to the value of the
+        `TFX_COMPILED_NODE_CACHE_DIR` environment variable. If neither is set,
+        compiled nodes are only reused within the process.
+    """
+    self._use_node_cache = use_node_cache
+    self._node_cache_dir = None
+    if use_node_cache:
+      self._node_cache_dir = (
+          node_cache_dir or os.environ.get(COMPILED_NODE_CACHE_DIR_ENV) or None)
+
   def _compile_importer_node_outputs(self, tfx_node: base_node.BaseNode,
                                      node_pb: pipeline_pb2.PipelineNode):
     """Compiles the outputs of an importer node."""
@@ -422,6 +480,133 @@ class Compiler(object):
           visit_queue.append(upstream_node)
     return result
 
+  def _compile_node_with_cache(
+      self, tfx_node: base_node.BaseNode, compile_context: _CompilerContext,
+      deployment_config: pipeline_pb2.IntermediateDeploymentConfig,
+      enable_cache: bool) -> pipeline_pb2.PipelineNode:
+    """Compiles a node, reusing an identical node compiled earlier if any.
+
+    Args:
+      tfx_node: A TFX node.
+      compile_context: Resources needed to compile the node.
+      deployment_config: Intermediate deployment config to set.
+      enable_cache: whether cache is enabled
+
+    Returns:
+      A PipelineNode proto that encodes information of the node. The proto may
+      be shared with other compilations and must not be modified.
+    """
+    fingerprint = None
+    if self._use_node_cache:
+      fingerprint = self._node_fingerprint(tfx_node, compile_context,
+                                           enable_cache)
+    if fingerprint is None:
+      return self._compile_node(tfx_node, compile_context, deployment_config,
+                                enable_cache)
+
+    with _compiled_node_cache_lock:
+      compiled_node = _COMPILED_NODE_CACHE.get(fingerprint)
+      if compiled_node is not None:
+        _COMPILED_NODE_CACHE.move_to_end(fingerprint)
+    if compiled_node is None:
+      compiled_node = self._load_compiled_node(fingerprint)
+      if compiled_node is None:
+        node_deployment_config = pipeline_pb2.IntermediateDeploymentConfig()
+        node_pb = self._compile_node(tfx_node, compile_context,
+                                     node_deployment_config, enable_cache)
+        compiled_node = _CompiledNode(node_pb, node_deployment_config)
+        self._save_compiled_node(fingerprint, compiled_node)
+      with _compiled_node_cache_lock:
+        _COMPILED_NODE_CACHE[fingerprint] = compiled_node
+        while len(_COMPILED_NODE_CACHE) > _COMPILED_NODE_CACHE_MAX_SIZE:
+          _COMPILED_NODE_CACHE.popitem(last=False)
+    # The deployment config of a node only has entries keyed by the node id.
+    deployment_config.MergeFrom(compiled_node.deployment_config)
+    return compiled_node.node_pb
+
+  def _compiled_node_path(self, fingerprint: str) -> str:
+    return os.path.join(self._node_cache_dir, fingerprint + ".pb")
+
+  def _load_compiled_node(self, fingerprint: str) -> Optional[_CompiledNode]:
+    """Loads a node persisted in the node cache directory, if any."""
+    if self._node_cache_dir is None:
+      return None
+    path = self._compiled_node_path(fingerprint)
+    try:
+      if not fileio.exists(path):
+        return None
+      with fileio.open(path, "rb") as f:
+        cached_pb = pipeline_pb2.Pipeline.FromString(f.read())
+      node_deployment_config = pipeline_pb2.IntermediateDeploymentConfig()
+      cached_pb.deployment_config.Unpack(node_deployment_config)
+      return _CompiledNode(cached_pb.nodes[0].pipeline_node,
+                           node_deployment_config)
+    except Exception as e:  # pylint: disable=broad-except
+      # The node is compiled again if its cached file can't be read.
+      logging.warning("Unable to load compiled node from %s: %s", path, e)
+      return None
+
+  def _save_compiled_node(self, fingerprint: str,
+                          compiled_node: _CompiledNode) -> None:
+    """Persists a compiled node in the node cache directory, if any."""
+    if self._node_cache_dir is None:
+      return
+    # A pipeline with a single node holds the node and its deployment config.
+    cached_pb = pipeline_pb2.Pipeline()
+    cached_pb.nodes.add().pipeline_node.CopyFrom(compiled_node.node_pb)
+    cached_pb.deployment_config.Pack(compiled_node.deployment_config)
+    path = self._compiled_node_path(fingerprint)
+    # Written to a temporary file first, so that concurrent compilations never
+    # read a partially written node.
+    tmp_path = "{}.{}.tmp".format(path, uuid.uuid4().hex)
+    try:
+      fileio.makedirs(self._node_cache_dir)
+      with fileio.open(tmp_path, "wb") as f:
+        f.write(cached_pb.SerializeToString())
+      fileio.rename(tmp_path, path, overwrite=True)
+    except Exception as e:  # pylint: disable=broad-except
+      logging.warning("Unable to save compiled node to %s: %s", path, e)
+
+  def _node_fingerprint(self, tfx_node: base_node.BaseNode,
+                        compile_context: _CompilerContext,
+                        enable_cache: bool) -> Optional[str]:
+    """Fingerprints everything the compilation of a node depends on.
+
+    Args:
+      tfx_node: A TFX node.
+      compile_context: Resources needed to compile the node.
+      enable_cache: whether cache is enabled
+
+    Returns:
+      The fingerprint, or `None` if the node has properties which can't be
+      serialized, in which case its compilation is not cached.
+    """
+    spec = {
+        # Nodes persisted by another TFX version may be compiled differently.
+        "tfx_version": version.__version__,
+        "pipeline_context_name":
+            compile_context.pipeline_info.pipeline_context_name,
+        "execution_mode": compile_context.execution_mode,
+        "enable_cache": enable_cache,
+        "node": _node_spec(tfx_node),
+    }
+    if compile_context.is_async_mode:
+      # Upstream resolver nodes are compiled into the resolver config.
+      spec["upstream_resolver_nodes"] = [
+          _node_spec(node) for node in compile_context.topologically_sorted(
+              self._get_upstream_resolver_nodes(tfx_node))
+      ]
+    else:
+      spec["upstream_nodes"] = sorted(
+          node.id for node in tfx_node.upstream_nodes)
+      spec["downstream_nodes"] = sorted(
+          node.id for node in tfx_node.downstream_nodes)
+    try:
+      serialized_spec = json_utils.dumps(spec)
+    except (TypeError, ValueError):
+      return None
+    return hashlib.sha256(serialized_spec.encode("utf-8")).hexdigest()
+
   def compile(self, tfx_pipeline: pipeline.Pipeline) -> pipeline_pb2.Pipeline:
     """Compiles a tfx pipeline into uDSL proto.
 
@@ -455,8 +640,8 @@ class Compiler(object):
       # ResolverConfig
       if compiler_utils.is_resolver(node) and context.is_async_mode:
         continue
-      node_pb = self._compile_node(node, context, deployment_config,
-                                   tfx_pipeline.enable_cache)
+      node_pb = self._compile_node_with_cache(node, context, deployment_config,
+                                              tfx_pipeline.enable_cache)
       pipeline_or_node = pipeline_pb.PipelineOrNode()
       pipeline_or_node.pipeline_node.CopyFrom(node_pb)
       # TODO(b/158713812): Support sub-pipeline.
@@ -470,6 +655,41 @@ class Compiler(object):
     return pipeline_pb
 
 
+def _channel_spec(channel: types.Channel) -> Dict[str, Any]:
+  """Returns the parts of a channel the compilation of a node depends on."""
+  return {
+      "producer_component_id": channel.producer_component_id,
+      "output_key": channel.output_key,
+      "type": channel.type._get_artifact_type(),  # pylint: disable=protected-access
+      "additional_properties": channel.additional_properties,
+      "additional_custom_properties": channel.additional_custom_properties,
+  }
+
+
+def _node_spec(tfx_node: base_node.BaseNode) -> Dict[str, Any]:
+  """Returns the parts of a node its compilation depends on."""
+  spec = {
+      "class": type(tfx_node),
+      "type": tfx_node.type,
+      "id": tfx_node.id,
+      "inputs": {
+          key: _channel_spec(channel)
+          for key, channel in tfx_node.inputs.items()
+      },
+      "outputs": {
+          key: _channel_spec(channel)
+          for key, channel in tfx_node.outputs.items()
+      },
+      "exec_properties": dict(tfx_node.exec_properties),
+  }
+  if isinstance(tfx_node, base_component.BaseComponent):
+    spec["executor_spec"] = tfx_node.executor_spec.encode(
+        component_spec=tfx_node.spec)
+    spec["driver_class"] = tfx_node.driver_class
+    spec["platform_config"] = tfx_node.platform_config
+  return spec
+
+
 def _iterate_resolver_cls_and_config(resolver_node: base_node.BaseNode):
   """Iterates through resolver class and configs that are bind to the node."""
   assert compiler_utils.is_resolver(resolver_node)
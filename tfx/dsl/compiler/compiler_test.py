@@ -15,6 +15,7 @@
 import os
 
 from absl.testing import parameterized
+import mock
 
 import tensorflow as tf
 from tfx.dsl.compiler import compiler
@@ -36,6 +37,7 @@ class CompilerTest(tf.test.TestCase, parameterized.TestCase):
     super(CompilerTest, self).setUp()
     # pylint: disable=g-bad-name
     self.maxDiff = 80 * 1000  # Let's hear what assertEqual has to say.
+    compiler.clear_compiled_node_cache()
 
   def _get_test_pipeline_definition(self, module) -> pipeline.Pipeline:
     """Gets the pipeline definition from module."""
@@ -63,6 +65,81 @@ class CompilerTest(tf.test.TestCase, parameterized.TestCase):
     expected_pb = self._get_test_pipeline_pb(expected_result_path)
     self.assertProtoEquals(expected_pb, compiled_pb)
 
+  @parameterized.named_parameters(
+      ("sync_pipeline", iris_pipeline_sync, "iris_pipeline_sync_ir.pbtxt"),
+      ("async_pipeline", iris_pipeline_async, "iris_pipeline_async_ir.pbtxt"))
+  def testCompileReusesCompiledNodes(self, pipeline_module,
+                                     expected_result_path):
+    dsl_compiler = compiler.Compiler()
+    dsl_compiler.compile(self._get_test_pipeline_definition(pipeline_module))
+
+    test_pipeline = self._get_test_pipeline_definition(pipeline_module)
+    with mock.patch.object(
+        dsl_compiler, "_compile_node",
+        wraps=dsl_compiler._compile_node) as mock_compile_node:
+      compiled_pb = dsl_compiler.compile(test_pipeline)
+    mock_compile_node.assert_not_called()
+    expected_pb = self._get_test_pipeline_pb(expected_result_path)
+    self.assertProtoEquals(expected_pb, compiled_pb)
+
+  @parameterized.named_parameters(
+      ("sync_pipeline", iris_pipeline_sync, "iris_pipeline_sync_ir.pbtxt"),
+      ("async_pipeline", iris_pipeline_async, "iris_pipeline_async_ir.pbtxt"))
+  def testCompileReusesPersistedNodes(self, pipeline_module,
+                                      expected_result_path):
+    node_cache_dir = os.path.join(self.get_temp_dir(), self._testMethodName)
+    compiler.Compiler(node_cache_dir=node_cache_dir).compile(
+        self._get_test_pipeline_definition(pipeline_module))
+    self.assertNotEmpty(os.listdir(node_cache_dir))
+
+    # As in a new process, compiling the same pipeline only reads the nodes
+    # persisted by the previous compilation.
+    compiler.clear_compiled_node_cache()
+    dsl_compiler = compiler.Compiler(node_cache_dir=node_cache_dir)
+    with mock.patch.object(
+        dsl_compiler, "_compile_node",
+        wraps=dsl_compiler._compile_node) as mock_compile_node:
+      compiled_pb = dsl_compiler.compile(
+          self._get_test_pipeline_definition(pipeline_module))
+    mock_compile_node.assert_not_called()
+    expected_pb = self._get_test_pipeline_pb(expected_result_path)
+    self.assertProtoEquals(expected_pb, compiled_pb)
+
+  def testCompileRecompilesChangedNodes(self):
+    dsl_compiler = compiler.Compiler()
+    dsl_compiler.compile(
+        self._get_test_pipeline_definition(iris_pipeline_sync))
+
+    test_pipeline = self._get_test_pipeline_definition(iris_pipeline_sync)
+    trainer = next(c for c in test_pipeline.components if c.id == "Trainer")
+    trainer.exec_properties["module_file"] = "/path/to/other_module.py"
+    with mock.patch.object(
+        dsl_compiler, "_compile_node",
+        wraps=dsl_compiler._compile_node) as mock_compile_node:
+      compiled_pb = dsl_compiler.compile(test_pipeline)
+    self.assertEqual(["Trainer"], [
+        call_args[0][0].id for call_args in mock_compile_node.call_args_list
+    ])
+    trainer_pb = next(n.pipeline_node for n in compiled_pb.nodes
+                      if n.pipeline_node.node_info.id == "Trainer")
+    self.assertEqual(
+        "/path/to/other_module.py",
+        trainer_pb.parameters.parameters["module_file"].field_value
+        .string_value)
+
+  def testCompileWithoutNodeCache(self):
+    dsl_compiler = compiler.Compiler(use_node_cache=False)
+    dsl_compiler.compile(
+        self._get_test_pipeline_definition(iris_pipeline_sync))
+
+    test_pipeline = self._get_test_pipeline_definition(iris_pipeline_sync)
+    with mock.patch.object(
+        dsl_compiler, "_compile_node",
+        wraps=dsl_compiler._compile_node) as mock_compile_node:
+      dsl_compiler.compile(test_pipeline)
+    self.assertLen(mock_compile_node.call_args_list,
+                   len(test_pipeline.components))
+
   def testCompileAdditionalPropertyTypeError(self):
     dsl_compiler = compiler.Compiler()
     test_pipeline = self._get_test_pipeline_definition(
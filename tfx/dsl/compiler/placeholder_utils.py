@@ -14,7 +14,9 @@
 """Utilities to evaluate and resolve Placeholders."""
 
 import base64
+import collections
 import re
+import threading
 from typing import Any, Callable, Dict, Union
 
 from absl import logging
@@ -107,117 +109,198 @@ def resolve_placeholder_expression(
   return result
 
 
-# Dictionary of registered placeholder operators,
-# maps from operator proto type names to actual operator functions.
-_PLACEHOLDER_OPERATORS: Dict[str, Callable[..., Any]] = {}
+# A placeholder expression compiled into a closure. Given an _ExpressionResolver
+# holding the values of an execution, returns the value of the expression.
+_CompiledExpression = Callable[["_ExpressionResolver"], Any]
+
+# Dictionary of registered placeholder operators, maps from operator proto type
+# names to functions compiling an operator proto into a _CompiledExpression.
+_PLACEHOLDER_OPERATORS: Dict[str, Callable[[Any], _CompiledExpression]] = {}
+
+# Maximum number of compiled expressions kept in _COMPILED_EXPRESSIONS.
+_MAX_COMPILED_EXPRESSIONS = 4096
+
+# Compiled expressions keyed by the serialized expression proto, in LRU order.
+_COMPILED_EXPRESSIONS: "collections.OrderedDict[bytes, _CompiledExpression]" = (
+    collections.OrderedDict())
+_COMPILED_EXPRESSIONS_LOCK = threading.Lock()
 
 
 def _register(op_proto):
   """Decorator function for registering operators. Internal in this module."""
 
-  def decorator(op: Callable[..., Any]):
+  def decorator(op: Callable[[Any], _CompiledExpression]):
     _PLACEHOLDER_OPERATORS[op_proto.DESCRIPTOR.name] = op
     return op
 
   return decorator
 
 
+def compile_placeholder_expression(
+    expression: placeholder_pb2.PlaceholderExpression) -> _CompiledExpression:
+  """Compiles a placeholder expression, reusing previously compiled ones.
+
+  Compiled expressions are cached by their serialized proto, so an expression
+  used by every execution of a node is only compiled once per process.
+
+  Args:
+    expression: A placeholder expression to be compiled.
+
+  Returns:
+    The compiled expression.
+  """
+  fingerprint = expression.SerializeToString(deterministic=True)
+  with _COMPILED_EXPRESSIONS_LOCK:
+    compiled = _COMPILED_EXPRESSIONS.get(fingerprint)
+    if compiled is not None:
+      _COMPILED_EXPRESSIONS.move_to_end(fingerprint)
+      return compiled
+  # Compile a private copy, as the compiled closures keep references to the
+  # protos they were compiled from.
+  compiled = _compile_expression(
+      placeholder_pb2.PlaceholderExpression.FromString(fingerprint))
+  with _COMPILED_EXPRESSIONS_LOCK:
+    _COMPILED_EXPRESSIONS[fingerprint] = compiled
+    while len(_COMPILED_EXPRESSIONS) > _MAX_COMPILED_EXPRESSIONS:
+      _COMPILED_EXPRESSIONS.popitem(last=False)
+  return compiled
+
+
+def clear_compiled_expression_cache() -> None:
+  """Drops all compiled expressions cached by compile_placeholder_expression."""
+  with _COMPILED_EXPRESSIONS_LOCK:
+    _COMPILED_EXPRESSIONS.clear()
+
+
+def _compile_expression(
+    expression: placeholder_pb2.PlaceholderExpression) -> _CompiledExpression:
+  """Recursively compiles a placeholder expression."""
+  if expression.HasField("value"):
+    value = getattr(expression.value, expression.value.WhichOneof("value"))
+    return lambda resolver: value
+  elif expression.HasField("placeholder"):
+    return _compile_placeholder(expression.placeholder)
+  elif expression.HasField("operator"):
+    return _compile_placeholder_operator(expression.operator)
+  else:
+    raise ValueError("Unexpected placeholder expression type: "
+                     f"{expression.WhichOneof('expression_type')}.")
+
+
+def _compile_placeholder(
+    placeholder: placeholder_pb2.Placeholder) -> _CompiledExpression:
+  """Compiles a placeholder, which is looked up in the resolver."""
+  placeholder_type = placeholder.type
+  # Handle the special case of EXEC_INVOCATION placeholders, which don't take
+  # a key.
+  if placeholder_type == placeholder_pb2.Placeholder.Type.EXEC_INVOCATION:
+    return lambda resolver: resolver.get_resolution_value(placeholder_type)
+
+  key = placeholder.key
+
+  def resolve(resolver: _ExpressionResolver) -> Any:
+    context = resolver.get_resolution_value(placeholder_type)
+    # Handle remaining placeholder types.
+    try:
+      return context[key]
+    except KeyError as e:
+      # Handle placeholders that access a missing optional channel or exec
+      # property. In both cases the requested key will not be present in the
+      # context. However this means we cannot distinguish between a correct
+      # placeholder with an optional value vs. an incorrect placeholder.
+      # TODO(b/172001324): Handle this at compile time.
+      raise NullDereferenceError(placeholder)
+
+  return resolve
+
+
+def _compile_placeholder_operator(
+    placeholder_operator: placeholder_pb2.PlaceholderExpressionOperator
+) -> _CompiledExpression:
+  """Compiles a placeholder operator with its registered operator compiler."""
+  operator_name = placeholder_operator.WhichOneof("operator_type")
+  operator_pb = getattr(placeholder_operator, operator_name)
+  try:
+    operator_fn = _PLACEHOLDER_OPERATORS[operator_pb.DESCRIPTOR.name]
+  except KeyError as e:
+    raise KeyError(
+        f"Unsupported placeholder operator: {operator_pb.DESCRIPTOR.name}."
+    ) from e
+  return operator_fn(operator_pb)
+
+
 class _ExpressionResolver:
   """Utility class to resolve Placeholder expressions.
 
   Placeholder expression is defined as a proto structure
   placeholder_pb2.PlaceholderExpression. It can be resolved with
   ResolutionContext to a concrete value.
+
+  Values of the placeholders are only computed when an expression uses them,
+  and at most once per resolver.
   """
 
   def __init__(self, context: ResolutionContext):
-    self._resolution_values = {
-        placeholder_pb2.Placeholder.Type.INPUT_ARTIFACT:
-            context.exec_info.input_dict,
-        placeholder_pb2.Placeholder.Type.OUTPUT_ARTIFACT:
-            context.exec_info.output_dict,
-        placeholder_pb2.Placeholder.Type.EXEC_PROPERTY:
-            context.exec_info.exec_properties,
-        placeholder_pb2.Placeholder.Type.RUNTIME_INFO: {
-            ph.RuntimeInfoKey.EXECUTOR_SPEC.value: context.executor_spec,
-            ph.RuntimeInfoKey.PLATFORM_CONFIG.value: context.platform_config,
-        },
-        placeholder_pb2.Placeholder.Type.EXEC_INVOCATION:
-            context.exec_info.to_proto(),
-    }
+    self._context = context
+    self._exec_invocation = None
+
+  def get_resolution_value(self, placeholder_type: int) -> Any:
+    """Returns the value a placeholder of the given type is looked up in."""
+    exec_info = self._context.exec_info
+    if placeholder_type == placeholder_pb2.Placeholder.Type.INPUT_ARTIFACT:
+      return exec_info.input_dict
+    if placeholder_type == placeholder_pb2.Placeholder.Type.OUTPUT_ARTIFACT:
+      return exec_info.output_dict
+    if placeholder_type == placeholder_pb2.Placeholder.Type.EXEC_PROPERTY:
+      return exec_info.exec_properties
+    if placeholder_type == placeholder_pb2.Placeholder.Type.RUNTIME_INFO:
+      return {
+          ph.RuntimeInfoKey.EXECUTOR_SPEC.value: self._context.executor_spec,
+          ph.RuntimeInfoKey.PLATFORM_CONFIG.value:
+              self._context.platform_config,
+      }
+    if placeholder_type == placeholder_pb2.Placeholder.Type.EXEC_INVOCATION:
+      if self._exec_invocation is None:
+        self._exec_invocation = exec_info.to_proto()
+      return self._exec_invocation
+    raise KeyError(f"Unsupported placeholder type: {placeholder_type}.")
 
   def resolve(self, expression: placeholder_pb2.PlaceholderExpression) -> Any:
-    """Recursively evaluates a placeholder expression."""
-    if expression.HasField("value"):
-      return getattr(expression.value, expression.value.WhichOneof("value"))
-    elif expression.HasField("placeholder"):
-      return self._resolve_placeholder(expression.placeholder)
-    elif expression.HasField("operator"):
-      return self._resolve_placeholder_operator(expression.operator)
-    else:
-      raise ValueError("Unexpected placeholder expression type: "
-                       f"{expression.WhichOneof('expression_type')}.")
+    """Evaluates a placeholder expression."""
+    return compile_placeholder_expression(expression)(self)
 
-  def _resolve_placeholder(self,
-                           placeholder: placeholder_pb2.Placeholder) -> Any:
-    """Evaluates a placeholder using the contexts."""
-    try:
-      context = self._resolution_values[placeholder.type]
-    except KeyError as e:
-      raise KeyError(
-          f"Unsupported placeholder type: {placeholder.type}.") from e
 
-    # Handle the special case of EXEC_INVOCATION placeholders, which don't take
-    # a key.
-    if placeholder.type == placeholder_pb2.Placeholder.Type.EXEC_INVOCATION:
-      return context
+@_register(placeholder_pb2.ArtifactUriOperator)
+def _compile_artifact_uri_operator(
+    op: placeholder_pb2.ArtifactUriOperator) -> _CompiledExpression:
+  """Compiles the artifact URI operator."""
+  sub_expression = _compile_expression(op.expression)
+  split = op.split
 
-    # Handle remaining placeholder types.
-    try:
-      return context[placeholder.key]
-    except KeyError as e:
-      # Handle placeholders that access a missing optional channel or exec
-      # property. In both cases the requested key will not be present in the
-      # context. However this means we cannot distinguish between a correct
-      # placeholder with an optional value vs. an incorrect placeholder.
-      # TODO(b/172001324): Handle this at compile time.
-      raise NullDereferenceError(placeholder)
-
-  def _resolve_placeholder_operator(
-      self, placeholder_operator: placeholder_pb2.PlaceholderExpressionOperator
-  ) -> Any:
-    """Evaluates a placeholder operator by dispatching to the operator methods."""
-    operator_name = placeholder_operator.WhichOneof("operator_type")
-    operator_pb = getattr(placeholder_operator, operator_name)
-    try:
-      operator_fn = _PLACEHOLDER_OPERATORS[operator_pb.DESCRIPTOR.name]
-    except KeyError as e:
-      raise KeyError(
-          f"Unsupported placeholder operator: {operator_pb.DESCRIPTOR.name}."
-      ) from e
-    return operator_fn(self, operator_pb)
-
-  @_register(placeholder_pb2.ArtifactUriOperator)
-  def _resolve_artifact_uri_operator(
-      self, op: placeholder_pb2.ArtifactUriOperator) -> str:
-    """Evaluates the artifact URI operator."""
-    resolved_artifact = self.resolve(op.expression)
+  def resolve(resolver: _ExpressionResolver) -> str:
+    resolved_artifact = sub_expression(resolver)
     if resolved_artifact is None:
       raise NullDereferenceError(op.expression)
     if not isinstance(resolved_artifact, artifact.Artifact):
       raise ValueError("ArtifactUriOperator expects the expression "
                        "to evaluate to an artifact. "
                        f"Got {type(resolved_artifact)}")
-    if op.split:
-      return artifact_utils.get_split_uri([resolved_artifact], op.split)
+    if split:
+      return artifact_utils.get_split_uri([resolved_artifact], split)
     else:
       return resolved_artifact.uri
 
-  @_register(placeholder_pb2.ArtifactValueOperator)
-  def _resolve_artifact_value_operator(
-      self, op: placeholder_pb2.ArtifactValueOperator) -> str:
-    """Evaluates the artifact value operator."""
-    resolved_artifact = self.resolve(op.expression)
+  return resolve
+
+
+@_register(placeholder_pb2.ArtifactValueOperator)
+def _compile_artifact_value_operator(
+    op: placeholder_pb2.ArtifactValueOperator) -> _CompiledExpression:
+  """Compiles the artifact value operator."""
+  sub_expression = _compile_expression(op.expression)
+
+  def resolve(resolver: _ExpressionResolver) -> str:
+    resolved_artifact = sub_expression(resolver)
     if resolved_artifact is None:
       raise NullDereferenceError(op.expression)
     if not isinstance(resolved_artifact, value_artifact.ValueArtifact):
@@ -226,34 +309,55 @@ class _ExpressionResolver:
                        f"Got {type(resolved_artifact)}")
     return resolved_artifact.read()
 
-  @_register(placeholder_pb2.ConcatOperator)
-  def _resolve_concat_operator(self, op: placeholder_pb2.ConcatOperator) -> str:
-    """Evaluates the concat operator."""
+  return resolve
+
+
+@_register(placeholder_pb2.ConcatOperator)
+def _compile_concat_operator(
+    op: placeholder_pb2.ConcatOperator) -> _CompiledExpression:
+  """Compiles the concat operator."""
+  sub_expressions = [(e, _compile_expression(e)) for e in op.expressions]
+
+  def resolve(resolver: _ExpressionResolver) -> str:
     parts = []
-    for e in op.expressions:
-      value = self.resolve(e)
+    for e, sub_expression in sub_expressions:
+      value = sub_expression(resolver)
       if value is None:
         raise NullDereferenceError(e)
       parts.append(value)
     return "".join(str(part) for part in parts)
 
-  @_register(placeholder_pb2.IndexOperator)
-  def _resolve_index_operator(self, op: placeholder_pb2.IndexOperator) -> Any:
-    """Evaluates the index operator."""
-    value = self.resolve(op.expression)
+  return resolve
+
+
+@_register(placeholder_pb2.IndexOperator)
+def _compile_index_operator(
+    op: placeholder_pb2.IndexOperator) -> _CompiledExpression:
+  """Compiles the index operator."""
+  sub_expression = _compile_expression(op.expression)
+  index = op.index
+
+  def resolve(resolver: _ExpressionResolver) -> Any:
+    value = sub_expression(resolver)
     if value is None or not value:
       raise NullDereferenceError(op.expression)
     try:
-      return value[op.index]
+      return value[index]
     except (TypeError, IndexError) as e:
       raise ValueError(
-          f"IndexOperator failed to access the given index {op.index}.") from e
+          f"IndexOperator failed to access the given index {index}.") from e
+
+  return resolve
+
 
-  @_register(placeholder_pb2.Base64EncodeOperator)
-  def _resolve_base64_encode_operator(
-      self, op: placeholder_pb2.Base64EncodeOperator) -> str:
-    """Evaluates the Base64 encode operator."""
-    value = self.resolve(op.expression)
+@_register(placeholder_pb2.Base64EncodeOperator)
+def _compile_base64_encode_operator(
+    op: placeholder_pb2.Base64EncodeOperator) -> _CompiledExpression:
+  """Compiles the Base64 encode operator."""
+  sub_expression = _compile_expression(op.expression)
+
+  def resolve(resolver: _ExpressionResolver) -> str:
+    value = sub_expression(resolver)
     if value is None:
       raise NullDereferenceError(op.expression)
     if isinstance(value, str):
@@ -264,26 +368,88 @@ class _ExpressionResolver:
       raise ValueError(
           f"Failed to Base64 encode {value} of type {type(value)}.")
 
-  @_register(placeholder_pb2.ProtoOperator)
-  def _resolve_proto_operator(
-      self,
-      op: placeholder_pb2.ProtoOperator) -> Union[int, float, str, bool, bytes]:
-    """Evaluates the proto operator."""
-    raw_message = self.resolve(op.expression)
-    if raw_message is None:
-      raise NullDereferenceError(op.expression)
+  return resolve
 
-    if isinstance(raw_message, str):
-      # We need descriptor pool to parse encoded raw messages.
-      pool = descriptor_pool.Default()
+
+def _compile_proto_field_access(field: str) -> Callable[[Any], Any]:
+  """Compiles one step of a proto field path into an accessor function."""
+  if field.startswith("."):
+    attribute = field[1:]
+
+    def get_attribute(value: Any) -> Any:
+      try:
+        return getattr(value, attribute)
+      except AttributeError:
+        raise ValueError("While evaluting placeholder proto operator, "
+                         f"got unknown proto field {field}.")
+
+    return get_attribute
+
+  map_key = re.findall(r"\[['\"](.+)['\"]\]", field)
+  if len(map_key) == 1:
+    key = map_key[0]
+
+    def get_map_value(value: Any) -> Any:
+      try:
+        return value[key]
+      except KeyError:
+        raise ValueError("While evaluting placeholder proto operator, "
+                         f"got unknown map field {field}.")
+
+    return get_map_value
+
+  index = re.findall(r"\[(\d+)\]", field)
+  if index and str.isdecimal(index[0]):
+    position = int(index[0])
+
+    def get_element(value: Any) -> Any:
+      try:
+        return value[position]
+      except IndexError:
+        raise ValueError("While evaluting placeholder proto operator, "
+                         f"got unknown index field {field}.")
+
+    return get_element
+
+  def unsupported(value: Any) -> Any:
+    raise ValueError(f"Got unsupported proto field path: {field}")
+
+  return unsupported
+
+
+@_register(placeholder_pb2.ProtoOperator)
+def _compile_proto_operator(
+    op: placeholder_pb2.ProtoOperator) -> _CompiledExpression:
+  """Compiles the proto operator."""
+  sub_expression = _compile_expression(op.expression)
+  field_accessors = [_compile_proto_field_access(field)
+                     for field in op.proto_field_path]
+  # The message type of encoded raw messages, which is only looked up in the
+  # descriptor pool when a raw message is first resolved.
+  message_types = []
+
+  def parse_raw_message(raw_message: str) -> message.Message:
+    # We need descriptor pool to parse encoded raw messages.
+    pool = descriptor_pool.Default()
+    if not message_types:
       for file_descriptor in op.proto_schema.file_descriptors.file:
         pool.Add(file_descriptor)
       message_descriptor = pool.FindMessageTypeByName(
           op.proto_schema.message_type)
       factory = message_factory.MessageFactory(pool)
-      message_type = factory.GetPrototype(message_descriptor)
-      value = message_type()
-      json_format.Parse(raw_message, value, descriptor_pool=pool)
+      message_types.append(factory.GetPrototype(message_descriptor))
+    value = message_types[0]()
+    json_format.Parse(raw_message, value, descriptor_pool=pool)
+    return value
+
+  def resolve(
+      resolver: _ExpressionResolver) -> Union[int, float, str, bool, bytes]:
+    raw_message = sub_expression(resolver)
+    if raw_message is None:
+      raise NullDereferenceError(op.expression)
+
+    if isinstance(raw_message, str):
+      value = parse_raw_message(raw_message)
     elif isinstance(raw_message, message.Message):
       # Message such as platform config should not be encoded.
       value = raw_message
@@ -292,32 +458,8 @@ class _ExpressionResolver:
           f"Got unsupported value type for proto operator: {type(raw_message)}."
       )
 
-    if op.proto_field_path:
-      for field in op.proto_field_path:
-        if field.startswith("."):
-          try:
-            value = getattr(value, field[1:])
-          except AttributeError:
-            raise ValueError("While evaluting placeholder proto operator, "
-                             f"got unknown proto field {field}.")
-          continue
-        map_key = re.findall(r"\[['\"](.+)['\"]\]", field)
-        if len(map_key) == 1:
-          try:
-            value = value[map_key[0]]
-          except KeyError:
-            raise ValueError("While evaluting placeholder proto operator, "
-                             f"got unknown map field {field}.")
-          continue
-        index = re.findall(r"\[(\d+)\]", field)
-        if index and str.isdecimal(index[0]):
-          try:
-            value = value[int(index[0])]
-          except IndexError:
-            raise ValueError("While evaluting placeholder proto operator, "
-                             f"got unknown index field {field}.")
-          continue
-        raise ValueError(f"Got unsupported proto field path: {field}")
+    for field_accessor in field_accessors:
+      value = field_accessor(value)
 
     # Non-message primitive values are returned directly.
     if isinstance(value, (int, float, str, bool, bytes)):
@@ -341,6 +483,8 @@ class _ExpressionResolver:
         "Proto operator resolves to a proto message value. A serialization "
         "format is needed to render it.")
 
+  return resolve
+
 
 def debug_str(expression: placeholder_pb2.PlaceholderExpression) -> str:
   """Gets the debug string of a placeholder expression proto.
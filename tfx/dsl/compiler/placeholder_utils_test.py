@@ -15,6 +15,7 @@
 """Tests for tfx.dsl.compiler.placeholder_utils."""
 
 import base64
+import mock
 import tensorflow as tf
 from tfx.dsl.compiler import placeholder_utils
 from tfx.orchestration.portable import data_types
@@ -632,6 +633,36 @@ class PlaceholderUtilsTest(tf.test.TestCase):
     expected_binary_str = self._serving_spec.SerializeToString().decode()
     self._assert_serialized_proto_b64encode_eq("BINARY", expected_binary_str)
 
+  def testCompiledExpressionIsCached(self):
+    placeholder_utils.clear_compiled_expression_cache()
+    pb = text_format.Parse(_CONCAT_SPLIT_URI_EXPRESSION,
+                           placeholder_pb2.PlaceholderExpression())
+    compiled = placeholder_utils.compile_placeholder_expression(pb)
+    self.assertIs(
+        compiled,
+        placeholder_utils.compile_placeholder_expression(
+            text_format.Parse(_CONCAT_SPLIT_URI_EXPRESSION,
+                              placeholder_pb2.PlaceholderExpression())))
+    # Mutating the expression after compilation does not affect the compiled
+    # expression.
+    pb.operator.concat_op.expressions[1].value.string_value = "-"
+    self.assertEqual(
+        compiled(placeholder_utils._ExpressionResolver(
+            self._resolution_context)), "/tmp/train/1")
+    self.assertEqual(
+        placeholder_utils.resolve_placeholder_expression(
+            pb, self._resolution_context), "/tmp/train-1")
+
+  def testExecInvocationIsBuiltLazily(self):
+    pb = text_format.Parse(_CONCAT_SPLIT_URI_EXPRESSION,
+                           placeholder_pb2.PlaceholderExpression())
+    with mock.patch.object(
+        data_types.ExecutionInfo, "to_proto",
+        side_effect=AssertionError("to_proto should not be called")):
+      self.assertEqual(
+          placeholder_utils.resolve_placeholder_expression(
+              pb, self._resolution_context), "/tmp/train/1")
+
   def testDebugPlaceholder(self):
     pb = text_format.Parse(_CONCAT_SPLIT_URI_EXPRESSION,
                            placeholder_pb2.PlaceholderExpression())
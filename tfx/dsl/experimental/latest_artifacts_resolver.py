@@ -18,6 +18,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import itertools
 from typing import Dict, List, Optional, Text
 
 from tfx import types
@@ -58,11 +59,14 @@ class LatestArtifactsResolver(base_resolver.BaseResolver):
 
     candidate_dict = {}
     for k, c in source_channels.items():
-      candidate_artifacts = metadata_handler.get_qualified_artifacts(
-          contexts=[pipeline_context],
-          type_name=c.type_name,
-          producer_component_id=c.producer_component_id,
-          output_key=c.output_key)
+      # Candidates are iterated newest first, so only the artifacts which are
+      # returned are fetched and deserialized.
+      candidate_artifacts = itertools.islice(
+          metadata_handler.iter_qualified_artifacts_newest_first(
+              contexts=[pipeline_context],
+              type_name=c.type_name,
+              producer_component_id=c.producer_component_id,
+              output_key=c.output_key), self._desired_num_of_artifact)
       candidate_dict[k] = [
           artifact_utils.deserialize_artifact(a.type, a.artifact)
           for a in candidate_artifacts
@@ -92,27 +92,60 @@ class LatestBlessedModelResolver(base_resolver.BaseResolver):
     if pipeline_context is None:
       raise RuntimeError('Pipeline context absent for %s' % pipeline_context)
 
-    candidate_dict = {}
-    # Gets all models in the search space and sort in reverse order by id.
-    all_models = metadata_handler.get_qualified_artifacts(
+    candidate_dict = {
+        model_channel_key: [],
+        model_blessing_channel_key: [],
+    }
+    # Model ids of the qualified models, and a lazily fetched map from model id
+    # to the qualified model.
+    qualified_models = {}
+    model_iterator = metadata_handler.iter_qualified_artifacts_newest_first(
         contexts=[pipeline_context],
         type_name=model_channel.type_name,
         producer_component_id=model_channel.producer_component_id,
         output_key=model_channel.output_key)
-    candidate_dict[model_channel_key] = [
-        artifact_utils.deserialize_artifact(a.type, a.artifact)
-        for a in all_models
-    ]
-    # Gets all ModelBlessing artifacts in the search space.
-    all_model_blessings = metadata_handler.get_qualified_artifacts(
+    # Iterates ModelBlessing artifacts newest first. As a ModelBlessing is
+    # always created after the Model it evaluates, and artifact ids are
+    # increasing, a blessing older than the latest blessed model found so far
+    # can not bless a newer model. This bounds the number of blessings and
+    # models which are fetched and deserialized.
+    latest_blessed_model = None
+    latest_model_blessing = None
+    for blessing in metadata_handler.iter_qualified_artifacts_newest_first(
         contexts=[pipeline_context],
         type_name=model_blessing_channel.type_name,
         producer_component_id=model_blessing_channel.producer_component_id,
-        output_key=model_blessing_channel.output_key)
-    candidate_dict[model_blessing_channel_key] = [
-        artifact_utils.deserialize_artifact(a.type, a.artifact)
-        for a in all_model_blessings
-    ]
+        output_key=model_blessing_channel.output_key):
+      if (latest_blessed_model is not None and
+          blessing.artifact.id < latest_blessed_model.artifact.id):
+        break
+      custom_properties = blessing.artifact.custom_properties
+      if custom_properties[
+          evaluator.ARTIFACT_PROPERTY_BLESSED_KEY].int_value != 1:
+        continue
+      model_id = custom_properties[
+          evaluator.ARTIFACT_PROPERTY_CURRENT_MODEL_ID_KEY].int_value
+      if (latest_blessed_model is not None and
+          model_id <= latest_blessed_model.artifact.id):
+        continue
+      # Fetches qualified models until reaching the blessed model id.
+      for model in model_iterator:
+        qualified_models[model.artifact.id] = model
+        if model.artifact.id <= model_id:
+          break
+      if model_id in qualified_models:
+        latest_blessed_model = qualified_models[model_id]
+        latest_model_blessing = blessing
+
+    if latest_blessed_model is not None:
+      candidate_dict[model_channel_key] = [
+          artifact_utils.deserialize_artifact(latest_blessed_model.type,
+                                              latest_blessed_model.artifact)
+      ]
+      candidate_dict[model_blessing_channel_key] = [
+          artifact_utils.deserialize_artifact(latest_model_blessing.type,
+                                              latest_model_blessing.artifact)
+      ]
 
     resolved_dict = self._resolve(candidate_dict, model_channel_key,
                                   model_blessing_channel_key)
@@ -168,6 +168,69 @@ class LatestBlessedModelResolverTest(tf.test.TestCase):
       ], ['model_two'])
       self.assertTrue(resolve_result.per_key_resolve_state['model'])
 
+  def testGetLatestBlessedModelArtifact_BlessingsOutOfOrder(self):
+    with metadata.Metadata(connection_config=self._connection_config) as m:
+      contexts = m.register_pipeline_contexts_if_not_exists(self._pipeline_info)
+      models = []
+      for i in range(4):
+        model = standard_artifacts.Model()
+        model.uri = 'model_%d' % i
+        models.append(model)
+      m.publish_artifacts(models)
+
+      # The newest blessing blesses an older model than the one before it, and
+      # the newest model is not blessed.
+      blessing_of_model_two = standard_artifacts.ModelBlessing()
+      self._set_model_blessing_bit(blessing_of_model_two, models[2].id, 1)
+      blessing_of_model_one = standard_artifacts.ModelBlessing()
+      self._set_model_blessing_bit(blessing_of_model_one, models[1].id, 1)
+      blessing_of_model_three = standard_artifacts.ModelBlessing()
+      self._set_model_blessing_bit(blessing_of_model_three, models[3].id, 0)
+      m.publish_artifacts([blessing_of_model_two])
+      m.publish_artifacts([blessing_of_model_one])
+      m.publish_artifacts([blessing_of_model_three])
+
+      m.register_execution(
+          exec_properties={},
+          pipeline_info=self._pipeline_info,
+          component_info=self._component_info,
+          contexts=contexts)
+      m.publish_execution(
+          component_info=self._component_info,
+          output_artifacts={
+              'a': models,
+              'b': [
+                  blessing_of_model_two, blessing_of_model_one,
+                  blessing_of_model_three
+              ]
+          })
+
+      resolver = latest_blessed_model_resolver.LatestBlessedModelResolver()
+      resolve_result = resolver.resolve(
+          pipeline_info=self._pipeline_info,
+          metadata_handler=m,
+          source_channels={
+              'model':
+                  types.Channel(
+                      type=standard_artifacts.Model,
+                      producer_component_id=self._component_info.component_id,
+                      output_key='a'),
+              'model_blessing':
+                  types.Channel(
+                      type=standard_artifacts.ModelBlessing,
+                      producer_component_id=self._component_info.component_id,
+                      output_key='b')
+          })
+      self.assertTrue(resolve_result.has_complete_result)
+      self.assertEqual(
+          ['model_2'],
+          [a.uri for a in resolve_result.per_key_resolve_result['model']])
+      self.assertEqual(
+          [blessing_of_model_two.id], [
+              a.id
+              for a in resolve_result.per_key_resolve_result['model_blessing']
+          ])
+
   def testGetLatestBlessedModelArtifact_IrMode(self):
     with metadata.Metadata(connection_config=self._connection_config) as m:
       # Model with id 1, will be blessed.
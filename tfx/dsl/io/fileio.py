@@ -24,9 +24,11 @@ from tfx.dsl.io import filesystem
 from tfx.dsl.io import filesystem_registry
 from tfx.dsl.io.filesystem import PathType
 
-# Import modules that may provide filesystem plugins.
+# Import modules that may provide filesystem plugins. Plugins with expensive
+# dependencies are only imported when a filesystem is first used.
 import tfx.dsl.io.plugins.local  # pylint: disable=unused-import, g-import-not-at-top
-import tfx.dsl.io.plugins.tensorflow_gfile  # pylint: disable=unused-import, g-import-not-at-top
+filesystem_registry.DEFAULT_FILESYSTEM_REGISTRY.register_lazy_plugin(
+    'tfx.dsl.io.plugins.tensorflow_gfile')
 
 
 # Expose `NotFoundError` as `fileio.NotFoundError`.
@@ -18,6 +18,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import importlib
 import re
 import threading
 from typing import Text, Type
@@ -34,6 +35,13 @@ class FilesystemRegistry(object):
     self._filesystem_priority = {}
     self._fallback_filesystem = None
     self._registration_lock = threading.Lock()
+    self._lazy_plugin_modules = []
+    self._lazy_plugin_lock = threading.RLock()
+    # Set once all the registered plugin modules are imported.
+    self._lazy_plugins_loaded = threading.Event()
+    # Whether the plugin modules are being imported. Only read and written by
+    # the thread holding _lazy_plugin_lock.
+    self._loading_lazy_plugins = False
 
   def register(self, filesystem_cls: Type[filesystem.Filesystem],
                priority: int, use_as_fallback: bool = False) -> None:
@@ -60,9 +68,47 @@ class FilesystemRegistry(object):
             priority < self._filesystem_priority[self._fallback_filesystem]):
           self._fallback_filesystem = filesystem_cls
 
+  def register_lazy_plugin(self, module_name: Text) -> None:
+    """Register a module providing filesystem plugins, without importing it.
+
+    The module is expected to register its filesystems with this registry when
+    imported. It is imported when a filesystem is first looked up, so that
+    plugins with expensive dependencies (e.g. `tensorflow`) do not slow down
+    importing modules which only reference `fileio`.
+
+    Args:
+      module_name: Fully qualified name of the plugin module.
+    """
+    with self._lazy_plugin_lock:
+      self._lazy_plugin_modules.append(module_name)
+      self._lazy_plugins_loaded.clear()
+
+  def _load_lazy_plugins(self) -> None:
+    """Imports all plugin modules registered by `register_lazy_plugin`.
+
+    Other threads looking up a filesystem meanwhile wait until the imports are
+    done. A module failing to import stays registered, and its import is
+    retried on the next lookup.
+    """
+    if self._lazy_plugins_loaded.is_set():
+      return
+    with self._lazy_plugin_lock:
+      # A plugin module being imported may look up a filesystem itself.
+      if self._loading_lazy_plugins:
+        return
+      self._loading_lazy_plugins = True
+      try:
+        while self._lazy_plugin_modules:
+          importlib.import_module(self._lazy_plugin_modules[0])
+          self._lazy_plugin_modules.pop(0)
+        self._lazy_plugins_loaded.set()
+      finally:
+        self._loading_lazy_plugins = False
+
   def get_filesystem_for_scheme(
       self, scheme: PathType) -> Type[filesystem.Filesystem]:
     """Get filesystem plugin for given scheme string."""
+    self._load_lazy_plugins()
     if isinstance(scheme, bytes):
       scheme = scheme.decode('utf-8')
     if scheme not in self._preferred_filesystem_by_scheme:
@@ -18,6 +18,9 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import threading
+
+import mock
 import tensorflow as tf
 
 from tfx.dsl.io import filesystem
@@ -123,6 +126,74 @@ class FilesystemRegistryTest(tf.test.TestCase):
     with self.assertRaisesRegexp(ValueError, 'Invalid path type'):
       registry.get_filesystem_for_path(123)
 
+  def testLazyPlugin(self):
+    registry = filesystem_registry.FilesystemRegistry()
+    registry.register(local.LocalFilesystem, 20)
+    registered = []
+
+    def fake_import_module(module_name):
+      registered.append(module_name)
+      registry.register(
+          tensorflow_gfile.TensorflowFilesystem, 10, use_as_fallback=True)
+
+    registry.register_lazy_plugin('fake.plugin.module')
+    with mock.patch.object(filesystem_registry.importlib, 'import_module',
+                           fake_import_module):
+      # The plugin is not imported until a filesystem is looked up.
+      self.assertEqual([], registered)
+      self.assertIs(tensorflow_gfile.TensorflowFilesystem,
+                    registry.get_filesystem_for_path('/tmp/my/file'))
+      self.assertIs(tensorflow_gfile.TensorflowFilesystem,
+                    registry.get_filesystem_for_path('gs://bucket/my/file'))
+      # The plugin is imported only once.
+      self.assertEqual(['fake.plugin.module'], registered)
+
+  def testLazyPluginImportFailureIsRetried(self):
+    registry = filesystem_registry.FilesystemRegistry()
+    registry.register_lazy_plugin('fake.plugin.module')
+    with mock.patch.object(filesystem_registry.importlib, 'import_module',
+                           side_effect=ImportError('failed')):
+      with self.assertRaises(ImportError):
+        registry.get_filesystem_for_path('/tmp/my/file')
+
+    def fake_import_module(unused_module_name):
+      registry.register(local.LocalFilesystem, 20, use_as_fallback=True)
+
+    with mock.patch.object(filesystem_registry.importlib, 'import_module',
+                           fake_import_module):
+      self.assertIs(local.LocalFilesystem,
+                    registry.get_filesystem_for_path('/tmp/my/file'))
+
+  def testLazyPluginConcurrentLookup(self):
+    registry = filesystem_registry.FilesystemRegistry()
+    import_started = threading.Event()
+    finish_import = threading.Event()
+
+    def slow_import_module(unused_module_name):
+      import_started.set()
+      finish_import.wait()
+      registry.register(
+          tensorflow_gfile.TensorflowFilesystem, 10, use_as_fallback=True)
+
+    registry.register_lazy_plugin('fake.plugin.module')
+    results = []
+    with mock.patch.object(filesystem_registry.importlib, 'import_module',
+                           slow_import_module):
+      threads = [
+          threading.Thread(
+              target=lambda: results.append(
+                  registry.get_filesystem_for_path('gs://bucket/my/file')))
+          for _ in range(2)
+      ]
+      threads[0].start()
+      import_started.wait()
+      # The second lookup waits for the plugin imported by the first one.
+      threads[1].start()
+      finish_import.set()
+      for thread in threads:
+        thread.join()
+    self.assertEqual([tensorflow_gfile.TensorflowFilesystem] * 2, results)
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -25,6 +25,7 @@ from tfx.components.example_gen import component
 from tfx.components.example_gen import utils
 from tfx.dsl.components.base import executor_spec
 from tfx.extensions.google_cloud_big_query.example_gen import executor
+from tfx.extensions.google_cloud_big_query.example_gen.proto import big_query_config_pb2
 from tfx.proto import example_gen_pb2
 
 
@@ -42,7 +43,9 @@ class BigQueryExampleGen(component.QueryBasedExampleGen):
                input_config: Optional[example_gen_pb2.Input] = None,
                output_config: Optional[example_gen_pb2.Output] = None,
                example_artifacts: Optional[types.Channel] = None,
-               instance_name: Optional[Text] = None):
+               instance_name: Optional[Text] = None,
+               big_query_config: Optional[
+                   big_query_config_pb2.BigQueryConfig] = None):
     """Constructs a BigQueryExampleGen component.
 
     Args:
@@ -62,6 +65,10 @@ class BigQueryExampleGen(component.QueryBasedExampleGen):
         eval examples.
       instance_name: Optional unique instance name. Necessary if multiple
         BigQueryExampleGen components are declared in the same pipeline.
+      big_query_config: An optional big_query_config_pb2.BigQueryConfig
+        instance. If its `arrow_read` is set, the query results are read with
+        the BigQuery Storage API as Arrow and converted to tf.Examples
+        batch-wise.
 
     Raises:
       RuntimeError: Only one of query and input_config should be set.
@@ -69,8 +76,13 @@ class BigQueryExampleGen(component.QueryBasedExampleGen):
     if bool(query) == bool(input_config):
       raise RuntimeError('Exactly one of query and input_config should be set.')
     input_config = input_config or utils.make_default_input_config(query)
+    custom_config = None
+    if big_query_config is not None:
+      custom_config = example_gen_pb2.CustomConfig()
+      custom_config.custom_config.Pack(big_query_config)
     super(BigQueryExampleGen, self).__init__(
         input_config=input_config,
         output_config=output_config,
+        custom_config=custom_config,
         example_artifacts=example_artifacts,
         instance_name=instance_name)
@@ -20,8 +20,10 @@ from __future__ import print_function
 
 import tensorflow as tf
 from tfx.extensions.google_cloud_big_query.example_gen import component
+from tfx.extensions.google_cloud_big_query.example_gen.proto import big_query_config_pb2
 from tfx.proto import example_gen_pb2
 from tfx.types import standard_artifacts
+from tfx.utils import proto_utils
 
 
 class ComponentTest(tf.test.TestCase):
@@ -51,5 +53,17 @@ class ComponentTest(tf.test.TestCase):
     self.assertEqual(standard_artifacts.Examples.TYPE_NAME,
                      big_query_example_gen.outputs['examples'].type_name)
 
+  def testConstructWithBigQueryConfig(self):
+    big_query_config = big_query_config_pb2.BigQueryConfig(
+        arrow_read=True, max_stream_count=10)
+    big_query_example_gen = component.BigQueryExampleGen(
+        query='query', big_query_config=big_query_config)
+    custom_config = example_gen_pb2.CustomConfig()
+    proto_utils.json_to_proto(
+        big_query_example_gen.exec_properties['custom_config'], custom_config)
+    unpacked_big_query_config = big_query_config_pb2.BigQueryConfig()
+    custom_config.custom_config.Unpack(unpacked_big_query_config)
+    self.assertEqual(big_query_config, unpacked_big_query_config)
+
 if __name__ == '__main__':
   tf.test.main()
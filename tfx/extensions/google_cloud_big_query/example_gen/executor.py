@@ -18,7 +18,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from typing import Any, Dict, Optional, Text
+from typing import Any, Dict, Optional, Text, Union
 
 import apache_beam as beam
 
@@ -27,7 +27,9 @@ from google.cloud import bigquery
 import tensorflow as tf
 
 from tfx.components.example_gen import base_example_gen_executor
+from tfx.components.example_gen import utils as example_gen_utils
 from tfx.extensions.google_cloud_big_query import utils
+from tfx.extensions.google_cloud_big_query.example_gen.proto import big_query_config_pb2
 
 
 class _BigQueryConverter(object):
@@ -56,7 +58,7 @@ class _BigQueryConverter(object):
 
 @beam.ptransform_fn
 @beam.typehints.with_input_types(beam.Pipeline)
-@beam.typehints.with_output_types(tf.train.Example)
+@beam.typehints.with_output_types(Union[tf.train.Example, bytes])
 def _BigQueryToExample(
     pipeline: beam.Pipeline,
     exec_properties: Dict[Text, Any],
@@ -66,10 +68,12 @@ def _BigQueryToExample(
   Args:
     pipeline: beam pipeline.
     exec_properties: A dict of execution properties.
+      - custom_config: Optional JSON string of example_gen_pb2.CustomConfig
+        instance, holding a big_query_config_pb2.BigQueryConfig.
     split_pattern: Split.pattern in Input config, a BigQuery sql string.
 
   Returns:
-    PCollection of TF examples.
+    PCollection of TF examples, serialized if read as Arrow.
   """
 
   beam_pipeline_args = exec_properties['_beam_pipeline_args']
@@ -80,6 +84,18 @@ def _BigQueryToExample(
       beam.options.pipeline_options.GoogleCloudOptions).project
   if isinstance(project, value_provider.ValueProvider):
     project = project.get()
+
+  big_query_config = example_gen_utils.get_custom_config(
+      exec_properties, big_query_config_pb2.BigQueryConfig)
+  if big_query_config.arrow_read:
+    return (pipeline
+            | 'QueryTableAsArrow' >> utils.ReadArrowFromBigQuery(
+                query=split_pattern,
+                project=project,
+                max_stream_count=big_query_config.max_stream_count)
+            | 'ToSerializedTFExample' >> beam.FlatMap(
+                utils.record_batch_to_examples))
+
   converter = _BigQueryConverter(split_pattern, project)
 
   return (pipeline
@@ -21,11 +21,13 @@ import apache_beam as beam
 from apache_beam.testing import util
 from google.cloud import bigquery
 import mock
+import pyarrow as pa
 import tensorflow as tf
 from tfx.dsl.components.base import base_executor
 from tfx.dsl.io import fileio
 from tfx.extensions.google_cloud_big_query import utils
 from tfx.extensions.google_cloud_big_query.example_gen import executor
+from tfx.extensions.google_cloud_big_query.example_gen.proto import big_query_config_pb2
 from tfx.proto import example_gen_pb2
 from tfx.types import artifact_utils
 from tfx.types import standard_artifacts
@@ -61,6 +63,36 @@ def _MockReadFromBigQuery2(pipeline, query):
   return pipeline | beam.Create(mock_query_results)
 
 
+def _WriteArrowFile(path):
+  """Writes an Arrow file standing in for the result table of a query."""
+  record_batch = pa.RecordBatch.from_arrays([
+      pa.array([1], type=pa.int64()),
+      pa.array([[2, 3]], type=pa.list_(pa.int64())),
+      pa.array([True], type=pa.bool_()),
+      pa.array([2.0], type=pa.float64()),
+      pa.array([[2.7, 3.8]], type=pa.list_(pa.float64())),
+      pa.array(['abc'], type=pa.string()),
+      pa.array([['abc', 'def']], type=pa.list_(pa.string())),
+  ], ['i', 'i2', 'b', 'f', 'f2', 's', 's2'])
+  with pa.OSFile(path, 'wb') as sink:
+    with pa.RecordBatchFileWriter(sink, record_batch.schema) as writer:
+      for _ in range(3):
+        writer.write_batch(record_batch)
+
+
+def _MakeMockReadArrowFromBigQuery(path):
+  """Returns a ReadArrowFromBigQuery reading the Arrow file at `path`."""
+
+  @beam.ptransform_fn
+  def _MockReadArrowFromBigQuery(pipeline, query, project, max_stream_count):
+    del query, project, max_stream_count  # Unused args
+    reader = pa.ipc.open_file(path)
+    return pipeline | beam.Create(
+        [reader.get_batch(i) for i in range(reader.num_record_batches)])
+
+  return _MockReadArrowFromBigQuery
+
+
 class ExecutorTest(tf.test.TestCase):
 
   def setUp(self):
@@ -110,6 +142,48 @@ class ExecutorTest(tf.test.TestCase):
           features=tf.train.Features(feature=feature))
       util.assert_that(examples, util.equal_to([example_proto]))
 
+  def testBigQueryToExampleWithArrowRead(self):
+    arrow_file_path = os.path.join(self.get_temp_dir(), 'table.arrow')
+    _WriteArrowFile(arrow_file_path)
+    custom_config = example_gen_pb2.CustomConfig()
+    custom_config.custom_config.Pack(
+        big_query_config_pb2.BigQueryConfig(arrow_read=True))
+
+    with mock.patch.object(
+        utils, 'ReadArrowFromBigQuery',
+        _MakeMockReadArrowFromBigQuery(arrow_file_path)):
+      with beam.Pipeline() as pipeline:
+        examples = (
+            pipeline | 'ToTFExample' >> executor._BigQueryToExample(
+                exec_properties={
+                    '_beam_pipeline_args': [],
+                    'custom_config': proto_utils.proto_to_json(custom_config),
+                },
+                split_pattern='SELECT i, i2, b, f, f2, s, s2 FROM `fake`'))
+
+        feature = {}
+        feature['i'] = tf.train.Feature(
+            int64_list=tf.train.Int64List(value=[1]))
+        feature['i2'] = tf.train.Feature(
+            int64_list=tf.train.Int64List(value=[2, 3]))
+        feature['b'] = tf.train.Feature(
+            int64_list=tf.train.Int64List(value=[1]))
+        feature['f'] = tf.train.Feature(
+            float_list=tf.train.FloatList(value=[2.0]))
+        feature['f2'] = tf.train.Feature(
+            float_list=tf.train.FloatList(value=[2.7, 3.8]))
+        feature['s'] = tf.train.Feature(
+            bytes_list=tf.train.BytesList(value=[tf.compat.as_bytes('abc')]))
+        feature['s2'] = tf.train.Feature(
+            bytes_list=tf.train.BytesList(
+                value=[tf.compat.as_bytes('abc'),
+                       tf.compat.as_bytes('def')]))
+        example_proto = tf.train.Example(
+            features=tf.train.Features(feature=feature))
+        util.assert_that(
+            examples | beam.Map(tf.train.Example.FromString),
+            util.equal_to([example_proto] * 3))
+
   @mock.patch.multiple(
       utils,
       ReadFromBigQuery=_MockReadFromBigQuery,
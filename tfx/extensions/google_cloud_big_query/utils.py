@@ -18,12 +18,17 @@
 Internal utilities, no backwards compatibility guarantees.
 """
 
-from typing import Any, Dict, Text
+from typing import Any, Dict, Iterable, List, Optional, Text
 
 import apache_beam as beam
 from apache_beam.io.gcp import bigquery
+from google.cloud import bigquery as bigquery_client
+from google.cloud import bigquery_storage
+import numpy as np
+import pyarrow as pa
 import tensorflow as tf
 from tfx.utils import telemetry_utils
+from tfx_bsl.coders import example_coder
 
 
 @beam.ptransform_fn
@@ -47,6 +52,143 @@ def ReadFromBigQuery(
               bigquery_job_labels=telemetry_utils.get_labels_dict()))
 
 
+class _ReadArrowStreamDoFn(beam.DoFn):
+  """Reads the Arrow RecordBatches of a stream of a BigQuery read session."""
+
+  def __init__(self, serialized_arrow_schema: bytes):
+    self._serialized_arrow_schema = serialized_arrow_schema
+    self._client = None
+    self._arrow_schema = None
+
+  def setup(self):
+    self._client = bigquery_storage.BigQueryReadClient()
+    self._arrow_schema = pa.ipc.read_schema(
+        pa.py_buffer(self._serialized_arrow_schema))
+
+  def process(self, stream_name: Text) -> Iterable[pa.RecordBatch]:
+    for response in self._client.read_rows(stream_name):
+      yield pa.ipc.read_record_batch(
+          pa.py_buffer(response.arrow_record_batch.serialized_record_batch),
+          self._arrow_schema)
+
+
+@beam.ptransform_fn
+@beam.typehints.with_input_types(beam.Pipeline)
+@beam.typehints.with_output_types(pa.RecordBatch)
+def ReadArrowFromBigQuery(
+    pipeline: beam.Pipeline,
+    query: Text,
+    project: Optional[Text] = None,
+    max_stream_count: int = 0) -> beam.pvalue.PCollection:
+  """Reads the result of a query as Arrow RecordBatches.
+
+  The query is run when the pipeline is constructed, and its result table is
+  read with the BigQuery Storage API, each stream of the read session by a
+  separate worker.
+
+  Args:
+    pipeline: Beam pipeline.
+    query: A BigQuery standard sql string.
+    project: The GCP project ID to run the query job and the read session in.
+      Default to the GCP project ID set by the gcloud environment.
+    max_stream_count: Maximum number of streams of the read session. The
+      BigQuery Storage API chooses it if 0.
+
+  Returns:
+    PCollection of Arrow RecordBatches.
+  """
+  client = bigquery_client.Client(project=project)
+  query_job = client.query(
+      query,
+      job_config=bigquery_client.QueryJobConfig(
+          labels=telemetry_utils.get_labels_dict()))
+  query_job.result()
+  table = query_job.destination
+  read_session = bigquery_storage.BigQueryReadClient().create_read_session(
+      parent='projects/{}'.format(client.project),
+      read_session=bigquery_storage.types.ReadSession(
+          table='projects/{}/datasets/{}/tables/{}'.format(
+              table.project, table.dataset_id, table.table_id),
+          data_format=bigquery_storage.types.DataFormat.ARROW),
+      max_stream_count=max_stream_count)
+
+  return (pipeline
+          | 'CreateReadStreams' >> beam.Create(
+              [stream.name for stream in read_session.streams])
+          # Prevents the streams from being read by a single worker.
+          | 'ReshuffleReadStreams' >> beam.Reshuffle()
+          | 'ReadArrowStreams' >> beam.ParDo(
+              _ReadArrowStreamDoFn(
+                  read_session.arrow_schema.serialized_schema)))
+
+
+def _to_large_list_array(column: pa.Array,
+                         value_type: pa.DataType) -> pa.Array:
+  """Returns a column of BigQuery values as a large_list<value_type> array."""
+  null_mask = np.asarray(column.is_null(), dtype=bool)
+  if pa.types.is_list(column.type) or pa.types.is_large_list(column.type):
+    lengths = np.diff(np.asarray(column.offsets, dtype=np.int64))
+    # Unlike `values`, drops the values backing NULL rows, if any.
+    values = column.flatten()
+  else:
+    # One value per non-NULL row.
+    lengths = np.ones(len(column), dtype=np.int64)
+    values = column.filter(pa.array(~null_mask))
+  # NULL rows have no values, so that they do not extend the previous row
+  # once their offsets are masked.
+  lengths[null_mask] = 0
+  offsets = np.concatenate([[0], np.cumsum(lengths)])
+  if pa.types.is_boolean(values.type):
+    values = values.cast(pa.int64())
+  elif pa.types.is_string(values.type):
+    values = values.cast(pa.binary())
+  values = values.cast(value_type, safe=False)
+  return pa.LargeListArray.from_arrays(
+      pa.array(offsets, mask=np.append(null_mask, False)), values)
+
+
+def _get_value_type(column_name: Text, data_type: pa.DataType) -> pa.DataType:
+  """Returns the tf.Example compatible Arrow type of a BigQuery column."""
+  if pa.types.is_list(data_type) or pa.types.is_large_list(data_type):
+    data_type = data_type.value_type
+  if pa.types.is_integer(data_type) or pa.types.is_boolean(data_type):
+    return pa.int64()
+  if pa.types.is_floating(data_type):
+    return pa.float32()
+  if pa.types.is_string(data_type):
+    return pa.large_binary()
+  raise RuntimeError('BigQuery column {} of Arrow type {} is not '
+                     'supported.'.format(column_name, data_type))
+
+
+def record_batch_to_examples(record_batch: pa.RecordBatch) -> List[bytes]:
+  """Converts a RecordBatch of BigQuery query results to tf examples.
+
+  The RecordBatch is converted column-wise and encoded in a single call, rather
+  than row by row as in `row_to_example`. As there, NULL values are encoded as
+  features without values.
+
+  Args:
+    record_batch: Arrow RecordBatch read with the BigQuery Storage API.
+
+  Returns:
+    Serialized tf.Examples, one per row of the RecordBatch. Note that BOOLEAN
+    type in BigQuery result will be converted to int in tf.train.Example.
+
+  Raises:
+    RuntimeError: If the data type is not supported to be converted.
+      Only INTEGER, BOOLEAN, FLOAT, STRING is supported now.
+  """
+  columns = []
+  for column_name, column in zip(record_batch.schema.names,
+                                 record_batch.columns):
+    columns.append(
+        _to_large_list_array(column,
+                             _get_value_type(column_name, column.type)))
+  return example_coder.RecordBatchToExamples(
+      pa.RecordBatch.from_arrays(columns, record_batch.schema.names))
+
+
 def row_to_example(  # pylint: disable=invalid-name
     field_to_type: Dict[Text, Text],
     field_name_to_data: Dict[Text, Any]) -> tf.train.Example:
@@ -14,6 +14,7 @@
 # limitations under the License.
 """Tests for tfx.extensions.google_cloud_big_query.utils."""
 
+import pyarrow as pa
 import tensorflow as tf
 from tfx.extensions.google_cloud_big_query import utils
 from google.protobuf import text_format
@@ -105,6 +106,66 @@ class UtilsTest(tf.test.TestCase):
     self.assertIn('BigQuery column type TIMESTAMP is not supported.',
                   str(context.exception))
 
+  def testRecordBatchToExamples(self):
+    record_batch = pa.RecordBatch.from_arrays([
+        pa.array([1, None], type=pa.int64()),
+        pa.array(['James', None], type=pa.string()),
+        pa.array([True, False], type=pa.bool_()),
+        pa.array([100.2, None], type=pa.float64()),
+        pa.array([[20.5, 30.5, 100.2], []], type=pa.list_(pa.float64())),
+    ], ['id', 'name', 'can_program', 'income', 'income_history'])
+
+    examples = [
+        tf.train.Example.FromString(serialized_example)
+        for serialized_example in utils.record_batch_to_examples(record_batch)
+    ]
+
+    self.assertLen(examples, 2)
+    self.assertEqual(examples[0], _EXAMPLE_1)
+    for feature_name in ('id', 'name', 'income'):
+      self.assertIsNone(
+          examples[1].features.feature[feature_name].WhichOneof('kind'))
+    self.assertEqual([0], examples[1].features.feature['can_program']
+                     .int64_list.value)
+    self.assertEmpty(
+        examples[1].features.feature['income_history'].float_list.value)
+
+  def testRecordBatchToExamplesWithNullInMiddleRow(self):
+    record_batch = pa.RecordBatch.from_arrays([
+        pa.array([1, None, 3], type=pa.int64()),
+        pa.array(['a', None, 'c'], type=pa.string()),
+        pa.array([[1.5, 2.5], None, [3.5]], type=pa.list_(pa.float64())),
+    ], ['id', 'name', 'history'])
+
+    examples = [
+        tf.train.Example.FromString(serialized_example)
+        for serialized_example in utils.record_batch_to_examples(record_batch)
+    ]
+
+    self.assertLen(examples, 3)
+    self.assertEqual([1], examples[0].features.feature['id'].int64_list.value)
+    self.assertEqual([b'a'],
+                     examples[0].features.feature['name'].bytes_list.value)
+    self.assertEqual([1.5, 2.5],
+                     examples[0].features.feature['history'].float_list.value)
+    for feature in examples[1].features.feature.values():
+      self.assertIsNone(feature.WhichOneof('kind'))
+    self.assertEqual([3], examples[2].features.feature['id'].int64_list.value)
+    self.assertEqual([b'c'],
+                     examples[2].features.feature['name'].bytes_list.value)
+    self.assertEqual([3.5],
+                     examples[2].features.feature['history'].float_list.value)
+
+  def testRecordBatchToExamplesWithUnsupportedTypes(self):
+    record_batch = pa.RecordBatch.from_arrays(
+        [pa.array([1603493800000], type=pa.timestamp('us'))], ['time'])
+
+    with self.assertRaises(RuntimeError) as context:
+      utils.record_batch_to_examples(record_batch)
+
+    self.assertIn('BigQuery column time of Arrow type timestamp[us] is not '
+                  'supported.', str(context.exception))
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -13,12 +13,14 @@
 # limitations under the License.
 """Definition of Beam TFX runner."""
 
+import collections
 import datetime
 import os
-from typing import Any, Iterable, List, Optional, Text, Union
+from typing import Any, Dict, Iterable, List, Optional, Text, Union
 
 from absl import logging
 import apache_beam as beam
+from apache_beam.options import pipeline_options
 from tfx.dsl.compiler import compiler
 from tfx.dsl.compiler import constants
 from tfx.orchestration import metadata
@@ -35,6 +37,33 @@ from tfx.utils import telemetry_utils
 from google.protobuf import any_pb2
 from google.protobuf import message
 
+# Running modes of the DirectRunner supported by the parallel mode of
+# BeamDagRunner.
+MULTI_THREADING = 'multi_threading'
+MULTI_PROCESSING = 'multi_processing'
+
+
+class _WorkerMetadata(metadata.Metadata):
+  """Metadata which keeps its MLMD connection open across `with` blocks.
+
+  The launcher enters its MLMD connection several times per execution. A plain
+  `Metadata` connects to MLMD on every enter, whereas this one connects on the
+  first enter only and is shared by all the executions of a DoFn instance until
+  `close` is called.
+  """
+
+  def __enter__(self) -> 'metadata.Metadata':
+    if self._store is None:
+      super().__enter__()
+    return self
+
+  def __exit__(self, exc_type, exc_value, exc_tb) -> None:
+    pass
+
+  def close(self) -> None:
+    """Releases the MLMD connection."""
+    self._store = None
+
 
 # TODO(jyzhao): confirm it's re-executable, add test case.
 @beam.typehints.with_input_types(Any)
@@ -73,6 +102,16 @@ class PipelineNodeAsDoFn(beam.DoFn):
     self._custom_driver_spec = custom_driver_spec
     self._node_id = pipeline_node.node_info.id
     self._deployment_config = deployment_config
+    self._mlmd_connection = None
+
+  def setup(self) -> None:
+    """Creates the MLMD connection shared by the executions of this worker."""
+    self._mlmd_connection = _WorkerMetadata(self._mlmd_connection_config)
+
+  def teardown(self) -> None:
+    if self._mlmd_connection is not None:
+      self._mlmd_connection.close()
+      self._mlmd_connection = None
 
   def process(self, element: Any, *signals: Iterable[Any]) -> None:
     """Executes node based on signals.
@@ -95,7 +134,8 @@ class PipelineNodeAsDoFn(beam.DoFn):
                                                     self._node_id)
     launcher.Launcher(
         pipeline_node=self._pipeline_node,
-        mlmd_connection=metadata.Metadata(self._mlmd_connection_config),
+        mlmd_connection=(self._mlmd_connection or
+                         metadata.Metadata(self._mlmd_connection_config)),
         pipeline_info=self._pipeline_info,
         pipeline_runtime_spec=self._pipeline_runtime_spec,
         executor_spec=self._executor_spec,
@@ -111,6 +151,30 @@ class PipelineNodeAsDoFn(beam.DoFn):
             if platform_config else None)
 
 
+@beam.typehints.with_input_types(Text)
+@beam.typehints.with_output_types(Any)
+class _NodeLayerAsDoFn(beam.DoFn):
+  """Runs the node whose id is the element among a layer of nodes.
+
+  Nodes of a layer don't depend on each other, so that the DirectRunner can run
+  them concurrently on different workers.
+  """
+
+  def __init__(self, node_do_fns: Dict[Text, PipelineNodeAsDoFn]):
+    self._node_do_fns = node_do_fns
+
+  def setup(self) -> None:
+    for node_do_fn in self._node_do_fns.values():
+      node_do_fn.setup()
+
+  def teardown(self) -> None:
+    for node_do_fn in self._node_do_fns.values():
+      node_do_fn.teardown()
+
+  def process(self, element: Text, *signals: Iterable[Any]) -> None:
+    self._node_do_fns[element].process(element, *signals)
+
+
 class BeamDagRunner(tfx_runner.TfxRunner):
   """Legacy TFX BeamDagRunner.
 
@@ -122,7 +186,9 @@ class BeamDagRunner(tfx_runner.TfxRunner):
   def __new__(
       cls,
       beam_orchestrator_args: Optional[List[Text]] = None,
-      config: Optional[pipeline_config.PipelineConfig] = None):
+      config: Optional[pipeline_config.PipelineConfig] = None,
+      num_workers: int = 1,
+      running_mode: Text = MULTI_THREADING):
     """Initializes BeamDagRunner as a TFX orchestrator.
 
     Create the legacy BeamDagRunner object if any of the legacy
@@ -139,6 +205,8 @@ class BeamDagRunner(tfx_runner.TfxRunner):
         of each component. Defaults to pipeline config that supports
         InProcessComponentLauncher and DockerComponentLauncher. If this option
         is used, the legacy non-IR-based BeamDagRunner will be constructed.
+      num_workers: See `__init__`.
+      running_mode: See `__init__`.
 
     Returns:
       Legacy or IR-based BeamDagRunner object.
@@ -152,8 +220,35 @@ class BeamDagRunner(tfx_runner.TfxRunner):
     else:
       return super(BeamDagRunner, cls).__new__(cls)
 
-  def __init__(self):
-    """Initializes BeamDagRunner as a TFX orchestrator."""
+  def __init__(self,
+               beam_orchestrator_args: Optional[List[Text]] = None,
+               config: Optional[pipeline_config.PipelineConfig] = None,
+               num_workers: int = 1,
+               running_mode: Text = MULTI_THREADING):
+    """Initializes BeamDagRunner as a TFX orchestrator.
+
+    Args:
+      beam_orchestrator_args: See `__new__`.
+      config: See `__new__`.
+      num_workers: Number of DirectRunner workers. If greater than 1, the
+        pipeline runs in local parallel mode, where the nodes are grouped in
+        layers by their depth in the pipeline DAG and the independent nodes of a
+        layer run concurrently on up to `num_workers` workers.
+      running_mode: Running mode of the DirectRunner workers in local parallel
+        mode, either `MULTI_THREADING` or `MULTI_PROCESSING`.
+
+    Raises:
+      ValueError: If `num_workers` or `running_mode` is invalid.
+    """
+    del beam_orchestrator_args, config
+    if num_workers < 1:
+      raise ValueError(
+          'num_workers must be positive but got {}'.format(num_workers))
+    if running_mode not in (MULTI_THREADING, MULTI_PROCESSING):
+      raise ValueError('running_mode must be one of {} but got {}'.format(
+          [MULTI_THREADING, MULTI_PROCESSING], running_mode))
+    self._num_workers = num_workers
+    self._running_mode = running_mode
 
   def _build_executable_spec(
       self, node_id: str,
@@ -285,43 +380,109 @@ class BeamDagRunner(tfx_runner.TfxRunner):
 
     with telemetry_utils.scoped_labels(
         {telemetry_utils.LABEL_TFX_RUNNER: 'beam'}):
-      with beam.Pipeline() as p:
-        # Uses for triggering the node DoFns.
-        root = p | 'CreateRoot' >> beam.Create([None])
-
-        # Stores mapping of node to its signal.
-        signal_map = {}
-        # pipeline.nodes are in topological order.
-        for node in pipeline.nodes:
-          # TODO(b/160882349): Support subpipeline
-          pipeline_node = node.pipeline_node
-          node_id = pipeline_node.node_info.id
-          executor_spec = self._extract_executor_spec(deployment_config,
-                                                      node_id)
-          custom_driver_spec = self._extract_custom_driver_spec(
-              deployment_config, node_id)
-
-          # Signals from upstream nodes.
-          signals_to_wait = []
-          for upstream_node in pipeline_node.upstream_nodes:
-            assert upstream_node in signal_map, ('Nodes are not in '
-                                                 'topological order')
-            signals_to_wait.append(signal_map[upstream_node])
-          logging.info('Node %s depends on %s.', node_id,
-                       [s.producer.full_label for s in signals_to_wait])
-
-          # Each signal is an empty PCollection. AsIter ensures a node will
-          # be triggered after upstream nodes are finished.
-          signal_map[node_id] = (
-              root
-              | 'Run[%s]' % node_id >> beam.ParDo(
-                  self._PIPELINE_NODE_DO_FN_CLS(
-                      pipeline_node=pipeline_node,
-                      mlmd_connection_config=connection_config,
-                      pipeline_info=pipeline.pipeline_info,
-                      pipeline_runtime_spec=pipeline.runtime_spec,
-                      executor_spec=executor_spec,
-                      custom_driver_spec=custom_driver_spec,
-                      deployment_config=deployment_config),
-                  *[beam.pvalue.AsIter(s) for s in signals_to_wait]))
-          logging.info('Node %s is scheduled.', node_id)
+      with beam.Pipeline(options=self._beam_pipeline_options()) as p:
+        if self._num_workers > 1:
+          self._schedule_node_layers(p, pipeline, deployment_config,
+                                     connection_config)
+        else:
+          self._schedule_nodes(p, pipeline, deployment_config,
+                               connection_config)
+
+  def _beam_pipeline_options(
+      self) -> Optional[pipeline_options.PipelineOptions]:
+    """Returns the options of the Beam pipeline running the nodes."""
+    if self._num_workers <= 1:
+      return None
+    return pipeline_options.PipelineOptions([
+        '--direct_num_workers={}'.format(self._num_workers),
+        '--direct_running_mode={}'.format(self._running_mode),
+    ])
+
+  def _build_node_do_fn(
+      self, pipeline: pipeline_pb2.Pipeline,
+      pipeline_node: pipeline_pb2.PipelineNode,
+      deployment_config: local_deployment_config_pb2.LocalDeploymentConfig,
+      connection_config: metadata.ConnectionConfigType) -> PipelineNodeAsDoFn:
+    node_id = pipeline_node.node_info.id
+    return self._PIPELINE_NODE_DO_FN_CLS(
+        pipeline_node=pipeline_node,
+        mlmd_connection_config=connection_config,
+        pipeline_info=pipeline.pipeline_info,
+        pipeline_runtime_spec=pipeline.runtime_spec,
+        executor_spec=self._extract_executor_spec(deployment_config, node_id),
+        custom_driver_spec=self._extract_custom_driver_spec(
+            deployment_config, node_id),
+        deployment_config=deployment_config)
+
+  def _schedule_nodes(
+      self, p: beam.Pipeline, pipeline: pipeline_pb2.Pipeline,
+      deployment_config: local_deployment_config_pb2.LocalDeploymentConfig,
+      connection_config: metadata.ConnectionConfigType) -> None:
+    """Schedules each node as a ParDo waiting for its upstream nodes."""
+    # Uses for triggering the node DoFns.
+    root = p | 'CreateRoot' >> beam.Create([None])
+
+    # Stores mapping of node to its signal.
+    signal_map = {}
+    # pipeline.nodes are in topological order.
+    for node in pipeline.nodes:
+      # TODO(b/160882349): Support subpipeline
+      pipeline_node = node.pipeline_node
+      node_id = pipeline_node.node_info.id
+
+      # Signals from upstream nodes.
+      signals_to_wait = []
+      for upstream_node in pipeline_node.upstream_nodes:
+        assert upstream_node in signal_map, ('Nodes are not in '
+                                             'topological order')
+        signals_to_wait.append(signal_map[upstream_node])
+      logging.info('Node %s depends on %s.', node_id,
+                   [s.producer.full_label for s in signals_to_wait])
+
+      # Each signal is an empty PCollection. AsIter ensures a node will
+      # be triggered after upstream nodes are finished.
+      signal_map[node_id] = (
+          root
+          | 'Run[%s]' % node_id >> beam.ParDo(
+              self._build_node_do_fn(pipeline, pipeline_node,
+                                     deployment_config, connection_config),
+              *[beam.pvalue.AsIter(s) for s in signals_to_wait]))
+      logging.info('Node %s is scheduled.', node_id)
+
+  def _schedule_node_layers(
+      self, p: beam.Pipeline, pipeline: pipeline_pb2.Pipeline,
+      deployment_config: local_deployment_config_pb2.LocalDeploymentConfig,
+      connection_config: metadata.ConnectionConfigType) -> None:
+    """Schedules the nodes as layers of independent nodes run concurrently.
+
+    The DirectRunner runs the stages of a Beam pipeline one after another, so
+    that nodes scheduled as separate ParDos never run concurrently. Instead, the
+    nodes are grouped by their depth in the pipeline DAG and the node ids of
+    each layer are reshuffled over the workers, which run the nodes with a
+    single ParDo. A layer waits for the whole previous layer.
+    """
+    depths = {}
+    layers = collections.defaultdict(dict)
+    # pipeline.nodes are in topological order.
+    for node in pipeline.nodes:
+      # TODO(b/160882349): Support subpipeline
+      pipeline_node = node.pipeline_node
+      node_id = pipeline_node.node_info.id
+      for upstream_node in pipeline_node.upstream_nodes:
+        assert upstream_node in depths, 'Nodes are not in topological order'
+      depths[node_id] = max(
+          [depths[u] + 1 for u in pipeline_node.upstream_nodes], default=0)
+      layers[depths[node_id]][node_id] = self._build_node_do_fn(
+          pipeline, pipeline_node, deployment_config, connection_config)
+
+    signal = None
+    for depth in sorted(layers):
+      node_do_fns = layers[depth]
+      logging.info('Layer %d runs nodes %s.', depth, sorted(node_do_fns))
+      signal = (
+          p
+          | 'CreateLayer[%d]' % depth >> beam.Create(sorted(node_do_fns))
+          | 'ReshuffleLayer[%d]' % depth >> beam.Reshuffle()
+          | 'RunLayer[%d]' % depth >> beam.ParDo(
+              _NodeLayerAsDoFn(node_do_fns),
+              *([beam.pvalue.AsIter(signal)] if signal is not None else [])))
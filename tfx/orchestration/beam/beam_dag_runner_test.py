@@ -295,6 +295,40 @@ class BeamDagRunnerTest(test_case_utils.TfxTest):
     # Verifies that every component gets a not-None pipeline_run.
     self.assertTrue(all(_conponent_to_pipeline_run.values()))
 
+  @mock.patch.multiple(
+      beam_dag_runner.BeamDagRunner,
+      _PIPELINE_NODE_DO_FN_CLS=_FakeComponentAsDoFn,
+  )
+  def testRunInParallelMode(self):
+    self._pipeline.deployment_config.Pack(_LOCAL_DEPLOYMENT_CONFIG)
+    beam_dag_runner.BeamDagRunner(num_workers=2).run(self._pipeline)
+    self.assertCountEqual(
+        _executed_components,
+        ['my_example_gen', 'my_importer', 'my_transform', 'my_trainer'])
+    # 'my_importer' has no upstream and can be executed in any order.
+    _executed_components.remove('my_importer')
+    self.assertEqual(_executed_components,
+                     ['my_example_gen', 'my_transform', 'my_trainer'])
+    self.assertTrue(all(_conponent_to_pipeline_run.values()))
+
+  def testInvalidParallelMode(self):
+    with self.assertRaisesRegex(ValueError, 'num_workers must be positive'):
+      beam_dag_runner.BeamDagRunner(num_workers=0)
+    with self.assertRaisesRegex(ValueError, 'running_mode must be one of'):
+      beam_dag_runner.BeamDagRunner(num_workers=2, running_mode='in_memory')
+
+  @mock.patch.object(metadata.mlmd, 'MetadataStore')
+  def testWorkerMetadataReusesConnection(self, mock_metadata_store):
+    connection = beam_dag_runner._WorkerMetadata(
+        metadata.sqlite_metadata_connection_config('unused'))
+    for _ in range(3):
+      with connection as m:
+        self.assertIs(m.store, mock_metadata_store.return_value)
+    mock_metadata_store.assert_called_once()
+    connection.close()
+    with self.assertRaises(RuntimeError):
+      _ = connection.store
+
   def testLegacyBeamDagRunnerConstruction(self):
     self.assertIsInstance(beam_dag_runner.BeamDagRunner(),
                           beam_dag_runner.BeamDagRunner)
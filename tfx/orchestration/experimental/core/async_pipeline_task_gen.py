@@ -13,8 +13,10 @@
 # limitations under the License.
 """TaskGenerator implementation for async pipelines."""
 
+import hashlib
 import itertools
-from typing import Callable, List, Optional, Set
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from absl import logging
 from tfx.orchestration import metadata
@@ -22,12 +24,38 @@ from tfx.orchestration.experimental.core import task as task_lib
 from tfx.orchestration.experimental.core import task_gen
 from tfx.orchestration.experimental.core import task_gen_utils
 from tfx.orchestration.portable import execution_publish_utils
+from tfx.orchestration.portable import inputs_utils
 from tfx.orchestration.portable import outputs_utils
 from tfx.orchestration.portable.mlmd import execution_lib
 from tfx.proto.orchestration import pipeline_pb2
 
 from ml_metadata.proto import metadata_store_pb2
 
+# Input watermarks of the nodes for which the last task generation attempt
+# resolved inputs that did not warrant a new execution, keyed by MLMD
+# connection config and node uid. Task generators are created anew for each
+# orchestration loop iteration, so these are kept at module level. Entries of
+# pipelines which are no longer active are dropped by
+# `drop_inactive_pipeline_input_watermarks`.
+_INPUT_WATERMARKS = {}  # type: Dict[Tuple[bytes, task_lib.NodeUid], Any]
+_INPUT_WATERMARKS_LOCK = threading.Lock()
+
+
+def clear_input_watermarks() -> None:
+  """Clears the input watermarks, forcing input resolution for all nodes."""
+  with _INPUT_WATERMARKS_LOCK:
+    _INPUT_WATERMARKS.clear()
+
+
+def drop_inactive_pipeline_input_watermarks(
+    active_pipeline_uids: Iterable[task_lib.PipelineUid]) -> None:
+  """Forgets the input watermarks of the pipelines no longer active."""
+  active_pipeline_uids = set(active_pipeline_uids)
+  with _INPUT_WATERMARKS_LOCK:
+    for key in list(_INPUT_WATERMARKS):
+      if key[1].pipeline_uid not in active_pipeline_uids:
+        del _INPUT_WATERMARKS[key]
+
 
 class AsyncPipelineTaskGenerator(task_gen.TaskGenerator):
   """Task generator for executing an async pipeline.
@@ -117,12 +145,32 @@ class AsyncPipelineTaskGenerator(task_gen.TaskGenerator):
     if result:
       return result
 
+    # Input resolution is skipped if neither the inputs nor the node changed
+    # since the last attempt, which did not generate a task.
+    watermark_key = (metadata_handler.connection_config.SerializeToString(),
+                     task_lib.NodeUid.from_pipeline_node(self._pipeline, node))
+    # The node is fingerprinted rather than kept serialized, to keep the
+    # watermarks small.
+    watermark = (hashlib.sha256(
+        node.SerializeToString(deterministic=True)).hexdigest(),
+                 max((e.id for e in executions), default=0),
+                 inputs_utils.get_input_watermark(metadata_handler,
+                                                  node.inputs))
+    with _INPUT_WATERMARKS_LOCK:
+      if _INPUT_WATERMARKS.get(watermark_key) == watermark:
+        logging.info(
+            'Task not generated for node %s since its inputs did not change.',
+            node.node_info.id)
+        return None
+      _INPUT_WATERMARKS.pop(watermark_key, None)
+
     resolved_info = task_gen_utils.generate_resolved_info(
         metadata_handler, node)
     if resolved_info.input_artifacts is None:
       logging.info(
           'Task cannot be generated for node %s since no input artifacts '
           'are resolved.', node.node_info.id)
+      _set_input_watermark(watermark_key, watermark)
       return None
 
     # If the latest successful execution had the same resolved input artifacts,
@@ -142,6 +190,7 @@ class AsyncPipelineTaskGenerator(task_gen.TaskGenerator):
           a.id
           for a in itertools.chain(*resolved_info.input_artifacts.values()))
       if latest_exec_input_artifact_ids == current_exec_input_artifact_ids:
+        _set_input_watermark(watermark_key, watermark)
         return None
 
     execution = execution_publish_utils.register_execution(
@@ -166,3 +215,9 @@ class AsyncPipelineTaskGenerator(task_gen.TaskGenerator):
         stateful_working_dir=outputs_resolver.get_stateful_working_directory(
             execution.id),
         pipeline=self._pipeline)
+
+
+def _set_input_watermark(key: Tuple[bytes, task_lib.NodeUid],
+                         watermark: Any) -> None:
+  with _INPUT_WATERMARKS_LOCK:
+    _INPUT_WATERMARKS[key] = watermark
@@ -17,10 +17,12 @@
 import os
 
 from absl.testing import parameterized
+import mock
 import tensorflow as tf
 from tfx.orchestration import metadata
 from tfx.orchestration.experimental.core import async_pipeline_task_gen as asptg
 from tfx.orchestration.experimental.core import task as task_lib
+from tfx.orchestration.experimental.core import task_gen_utils
 from tfx.orchestration.experimental.core import task_queue as tq
 from tfx.orchestration.experimental.core import test_utils as otu
 from tfx.proto.orchestration import pipeline_pb2
@@ -66,6 +68,7 @@ class AsyncPipelineTaskGeneratorTest(tu.TfxTest, parameterized.TestCase):
     self._trainer = pipeline.nodes[2].pipeline_node
 
     self._task_queue = tq.TaskQueue()
+    asptg.clear_input_watermarks()
 
   def _verify_exec_node_task(self, node, execution_id, task):
     self.assertEqual(
@@ -340,6 +343,59 @@ class AsyncPipelineTaskGeneratorTest(tu.TfxTest, parameterized.TestCase):
         self._verify_exec_node_task(self._transform, active_executions[0].id,
                                     tasks[0])
 
+  def test_input_resolution_skipped_when_inputs_unchanged(self):
+
+    def _generate():
+      with self._mlmd_connection as m:
+        task_gen = asptg.AsyncPipelineTaskGenerator(
+            m, self._pipeline, self._task_queue.contains_task_id)
+        with mock.patch.object(
+            task_gen_utils,
+            'generate_resolved_info',
+            wraps=task_gen_utils.generate_resolved_info) as mock_resolve:
+          tasks = task_gen.generate()
+      for task in tasks:
+        self._task_queue.enqueue(task)
+      return tasks, mock_resolve.call_count
+
+    # Transform and trainer inputs are resolved, but there are none yet.
+    tasks, num_resolutions = _generate()
+    self.assertEmpty(tasks)
+    self.assertEqual(2, num_resolutions)
+
+    # Inputs have not changed since, so they are not resolved again.
+    tasks, num_resolutions = _generate()
+    self.assertEmpty(tasks)
+    self.assertEqual(0, num_resolutions)
+
+    # An ExampleGen run changes the inputs of both nodes. Only transform has
+    # all its inputs.
+    otu.fake_example_gen_run(self._mlmd_connection, self._example_gen, 1, 1)
+    tasks, num_resolutions = _generate()
+    self.assertEqual(2, num_resolutions)
+    self.assertLen(tasks, 1)
+    self._verify_exec_node_task(self._transform, tasks[0].execution.id,
+                                tasks[0])
+
+    # Trainer inputs are not resolved again until transform completes, and the
+    # transform task is already enqueued.
+    tasks, num_resolutions = _generate()
+    self.assertEmpty(tasks)
+    self.assertEqual(0, num_resolutions)
+
+    # Watermarks of an active pipeline are kept.
+    asptg.drop_inactive_pipeline_input_watermarks(
+        [task_lib.PipelineUid.from_pipeline(self._pipeline)])
+    tasks, num_resolutions = _generate()
+    self.assertEqual(0, num_resolutions)
+
+    # Once the pipeline is inactive its watermarks are dropped, so trainer
+    # inputs are resolved again.
+    asptg.drop_inactive_pipeline_input_watermarks([])
+    tasks, num_resolutions = _generate()
+    self.assertEmpty(tasks)
+    self.assertEqual(1, num_resolutions)
+
 
 if __name__ == '__main__':
   tf.test.main()
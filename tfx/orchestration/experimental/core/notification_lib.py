@@ -0,0 +1,195 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Notifications of MLMD execution updates.
+
+Components of the orchestrator which update executions in MLMD (e.g. the
+`TaskManager` publishing execution results) call `notify_execution_update` so
+that threads waiting for an execution state change can wake up immediately
+instead of polling MLMD at a fixed interval.
+
+Typical usage by a waiter, which avoids missing an update notified between
+reading MLMD and starting to wait:
+
+  while True:
+    version = notification_lib.current_version()
+    if <condition read from MLMD holds>:
+      break
+    notification_lib.wait_for_update(version, timeout_secs)
+
+Updates which are notified along with a pipeline uid are also recorded as
+pending for the orchestration loop, which consumes them with
+`wait_for_updated_pipelines` to generate tasks for the updated pipelines only.
+
+Task schedulers running in other processes can notify updates by sending them
+to a `SocketNotificationListener` of the orchestrator process with
+`send_execution_update`.
+"""
+
+import json
+import socket
+import threading
+from typing import Optional, Set, Tuple
+
+from absl import logging
+from tfx.orchestration.experimental.core import task as task_lib
+
+_condition = threading.Condition()
+# Incremented on every notified execution update.
+_version = 0
+# Uids of the pipelines with updates not yet consumed by
+# `wait_for_updated_pipelines`.
+_pending_pipeline_uids = set()  # type: Set[task_lib.PipelineUid]
+
+# Maximum size of a notification sent over a socket.
+_MAX_MESSAGE_BYTES = 4096
+
+
+def current_version() -> int:
+  """Returns the version of the latest notified execution update."""
+  with _condition:
+    return _version
+
+
+def notify_execution_update(
+    execution_id: Optional[int] = None,
+    pipeline_uid: Optional[task_lib.PipelineUid] = None) -> None:
+  """Wakes up all the threads waiting for an execution update.
+
+  Args:
+    execution_id: Id of the updated execution, if known. Used for logging only.
+    pipeline_uid: Uid of the pipeline of the updated execution, if known. If
+      set, the pipeline is recorded as pending for `wait_for_updated_pipelines`.
+  """
+  global _version
+  logging.debug('Notifying update of execution (id: %s) of pipeline: %s.',
+                execution_id, pipeline_uid)
+  with _condition:
+    _version += 1
+    if pipeline_uid is not None:
+      _pending_pipeline_uids.add(pipeline_uid)
+    _condition.notify_all()
+
+
+def wait_for_update(version: int, timeout_secs: float) -> bool:
+  """Waits until an execution update newer than `version` is notified.
+
+  Args:
+    version: Version returned by `current_version` before the waiter last
+      checked MLMD.
+    timeout_secs: Maximum time to wait in seconds.
+
+  Returns:
+    `True` if an update was notified after `version`, `False` on timeout.
+  """
+  with _condition:
+    return _condition.wait_for(lambda: _version != version, timeout_secs)
+
+
+def wait_for_updated_pipelines(
+    timeout_secs: float) -> Set[task_lib.PipelineUid]:
+  """Waits for and consumes the pipelines with pending execution updates.
+
+  Meant to be called by a single consumer, the orchestration loop.
+
+  Args:
+    timeout_secs: Maximum time to wait in seconds.
+
+  Returns:
+    Uids of the pipelines with execution updates notified since the last call,
+    which are no longer pending. Empty on timeout.
+  """
+  with _condition:
+    _condition.wait_for(lambda: _pending_pipeline_uids, timeout_secs)
+    result = set(_pending_pipeline_uids)
+    _pending_pipeline_uids.clear()
+  return result
+
+
+def send_execution_update(address: Tuple[str, int], execution_id: int,
+                          pipeline_uid: task_lib.PipelineUid) -> None:
+  """Sends an execution update to a `SocketNotificationListener`.
+
+  Delivery is best effort; the orchestration loop still scans MLMD
+  periodically, so a lost notification only delays task generation.
+
+  Args:
+    address: Address of the listener, see `SocketNotificationListener.address`.
+    execution_id: Id of the updated execution.
+    pipeline_uid: Uid of the pipeline of the updated execution.
+  """
+  message = json.dumps({
+      'execution_id': execution_id,
+      'pipeline_id': pipeline_uid.pipeline_id,
+      'pipeline_run_id': pipeline_uid.pipeline_run_id,
+  }).encode('utf-8')
+  with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+    sock.sendto(message, address)
+
+
+class SocketNotificationListener:
+  """Receives execution updates from other processes over a local socket.
+
+  Received updates are notified in-process with `notify_execution_update`. The
+  listener only binds to the loopback interface. Can be used as a context
+  manager.
+  """
+
+  def __init__(self, port: int = 0):
+    """Constructs and starts a `SocketNotificationListener`.
+
+    Args:
+      port: Port to listen on. If 0 (default), any free port is used.
+    """
+    self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    self._socket.bind(('127.0.0.1', port))
+    # Periodically wakes up the listener thread to check for `close`.
+    self._socket.settimeout(1.0)
+    self._stop_event = threading.Event()
+    self._thread = threading.Thread(target=self._listen, daemon=True)
+    self._thread.start()
+
+  @property
+  def address(self) -> Tuple[str, int]:
+    """Returns the address to pass to `send_execution_update`."""
+    return self._socket.getsockname()
+
+  def close(self) -> None:
+    """Stops listening."""
+    self._stop_event.set()
+    self._thread.join()
+    self._socket.close()
+
+  def __enter__(self) -> 'SocketNotificationListener':
+    return self
+
+  def __exit__(self, exc_type, exc_val, exc_tb):
+    self.close()
+
+  def _listen(self) -> None:
+    while not self._stop_event.is_set():
+      try:
+        message, _ = self._socket.recvfrom(_MAX_MESSAGE_BYTES)
+      except socket.timeout:
+        continue
+      try:
+        update = json.loads(message.decode('utf-8'))
+        pipeline_uid = task_lib.PipelineUid(
+            pipeline_id=update['pipeline_id'],
+            pipeline_run_id=update.get('pipeline_run_id'))
+        execution_id = update.get('execution_id')
+      except (ValueError, KeyError, TypeError) as e:
+        logging.warning('Ignoring malformed execution update %r: %s', message,
+                        e)
+        continue
+      notify_execution_update(execution_id, pipeline_uid)
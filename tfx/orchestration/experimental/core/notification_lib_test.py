@@ -0,0 +1,70 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.orchestration.experimental.core.notification_lib."""
+
+import threading
+
+import tensorflow as tf
+from tfx.orchestration.experimental.core import notification_lib
+from tfx.orchestration.experimental.core import task as task_lib
+
+
+class NotificationLibTest(tf.test.TestCase):
+
+  def test_wait_for_update_times_out(self):
+    version = notification_lib.current_version()
+    self.assertFalse(notification_lib.wait_for_update(version, 0.1))
+
+  def test_wait_for_update_returns_on_notification(self):
+    version = notification_lib.current_version()
+    timer = threading.Timer(
+        0.1, notification_lib.notify_execution_update, args=(1,))
+    timer.start()
+    self.assertTrue(notification_lib.wait_for_update(version, 30.0))
+    timer.join()
+    self.assertGreater(notification_lib.current_version(), version)
+
+  def test_update_before_wait_is_not_missed(self):
+    version = notification_lib.current_version()
+    notification_lib.notify_execution_update()
+    self.assertTrue(notification_lib.wait_for_update(version, 0.0))
+
+  def test_wait_for_updated_pipelines(self):
+    # Consumes any updates pending from other tests.
+    notification_lib.wait_for_updated_pipelines(0.0)
+
+    pipeline_uid1 = task_lib.PipelineUid(
+        pipeline_id='pipeline1', pipeline_run_id=None)
+    pipeline_uid2 = task_lib.PipelineUid(
+        pipeline_id='pipeline2', pipeline_run_id=None)
+    notification_lib.notify_execution_update(1, pipeline_uid1)
+    notification_lib.notify_execution_update(2, pipeline_uid2)
+    # Updates without a pipeline uid are not pending.
+    notification_lib.notify_execution_update(3)
+    self.assertEqual({pipeline_uid1, pipeline_uid2},
+                     notification_lib.wait_for_updated_pipelines(30.0))
+    self.assertEqual(set(), notification_lib.wait_for_updated_pipelines(0.1))
+
+  def test_socket_notification_listener(self):
+    notification_lib.wait_for_updated_pipelines(0.0)
+    pipeline_uid = task_lib.PipelineUid(
+        pipeline_id='pipeline1', pipeline_run_id='run1')
+    with notification_lib.SocketNotificationListener() as listener:
+      notification_lib.send_execution_update(listener.address, 1, pipeline_uid)
+      self.assertEqual({pipeline_uid},
+                       notification_lib.wait_for_updated_pipelines(30.0))
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -13,15 +13,19 @@
 # limitations under the License.
 """Pipeline-level operations."""
 
+import collections
+from concurrent import futures
+import contextlib
 import copy
 import functools
 import threading
 import time
-from typing import List, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from absl import logging
 from tfx.orchestration import metadata
 from tfx.orchestration.experimental.core import async_pipeline_task_gen
+from tfx.orchestration.experimental.core import notification_lib
 from tfx.orchestration.experimental.core import pipeline_state as pstate
 from tfx.orchestration.experimental.core import status as status_lib
 from tfx.orchestration.experimental.core import sync_pipeline_task_gen
@@ -33,20 +37,55 @@ from tfx.proto.orchestration import pipeline_pb2
 
 from ml_metadata.proto import metadata_store_pb2
 
-# A coarse grained lock is used to ensure serialization of pipeline operations
-# since there isn't a suitable MLMD transaction API.
-_PIPELINE_OPS_LOCK = threading.RLock()
-
-
-def _pipeline_ops_lock(fn):
-  """Decorator to run `fn` within `_PIPELINE_OPS_LOCK` context."""
+# Pipeline operations are serialized per pipeline uid, since there isn't a
+# suitable MLMD transaction API. `_PIPELINE_OPS_LOCK` only guards the lookup of
+# the per-pipeline locks and is never held during MLMD calls, so that an
+# operation on one pipeline does not block operations on other pipelines.
+_PIPELINE_OPS_LOCK = threading.Lock()
+# Both of the below are keyed by orchestrator context name, which identifies the
+# pipeline state of a pipeline uid in MLMD.
+_PIPELINE_LOCKS = {}  # type: Dict[str, threading.RLock]
+# Number of completed operations per pipeline, any of which may have updated its
+# pipeline state in MLMD. Used by `generate_tasks` to detect pipeline states
+# which were modified after they were loaded.
+_PIPELINE_GENERATIONS = collections.Counter()  # type: Dict[str, int]
+# Latest task generation latency in seconds of each active pipeline, for
+# monitoring.
+_PIPELINE_TICK_LATENCIES = {}  # type: Dict[task_lib.PipelineUid, float]
+# Task generation for a pipeline taking longer than this is logged as a warning.
+_SLOW_PIPELINE_TICK_SECS = 10.0
+
+# Thread pool generating the tasks of several pipelines concurrently. It is
+# reused across calls of `generate_tasks` so that its threads keep their MLMD
+# connections.
+_TASK_GEN_POOL_LOCK = threading.Lock()
+_task_gen_pool = None  # type: Optional[futures.ThreadPoolExecutor]
+_task_gen_pool_size = 0
+# Holds the MLMD connection of each thread of `_task_gen_pool`.
+_task_gen_thread_local = threading.local()
+
+# Time of the last call of `wait_and_generate_tasks` which generated tasks for
+# all the active pipelines.
+_last_full_scan_time = 0.0
+
+
+@contextlib.contextmanager
+def _pipeline_lock(pipeline_uid: task_lib.PipelineUid) -> Iterator[None]:
+  """Context manager to serialize operations on the given pipeline."""
+  key = pstate.orchestrator_context_name(pipeline_uid)
+  with _PIPELINE_OPS_LOCK:
+    lock = _PIPELINE_LOCKS.setdefault(key, threading.RLock())
+  with lock:
+    try:
+      yield
+    finally:
+      with _PIPELINE_OPS_LOCK:
+        _PIPELINE_GENERATIONS[key] += 1
 
-  @functools.wraps(fn)
-  def _wrapper(*args, **kwargs):
-    with _PIPELINE_OPS_LOCK:
-      return fn(*args, **kwargs)
 
-  return _wrapper
+def _pipeline_generation(pipeline_uid: task_lib.PipelineUid) -> int:
+  with _PIPELINE_OPS_LOCK:
+    return _PIPELINE_GENERATIONS[pstate.orchestrator_context_name(pipeline_uid)]
 
 
 def _to_status_not_ok_error(fn):
@@ -68,10 +107,10 @@ def _to_status_not_ok_error(fn):
 
 
 @_to_status_not_ok_error
-@_pipeline_ops_lock
 def initiate_pipeline_start(
     mlmd_handle: metadata.Metadata,
-    pipeline: pipeline_pb2.Pipeline) -> pstate.PipelineState:
+    pipeline: pipeline_pb2.Pipeline,
+    compress_ir: bool = False) -> pstate.PipelineState:
   """Initiates a pipeline start operation.
 
   Upon success, MLMD is updated to signal that the given pipeline must be
@@ -80,6 +119,7 @@ def initiate_pipeline_start(
   Args:
     mlmd_handle: A handle to the MLMD db.
     pipeline: IR of the pipeline to start.
+    compress_ir: If `True`, the pipeline IR is stored compressed in MLMD.
 
   Returns:
     The `PipelineState` object upon success.
@@ -88,8 +128,12 @@ def initiate_pipeline_start(
     status_lib.StatusNotOkError: Failure to initiate pipeline start or if
       execution is not inactive after waiting `timeout_secs`.
   """
-  with pstate.PipelineState.new(mlmd_handle, pipeline) as pipeline_state:
-    pass
+  with _pipeline_lock(task_lib.PipelineUid.from_pipeline(pipeline)):
+    with pstate.PipelineState.new(
+        mlmd_handle, pipeline, compress_ir=compress_ir) as pipeline_state:
+      pass
+  notification_lib.notify_execution_update(pipeline_state.execution.id,
+                                           pipeline_state.pipeline_uid)
   return pipeline_state
 
 
@@ -114,20 +158,24 @@ def stop_pipeline(
   Raises:
     status_lib.StatusNotOkError: Failure to initiate pipeline stop.
   """
-  with _PIPELINE_OPS_LOCK:
+  with _pipeline_lock(pipeline_uid):
     with pstate.PipelineState.load(mlmd_handle, pipeline_uid) as pipeline_state:
       pipeline_state.initiate_stop()
+  notification_lib.notify_execution_update(pipeline_state.execution.id,
+                                           pipeline_uid)
   _wait_for_inactivation(
       mlmd_handle, pipeline_state.execution, timeout_secs=timeout_secs)
 
 
 @_to_status_not_ok_error
-@_pipeline_ops_lock
 def initiate_node_start(mlmd_handle: metadata.Metadata,
                         node_uid: task_lib.NodeUid) -> pstate.PipelineState:
-  with pstate.PipelineState.load(mlmd_handle,
-                                 node_uid.pipeline_uid) as pipeline_state:
-    pipeline_state.initiate_node_start(node_uid)
+  with _pipeline_lock(node_uid.pipeline_uid):
+    with pstate.PipelineState.load(mlmd_handle,
+                                   node_uid.pipeline_uid) as pipeline_state:
+      pipeline_state.initiate_node_start(node_uid)
+  notification_lib.notify_execution_update(pipeline_state.execution.id,
+                                           node_uid.pipeline_uid)
   return pipeline_state
 
 
@@ -149,7 +197,7 @@ def stop_node(
   Raises:
     status_lib.StatusNotOkError: Failure to stop the node.
   """
-  with _PIPELINE_OPS_LOCK:
+  with _pipeline_lock(node_uid.pipeline_uid):
     with pstate.PipelineState.load(mlmd_handle,
                                    node_uid.pipeline_uid) as pipeline_state:
       nodes = pstate.get_all_pipeline_nodes(pipeline_state.pipeline)
@@ -162,6 +210,8 @@ def stop_node(
                 f'{node_uid}'))
       node = filtered_nodes[0]
       pipeline_state.initiate_node_stop(node_uid)
+    notification_lib.notify_execution_update(pipeline_state.execution.id,
+                                             node_uid.pipeline_uid)
 
     executions = task_gen_utils.get_executions(mlmd_handle, node)
     active_executions = [
@@ -186,6 +236,10 @@ def _wait_for_inactivation(
     timeout_secs: float = DEFAULT_WAIT_FOR_INACTIVATION_TIMEOUT_SECS) -> None:
   """Waits for the given execution to become inactive.
 
+  Wakes up as soon as an execution update is notified via `notification_lib`,
+  e.g. when the `TaskManager` publishes execution results. MLMD is also polled
+  at a coarse interval to observe updates made by other processes.
+
   Args:
     mlmd_handle: A handle to the MLMD db.
     execution: Execution whose inactivation is waited.
@@ -198,10 +252,13 @@ def _wait_for_inactivation(
   polling_interval_secs = min(10.0, timeout_secs / 4)
   end_time = time.time() + timeout_secs
   while end_time - time.time() > 0:
+    # The version must be read before MLMD so that no update is missed.
+    version = notification_lib.current_version()
     updated_executions = mlmd_handle.store.get_executions_by_id([execution.id])
     if not execution_lib.is_execution_active(updated_executions[0]):
       return
-    time.sleep(max(0, min(polling_interval_secs, end_time - time.time())))
+    notification_lib.wait_for_update(
+        version, max(0, min(polling_interval_secs, end_time - time.time())))
   raise status_lib.StatusNotOkError(
       code=status_lib.Code.DEADLINE_EXCEEDED,
       message=(f'Timed out ({timeout_secs} secs) waiting for execution '
@@ -209,9 +266,11 @@ def _wait_for_inactivation(
 
 
 @_to_status_not_ok_error
-@_pipeline_ops_lock
-def generate_tasks(mlmd_handle: metadata.Metadata,
-                   task_queue: tq.TaskQueue) -> None:
+def generate_tasks(
+    mlmd_handle: metadata.Metadata,
+    task_queue: tq.TaskQueue,
+    max_parallelism: int = 1,
+    pipeline_uids: Optional[Iterable[task_lib.PipelineUid]] = None) -> None:
   """Generates and enqueues tasks to be performed.
 
   Embodies the core functionality of the main orchestration loop that scans MLMD
@@ -220,119 +279,317 @@ def generate_tasks(mlmd_handle: metadata.Metadata,
   Args:
     mlmd_handle: A handle to the MLMD db.
     task_queue: A `TaskQueue` instance into which any tasks will be enqueued.
+    max_parallelism: Maximum number of pipelines for which tasks are generated
+      concurrently. If greater than 1, tasks for each pipeline are generated in
+      a thread pool whose threads each keep their own MLMD connection. Tasks
+      are enqueued in the same order as with sequential generation.
+    pipeline_uids: If set, tasks are only generated for the active pipelines
+      with these uids.
 
   Raises:
-    status_lib.StatusNotOkError: If error generating tasks.
+    status_lib.StatusNotOkError: If error generating tasks. If generating the
+      tasks of a pipeline fails, the tasks of the other pipelines are still
+      generated and enqueued before the first error is raised.
   """
+  # Pipeline states are loaded in a batch without holding the pipeline locks.
+  # The generations are read before loading so that any pipeline state modified
+  # concurrently by another pipeline operation is detected and reloaded.
+  with _PIPELINE_OPS_LOCK:
+    generations = dict(_PIPELINE_GENERATIONS)
   pipeline_states = _get_pipeline_states(mlmd_handle)
+  active_pipeline_uids = [state.pipeline_uid for state in pipeline_states]
+  _drop_inactive_pipeline_tick_latencies(active_pipeline_uids)
+  async_pipeline_task_gen.drop_inactive_pipeline_input_watermarks(
+      active_pipeline_uids)
+  if pipeline_uids is not None:
+    context_names = set(
+        pstate.orchestrator_context_name(uid) for uid in pipeline_uids)
+    pipeline_states = [
+        state for state in pipeline_states
+        if pstate.orchestrator_context_name(state.pipeline_uid) in context_names
+    ]
   if not pipeline_states:
     logging.info('No active pipelines to run.')
     return
 
-  active_pipeline_states = []
-  stop_initiated_pipeline_states = []
-  for pipeline_state in pipeline_states:
-    if pipeline_state.is_stop_initiated():
-      stop_initiated_pipeline_states.append(pipeline_state)
-    elif execution_lib.is_execution_active(pipeline_state.execution):
-      active_pipeline_states.append(pipeline_state)
-    else:
-      raise status_lib.StatusNotOkError(
-          code=status_lib.Code.INTERNAL,
-          message=(f'Found pipeline (uid: {pipeline_state.pipeline_uid}) which '
-                   f'is neither active nor stop-initiated.'))
-
-  if stop_initiated_pipeline_states:
-    logging.info(
-        'Stop-initiated pipeline uids:\n%s', '\n'.join(
-            str(pipeline_state.pipeline_uid)
-            for pipeline_state in stop_initiated_pipeline_states))
-    _process_stop_initiated_pipelines(mlmd_handle, task_queue,
-                                      stop_initiated_pipeline_states)
-  if active_pipeline_states:
-    logging.info(
-        'Active (excluding stop-initiated) pipeline uids:\n%s', '\n'.join(
-            str(pipeline_state.pipeline_uid)
-            for pipeline_state in active_pipeline_states))
-    _process_active_pipelines(mlmd_handle, task_queue, active_pipeline_states)
+  # Callables returning the tasks of each pipeline, in order.
+  if min(max_parallelism, len(pipeline_states)) > 1:
+    pool = _get_task_gen_pool(max_parallelism)
+    get_tasks_fns = [
+        pool.submit(_generate_pipeline_tasks_with_thread_connection,
+                    mlmd_handle.connection_config, task_queue, generations,
+                    pipeline_state).result
+        for pipeline_state in pipeline_states
+    ]
+  else:
+    get_tasks_fns = [
+        functools.partial(_generate_pipeline_tasks, mlmd_handle, task_queue,
+                          generations, pipeline_state)
+        for pipeline_state in pipeline_states
+    ]
+
+  # The tasks of each pipeline are enqueued as soon as they are generated, and
+  # a pipeline failing to generate tasks does not prevent enqueuing the tasks
+  # of the other pipelines. The first error is raised once all the pipelines
+  # are processed.
+  first_error = None
+  for pipeline_state, get_tasks_fn in zip(pipeline_states, get_tasks_fns):
+    try:
+      tasks = get_tasks_fn()
+    except Exception as e:  # pylint: disable=broad-except
+      logging.exception('Failed to generate tasks for pipeline with uid %s.',
+                        pipeline_state.pipeline_uid)
+      if first_error is None:
+        first_error = e
+      continue
+    for task in tasks:
+      task_queue.enqueue(task)
+  if first_error is not None:
+    raise first_error
+
+
+def wait_and_generate_tasks(mlmd_handle: metadata.Metadata,
+                            task_queue: tq.TaskQueue,
+                            max_wait_secs: float,
+                            max_parallelism: int = 1) -> None:
+  """Generates tasks as soon as executions are updated, or after a timeout.
+
+  Meant to be called repeatedly by the orchestration loop instead of sleeping
+  between calls to `generate_tasks`. Returns as soon as an execution update or
+  a pipeline operation is notified via `notification_lib` (e.g. the
+  `TaskManager` publishing execution results), after generating tasks only for
+  the updated pipelines. Tasks are generated for all the active pipelines at
+  least every `max_wait_secs`, even if updates keep being notified, which also
+  covers updates made without a notification (e.g. new input data of async
+  pipelines).
+
+  Args:
+    mlmd_handle: A handle to the MLMD db.
+    task_queue: A `TaskQueue` instance into which any tasks will be enqueued.
+    max_wait_secs: Maximum time between two task generations for all the active
+      pipelines.
+    max_parallelism: See `generate_tasks`.
+
+  Raises:
+    status_lib.StatusNotOkError: If error generating tasks.
+  """
+  global _last_full_scan_time
+  pipeline_uids = notification_lib.wait_for_updated_pipelines(
+      max(0.0, _last_full_scan_time + max_wait_secs - time.time()))
+  if time.time() - _last_full_scan_time >= max_wait_secs:
+    pipeline_uids = None
+    _last_full_scan_time = time.time()
+  elif pipeline_uids:
+    logging.info('Generating tasks for updated pipelines: %s',
+                 ', '.join(str(uid) for uid in pipeline_uids))
+  else:
+    return
+  generate_tasks(
+      mlmd_handle,
+      task_queue,
+      max_parallelism=max_parallelism,
+      pipeline_uids=pipeline_uids)
+
+
+def get_pipeline_tick_latencies() -> Dict[task_lib.PipelineUid, float]:
+  """Returns the latest task generation latency in seconds of each pipeline."""
+  with _PIPELINE_OPS_LOCK:
+    return dict(_PIPELINE_TICK_LATENCIES)
 
 
 def _get_pipeline_states(
     mlmd_handle: metadata.Metadata) -> List[pstate.PipelineState]:
   """Scans MLMD and returns pipeline states."""
-  contexts = pstate.get_orchestrator_contexts(mlmd_handle)
-  result = []
-  for context in contexts:
-    try:
-      pipeline_state = pstate.PipelineState.load_from_orchestrator_context(
-          mlmd_handle, context)
-    except status_lib.StatusNotOkError as e:
-      if e.code == status_lib.Code.NOT_FOUND:
-        # Ignore any old contexts with no associated active pipelines.
-        logging.info(e.message)
-        continue
-      else:
+  return pstate.PipelineState.load_all_active(mlmd_handle)
+
+
+def _drop_inactive_pipeline_tick_latencies(
+    active_pipeline_uids: Iterable[task_lib.PipelineUid]) -> None:
+  """Forgets the tick latencies of the pipelines which are no longer active."""
+  active_pipeline_uids = set(active_pipeline_uids)
+  with _PIPELINE_OPS_LOCK:
+    for pipeline_uid in list(_PIPELINE_TICK_LATENCIES):
+      if pipeline_uid not in active_pipeline_uids:
+        del _PIPELINE_TICK_LATENCIES[pipeline_uid]
+
+
+def _get_task_gen_pool(max_workers: int) -> futures.ThreadPoolExecutor:
+  """Returns the task generation thread pool, of the given size."""
+  global _task_gen_pool, _task_gen_pool_size
+  with _TASK_GEN_POOL_LOCK:
+    if _task_gen_pool is None or _task_gen_pool_size != max_workers:
+      if _task_gen_pool is not None:
+        _task_gen_pool.shutdown(wait=False)
+      _task_gen_pool = futures.ThreadPoolExecutor(
+          max_workers=max_workers, thread_name_prefix='generate_tasks')
+      _task_gen_pool_size = max_workers
+    return _task_gen_pool
+
+
+def _generate_pipeline_tasks_with_thread_connection(
+    connection_config: metadata.ConnectionConfigType, task_queue: tq.TaskQueue,
+    generations: Dict[str, int],
+    pipeline_state: pstate.PipelineState) -> List[task_lib.Task]:
+  """Same as `_generate_pipeline_tasks` with the MLMD connection of the thread.
+
+  The connection is opened on the first call in a thread of `_task_gen_pool`
+  and reused by the later calls in that thread. It is reopened after an error,
+  in case the error left it unusable.
+
+  Args:
+    connection_config: Connection config of MLMD.
+    task_queue: See `_generate_pipeline_tasks`.
+    generations: See `_generate_pipeline_tasks`.
+    pipeline_state: See `_generate_pipeline_tasks`.
+
+  Returns:
+    The tasks to be enqueued, in order.
+  """
+  mlmd_handle = getattr(_task_gen_thread_local, 'mlmd_handle', None)
+  if (mlmd_handle is None or
+      mlmd_handle.connection_config != connection_config):
+    mlmd_handle = metadata.Metadata(connection_config).__enter__()
+    _task_gen_thread_local.mlmd_handle = mlmd_handle
+  try:
+    return _generate_pipeline_tasks(mlmd_handle, task_queue, generations,
+                                    pipeline_state)
+  except Exception:
+    mlmd_handle.__exit__(None, None, None)
+    _task_gen_thread_local.mlmd_handle = None
+    raise
+
+
+def _generate_pipeline_tasks(
+    mlmd_handle: metadata.Metadata, task_queue: tq.TaskQueue,
+    generations: Dict[str, int],
+    pipeline_state: pstate.PipelineState) -> List[task_lib.Task]:
+  """Generates the tasks of a pipeline, within the pipeline's lock.
+
+  Args:
+    mlmd_handle: A handle to the MLMD db.
+    task_queue: The `TaskQueue` into which the returned tasks will be enqueued.
+    generations: Pipeline generations read before `pipeline_state` was loaded.
+    pipeline_state: Pipeline state of the pipeline.
+
+  Returns:
+    The tasks to be enqueued, in order.
+  """
+  pipeline_uid = pipeline_state.pipeline_uid
+  start_time = time.time()
+  with _pipeline_lock(pipeline_uid):
+    if _pipeline_generation(pipeline_uid) != generations.get(
+        pstate.orchestrator_context_name(pipeline_uid), 0):
+      try:
+        pipeline_state = pstate.PipelineState.load(mlmd_handle, pipeline_uid)
+      except status_lib.StatusNotOkError as e:
+        if e.code == status_lib.Code.NOT_FOUND:
+          # The pipeline was inactivated since the states were loaded.
+          logging.info(e.message)
+          with _PIPELINE_OPS_LOCK:
+            _PIPELINE_TICK_LATENCIES.pop(pipeline_uid, None)
+          return []
         raise
-    result.append(pipeline_state)
-  return result
+    tasks = _process_pipeline(mlmd_handle, task_queue, pipeline_state)
+  latency_secs = time.time() - start_time
+  with _PIPELINE_OPS_LOCK:
+    _PIPELINE_TICK_LATENCIES[pipeline_uid] = latency_secs
+  if latency_secs > _SLOW_PIPELINE_TICK_SECS:
+    logging.warning(
+        'Task generation for pipeline with uid %s took %.3f secs.',
+        pipeline_uid, latency_secs)
+  else:
+    logging.info('Task generation for pipeline with uid %s took %.3f secs.',
+                 pipeline_uid, latency_secs)
+  return tasks
+
+
+def _process_pipeline(
+    mlmd_handle: metadata.Metadata, task_queue: tq.TaskQueue,
+    pipeline_state: pstate.PipelineState) -> List[task_lib.Task]:
+  """Processes a pipeline and returns the tasks to be enqueued."""
+  if pipeline_state.is_stop_initiated():
+    logging.info('Processing stop-initiated pipeline with uid: %s',
+                 pipeline_state.pipeline_uid)
+    return _process_stop_initiated_pipeline(mlmd_handle, task_queue,
+                                            pipeline_state)
+  elif execution_lib.is_execution_active(pipeline_state.execution):
+    logging.info('Processing active pipeline with uid: %s',
+                 pipeline_state.pipeline_uid)
+    return _process_active_pipeline(mlmd_handle, task_queue, pipeline_state)
+  else:
+    raise status_lib.StatusNotOkError(
+        code=status_lib.Code.INTERNAL,
+        message=(f'Found pipeline (uid: {pipeline_state.pipeline_uid}) which '
+                 f'is neither active nor stop-initiated.'))
 
 
-def _process_stop_initiated_pipelines(
+def _process_stop_initiated_pipeline(
     mlmd_handle: metadata.Metadata, task_queue: tq.TaskQueue,
-    pipeline_states: Sequence[pstate.PipelineState]) -> None:
-  """Processes stop initiated pipelines."""
-  for pipeline_state in pipeline_states:
-    pipeline = pipeline_state.pipeline
-    execution = pipeline_state.execution
-    has_active_executions = False
-    for node in pstate.get_all_pipeline_nodes(pipeline):
-      if _maybe_enqueue_cancellation_task(mlmd_handle, pipeline, node,
-                                          task_queue):
-        has_active_executions = True
-    if not has_active_executions:
-      updated_execution = copy.deepcopy(execution)
-      updated_execution.last_known_state = metadata_store_pb2.Execution.CANCELED
-      mlmd_handle.store.put_executions([updated_execution])
-
-
-def _process_active_pipelines(
+    pipeline_state: pstate.PipelineState) -> List[task_lib.Task]:
+  """Processes a stop initiated pipeline."""
+  pipeline = pipeline_state.pipeline
+  execution = pipeline_state.execution
+  tasks = []
+  for node in pstate.get_all_pipeline_nodes(pipeline):
+    task = _maybe_generate_cancellation_task(mlmd_handle, pipeline, node,
+                                             task_queue)
+    if task:
+      tasks.append(task)
+  if not tasks:
+    updated_execution = copy.deepcopy(execution)
+    updated_execution.last_known_state = metadata_store_pb2.Execution.CANCELED
+    mlmd_handle.store.put_executions([updated_execution])
+    notification_lib.notify_execution_update(execution.id,
+                                             pipeline_state.pipeline_uid)
+  return tasks
+
+
+def _process_active_pipeline(
     mlmd_handle: metadata.Metadata, task_queue: tq.TaskQueue,
-    pipeline_states: Sequence[pstate.PipelineState]) -> None:
-  """Processes active pipelines."""
-  for pipeline_state in pipeline_states:
-    pipeline = pipeline_state.pipeline
-    execution = pipeline_state.execution
-    assert execution.last_known_state in (metadata_store_pb2.Execution.NEW,
-                                          metadata_store_pb2.Execution.RUNNING)
-    if execution.last_known_state != metadata_store_pb2.Execution.RUNNING:
-      updated_execution = copy.deepcopy(execution)
-      updated_execution.last_known_state = metadata_store_pb2.Execution.RUNNING
-      mlmd_handle.store.put_executions([updated_execution])
-
-    # Create cancellation tasks for stop-initiated nodes if necessary.
-    stop_initiated_nodes = _get_stop_initiated_nodes(pipeline_state)
-    for node in stop_initiated_nodes:
-      _maybe_enqueue_cancellation_task(mlmd_handle, pipeline, node, task_queue)
-
-    # Initialize task generator for the pipeline.
-    if pipeline.execution_mode == pipeline_pb2.Pipeline.SYNC:
-      generator = sync_pipeline_task_gen.SyncPipelineTaskGenerator(
-          mlmd_handle, pipeline, task_queue.contains_task_id)
-    elif pipeline.execution_mode == pipeline_pb2.Pipeline.ASYNC:
-      generator = async_pipeline_task_gen.AsyncPipelineTaskGenerator(
-          mlmd_handle, pipeline, task_queue.contains_task_id,
-          set(n.node_info.id for n in stop_initiated_nodes))
-    else:
-      raise status_lib.StatusNotOkError(
-          code=status_lib.Code.FAILED_PRECONDITION,
-          message=(
-              f'Only SYNC and ASYNC pipeline execution modes supported; '
-              f'found pipeline with execution mode: {pipeline.execution_mode}'))
+    pipeline_state: pstate.PipelineState) -> List[task_lib.Task]:
+  """Processes an active pipeline."""
+  pipeline = pipeline_state.pipeline
+  execution = pipeline_state.execution
+  assert execution.last_known_state in (metadata_store_pb2.Execution.NEW,
+                                        metadata_store_pb2.Execution.RUNNING)
+  if execution.last_known_state != metadata_store_pb2.Execution.RUNNING:
+    updated_execution = copy.deepcopy(execution)
+    updated_execution.last_known_state = metadata_store_pb2.Execution.RUNNING
+    mlmd_handle.store.put_executions([updated_execution])
+
+  # Create cancellation tasks for stop-initiated nodes if necessary.
+  tasks = []
+  stop_initiated_nodes = _get_stop_initiated_nodes(pipeline_state)
+  for node in stop_initiated_nodes:
+    task = _maybe_generate_cancellation_task(mlmd_handle, pipeline, node,
+                                             task_queue)
+    if task:
+      tasks.append(task)
+
+  # Tasks of this pipeline which are not yet enqueued are considered enqueued
+  # by the task generator.
+  task_ids = set(task.task_id for task in tasks)
+
+  def _is_task_id_tracked(task_id: task_lib.TaskId) -> bool:
+    return task_id in task_ids or task_queue.contains_task_id(task_id)
+
+  # Initialize task generator for the pipeline.
+  if pipeline.execution_mode == pipeline_pb2.Pipeline.SYNC:
+    generator = sync_pipeline_task_gen.SyncPipelineTaskGenerator(
+        mlmd_handle, pipeline, _is_task_id_tracked)
+  elif pipeline.execution_mode == pipeline_pb2.Pipeline.ASYNC:
+    generator = async_pipeline_task_gen.AsyncPipelineTaskGenerator(
+        mlmd_handle, pipeline, _is_task_id_tracked,
+        set(n.node_info.id for n in stop_initiated_nodes))
+  else:
+    raise status_lib.StatusNotOkError(
+        code=status_lib.Code.FAILED_PRECONDITION,
+        message=(
+            f'Only SYNC and ASYNC pipeline execution modes supported; '
+            f'found pipeline with execution mode: {pipeline.execution_mode}'))
 
-    # TODO(goutham): Consider concurrent task generation.
-    tasks = generator.generate()
-    for task in tasks:
-      task_queue.enqueue(task)
+  tasks.extend(generator.generate())
+  return tasks
 
 
 def _get_stop_initiated_nodes(
@@ -348,43 +605,36 @@ def _get_stop_initiated_nodes(
   return result
 
 
-def _maybe_enqueue_cancellation_task(mlmd_handle: metadata.Metadata,
-                                     pipeline: pipeline_pb2.Pipeline,
-                                     node: pipeline_pb2.PipelineNode,
-                                     task_queue: tq.TaskQueue) -> bool:
-  """Enqueues a node cancellation task if not already stopped.
+def _maybe_generate_cancellation_task(
+    mlmd_handle: metadata.Metadata, pipeline: pipeline_pb2.Pipeline,
+    node: pipeline_pb2.PipelineNode,
+    task_queue: tq.TaskQueue) -> Optional[task_lib.Task]:
+  """Generates a node cancellation task if not already stopped.
 
   If the node has an ExecNodeTask in the task queue, issue a cancellation.
   Otherwise, if the node has an active execution in MLMD but no ExecNodeTask
   enqueued, it may be due to orchestrator restart after stopping was initiated
-  but before the schedulers could finish. So, enqueue an ExecNodeTask with
+  but before the schedulers could finish. So, generate an ExecNodeTask with
   is_cancelled set to give a chance for the scheduler to finish gracefully.
 
   Args:
     mlmd_handle: A handle to the MLMD db.
     pipeline: The pipeline containing the node to cancel.
     node: The node to cancel.
-    task_queue: A `TaskQueue` instance into which any cancellation tasks will be
+    task_queue: The `TaskQueue` into which any cancellation task will be
       enqueued.
 
   Returns:
-    `True` if a cancellation task was enqueued. `False` if node is already
-    stopped or no cancellation was required.
+    The cancellation task to be enqueued. `None` if node is already stopped or
+    no cancellation was required.
   """
   if not task_gen_utils.is_feasible_node(node):
-    return False
+    return None
   exec_node_task_id = task_lib.exec_node_task_id_from_pipeline_node(
       pipeline, node)
   if task_queue.contains_task_id(exec_node_task_id):
-    task_queue.enqueue(
-        task_lib.CancelNodeTask(
-            node_uid=task_lib.NodeUid.from_pipeline_node(pipeline, node)))
-    return True
-  else:
-    executions = task_gen_utils.get_executions(mlmd_handle, node)
-    exec_node_task = task_gen_utils.generate_task_from_active_execution(
-        mlmd_handle, pipeline, node, executions, is_cancelled=True)
-    if exec_node_task:
-      task_queue.enqueue(exec_node_task)
-      return True
-  return False
+    return task_lib.CancelNodeTask(
+        node_uid=task_lib.NodeUid.from_pipeline_node(pipeline, node))
+  executions = task_gen_utils.get_executions(mlmd_handle, node)
+  return task_gen_utils.generate_task_from_active_execution(
+      mlmd_handle, pipeline, node, executions, is_cancelled=True)
@@ -22,6 +22,7 @@ from absl.testing.absltest import mock
 import tensorflow as tf
 from tfx.orchestration import metadata
 from tfx.orchestration.experimental.core import async_pipeline_task_gen
+from tfx.orchestration.experimental.core import notification_lib
 from tfx.orchestration.experimental.core import pipeline_ops
 from tfx.orchestration.experimental.core import pipeline_state as pstate
 from tfx.orchestration.experimental.core import status as status_lib
@@ -123,9 +124,11 @@ class PipelineOpsTest(tu.TfxTest):
       pipeline1 = _test_pipeline('pipeline1')
       execution = pipeline_ops.initiate_pipeline_start(m, pipeline1).execution
 
+      pipeline_uid = task_lib.PipelineUid.from_pipeline(pipeline1)
+
       def _inactivate(execution):
         time.sleep(2.0)
-        with pipeline_ops._PIPELINE_OPS_LOCK:
+        with pipeline_ops._pipeline_lock(pipeline_uid):
           execution.last_known_state = metadata_store_pb2.Execution.COMPLETE
           m.store.put_executions([execution])
 
@@ -133,11 +136,60 @@ class PipelineOpsTest(tu.TfxTest):
           target=_inactivate, args=(copy.deepcopy(execution),))
       thread.start()
 
+      pipeline_ops.stop_pipeline(m, pipeline_uid, timeout_secs=5.0)
+
+      thread.join()
+
+  def test_stop_pipeline_wakes_up_on_execution_update_notification(self):
+    with self._mlmd_connection as m:
+      pipeline1 = _test_pipeline('pipeline1')
+      execution = pipeline_ops.initiate_pipeline_start(m, pipeline1).execution
+
+      def _inactivate(execution):
+        time.sleep(1.0)
+        execution.last_known_state = metadata_store_pb2.Execution.COMPLETE
+        m.store.put_executions([execution])
+        notification_lib.notify_execution_update(execution.id)
+
+      thread = threading.Thread(
+          target=_inactivate, args=(copy.deepcopy(execution),))
+      thread.start()
+
+      # MLMD is polled every 10 secs for the given timeout, so the stop only
+      # completes quickly if the wait is woken up by the notification.
+      start_time = time.time()
       pipeline_ops.stop_pipeline(
-          m, task_lib.PipelineUid.from_pipeline(pipeline1), timeout_secs=5.0)
+          m, task_lib.PipelineUid.from_pipeline(pipeline1), timeout_secs=100.0)
+      self.assertLess(time.time() - start_time, 5.0)
 
       thread.join()
 
+  def test_pipeline_ops_on_different_pipelines_do_not_block(self):
+    with self._mlmd_connection as m:
+      pipeline1 = _test_pipeline('pipeline1')
+      pipeline2 = _test_pipeline('pipeline2')
+      locked = threading.Event()
+      release = threading.Event()
+
+      def _hold_pipeline1_lock():
+        with pipeline_ops._pipeline_lock(
+            task_lib.PipelineUid.from_pipeline(pipeline1)):
+          locked.set()
+          release.wait()
+
+      thread = threading.Thread(target=_hold_pipeline1_lock)
+      thread.start()
+      locked.wait()
+      try:
+        # Operations on pipeline2 must not wait for the lock of pipeline1.
+        pipeline_state = pipeline_ops.initiate_pipeline_start(m, pipeline2)
+        self.assertEqual(
+            task_lib.PipelineUid.from_pipeline(pipeline2),
+            pipeline_state.pipeline_uid)
+      finally:
+        release.set()
+        thread.join()
+
   def test_stop_pipeline_wait_for_inactivation_timeout(self):
     with self._mlmd_connection as m:
       pipeline1 = _test_pipeline('pipeline1')
@@ -188,7 +240,7 @@ class PipelineOpsTest(tu.TfxTest):
 
       def _inactivate(execution):
         time.sleep(2.0)
-        with pipeline_ops._PIPELINE_OPS_LOCK:
+        with pipeline_ops._pipeline_lock(pipeline_uid):
           execution.last_known_state = metadata_store_pb2.Execution.COMPLETE
           m.store.put_executions([execution])
 
@@ -293,6 +345,218 @@ class PipelineOpsTest(tu.TfxTest):
         self.assertEqual('pipeline2', task.node_uid.pipeline_uid.pipeline_id)
       self.assertTrue(task_queue.is_empty())
 
+  @mock.patch.object(async_pipeline_task_gen, 'AsyncPipelineTaskGenerator')
+  def test_generate_tasks_in_parallel(self, mock_async_task_gen):
+    with self._mlmd_connection as m:
+      pipeline_ids = ['pipeline1', 'pipeline2', 'pipeline3']
+      for pipeline_id in pipeline_ids:
+        pipeline_ops.initiate_pipeline_start(m, _test_pipeline(pipeline_id))
+
+      def _create_task_gen(mlmd_handle, pipeline, unused_is_task_id_tracked_fn,
+                           unused_ignore_node_ids):
+        # Each pipeline is processed with its own MLMD connection.
+        self.assertIsNot(m, mlmd_handle)
+        task_gen = mock.Mock()
+        task_gen.generate.return_value = [
+            test_utils.create_exec_node_task(
+                node_uid=task_lib.NodeUid(
+                    pipeline_uid=task_lib.PipelineUid.from_pipeline(pipeline),
+                    node_id=node_id)) for node_id in ('Transform', 'Trainer')
+        ]
+        return task_gen
+
+      mock_async_task_gen.side_effect = _create_task_gen
+
+      task_queue = tq.TaskQueue()
+      pipeline_ops.generate_tasks(m, task_queue, max_parallelism=3)
+
+      self.assertEqual(3, mock_async_task_gen.call_count)
+      # Tasks are enqueued in the same order as with sequential generation.
+      for pipeline_id in pipeline_ids:
+        for node_id in ('Transform', 'Trainer'):
+          task = task_queue.dequeue()
+          task_queue.task_done(task)
+          self.assertEqual(node_id, task.node_uid.node_id)
+          self.assertEqual(pipeline_id,
+                           task.node_uid.pipeline_uid.pipeline_id)
+      self.assertTrue(task_queue.is_empty())
+
+      latencies = pipeline_ops.get_pipeline_tick_latencies()
+      for pipeline_id in pipeline_ids:
+        self.assertIn(
+            task_lib.PipelineUid(pipeline_id=pipeline_id, pipeline_run_id=None),
+            latencies)
+
+  @mock.patch.object(async_pipeline_task_gen, 'AsyncPipelineTaskGenerator')
+  def test_generate_tasks_isolates_failing_pipeline(self, mock_async_task_gen):
+    with self._mlmd_connection as m:
+      pipeline_ids = ['pipeline1', 'pipeline2', 'pipeline3']
+      for pipeline_id in pipeline_ids:
+        pipeline_ops.initiate_pipeline_start(m, _test_pipeline(pipeline_id))
+
+      def _create_task_gen(unused_mlmd_handle, pipeline,
+                           unused_is_task_id_tracked_fn,
+                           unused_ignore_node_ids):
+        task_gen = mock.Mock()
+        if pipeline.pipeline_info.id == 'pipeline2':
+          task_gen.generate.side_effect = status_lib.StatusNotOkError(
+              code=status_lib.Code.INTERNAL, message='task gen failed')
+        else:
+          task_gen.generate.return_value = [
+              test_utils.create_exec_node_task(
+                  node_uid=task_lib.NodeUid(
+                      pipeline_uid=task_lib.PipelineUid.from_pipeline(
+                          pipeline),
+                      node_id='Trainer'))
+          ]
+        return task_gen
+
+      mock_async_task_gen.side_effect = _create_task_gen
+
+      for max_parallelism in (1, 3):
+        task_queue = tq.TaskQueue()
+        with self.assertRaises(status_lib.StatusNotOkError) as context:
+          pipeline_ops.generate_tasks(
+              m, task_queue, max_parallelism=max_parallelism)
+        self.assertEqual('task gen failed', context.exception.message)
+
+        # The tasks of the other pipelines are still enqueued.
+        for pipeline_id in ('pipeline1', 'pipeline3'):
+          task = task_queue.dequeue()
+          task_queue.task_done(task)
+          self.assertEqual(pipeline_id,
+                           task.node_uid.pipeline_uid.pipeline_id)
+        self.assertTrue(task_queue.is_empty())
+
+  @mock.patch.object(async_pipeline_task_gen, 'AsyncPipelineTaskGenerator')
+  def test_generate_tasks_in_parallel_reuses_connections(
+      self, mock_async_task_gen):
+    with self._mlmd_connection as m:
+      for pipeline_id in ('pipeline1', 'pipeline2', 'pipeline3'):
+        pipeline_ops.initiate_pipeline_start(m, _test_pipeline(pipeline_id))
+      mlmd_handles = set()
+
+      def _create_task_gen(mlmd_handle, unused_pipeline,
+                           unused_is_task_id_tracked_fn,
+                           unused_ignore_node_ids):
+        mlmd_handles.add(mlmd_handle)
+        task_gen = mock.Mock()
+        task_gen.generate.return_value = []
+        return task_gen
+
+      mock_async_task_gen.side_effect = _create_task_gen
+
+      for _ in range(3):
+        pipeline_ops.generate_tasks(m, tq.TaskQueue(), max_parallelism=2)
+
+      # Each of the two worker threads keeps using its own connection.
+      self.assertEqual(9, mock_async_task_gen.call_count)
+      self.assertLessEqual(len(mlmd_handles), 2)
+
+  @mock.patch.object(async_pipeline_task_gen, 'AsyncPipelineTaskGenerator')
+  def test_generate_tasks_drops_latencies_of_inactive_pipelines(
+      self, mock_async_task_gen):
+    with self._mlmd_connection as m:
+      pipeline1 = _test_pipeline('pipeline1')
+      execution = pipeline_ops.initiate_pipeline_start(m, pipeline1).execution
+      pipeline_uid = task_lib.PipelineUid.from_pipeline(pipeline1)
+      mock_async_task_gen.return_value.generate.return_value = []
+
+      pipeline_ops.generate_tasks(m, tq.TaskQueue())
+      self.assertIn(pipeline_uid, pipeline_ops.get_pipeline_tick_latencies())
+
+      execution.last_known_state = metadata_store_pb2.Execution.COMPLETE
+      m.store.put_executions([execution])
+      pipeline_ops.generate_tasks(m, tq.TaskQueue())
+      self.assertNotIn(pipeline_uid,
+                       pipeline_ops.get_pipeline_tick_latencies())
+
+  @mock.patch.object(async_pipeline_task_gen, 'AsyncPipelineTaskGenerator')
+  def test_wait_and_generate_tasks(self, mock_async_task_gen):
+    with self._mlmd_connection as m:
+      pipeline1 = _test_pipeline('pipeline1')
+      pipeline2 = _test_pipeline('pipeline2')
+      pipeline_ops.initiate_pipeline_start(m, pipeline1)
+      pipeline_ops.initiate_pipeline_start(m, pipeline2)
+      mock_async_task_gen.return_value.generate.return_value = []
+      # Consumes any updates pending from other tests.
+      notification_lib.wait_for_updated_pipelines(0.0)
+
+      # Without notifications, tasks are generated for all pipelines after
+      # waiting.
+      pipeline_ops.wait_and_generate_tasks(
+          m, tq.TaskQueue(), max_wait_secs=0.1)
+      self.assertEqual(2, mock_async_task_gen.call_count)
+
+      # A notified execution update wakes up the wait and tasks are only
+      # generated for the updated pipeline.
+      mock_async_task_gen.reset_mock()
+      timer = threading.Timer(
+          0.1,
+          notification_lib.notify_execution_update,
+          args=(1, task_lib.PipelineUid.from_pipeline(pipeline2)))
+      timer.start()
+      start_time = time.time()
+      pipeline_ops.wait_and_generate_tasks(
+          m, tq.TaskQueue(), max_wait_secs=100.0)
+      self.assertLess(time.time() - start_time, 5.0)
+      timer.join()
+      mock_async_task_gen.assert_called_once()
+      self.assertEqual(pipeline2, mock_async_task_gen.call_args[0][1])
+
+  @mock.patch.object(async_pipeline_task_gen, 'AsyncPipelineTaskGenerator')
+  def test_wait_and_generate_tasks_with_continuous_notifications(
+      self, mock_async_task_gen):
+    with self._mlmd_connection as m:
+      pipeline1 = _test_pipeline('pipeline1')
+      pipeline2 = _test_pipeline('pipeline2')
+      pipeline_ops.initiate_pipeline_start(m, pipeline1)
+      pipeline_ops.initiate_pipeline_start(m, pipeline2)
+      mock_async_task_gen.return_value.generate.return_value = []
+      pipeline_ops.wait_and_generate_tasks(m, tq.TaskQueue(), max_wait_secs=0.0)
+      mock_async_task_gen.reset_mock()
+
+      # Updates of pipeline1 keep being notified.
+      stop_notifying = threading.Event()
+
+      def _notify_pipeline1():
+        while not stop_notifying.wait(0.01):
+          notification_lib.notify_execution_update(
+              1, task_lib.PipelineUid.from_pipeline(pipeline1))
+
+      thread = threading.Thread(target=_notify_pipeline1)
+      thread.start()
+      try:
+        end_time = time.time() + 2.0
+        while time.time() < end_time:
+          pipeline_ops.wait_and_generate_tasks(
+              m, tq.TaskQueue(), max_wait_secs=0.5)
+      finally:
+        stop_notifying.set()
+        thread.join()
+
+      # pipeline2 is still processed by the periodic full scans.
+      processed_pipelines = [
+          call[0][1] for call in mock_async_task_gen.call_args_list
+      ]
+      self.assertIn(pipeline1, processed_pipelines)
+      self.assertIn(pipeline2, processed_pipelines)
+
+  def test_pipeline_ops_notify_pipeline_updates(self):
+    with self._mlmd_connection as m:
+      pipeline1 = _test_pipeline('pipeline1')
+      pipeline_uid = task_lib.PipelineUid.from_pipeline(pipeline1)
+      notification_lib.wait_for_updated_pipelines(0.0)
+
+      pipeline_ops.initiate_pipeline_start(m, pipeline1)
+      self.assertEqual({pipeline_uid},
+                       notification_lib.wait_for_updated_pipelines(0.0))
+
+      with self.assertRaises(status_lib.StatusNotOkError):
+        pipeline_ops.stop_pipeline(m, pipeline_uid, timeout_secs=0.1)
+      self.assertEqual({pipeline_uid},
+                       notification_lib.wait_for_updated_pipelines(0.0))
+
   @mock.patch.object(sync_pipeline_task_gen, 'SyncPipelineTaskGenerator')
   @mock.patch.object(async_pipeline_task_gen, 'AsyncPipelineTaskGenerator')
   @mock.patch.object(task_gen_utils, 'generate_task_from_active_execution')
@@ -455,6 +719,33 @@ class PipelineOpsTest(tu.TfxTest):
       # No more tasks.
       self.assertTrue(task_queue.is_empty())
 
+  @mock.patch.object(async_pipeline_task_gen, 'AsyncPipelineTaskGenerator')
+  def test_generate_tasks_reloads_concurrently_modified_pipeline_state(
+      self, mock_async_task_gen):
+    with self._mlmd_connection as m:
+      pipeline = _test_pipeline('pipeline1')
+      pipeline_uid = task_lib.PipelineUid.from_pipeline(pipeline)
+      execution = pipeline_ops.initiate_pipeline_start(m, pipeline).execution
+
+      def _get_pipeline_states(mlmd_handle):
+        result = pstate.PipelineState.load_all_active(mlmd_handle)
+        # Stop is initiated after the pipeline states were loaded.
+        with pipeline_ops._pipeline_lock(pipeline_uid):
+          with pstate.PipelineState.load(m, pipeline_uid) as pipeline_state:
+            pipeline_state.initiate_stop()
+        return result
+
+      with mock.patch.object(pipeline_ops, '_get_pipeline_states',
+                             _get_pipeline_states):
+        pipeline_ops.generate_tasks(m, tq.TaskQueue())
+
+      # The pipeline is processed as stop-initiated and, having no active node
+      # executions, cancelled.
+      mock_async_task_gen.assert_not_called()
+      [execution] = m.store.get_executions_by_id([execution.id])
+      self.assertEqual(metadata_store_pb2.Execution.CANCELED,
+                       execution.last_known_state)
+
   def test_to_status_not_ok_error_decorator(self):
 
     @pipeline_ops._to_status_not_ok_error
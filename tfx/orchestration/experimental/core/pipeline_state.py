@@ -14,7 +14,11 @@
 """Pipeline state management functionality."""
 
 import base64
-from typing import List
+import collections
+import hashlib
+import threading
+from typing import Dict, List, Set, Tuple
+import zlib
 
 from absl import logging
 from tfx.orchestration import data_types_utils
@@ -29,12 +33,24 @@ from ml_metadata.proto import metadata_store_pb2
 
 _ORCHESTRATOR_RESERVED_ID = '__ORCHESTRATOR__'
 _PIPELINE_IR = 'pipeline_ir'
+_PIPELINE_IR_ENCODING = 'pipeline_ir_encoding'
+_PIPELINE_IR_FINGERPRINT = 'pipeline_ir_fingerprint'
+_PIPELINE_IR_ENCODING_ZLIB = 'zlib'
 _STOP_INITIATED = 'stop_initiated'
 _NODE_STOP_INITIATED_PREFIX = 'node_stop_initiated_'
 _ORCHESTRATOR_EXECUTION_TYPE = metadata_store_pb2.ExecutionType(
     name=_ORCHESTRATOR_RESERVED_ID,
     properties={_PIPELINE_IR: metadata_store_pb2.STRING})
 
+# Parsed pipeline IRs keyed by (orchestrator execution id, IR fingerprint). The
+# pipeline IR of an orchestrator execution never changes, so this saves
+# decoding and parsing the IR of every active pipeline in each orchestration
+# loop iteration. Entries of inactive executions are evicted by
+# `PipelineState.load_all_active`, so the cache is bounded by the active
+# pipelines rather than by a fixed size.
+_PIPELINE_IR_CACHE = {}  # type: Dict[Tuple[int, str], pipeline_pb2.Pipeline]
+_PIPELINE_IR_CACHE_LOCK = threading.Lock()
+
 
 class PipelineState:
   """Class for dealing with pipeline state. Can be used as a context manager."""
@@ -54,8 +70,10 @@ class PipelineState:
     self._pipeline = None  # lazily set
 
   @classmethod
-  def new(cls, mlmd_handle: metadata.Metadata,
-          pipeline: pipeline_pb2.Pipeline) -> 'PipelineState':
+  def new(cls,
+          mlmd_handle: metadata.Metadata,
+          pipeline: pipeline_pb2.Pipeline,
+          compress_ir: bool = False) -> 'PipelineState':
     """Creates a `PipelineState` object for a new pipeline.
 
     No active pipeline with the same pipeline uid should exist for the call to
@@ -64,6 +82,8 @@ class PipelineState:
     Args:
       mlmd_handle: A handle to the MLMD db.
       pipeline: IR of the pipeline.
+      compress_ir: If `True`, the pipeline IR is zlib compressed before being
+        stored in MLMD. Recommended for large pipelines.
 
     Returns:
       A `PipelineState` object.
@@ -83,14 +103,12 @@ class PipelineState:
           code=status_lib.Code.ALREADY_EXISTS,
           message=f'Pipeline with uid {pipeline_uid} already active.')
 
+    exec_properties = _encode_pipeline_ir(pipeline, compress_ir)
     execution = execution_lib.prepare_execution(
         mlmd_handle,
         _ORCHESTRATOR_EXECUTION_TYPE,
         metadata_store_pb2.Execution.NEW,
-        exec_properties={
-            _PIPELINE_IR:
-                base64.b64encode(pipeline.SerializeToString()).decode('utf-8')
-        })
+        exec_properties=exec_properties)
 
     return cls(
         mlmd_handle=mlmd_handle,
@@ -166,14 +184,80 @@ class PipelineState:
         execution=active_executions[0],
         commit=False)
 
+  @classmethod
+  def load_all_active(
+      cls, mlmd_handle: metadata.Metadata) -> List['PipelineState']:
+    """Loads pipeline states of all the active pipelines.
+
+    Unlike calling `load_from_orchestrator_context` for each orchestrator
+    context, this fetches all the orchestrator contexts and executions with
+    a fixed number of MLMD calls regardless of the number of pipelines.
+
+    Args:
+      mlmd_handle: A handle to the MLMD db.
+
+    Returns:
+      A list of `PipelineState` objects, one for each active pipeline.
+
+    Raises:
+      status_lib.StatusNotOkError: With code=INTERNAL if more than 1 active
+      execution exists for a pipeline uid or if the orchestrator context of an
+      active pipeline execution cannot be found.
+    """
+    contexts_by_name = {
+        c.name: c for c in get_orchestrator_contexts(mlmd_handle)
+    }
+    if not contexts_by_name:
+      return []
+    active_executions = [
+        e for e in mlmd_handle.store.get_executions_by_type(
+            _ORCHESTRATOR_RESERVED_ID) if execution_lib.is_execution_active(e)
+    ]
+    _evict_inactive_pipeline_irs(set(e.id for e in active_executions))
+    # Active executions and their pipeline IRs grouped by orchestrator context
+    # name.
+    active_by_context_name = collections.defaultdict(list)
+    for execution in active_executions:
+      pipeline = _get_pipeline_from_execution(execution)
+      context_name = orchestrator_context_name(
+          task_lib.PipelineUid.from_pipeline(pipeline))
+      active_by_context_name[context_name].append((execution, pipeline))
+
+    result = []
+    for context_name, executions in active_by_context_name.items():
+      context = contexts_by_name.get(context_name)
+      if context is None:
+        raise status_lib.StatusNotOkError(
+            code=status_lib.Code.INTERNAL,
+            message=(f'No orchestrator context found for active pipeline '
+                     f'execution (id: {executions[0][0].id}).'))
+      pipeline_uid = pipeline_uid_from_orchestrator_context(context)
+      if len(executions) > 1:
+        raise status_lib.StatusNotOkError(
+            code=status_lib.Code.INTERNAL,
+            message=(
+                f'Expected 1 but found {len(executions)} active pipeline '
+                f'executions for pipeline uid: {pipeline_uid}'))
+      execution, pipeline = executions[0]
+      pipeline_state = cls(
+          mlmd_handle=mlmd_handle,
+          pipeline_uid=pipeline_uid,
+          context=context,
+          execution=execution,
+          commit=False)
+      pipeline_state._pipeline = pipeline  # pylint: disable=protected-access
+      result.append(pipeline_state)
+    return result
+
   @property
   def pipeline(self) -> pipeline_pb2.Pipeline:
+    """Returns the pipeline IR.
+
+    The returned proto may be shared with other `PipelineState` objects of the
+    same pipeline execution and must not be mutated.
+    """
     if not self._pipeline:
-      pipeline_ir_b64 = data_types_utils.get_metadata_value(
-          self.execution.properties[_PIPELINE_IR])
-      pipeline = pipeline_pb2.Pipeline()
-      pipeline.ParseFromString(base64.b64decode(pipeline_ir_b64))
-      self._pipeline = pipeline
+      self._pipeline = _get_pipeline_from_execution(self.execution)
     return self._pipeline
 
   def initiate_stop(self) -> None:
@@ -270,6 +354,81 @@ def pipeline_uid_from_orchestrator_context(
   return task_lib.PipelineUid(pipeline_id=pipeline_id, pipeline_run_id=None)
 
 
+def clear_pipeline_ir_cache() -> None:
+  """Clears the in-process cache of parsed pipeline IRs."""
+  with _PIPELINE_IR_CACHE_LOCK:
+    _PIPELINE_IR_CACHE.clear()
+
+
+def _encode_pipeline_ir(pipeline: pipeline_pb2.Pipeline,
+                        compress_ir: bool) -> Dict[str, str]:
+  """Returns the execution properties storing the encoded pipeline IR."""
+  serialized = pipeline.SerializeToString(deterministic=True)
+  result = {}
+  if compress_ir:
+    serialized = zlib.compress(serialized)
+    result[_PIPELINE_IR_ENCODING] = _PIPELINE_IR_ENCODING_ZLIB
+  pipeline_ir = base64.b64encode(serialized).decode('utf-8')
+  result[_PIPELINE_IR] = pipeline_ir
+  result[_PIPELINE_IR_FINGERPRINT] = _fingerprint(pipeline_ir)
+  return result
+
+
+def _fingerprint(pipeline_ir: str) -> str:
+  return hashlib.sha256(pipeline_ir.encode('utf-8')).hexdigest()
+
+
+def _get_custom_property(execution: metadata_store_pb2.Execution,
+                         name: str) -> str:
+  if name in execution.custom_properties:
+    return data_types_utils.get_metadata_value(
+        execution.custom_properties[name])
+  return ''
+
+
+def _get_pipeline_from_execution(
+    execution: metadata_store_pb2.Execution) -> pipeline_pb2.Pipeline:
+  """Returns the pipeline IR of an orchestrator execution, using the cache."""
+  pipeline_ir = data_types_utils.get_metadata_value(
+      execution.properties[_PIPELINE_IR])
+  # Executions created before fingerprints were recorded are fingerprinted here,
+  # which is still much cheaper than parsing the IR.
+  fingerprint = (
+      _get_custom_property(execution, _PIPELINE_IR_FINGERPRINT) or
+      _fingerprint(pipeline_ir))
+  # Executions which are not yet committed have no id and are not cached.
+  key = (execution.id, fingerprint) if execution.HasField('id') else None
+  if key is not None:
+    with _PIPELINE_IR_CACHE_LOCK:
+      pipeline = _PIPELINE_IR_CACHE.get(key)
+    if pipeline is not None:
+      return pipeline
+
+  serialized = base64.b64decode(pipeline_ir)
+  encoding = _get_custom_property(execution, _PIPELINE_IR_ENCODING)
+  if encoding == _PIPELINE_IR_ENCODING_ZLIB:
+    serialized = zlib.decompress(serialized)
+  elif encoding:
+    raise status_lib.StatusNotOkError(
+        code=status_lib.Code.INTERNAL,
+        message=f'Unknown pipeline IR encoding: {encoding}')
+  pipeline = pipeline_pb2.Pipeline()
+  pipeline.ParseFromString(serialized)
+
+  if key is not None:
+    with _PIPELINE_IR_CACHE_LOCK:
+      _PIPELINE_IR_CACHE[key] = pipeline
+  return pipeline
+
+
+def _evict_inactive_pipeline_irs(active_execution_ids: Set[int]) -> None:
+  """Evicts the cached pipeline IRs of inactive orchestrator executions."""
+  with _PIPELINE_IR_CACHE_LOCK:
+    for key in list(_PIPELINE_IR_CACHE):
+      if key[0] not in active_execution_ids:
+        del _PIPELINE_IR_CACHE[key]
+
+
 def _node_stop_initiated_property(node_uid: task_lib.NodeUid) -> str:
   return f'{_NODE_STOP_INITIATED_PREFIX}{node_uid.node_id}'
 
@@ -131,6 +131,93 @@ class PipelineStateTest(tu.TfxTest):
           task_lib.PipelineUid.from_pipeline(pipeline),
           pipeline_state.pipeline_uid)
 
+  def test_load_all_active(self):
+    with self._mlmd_connection as m:
+      self.assertEqual([], pstate.PipelineState.load_all_active(m))
+
+      pipeline1 = _test_pipeline('pipeline1')
+      pipeline2 = _test_pipeline('pipeline2', pipeline_pb2.Pipeline.SYNC)
+      pipeline3 = _test_pipeline('pipeline3')
+      with pstate.PipelineState.new(m, pipeline1):
+        pass
+      with pstate.PipelineState.new(m, pipeline2, compress_ir=True):
+        pass
+      with pstate.PipelineState.new(m, pipeline3) as pipeline_state3:
+        pass
+
+      # Inactivate pipeline3.
+      execution = pipeline_state3.execution
+      execution.last_known_state = metadata_store_pb2.Execution.COMPLETE
+      m.store.put_executions([execution])
+
+      pipeline_states = sorted(
+          pstate.PipelineState.load_all_active(m),
+          key=lambda p: p.pipeline_uid.pipeline_id)
+      self.assertLen(pipeline_states, 2)
+      for pipeline, pipeline_state in zip((pipeline1, pipeline2),
+                                          pipeline_states):
+        expected_state = pstate.PipelineState.load(
+            m, task_lib.PipelineUid.from_pipeline(pipeline))
+        self.assertEqual(expected_state.pipeline_uid,
+                         pipeline_state.pipeline_uid)
+        self.assertProtoPartiallyEquals(expected_state.context,
+                                        pipeline_state.context)
+        self.assertProtoPartiallyEquals(expected_state.execution,
+                                        pipeline_state.execution)
+        self.assertEqual(pipeline, pipeline_state.pipeline)
+
+  def test_compressed_pipeline_ir(self):
+    with self._mlmd_connection as m:
+      pipeline = _test_pipeline('pipeline1')
+      with pstate.PipelineState.new(m, pipeline, compress_ir=True):
+        pass
+
+      pstate.clear_pipeline_ir_cache()
+      pipeline_state = pstate.PipelineState.load(
+          m, task_lib.PipelineUid.from_pipeline(pipeline))
+      self.assertEqual(pipeline, pipeline_state.pipeline)
+
+  def test_pipeline_ir_is_cached(self):
+    with self._mlmd_connection as m:
+      pipeline = _test_pipeline('pipeline1')
+      with pstate.PipelineState.new(m, pipeline):
+        pass
+
+      pstate.clear_pipeline_ir_cache()
+      pipeline_uid = task_lib.PipelineUid.from_pipeline(pipeline)
+      pipeline1 = pstate.PipelineState.load(m, pipeline_uid).pipeline
+      pipeline2 = pstate.PipelineState.load(m, pipeline_uid).pipeline
+      self.assertEqual(pipeline, pipeline1)
+      self.assertIs(pipeline1, pipeline2)
+
+      pstate.clear_pipeline_ir_cache()
+      pipeline3 = pstate.PipelineState.load(m, pipeline_uid).pipeline
+      self.assertEqual(pipeline, pipeline3)
+      self.assertIsNot(pipeline1, pipeline3)
+
+  def test_pipeline_ir_cache_evicts_inactive_pipelines(self):
+    with self._mlmd_connection as m:
+      pipeline1 = _test_pipeline('pipeline1')
+      pipeline2 = _test_pipeline('pipeline2')
+      with pstate.PipelineState.new(m, pipeline1) as pipeline_state1:
+        pass
+      with pstate.PipelineState.new(m, pipeline2) as pipeline_state2:
+        pass
+      pstate.clear_pipeline_ir_cache()
+      self.assertLen(pstate.PipelineState.load_all_active(m), 2)
+
+      # Inactivate pipeline1.
+      execution = pipeline_state1.execution
+      execution.last_known_state = metadata_store_pb2.Execution.COMPLETE
+      m.store.put_executions([execution])
+
+      self.assertLen(pstate.PipelineState.load_all_active(m), 1)
+      # pylint: disable=protected-access
+      self.assertEqual(
+          {pipeline_state2.execution.id},
+          {execution_id for execution_id, _ in pstate._PIPELINE_IR_CACHE})
+      # pylint: enable=protected-access
+
   def test_new_pipeline_state_when_pipeline_already_exists(self):
     with self._mlmd_connection as m:
       pipeline = _test_pipeline('pipeline1')
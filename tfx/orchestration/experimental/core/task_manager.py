@@ -18,10 +18,12 @@ import copy
 import threading
 import time
 import typing
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from absl import logging
+import attr
 from tfx.orchestration import metadata
+from tfx.orchestration.experimental.core import notification_lib
 from tfx.orchestration.experimental.core import status as status_lib
 from tfx.orchestration.experimental.core import task as task_lib
 from tfx.orchestration.experimental.core import task_queue as tq
@@ -31,6 +33,8 @@ from tfx.orchestration.portable import execution_publish_utils
 from ml_metadata.proto import metadata_store_pb2
 
 _MAX_DEQUEUE_WAIT_SECS = 5.0
+# Maximum number of execution results published in one batch.
+_MAX_PUBLISH_BATCH_SIZE = 100
 
 
 class Error(Exception):
@@ -57,7 +61,8 @@ class TaskManager:
                task_queue: tq.TaskQueue,
                max_active_task_schedulers: int,
                max_dequeue_wait_secs: float = _MAX_DEQUEUE_WAIT_SECS,
-               process_all_queued_tasks_before_exit: bool = False):
+               process_all_queued_tasks_before_exit: bool = False,
+               publish_batch_interval_secs: Optional[float] = None):
     """Constructs `TaskManager`.
 
     Args:
@@ -70,6 +75,12 @@ class TaskManager:
       process_all_queued_tasks_before_exit: All existing items in the queues are
         processed before exiting the context manager. This is useful for
         deterministic behavior in tests.
+      publish_batch_interval_secs: If set, the results of executions completed
+        within this interval of each other are published to MLMD together, by
+        a single thread, which reduces MLMD write contention when many short
+        tasks complete concurrently. A task scheduler waits at most this long
+        plus the publish time for its results to be published. If `None`
+        (default), each result is published as soon as its task completes.
     """
     self._mlmd_handle = mlmd_handle
     self._task_queue = task_queue
@@ -94,9 +105,16 @@ class TaskManager:
     self._last_mlmd_publish_time = None
     self._publish_time_lock = threading.Lock()
 
+    self._publish_batch_interval_secs = publish_batch_interval_secs
+    self._publish_batcher = None
+
   def __enter__(self):
     if self._main_future is not None:
       raise RuntimeError('TaskManager already started.')
+    if self._publish_batch_interval_secs is not None:
+      self._publish_batcher = _ExecutionPublishBatcher(
+          self._mlmd_handle, self._publish_batch_interval_secs,
+          _MAX_PUBLISH_BATCH_SIZE)
     self._main_future = self._main_executor.submit(self._main)
     return self
 
@@ -156,7 +174,11 @@ class TaskManager:
 
       # Final cleanup before exiting. Any exceptions raised here are
       # automatically chained with any raised in the try block.
-      self._cleanup(True)
+      try:
+        self._cleanup(True)
+      finally:
+        if self._publish_batcher is not None:
+          self._publish_batcher.close()
 
   def _handle_task(self, task: task_lib.Task) -> None:
     """Dispatches task to the task specific handler."""
@@ -216,10 +238,16 @@ class TaskManager:
               code=status_lib.Code.ABORTED, message=str(e)))
     logging.info('For ExecNodeTask id: %s, task-scheduler result status: %s',
                  task.task_id, result.status)
-    _publish_execution_results(
-        mlmd_handle=self._mlmd_handle, task=task, result=result)
+    if self._publish_batcher is not None:
+      self._publish_batcher.publish(task, result)
+    else:
+      _publish_execution_results(
+          mlmd_handle=self._mlmd_handle, task=task, result=result)
     with self._publish_time_lock:
       self._last_mlmd_publish_time = time.time()
+    # Wakes up the orchestration loop to generate tasks for downstream nodes.
+    notification_lib.notify_execution_update(task.execution.id,
+                                             task.node_uid.pipeline_uid)
     with self._tm_lock:
       del self._scheduler_by_node_uid[task.node_uid]
       self._task_queue.task_done(task)
@@ -244,36 +272,40 @@ def _update_execution_state_in_mlmd(
   mlmd_handle.store.put_executions([updated_execution])
 
 
+def _get_failed_execution_state(
+    task: task_lib.ExecNodeTask, result: ts.TaskSchedulerResult
+) -> Optional[metadata_store_pb2.Execution.State]:
+  """Returns the state of the execution of `task` if it failed, else `None`."""
+  status = result.status
+  if (status.code == status_lib.Code.OK and result.executor_output and
+      result.executor_output.execution_result.code != status_lib.Code.OK):
+    status = status_lib.Status(
+        code=result.executor_output.execution_result.code,
+        message=result.executor_output.execution_result.result_message)
+  if status.code == status_lib.Code.OK:
+    return None
+  if status.code == status_lib.Code.CANCELLED:
+    execution_state = metadata_store_pb2.Execution.CANCELED
+    state_msg = 'cancelled'
+  else:
+    execution_state = metadata_store_pb2.Execution.FAILED
+    state_msg = 'failed'
+  logging.info(
+      'Got error (status: %s) for task id: %s; marking execution (id: %s) '
+      'as %s.', status, task.task_id, task.execution.id, state_msg)
+  # TODO(goutham): Also record error code and error message as custom property
+  # of the execution.
+  return execution_state
+
+
 def _publish_execution_results(mlmd_handle: metadata.Metadata,
                                task: task_lib.ExecNodeTask,
                                result: ts.TaskSchedulerResult) -> None:
   """Publishes execution results to MLMD."""
-
-  def _update_state(status: status_lib.Status) -> None:
-    assert status.code != status_lib.Code.OK
-    if status.code == status_lib.Code.CANCELLED:
-      execution_state = metadata_store_pb2.Execution.CANCELED
-      state_msg = 'cancelled'
-    else:
-      execution_state = metadata_store_pb2.Execution.FAILED
-      state_msg = 'failed'
-    logging.info(
-        'Got error (status: %s) for task id: %s; marking execution (id: %s) '
-        'as %s.', status, task.task_id, task.execution.id, state_msg)
-    # TODO(goutham): Also record error code and error message as custom property
-    # of the execution.
+  execution_state = _get_failed_execution_state(task, result)
+  if execution_state is not None:
     _update_execution_state_in_mlmd(mlmd_handle, task.execution,
                                     execution_state)
-
-  if result.status.code != status_lib.Code.OK:
-    _update_state(result.status)
-    return
-
-  if (result.executor_output and
-      result.executor_output.execution_result.code != status_lib.Code.OK):
-    _update_state(status_lib.Status(
-        code=result.executor_output.execution_result.code,
-        message=result.executor_output.execution_result.result_message))
     return
 
   execution_publish_utils.publish_succeeded_execution(mlmd_handle,
@@ -281,3 +313,139 @@ def _publish_execution_results(mlmd_handle: metadata.Metadata,
                                                       task.contexts,
                                                       task.output_artifacts,
                                                       result.executor_output)
+
+
+def _publish_execution_results_batch(
+    mlmd_handle: metadata.Metadata,
+    results: List[Tuple[task_lib.ExecNodeTask, ts.TaskSchedulerResult]]
+) -> List[Optional[Exception]]:
+  """Publishes the results of several executions to MLMD.
+
+  The states of all the failed executions are updated in a single MLMD call.
+  Succeeded executions are published with
+  `execution_publish_utils.publish_succeeded_executions`.
+
+  Args:
+    mlmd_handle: A handle to the MLMD db.
+    results: Tasks and the results of their executions.
+
+  Returns:
+    The error raised publishing each result of `results`, or `None` if the
+    result was published.
+  """
+  errors = [None] * len(results)  # type: List[Optional[Exception]]
+  failed_indexes = []
+  failed_executions = []
+  succeeded_indexes = []
+  succeeded_executions = []
+  for i, (task, result) in enumerate(results):
+    execution_state = _get_failed_execution_state(task, result)
+    if execution_state is not None:
+      execution = copy.deepcopy(task.execution)
+      execution.last_known_state = execution_state
+      failed_indexes.append(i)
+      failed_executions.append(execution)
+    else:
+      succeeded_indexes.append(i)
+      succeeded_executions.append(
+          execution_publish_utils.SucceededExecution(
+              execution_id=task.execution.id,
+              contexts=task.contexts,
+              output_artifacts=task.output_artifacts,
+              executor_output=result.executor_output))
+
+  if failed_executions:
+    try:
+      mlmd_handle.store.put_executions(failed_executions)
+    except Exception:  # pylint: disable=broad-except
+      # Retries one execution at a time to isolate the erroneous ones.
+      for i, execution in zip(failed_indexes, failed_executions):
+        try:
+          mlmd_handle.store.put_executions([execution])
+        except Exception as e:  # pylint: disable=broad-except
+          errors[i] = e
+
+  if succeeded_executions:
+    try:
+      succeeded_errors = execution_publish_utils.publish_succeeded_executions(
+          mlmd_handle, succeeded_executions)
+    except Exception as e:  # pylint: disable=broad-except
+      succeeded_errors = [e] * len(succeeded_executions)
+    for i, error in zip(succeeded_indexes, succeeded_errors):
+      errors[i] = error
+  return errors
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class _PendingPublish:
+  """Execution results queued for publishing."""
+  task: task_lib.ExecNodeTask
+  result: ts.TaskSchedulerResult
+  # Resolved once the results are published.
+  future: futures.Future
+
+
+class _ExecutionPublishBatcher:
+  """Coalesces the publishing of concurrently completed executions.
+
+  `publish` queues the results of an execution and blocks until they are
+  published. A single thread publishes the queued results in batches: once
+  results are queued, it waits up to the flush interval for more results,
+  unless the batch is full, then publishes them all with
+  `_publish_execution_results_batch`.
+  """
+
+  def __init__(self, mlmd_handle: metadata.Metadata,
+               flush_interval_secs: float, max_batch_size: int):
+    self._mlmd_handle = mlmd_handle
+    self._flush_interval_secs = flush_interval_secs
+    self._max_batch_size = max_batch_size
+    self._condition = threading.Condition()
+    self._pending = []  # type: List[_PendingPublish]
+    self._closed = False
+    self._thread = threading.Thread(target=self._run, daemon=True)
+    self._thread.start()
+
+  def publish(self, task: task_lib.ExecNodeTask,
+              result: ts.TaskSchedulerResult) -> None:
+    """Publishes execution results to MLMD, raising any publishing error."""
+    future = futures.Future()
+    with self._condition:
+      if self._closed:
+        raise RuntimeError('Execution publish batcher already closed.')
+      self._pending.append(_PendingPublish(task, result, future))
+      self._condition.notify_all()
+    future.result()
+
+  def close(self) -> None:
+    """Publishes the queued results and stops the publishing thread."""
+    with self._condition:
+      self._closed = True
+      self._condition.notify_all()
+    self._thread.join()
+
+  def _run(self) -> None:
+    while True:
+      with self._condition:
+        self._condition.wait_for(lambda: self._pending or self._closed)
+        if not self._pending:
+          return
+        self._condition.wait_for(
+            lambda: len(self._pending) >= self._max_batch_size or self._closed,
+            self._flush_interval_secs)
+        batch = self._pending[:self._max_batch_size]
+        del self._pending[:self._max_batch_size]
+      self._flush(batch)
+
+  def _flush(self, batch: List['_PendingPublish']) -> None:
+    logging.info('Publishing results of %d executions.', len(batch))
+    try:
+      errors = _publish_execution_results_batch(
+          self._mlmd_handle, [(p.task, p.result) for p in batch])
+    except Exception as e:  # pylint: disable=broad-except
+      errors = [e] * len(batch)
+    for pending, error in zip(batch, errors):
+      if error is None:
+        pending.future.set_result(None)
+      else:
+        pending.future.set_exception(error)
@@ -118,13 +118,15 @@ class TaskManagerTest(tu.TfxTest):
     self._type_url = deployment_config.executor_specs['Trainer'].type_url
 
   @contextlib.contextmanager
-  def _task_manager(self, task_queue):
+  def _task_manager(self, task_queue, publish_batch_interval_secs=None):
     with tm.TaskManager(
         mock.Mock(),
         task_queue,
         max_active_task_schedulers=1000,
         max_dequeue_wait_secs=0.1,
-        process_all_queued_tasks_before_exit=True) as task_manager:
+        process_all_queued_tasks_before_exit=True,
+        publish_batch_interval_secs=publish_batch_interval_secs
+    ) as task_manager:
       yield task_manager
 
   @mock.patch.object(tm, '_publish_execution_results')
@@ -234,6 +236,48 @@ class TaskManagerTest(tu.TfxTest):
                                   any_order=True)
 
 
+  @mock.patch.object(tm, '_publish_execution_results_batch')
+  def test_batched_publish_isolates_errors(self, mock_publish_batch):
+    published_tasks = []
+
+    def _publish_batch(mlmd_handle, results):
+      del mlmd_handle
+      published_tasks.extend(task for task, _ in results)
+      return [
+          ValueError('test error')
+          if task.node_uid.node_id == 'Transform' else None
+          for task, _ in results
+      ]
+
+    mock_publish_batch.side_effect = _publish_batch
+
+    collector = _Collector()
+    ts.TaskSchedulerRegistry.register(
+        self._type_url,
+        functools.partial(
+            _FakeTaskScheduler, block_nodes={}, collector=collector))
+
+    task_queue = tq.TaskQueue()
+    tasks = [
+        _test_exec_node_task(node_id, 'test-pipeline', pipeline=self._pipeline)
+        for node_id in ('Transform', 'Trainer', 'Evaluator')
+    ]
+    for task in tasks:
+      task_queue.enqueue(task)
+    with self._task_manager(
+        task_queue, publish_batch_interval_secs=0.5) as task_manager:
+      pass
+
+    self.assertTrue(task_manager.done())
+    exception = task_manager.exception()
+    self.assertIsInstance(exception, tm.TasksProcessingError)
+    self.assertLen(exception.errors, 1)
+    self.assertEqual('test error', str(exception.errors[0]))
+    self.assertCountEqual(tasks, published_tasks)
+    # Tasks completing within the publish interval are published together.
+    self.assertLess(mock_publish_batch.call_count, len(tasks))
+
+
 class _FakeComponentScheduler(ts.TaskScheduler):
 
   def __init__(self, return_result, exception, **kwargs):
@@ -353,14 +397,16 @@ class TaskManagerE2ETest(tu.TfxTest):
             return_result=return_result,
             exception=exception))
 
-  def _run_task_manager(self):
+  def _run_task_manager(self, publish_batch_interval_secs=None):
     with self._mlmd_connection as m:
       with tm.TaskManager(
           m,
           self._task_queue,
           1000,
           max_dequeue_wait_secs=0.1,
-          process_all_queued_tasks_before_exit=True) as task_manager:
+          process_all_queued_tasks_before_exit=True,
+          publish_batch_interval_secs=publish_batch_interval_secs
+      ) as task_manager:
         pass
     return task_manager
 
@@ -386,6 +432,20 @@ class TaskManagerE2ETest(tu.TfxTest):
     self.assertEqual(metadata_store_pb2.Execution.COMPLETE,
                      execution.last_known_state)
 
+  def test_successful_execution_with_batched_publish(self):
+    self._register_task_scheduler(
+        ts.TaskSchedulerResult(
+            status=status_lib.Status(code=status_lib.Code.OK),
+            executor_output=_make_executor_output(self._task, code=0)))
+    task_manager = self._run_task_manager(publish_batch_interval_secs=0.1)
+    self.assertTrue(task_manager.done())
+    self.assertIsNone(task_manager.exception())
+
+    self.assertTrue(self._task_queue.is_empty())
+    execution = self._get_execution()
+    self.assertEqual(metadata_store_pb2.Execution.COMPLETE,
+                     execution.last_known_state)
+
   def test_scheduler_failure(self):
     # Register a fake task scheduler that returns a failure status.
     self._register_task_scheduler(
@@ -420,6 +480,20 @@ class TaskManagerE2ETest(tu.TfxTest):
     self.assertEqual(metadata_store_pb2.Execution.FAILED,
                      execution.last_known_state)
 
+  def test_scheduler_failure_with_batched_publish(self):
+    self._register_task_scheduler(
+        ts.TaskSchedulerResult(
+            status=status_lib.Status(code=status_lib.Code.CANCELLED),
+            executor_output=None))
+    task_manager = self._run_task_manager(publish_batch_interval_secs=0.1)
+    self.assertTrue(task_manager.done())
+    self.assertIsNone(task_manager.exception())
+
+    self.assertTrue(self._task_queue.is_empty())
+    execution = self._get_execution()
+    self.assertEqual(metadata_store_pb2.Execution.CANCELED,
+                     execution.last_known_state)
+
   def test_scheduler_raises_exception(self):
     # Register a fake task scheduler that raises an exception in `schedule`.
     self._register_task_scheduler(None, exception=ValueError('test exception'))
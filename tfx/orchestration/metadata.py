@@ -26,12 +26,13 @@ import os
 import random
 import time
 import types
-from typing import Any, Dict, List, Optional, Set, Text, Tuple, Type, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Text, Tuple, Type, Union
 
 import absl
 import six
 from tfx.dsl.io import fileio
 from tfx.orchestration import data_types
+from tfx.orchestration import metadata_instrumentation
 from tfx.types import artifact_utils
 from tfx.types.artifact import Artifact
 from tfx.types.artifact import ArtifactState
@@ -45,6 +46,8 @@ _MAX_INIT_RETRY = 10
 
 # Maximum number of executions we look at for previous result.
 MAX_EXECUTIONS_FOR_CACHE = 100
+# Number of artifacts fetched at a time when iterating qualified artifacts.
+_QUALIFIED_ARTIFACTS_PAGE_SIZE = 100
 # Execution state constant. We should replace this with MLMD enum once that is
 # ready.
 EXECUTION_STATE_CACHED = 'cached'
@@ -133,9 +136,20 @@ def mysql_metadata_connection_config(
 class Metadata(object):
   """Helper class to handle metadata I/O."""
 
-  def __init__(self, connection_config: ConnectionConfigType) -> None:
+  def __init__(self,
+               connection_config: ConnectionConfigType,
+               instrument: bool = False) -> None:
+    """Constructs a `Metadata`.
+
+    Args:
+      connection_config: Connection config of MLMD.
+      instrument: If `True`, records the calls to the MLMD store in `stats` and
+        in the active `metadata_instrumentation.record_calls` scopes.
+    """
     self._connection_config = connection_config
     self._store = None
+    self._stats = (
+        metadata_instrumentation.CallStats() if instrument else None)
 
   def __enter__(self) -> 'Metadata':
     # TODO(ruoyu): Establishing a connection pool instead of newing
@@ -145,6 +159,9 @@ class Metadata(object):
     for _ in range(_MAX_INIT_RETRY):
       try:
         self._store = mlmd.MetadataStore(self._connection_config)
+        if self._stats is not None:
+          self._store = metadata_instrumentation.InstrumentedMetadataStore(
+              self._store, self._stats)
       except RuntimeError as err:
         # MetadataStore could raise Aborted error if multiple concurrent
         # connections try to execute initialization DDL in database.
@@ -175,6 +192,16 @@ class Metadata(object):
       raise RuntimeError('Metadata object is not in enter state')
     return self._store
 
+  @property
+  def connection_config(self) -> ConnectionConfigType:
+    """Returns the connection config of the underlying MetadataStore."""
+    return self._connection_config
+
+  @property
+  def stats(self) -> Optional[metadata_instrumentation.CallStats]:
+    """Returns the stats of all the MLMD calls if instrumented, else `None`."""
+    return self._stats
+
   def _prepare_artifact_type(
       self, artifact_type: metadata_store_pb2.ArtifactType
   ) -> metadata_store_pb2.ArtifactType:
@@ -284,14 +311,16 @@ class Metadata(object):
       ]
     return result
 
-  def get_qualified_artifacts(
+  def _get_qualified_artifact_ids(
       self,
       contexts: List[metadata_store_pb2.Context],
       type_name: Text,
       producer_component_id: Optional[Text] = None,
       output_key: Optional[Text] = None,
-  ) -> List[metadata_store_service_pb2.ArtifactAndType]:
-    """Gets qualified artifacts that have the right producer info.
+  ) -> Tuple[Optional[metadata_store_pb2.ArtifactType], Set[int]]:
+    """Gets the ids of candidate artifacts that have the right producer info.
+
+    Candidate artifacts still need to be checked for their type and state.
 
     Args:
       contexts: context constraints to filter artifacts
@@ -300,7 +329,8 @@ class Metadata(object):
       output_key: output key constraint to filter artifacts
 
     Returns:
-      A list of ArtifactAndType, containing qualified artifacts.
+      A tuple of the artifact type, or None if it is not registered, and the
+      ids of the candidate artifacts.
     """
 
     def _match_producer_component_id(execution, component_id):
@@ -324,7 +354,7 @@ class Metadata(object):
         raise mlmd.errors.NotFoundError(
             None, None, 'No artifact type found for %s.' % type_name)
     except mlmd.errors.NotFoundError:
-      return []
+      return None, set()
 
     # Gets the executions that are associated with all contexts.
     assert contexts, 'Must have at least one context.'
@@ -346,20 +376,92 @@ class Metadata(object):
         ev for ev in self.store.get_events_by_execution_ids(
             qualified_producer_executions) if _match_output_key(ev, output_key)
     ]
+    return artifact_type, set(ev.artifact_id for ev in qualified_output_events)
+
+  def _is_qualified_artifact(
+      self, artifact: metadata_store_pb2.Artifact,
+      artifact_type: metadata_store_pb2.ArtifactType) -> bool:
+    """Whether an artifact has the right artifact type and state."""
+    return (artifact.type_id == artifact_type.id and
+            self._get_artifact_state(artifact) == ArtifactState.PUBLISHED)
+
+  def get_qualified_artifacts(
+      self,
+      contexts: List[metadata_store_pb2.Context],
+      type_name: Text,
+      producer_component_id: Optional[Text] = None,
+      output_key: Optional[Text] = None,
+  ) -> List[metadata_store_service_pb2.ArtifactAndType]:
+    """Gets qualified artifacts that have the right producer info.
+
+    Args:
+      contexts: context constraints to filter artifacts
+      type_name: type constraint to filter artifacts
+      producer_component_id: producer constraint to filter artifacts
+      output_key: output key constraint to filter artifacts
+
+    Returns:
+      A list of ArtifactAndType, containing qualified artifacts.
+    """
+    artifact_type, candidate_ids = self._get_qualified_artifact_ids(
+        contexts=contexts,
+        type_name=type_name,
+        producer_component_id=producer_component_id,
+        output_key=output_key)
+    if not artifact_type:
+      return []
 
     # Gets the candidate artifacts from output events.
-    candidate_artifacts = self.store.get_artifacts_by_id(
-        list(set(ev.artifact_id for ev in qualified_output_events)))
+    candidate_artifacts = self.store.get_artifacts_by_id(list(candidate_ids))
     # Filters the artifacts that have the right artifact type and state.
-    qualified_artifacts = [
-        a for a in candidate_artifacts if a.type_id == artifact_type.id and
-        self._get_artifact_state(a) == ArtifactState.PUBLISHED
-    ]
     return [
         metadata_store_service_pb2.ArtifactAndType(
-            artifact=a, type=artifact_type) for a in qualified_artifacts
+            artifact=a, type=artifact_type)
+        for a in candidate_artifacts
+        if self._is_qualified_artifact(a, artifact_type)
     ]
 
+  def iter_qualified_artifacts_newest_first(
+      self,
+      contexts: List[metadata_store_pb2.Context],
+      type_name: Text,
+      producer_component_id: Optional[Text] = None,
+      output_key: Optional[Text] = None,
+      page_size: int = _QUALIFIED_ARTIFACTS_PAGE_SIZE,
+  ) -> Iterator[metadata_store_service_pb2.ArtifactAndType]:
+    """Iterates qualified artifacts that have the right producer info.
+
+    Unlike `get_qualified_artifacts`, artifacts are fetched lazily in pages of
+    decreasing artifact id. Callers which only need the newest few artifacts
+    can stop iterating early, so that older artifacts are never fetched.
+
+    Args:
+      contexts: context constraints to filter artifacts
+      type_name: type constraint to filter artifacts
+      producer_component_id: producer constraint to filter artifacts
+      output_key: output key constraint to filter artifacts
+      page_size: number of artifacts fetched from MLMD at a time.
+
+    Yields:
+      ArtifactAndType of qualified artifacts, in decreasing artifact id order.
+    """
+    artifact_type, candidate_ids = self._get_qualified_artifact_ids(
+        contexts=contexts,
+        type_name=type_name,
+        producer_component_id=producer_component_id,
+        output_key=output_key)
+    if not artifact_type:
+      return
+
+    sorted_candidate_ids = sorted(candidate_ids, reverse=True)
+    for start in range(0, len(sorted_candidate_ids), page_size):
+      page = self.store.get_artifacts_by_id(
+          sorted_candidate_ids[start:start + page_size])
+      for a in sorted(page, key=lambda a: a.id, reverse=True):
+        if self._is_qualified_artifact(a, artifact_type):
+          yield metadata_store_service_pb2.ArtifactAndType(
+              artifact=a, type=artifact_type)
+
   def _prepare_event(self,
                      event_type: metadata_store_pb2.Event.Type,
                      execution_id: Optional[int] = None,
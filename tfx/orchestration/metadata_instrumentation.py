@@ -0,0 +1,202 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Instrumentation of the calls to MLMD.
+
+A `Metadata` constructed with `instrument=True` wraps its MLMD store with an
+`InstrumentedMetadataStore`, which records the number of calls, the latency and
+the payload size of every store method. The calls are recorded in the
+cumulative stats of the `Metadata` object and in the stats of every
+`record_calls` scope active on the calling thread, e.g.:
+
+  with metadata_instrumentation.record_calls() as stats:
+    launcher.launch()
+  logging.info('%s', stats.summary())
+"""
+
+import collections
+import contextlib
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Text
+
+from absl import logging
+import attr
+from tfx.utils import telemetry_utils
+
+from google.protobuf import message
+
+# Stats of the `record_calls` scopes active on the current thread.
+_thread_local_scopes = threading.local()
+
+
+@attr.s(auto_attribs=True)
+class MethodStats:
+  """Stats of the calls to one MLMD store method."""
+  # Number of calls.
+  calls: int = 0
+  # Number of calls which raised an error.
+  errors: int = 0
+  # Total latency of the calls in seconds.
+  total_secs: float = 0.0
+  # Total serialized size of the proto messages passed to the calls.
+  request_bytes: int = 0
+  # Total serialized size of the proto messages returned by the calls.
+  response_bytes: int = 0
+
+
+class CallStats:
+  """Stats of the calls to MLMD store methods. Thread-safe."""
+
+  def __init__(self, labels: Optional[Dict[Text, Text]] = None):
+    """Constructs `CallStats`.
+
+    Args:
+      labels: Telemetry labels the calls are made under, included in
+        `summary`.
+    """
+    self._lock = threading.Lock()
+    self._methods = collections.defaultdict(
+        MethodStats)  # type: Dict[Text, MethodStats]
+    self.labels = dict(labels or {})
+
+  def record(self, method_name: Text, secs: float, request_bytes: int,
+             response_bytes: int, error: bool) -> None:
+    """Records one call to `method_name`."""
+    self._add(
+        method_name,
+        MethodStats(
+            calls=1,
+            errors=int(error),
+            total_secs=secs,
+            request_bytes=request_bytes,
+            response_bytes=response_bytes))
+
+  def merge(self, other: 'CallStats') -> None:
+    """Adds the calls recorded in `other` to these stats."""
+    for method_name, other_stats in other.methods.items():
+      self._add(method_name, other_stats)
+
+  def _add(self, method_name: Text, other_stats: MethodStats) -> None:
+    with self._lock:
+      stats = self._methods[method_name]
+      stats.calls += other_stats.calls
+      stats.errors += other_stats.errors
+      stats.total_secs += other_stats.total_secs
+      stats.request_bytes += other_stats.request_bytes
+      stats.response_bytes += other_stats.response_bytes
+
+  @property
+  def methods(self) -> Dict[Text, MethodStats]:
+    """Returns a copy of the stats by method name."""
+    with self._lock:
+      return {name: attr.evolve(s) for name, s in self._methods.items()}
+
+  @property
+  def total_calls(self) -> int:
+    return sum(s.calls for s in self.methods.values())
+
+  @property
+  def total_secs(self) -> float:
+    return sum(s.total_secs for s in self.methods.values())
+
+  def summary(self) -> Text:
+    """Returns a one line summary of the stats, slowest methods first."""
+    methods = sorted(
+        self.methods.items(), key=lambda kv: kv[1].total_secs, reverse=True)
+    method_summaries = [
+        '{}: {} calls, {:.3f}s, {}B sent, {}B received'.format(
+            name, s.calls, s.total_secs, s.request_bytes, s.response_bytes)
+        for name, s in methods
+    ]
+    return '{} MLMD calls in {:.3f}s [{}] (labels: {})'.format(
+        sum(s.calls for _, s in methods), sum(s.total_secs for _, s in methods),
+        '; '.join(method_summaries), self.labels)
+
+
+def _active_scopes() -> List[CallStats]:
+  if getattr(_thread_local_scopes, 'stack', None) is None:
+    _thread_local_scopes.stack = []
+  return _thread_local_scopes.stack
+
+
+@contextlib.contextmanager
+def record_calls(log: bool = False) -> Iterator[CallStats]:
+  """Records the calls to instrumented MLMD stores made by the current thread.
+
+  Scopes can be nested, in which case calls are recorded in all of them.
+
+  Args:
+    log: If `True`, logs a summary of the recorded calls when exiting the scope,
+      unless no call was recorded.
+
+  Yields:
+    `CallStats` of the calls made within the scope, labelled with the
+    `telemetry_utils` labels at the start of the scope.
+  """
+  stats = CallStats(labels=telemetry_utils.get_labels_dict())
+  scopes = _active_scopes()
+  scopes.append(stats)
+  try:
+    yield stats
+  finally:
+    scopes.remove(stats)
+    if log and stats.total_calls:
+      logging.info('%s', stats.summary())
+
+
+def _payload_bytes(value: Any) -> int:
+  """Returns the serialized size of the proto messages in `value`."""
+  if isinstance(value, message.Message):
+    return value.ByteSize()
+  if isinstance(value, (list, tuple)):
+    return sum(_payload_bytes(v) for v in value)
+  return 0
+
+
+class InstrumentedMetadataStore:
+  """Proxy of an MLMD store recording the calls to its methods."""
+
+  def __init__(self, store: Any, stats: CallStats):
+    """Constructs `InstrumentedMetadataStore`.
+
+    Args:
+      store: The MLMD store to proxy.
+      stats: Stats to record all the calls in, in addition to the active
+        `record_calls` scopes.
+    """
+    self._store = store
+    self._stats = stats
+
+  def __getattr__(self, name: Text) -> Any:
+    value = getattr(self._store, name)
+    if name.startswith('_') or not callable(value):
+      return value
+
+    def instrumented(*args, **kwargs):
+      error = True
+      result = None
+      start = time.time()
+      try:
+        result = value(*args, **kwargs)
+        error = False
+        return result
+      finally:
+        secs = time.time() - start
+        request_bytes = (
+            _payload_bytes(args) + _payload_bytes(list(kwargs.values())))
+        response_bytes = _payload_bytes(result)
+        for stats in [self._stats] + _active_scopes():
+          stats.record(name, secs, request_bytes, response_bytes, error)
+
+    return instrumented
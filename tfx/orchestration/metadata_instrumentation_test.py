@@ -0,0 +1,101 @@
+# Copyright 2021 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.orchestration.metadata_instrumentation."""
+
+import tensorflow as tf
+from tfx.orchestration import metadata
+from tfx.orchestration import metadata_instrumentation
+from tfx.utils import telemetry_utils
+
+from ml_metadata.proto import metadata_store_pb2
+
+
+class MetadataInstrumentationTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._connection_config = metadata_store_pb2.ConnectionConfig()
+    self._connection_config.sqlite.SetInParent()
+    self._artifact_type = metadata_store_pb2.ArtifactType(name='Examples')
+
+  def testNotInstrumentedByDefault(self):
+    with metadata.Metadata(self._connection_config) as m:
+      with metadata_instrumentation.record_calls() as stats:
+        m.store.put_artifact_type(self._artifact_type)
+      self.assertIsNone(m.stats)
+      self.assertEqual(0, stats.total_calls)
+
+  def testRecordCalls(self):
+    m = metadata.Metadata(self._connection_config, instrument=True)
+    with m:
+      type_id = m.store.put_artifact_type(self._artifact_type)
+      with metadata_instrumentation.record_calls() as outer_stats:
+        m.store.get_artifact_type('Examples')
+        with metadata_instrumentation.record_calls() as inner_stats:
+          m.store.put_artifacts(
+              [metadata_store_pb2.Artifact(type_id=type_id, uri='/a')])
+          with self.assertRaises(Exception):
+            m.store.get_artifact_type('Unknown')
+
+    self.assertEqual(4, m.stats.total_calls)
+    self.assertCountEqual(
+        ['put_artifact_type', 'get_artifact_type', 'put_artifacts'],
+        m.stats.methods)
+    self.assertEqual(3, outer_stats.total_calls)
+    self.assertEqual(2, inner_stats.total_calls)
+    get_stats = outer_stats.methods['get_artifact_type']
+    self.assertEqual(2, get_stats.calls)
+    self.assertEqual(1, get_stats.errors)
+    self.assertGreater(get_stats.response_bytes, 0)
+    put_stats = inner_stats.methods['put_artifacts']
+    self.assertEqual(1, put_stats.calls)
+    self.assertGreater(put_stats.request_bytes, 0)
+    self.assertGreaterEqual(put_stats.total_secs, 0.0)
+
+  def testCallsOfOtherThreadsAreNotRecorded(self):
+    m = metadata.Metadata(self._connection_config, instrument=True)
+    with m:
+      with metadata_instrumentation.record_calls() as stats:
+        thread = self.checkedThread(
+            lambda: m.store.put_artifact_type(self._artifact_type))
+        thread.start()
+        thread.join()
+    self.assertEqual(0, stats.total_calls)
+    self.assertEqual(1, m.stats.total_calls)
+
+  def testMergeAndSummary(self):
+    with telemetry_utils.scoped_labels(
+        {telemetry_utils.LABEL_TFX_RUNNER: 'beam'}):
+      with metadata_instrumentation.record_calls() as stats:
+        pass
+    stats.record('get_executions', 0.5, 0, 100, error=False)
+    other = metadata_instrumentation.CallStats()
+    other.record('get_executions', 0.25, 0, 50, error=False)
+    other.record('put_execution', 1.0, 20, 10, error=True)
+    stats.merge(other)
+
+    self.assertEqual(
+        metadata_instrumentation.MethodStats(
+            calls=2, errors=0, total_secs=0.75, response_bytes=150),
+        stats.methods['get_executions'])
+    self.assertEqual(3, stats.total_calls)
+    self.assertEqual('beam', stats.labels[telemetry_utils.LABEL_TFX_RUNNER])
+    summary = stats.summary()
+    self.assertStartsWith(summary, '3 MLMD calls in 1.750s [put_execution: ')
+    self.assertIn('get_executions: 2 calls, 0.750s, 0B sent, 150B received',
+                  summary)
+
+
+if __name__ == '__main__':
+  tf.test.main()
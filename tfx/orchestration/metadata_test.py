@@ -22,6 +22,7 @@ from typing import Text
 
 # Standard Imports
 
+import mock
 import tensorflow as tf
 from tfx import types
 from tfx.orchestration import data_types
@@ -909,6 +910,41 @@ class MetadataTest(tf.test.TestCase):
       self.assertEqual(len(result), 1)
       self.assertEqual(result[0].artifact.id, artifact_one.id)
 
+  def testIterQualifiedArtifactsNewestFirst(self):
+    with metadata.Metadata(connection_config=self._connection_config) as m:
+      contexts = m.register_pipeline_contexts_if_not_exists(
+          self._pipeline_info)
+      m.register_execution(
+          exec_properties={},
+          pipeline_info=self._pipeline_info,
+          component_info=self._component_info,
+          contexts=list(contexts))
+      models = [standard_artifacts.Model() for _ in range(5)]
+      m.publish_execution(
+          component_info=self._component_info,
+          output_artifacts={
+              'k1': models,
+              'k2': [standard_artifacts.Model()]
+          })
+
+      with mock.patch.object(
+          m.store, 'get_artifacts_by_id',
+          wraps=m.store.get_artifacts_by_id) as get_artifacts:
+        result = m.iter_qualified_artifacts_newest_first(
+            contexts=contexts,
+            type_name=standard_artifacts.Model().type_name,
+            producer_component_id=self._component_info.component_id,
+            output_key='k1',
+            page_size=2)
+        newest_two = [next(result).artifact.id, next(result).artifact.id]
+        # Only the first page is fetched.
+        self.assertEqual(1, get_artifacts.call_count)
+        remaining = [a.artifact.id for a in result]
+
+      self.assertEqual(
+          sorted([a.id for a in models], reverse=True),
+          newest_two + remaining)
+
   def testContext(self):
     with metadata.Metadata(connection_config=self._connection_config) as m:
       contexts = m.register_pipeline_contexts_if_not_exists(self._pipeline_info)
@@ -16,6 +16,7 @@ import copy
 import os
 from typing import List, Mapping, MutableMapping, Optional, Sequence, cast
 
+import attr
 from tfx import types
 from tfx.orchestration import metadata
 from tfx.orchestration.portable.mlmd import execution_lib
@@ -100,6 +101,71 @@ def publish_succeeded_execution(
   Raises:
     RuntimeError: if the executor output to a output channel is partial.
   """
+  [execution] = metadata_handler.store.get_executions_by_id([execution_id])
+  return _publish_succeeded_execution(metadata_handler, execution, contexts,
+                                      output_artifacts, executor_output)
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class SucceededExecution:
+  """Arguments of `publish_succeeded_execution` for one execution."""
+  execution_id: int
+  contexts: Sequence[metadata_store_pb2.Context]
+  output_artifacts: Optional[MutableMapping[str,
+                                            Sequence[types.Artifact]]] = None
+  executor_output: Optional[execution_result_pb2.ExecutorOutput] = None
+
+
+def publish_succeeded_executions(
+    metadata_handler: metadata.Metadata,
+    executions: Sequence[SucceededExecution]) -> List[Optional[Exception]]:
+  """Marks several existing executions as success.
+
+  Equivalent to calling `publish_succeeded_execution` for each execution, but
+  reads all the executions from MLMD at once. Each execution is still written
+  in its own MLMD transaction so that an error publishing one execution (e.g. an
+  invalid executor output) does not prevent publishing the others.
+
+  Args:
+    metadata_handler: A handler to access MLMD.
+    executions: The executions to mark successful.
+
+  Returns:
+    The error raised publishing each execution of `executions`, or `None` if
+    the execution was published.
+  """
+  if not executions:
+    return []
+  executions_by_id = {
+      e.id: e for e in metadata_handler.store.get_executions_by_id(
+          [e.execution_id for e in executions])
+  }
+  errors = []
+  for succeeded_execution in executions:
+    try:
+      if succeeded_execution.execution_id not in executions_by_id:
+        raise RuntimeError('Execution {} not found in MLMD.'.format(
+            succeeded_execution.execution_id))
+      _publish_succeeded_execution(
+          metadata_handler,
+          executions_by_id[succeeded_execution.execution_id],
+          succeeded_execution.contexts, succeeded_execution.output_artifacts,
+          succeeded_execution.executor_output)
+    except Exception as e:  # pylint: disable=broad-except
+      errors.append(e)
+    else:
+      errors.append(None)
+  return errors
+
+
+def _publish_succeeded_execution(
+    metadata_handler: metadata.Metadata,
+    execution: metadata_store_pb2.Execution,
+    contexts: Sequence[metadata_store_pb2.Context],
+    output_artifacts: Optional[MutableMapping[str, Sequence[types.Artifact]]],
+    executor_output: Optional[execution_result_pb2.ExecutorOutput]
+) -> MutableMapping[str, List[types.Artifact]]:
+  """Implements `publish_succeeded_execution` given the MLMD execution."""
   output_artifacts = copy.deepcopy(output_artifacts) or {}
   output_artifacts = cast(MutableMapping[str, List[types.Artifact]],
                           output_artifacts)
@@ -136,7 +202,6 @@ def publish_succeeded_execution(
     for artifact in artifact_list:
       artifact.mlmd_artifact.state = metadata_store_pb2.Artifact.LIVE
 
-  [execution] = metadata_handler.store.get_executions_by_id([execution_id])
   execution.last_known_state = metadata_store_pb2.Execution.COMPLETE
 
   execution_lib.put_execution(
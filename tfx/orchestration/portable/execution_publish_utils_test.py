@@ -408,6 +408,51 @@ class ExecutionPublisherTest(test_case_utils.TfxTest):
         execution_publish_utils.publish_succeeded_execution(
             m, execution_id, contexts, output_dict, executor_output)
 
+  def testPublishSucceededExecutions(self):
+    with metadata.Metadata(connection_config=self._connection_config) as m:
+      contexts = self._generate_contexts(m)
+      execution_ids = [
+          execution_publish_utils.register_execution(m, self._execution_type,
+                                                     contexts).id
+          for _ in range(3)
+      ]
+      output_examples = []
+      for i in range(3):
+        output_example = standard_artifacts.Examples()
+        output_example.uri = '/examples_uri_%d' % i
+        output_examples.append(output_example)
+      # The executor output of the second execution is invalid.
+      invalid_executor_output = execution_result_pb2.ExecutorOutput()
+      invalid_executor_output.output_artifacts['new_key'].artifacts.add()
+
+      errors = execution_publish_utils.publish_succeeded_executions(m, [
+          execution_publish_utils.SucceededExecution(
+              execution_id=execution_ids[0],
+              contexts=contexts,
+              output_artifacts={'examples': [output_examples[0]]}),
+          execution_publish_utils.SucceededExecution(
+              execution_id=execution_ids[1],
+              contexts=contexts,
+              output_artifacts={'examples': [output_examples[1]]},
+              executor_output=invalid_executor_output),
+          execution_publish_utils.SucceededExecution(
+              execution_id=execution_ids[2],
+              contexts=contexts,
+              output_artifacts={'examples': [output_examples[2]]}),
+      ])
+
+      self.assertIsNone(errors[0])
+      self.assertIsInstance(errors[1], RuntimeError)
+      self.assertIsNone(errors[2])
+      executions = m.store.get_executions_by_id(execution_ids)
+      self.assertEqual([
+          metadata_store_pb2.Execution.COMPLETE,
+          metadata_store_pb2.Execution.RUNNING,
+          metadata_store_pb2.Execution.COMPLETE
+      ], [e.last_known_state for e in executions])
+      self.assertCountEqual(['/examples_uri_0', '/examples_uri_2'],
+                            [a.uri for a in m.store.get_artifacts()])
+
   def testPublishFailedExecution(self):
     with metadata.Metadata(connection_config=self._connection_config) as m:
       contexts = self._generate_contexts(m)
@@ -13,7 +13,8 @@
 # limitations under the License.
 """Portable library for input artifacts resolution."""
 import collections
-from typing import Dict, Iterable, List, Optional
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 from absl import logging
 from tfx import types
@@ -29,6 +30,64 @@ import ml_metadata as mlmd
 from ml_metadata.proto import metadata_store_pb2
 
 
+def _get_artifact_type(
+    metadata_handler: metadata.Metadata,
+    artifact_type: metadata_store_pb2.ArtifactType,
+    artifact_type_cache: Optional[Dict[
+        str, Optional[metadata_store_pb2.ArtifactType]]] = None
+) -> Optional[metadata_store_pb2.ArtifactType]:
+  """Gets the registered artifact type with the same name, if any."""
+  artifact_type_name = artifact_type.name
+  if (artifact_type_cache is not None and
+      artifact_type_name in artifact_type_cache):
+    return artifact_type_cache[artifact_type_name]
+  try:
+    result = metadata_handler.store.get_artifact_type(artifact_type_name)
+  except mlmd.errors.NotFoundError:
+    logging.warning('Artifact type %s is not found in MLMD.',
+                    artifact_type_name)
+    result = None
+  if artifact_type_cache is not None:
+    artifact_type_cache[artifact_type_name] = result
+  return result
+
+
+def _get_output_events_within_contexts(
+    metadata_handler: metadata.Metadata,
+    contexts: Iterable[metadata_store_pb2.Context]
+) -> List[metadata_store_pb2.Event]:
+  """Gets output events of successful executions within all the contexts."""
+  executions_within_context = (
+      execution_lib.get_executions_associated_with_all_contexts(
+          metadata_handler, contexts))
+
+  # Filters out non-success executions.
+  qualified_producer_executions = [
+      e.id
+      for e in executions_within_context
+      if execution_lib.is_execution_successful(e)
+  ]
+  if not qualified_producer_executions:
+    return []
+  return [
+      ev for ev in metadata_handler.store.get_events_by_execution_ids(
+          qualified_producer_executions)
+      if event_lib.is_valid_output_event(ev)
+  ]
+
+
+def _filter_and_deserialize_artifacts(
+    candidate_artifacts: Iterable[metadata_store_pb2.Artifact],
+    artifact_type: metadata_store_pb2.ArtifactType) -> List[types.Artifact]:
+  """Deserializes the artifacts that have the right artifact type and state."""
+  return [
+      artifact_utils.deserialize_artifact(artifact_type, a)
+      for a in candidate_artifacts
+      if a.type_id == artifact_type.id and
+      a.state == metadata_store_pb2.Artifact.LIVE
+  ]
+
+
 def get_qualified_artifacts(
     metadata_handler: metadata.Metadata,
     contexts: Iterable[metadata_store_pb2.Context],
@@ -51,67 +110,102 @@ def get_qualified_artifacts(
   if not contexts:
     return []
 
-  try:
-    artifact_type_name = artifact_type.name
-    artifact_type = metadata_handler.store.get_artifact_type(artifact_type_name)
-  except mlmd.errors.NotFoundError:
-    logging.warning('Artifact type %s is not found in MLMD.',
-                    artifact_type.name)
-    artifact_type = None
-
+  artifact_type = _get_artifact_type(metadata_handler, artifact_type)
   if not artifact_type:
     return []
 
-  executions_within_context = (
-      execution_lib.get_executions_associated_with_all_contexts(
-          metadata_handler, contexts))
-
-  # Filters out non-success executions.
-  qualified_producer_executions = [
-      e.id
-      for e in executions_within_context
-      if execution_lib.is_execution_successful(e)
-  ]
   # Gets the output events that have the matched output key.
   qualified_output_events = [
-      ev for ev in metadata_handler.store.get_events_by_execution_ids(
-          qualified_producer_executions)
+      ev for ev in _get_output_events_within_contexts(metadata_handler,
+                                                      contexts)
       if event_lib.is_valid_output_event(ev, output_key)
   ]
 
   # Gets the candidate artifacts from output events.
   candidate_artifacts = metadata_handler.store.get_artifacts_by_id(
       list(set(ev.artifact_id for ev in qualified_output_events)))
-  # Filters the artifacts that have the right artifact type and state.
-  qualified_artifacts = [
-      a for a in candidate_artifacts if a.type_id == artifact_type.id and
-      a.state == metadata_store_pb2.Artifact.LIVE
-  ]
-  return [
-      artifact_utils.deserialize_artifact(artifact_type, a)
-      for a in qualified_artifacts
-  ]
+  return _filter_and_deserialize_artifacts(candidate_artifacts, artifact_type)
+
 
+def _get_context_key(
+    channel: pipeline_pb2.InputSpec.Channel) -> FrozenSet[Tuple[str, Any]]:
+  """Returns the (type name, context name) pairs a channel is filtered by."""
+  return frozenset(
+      (context_query.type.name, data_types_utils.get_value(context_query.name))
+      for context_query in channel.context_queries)
 
-def _resolve_single_channel(
+
+def _resolve_channels(
     metadata_handler: metadata.Metadata,
-    channel: pipeline_pb2.InputSpec.Channel) -> List[types.Artifact]:
-  """Resolves input artifacts from a single channel."""
+    channels: List[pipeline_pb2.InputSpec.Channel]
+) -> List[List[types.Artifact]]:
+  """Resolves input artifacts from multiple channels with batched MLMD reads.
+
+  Channels are grouped by the set of contexts they are filtered by. Contexts,
+  executions and events are fetched once per group, and the candidate artifacts
+  of all channels are fetched in a single call.
+
+  Args:
+    metadata_handler: A metadata handler to access MLMD store.
+    channels: The channels to resolve.
+
+  Returns:
+    The artifacts of each channel, in the same order as `channels`.
+  """
+  contexts_by_name = {}
+  output_events_by_context_key = {}
+  artifact_type_cache = {}
+  # Qualified artifact type and candidate artifact ids of each channel. The
+  # artifact type is None if the channel resolves to no artifacts.
+  channel_candidates = []
+  for channel in channels:
+    context_key = _get_context_key(channel)
+    if context_key not in output_events_by_context_key:
+      contexts = []
+      for context_type_name, context_name in context_key:
+        if (context_type_name, context_name) not in contexts_by_name:
+          contexts_by_name[(context_type_name, context_name)] = (
+              metadata_handler.store.get_context_by_type_and_name(
+                  context_type_name, context_name))
+        context = contexts_by_name[(context_type_name, context_name)]
+        if context:
+          contexts.append(context)
+      # We expect to have at least one context for input resolution.
+      output_events_by_context_key[context_key] = (
+          _get_output_events_within_contexts(metadata_handler, contexts)
+          if contexts else [])
+
+    artifact_type = _get_artifact_type(metadata_handler,
+                                       channel.artifact_query.type,
+                                       artifact_type_cache)
+    output_key = channel.output_key or None
+    artifact_ids = set()
+    if artifact_type:
+      artifact_ids = set(
+          ev.artifact_id for ev in output_events_by_context_key[context_key]
+          if event_lib.is_valid_output_event(ev, output_key))
+    channel_candidates.append((artifact_type, artifact_ids))
 
-  artifact_type = channel.artifact_query.type
-  output_key = channel.output_key or None
+  all_artifact_ids = set()
+  for _, artifact_ids in channel_candidates:
+    all_artifact_ids.update(artifact_ids)
+  artifacts_by_id = {}
+  if all_artifact_ids:
+    artifacts_by_id = {
+        a.id: a for a in metadata_handler.store.get_artifacts_by_id(
+            list(all_artifact_ids))
+    }
 
-  contexts = []
-  for context_query in channel.context_queries:
-    context = metadata_handler.store.get_context_by_type_and_name(
-        context_query.type.name, data_types_utils.get_value(context_query.name))
-    if context:
-      contexts.append(context)
-  return get_qualified_artifacts(
-      metadata_handler=metadata_handler,
-      contexts=contexts,
-      artifact_type=artifact_type,
-      output_key=output_key)
+  result = []
+  for artifact_type, artifact_ids in channel_candidates:
+    if not artifact_type:
+      result.append([])
+      continue
+    result.append(
+        _filter_and_deserialize_artifacts(
+            (artifacts_by_id[i] for i in artifact_ids if i in artifacts_by_id),
+            artifact_type))
+  return result
 
 
 def resolve_input_artifacts(
@@ -128,13 +222,21 @@ def resolve_input_artifacts(
     If `min_count` for every input is met, returns a Dict[str, List[Artifact]].
     Otherwise, return None.
   """
-  result = collections.defaultdict(set)
+  start_time = time.time()
+  channel_keys = []
+  channels = []
   for key, input_spec in node_inputs.inputs.items():
     for channel in input_spec.channels:
-      artifacts = _resolve_single_channel(
-          metadata_handler=metadata_handler, channel=channel)
-      result[key].update(artifacts)
+      channel_keys.append(key)
+      channels.append(channel)
+  resolved_channels = _resolve_channels(metadata_handler, channels)
+  logging.info('Resolved %d input channels in %.3f seconds.', len(channels),
+               time.time() - start_time)
 
+  result = collections.defaultdict(set)
+  for key, artifacts in zip(channel_keys, resolved_channels):
+    result[key].update(artifacts)
+  for key, input_spec in node_inputs.inputs.items():
     # If `min_count` is not satisfied, return None for the whole result.
     if input_spec.min_count > len(result[key]):
       logging.warning(
@@ -142,7 +244,7 @@ def resolve_input_artifacts(
           'got %d', key, input_spec.min_count, len(result[key]))
       return None
 
-  result = {k: list(v) for k, v in result.items()}
+  result = {k: list(result[k]) for k in node_inputs.inputs}
   for processor in (resolver_processor
                     .make_resolver_processors(node_inputs.resolver_config)):
     result = processor(metadata_handler, result)
@@ -151,6 +253,54 @@ def resolve_input_artifacts(
   return result
 
 
+def get_input_watermark(
+    metadata_handler: metadata.Metadata,
+    node_inputs: pipeline_pb2.NodeInputs) -> Tuple[Any, ...]:
+  """Returns a cheap to compute watermark of the inputs of a pipeline node.
+
+  The watermark of each input channel is derived from the successful producer
+  executions within the channel's contexts: their maximum id, their latest
+  update time and their count. Since artifacts are only published along with a
+  successful execution, the result of `resolve_input_artifacts` cannot change
+  unless the watermark changes. Computing the watermark only requires the
+  context and execution lookups of the resolution, but no event, artifact or
+  resolver processing.
+
+  Args:
+    metadata_handler: A metadata handler to access MLMD store.
+    node_inputs: A pipeline_pb2.NodeInputs message of the pipeline node.
+
+  Returns:
+    A hashable watermark which can be compared with previous watermarks of the
+    same node.
+  """
+  watermarks_by_context_key = {}
+  result = []
+  for key in sorted(node_inputs.inputs):
+    for channel in node_inputs.inputs[key].channels:
+      context_key = _get_context_key(channel)
+      if context_key not in watermarks_by_context_key:
+        contexts = []
+        for context_type_name, context_name in sorted(context_key):
+          context = metadata_handler.store.get_context_by_type_and_name(
+              context_type_name, context_name)
+          if context:
+            contexts.append(context)
+        executions = (
+            execution_lib.get_executions_associated_with_all_contexts(
+                metadata_handler, contexts) if contexts else [])
+        successful_executions = [
+            e for e in executions if execution_lib.is_execution_successful(e)
+        ]
+        watermarks_by_context_key[context_key] = (
+            max((e.id for e in successful_executions), default=0),
+            max((e.last_update_time_since_epoch for e in successful_executions),
+                default=0),
+            len(successful_executions))
+      result.append((key, watermarks_by_context_key[context_key]))
+  return tuple(result)
+
+
 def resolve_parameters(
     node_parameters: pipeline_pb2.NodeParameters) -> Dict[str, types.Property]:
   """Resolves parameters given parameter spec.
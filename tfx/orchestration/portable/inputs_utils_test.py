@@ -16,6 +16,7 @@ import importlib
 import os
 import unittest
 
+import mock
 import tensorflow as tf
 
 from tfx import types
@@ -236,6 +237,89 @@ class InputsUtilsTest(test_case_utils.TfxTest, _TestMixin):
       self.assertArtifactMapEqual({'model': [output_model]},
                                   pusher_inputs)
 
+  def testResolveInputArtifactsBatchesChannelsWithSameContexts(self):
+    pipeline = self.load_pipeline_proto(
+        'pipeline_for_input_resolver_test.pbtxt')
+    my_example_gen = pipeline.nodes[0].pipeline_node
+    my_transform = pipeline.nodes[2].pipeline_node
+
+    with self.get_metadata() as m:
+      output_example = self.make_examples(uri='my_examples_uri')
+      side_examples = self.make_examples(uri='side_examples_uri')
+      output_artifacts = self.fake_execute(
+          m,
+          my_example_gen,
+          input_map=None,
+          output_map={
+              'output_examples': [output_example],
+              'another_examples': [side_examples]
+          })
+      output_example = output_artifacts['output_examples'][0]
+      side_examples = output_artifacts['another_examples'][0]
+
+      # Consumes both outputs of the first ExampleGen, whose channels are
+      # filtered by the same contexts.
+      node_inputs = pipeline_pb2.NodeInputs()
+      node_inputs.CopyFrom(my_transform.inputs)
+      side_channel = node_inputs.inputs['side_examples'].channels.add()
+      side_channel.CopyFrom(node_inputs.inputs['examples'].channels[0])
+      side_channel.output_key = 'another_examples'
+
+      with mock.patch.object(
+          m.store, 'get_executions_by_context',
+          wraps=m.store.get_executions_by_context) as get_executions, \
+          mock.patch.object(
+              m.store, 'get_artifacts_by_id',
+              wraps=m.store.get_artifacts_by_id) as get_artifacts:
+        inputs = inputs_utils.resolve_input_artifacts(m, node_inputs)
+
+      self.assertArtifactMapEqual(
+          {
+              'examples': [output_example],
+              'side_examples': [side_examples]
+          }, inputs)
+      # Executions are fetched once per context, not once per channel.
+      self.assertEqual(
+          len(node_inputs.inputs['examples'].channels[0].context_queries),
+          get_executions.call_count)
+      get_artifacts.assert_called_once()
+
+  def testGetInputWatermark(self):
+    pipeline = self.load_pipeline_proto(
+        'pipeline_for_input_resolver_test.pbtxt')
+    my_example_gen = pipeline.nodes[0].pipeline_node
+    my_transform = pipeline.nodes[2].pipeline_node
+
+    with self.get_metadata() as m:
+      watermark0 = inputs_utils.get_input_watermark(m, my_transform.inputs)
+      self.assertEqual(watermark0,
+                       inputs_utils.get_input_watermark(m, my_transform.inputs))
+
+      self.fake_execute(
+          m,
+          my_example_gen,
+          input_map=None,
+          output_map={'output_examples': [self.make_examples(uri='uri1')]})
+      watermark1 = inputs_utils.get_input_watermark(m, my_transform.inputs)
+      self.assertNotEqual(watermark0, watermark1)
+      self.assertEqual(watermark1,
+                       inputs_utils.get_input_watermark(m, my_transform.inputs))
+
+      with mock.patch.object(
+          m.store, 'get_events_by_execution_ids') as get_events, \
+          mock.patch.object(m.store, 'get_artifacts_by_id') as get_artifacts:
+        inputs_utils.get_input_watermark(m, my_transform.inputs)
+      get_events.assert_not_called()
+      get_artifacts.assert_not_called()
+
+      self.fake_execute(
+          m,
+          my_example_gen,
+          input_map=None,
+          output_map={'output_examples': [self.make_examples(uri='uri2')]})
+      self.assertNotEqual(
+          watermark1, inputs_utils.get_input_watermark(m, my_transform.inputs))
+
 
 def unprocessed_artifacts_resolvers_available():
   try:
@@ -20,6 +20,7 @@ import attr
 from tfx import types
 from tfx.dsl.io import fileio
 from tfx.orchestration import metadata
+from tfx.orchestration import metadata_instrumentation
 from tfx.orchestration.portable import base_driver_operator
 from tfx.orchestration.portable import base_executor_operator
 from tfx.orchestration.portable import cache_utils
@@ -354,6 +355,9 @@ class Launcher(object):
   def launch(self) -> Optional[metadata_store_pb2.Execution]:
     """Executes the component, includes driver, executor and publisher.
 
+    If the MLMD connection is instrumented, logs a summary of the MLMD calls
+    made by the launch.
+
     Returns:
       The metadata of this execution that is registered in MLMD. It can be None
       if the driver decides not to run the execution.
@@ -361,6 +365,11 @@ class Launcher(object):
     Raises:
       Exception: If the executor fails.
     """
+    with metadata_instrumentation.record_calls(log=True):
+      return self._launch()
+
+  def _launch(self) -> Optional[metadata_store_pb2.Execution]:
+    """Implements `launch`."""
     logging.info('Running launcher for %s', self._pipeline_node)
     if self._system_node_handler:
       # If this is a system node, runs it and directly return.
@@ -0,0 +1,229 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A pool of long-lived worker processes that run python class executors.
+
+Importing an executor module (and with it TensorFlow, Beam and their runners)
+is a significant part of the cost of a short executor run. Workers of an
+`ExecutorWorkerPool` stay alive across executions, so that cost is only paid
+the first time a worker runs a given executor class.
+
+Typical usage with the portable launcher:
+
+  pool = python_executor_worker_pool.ExecutorWorkerPool(num_workers=4)
+  launcher.Launcher(
+      ...,
+      custom_executor_operators={
+          executable_spec_pb2.PythonClassExecutableSpec:
+              pool.executor_operator_factory()
+      })
+"""
+
+import functools
+import importlib
+import multiprocessing
+import sys
+from typing import Callable, Dict, List, Optional, Sequence, cast
+
+from absl import logging
+from tfx.orchestration.portable import data_types
+from tfx.orchestration.portable import python_executor_operator
+from tfx.orchestration.python_execution_binary import python_execution_binary_utils
+from tfx.proto.orchestration import executable_spec_pb2
+from tfx.proto.orchestration import execution_result_pb2
+
+from google.protobuf import message
+
+# Operators constructed inside a worker, keyed by serialized executable spec.
+# Only populated in worker processes.
+_worker_operators: Dict[str,
+                        python_executor_operator.PythonExecutorOperator] = {}
+
+
+def _initialize_worker(preload_modules: Sequence[str]) -> None:
+  """Imports modules which are expected to be used by most executors."""
+  for module_name in preload_modules:
+    try:
+      importlib.import_module(module_name)
+    except ImportError:
+      logging.warning('Failed to preload module %s in executor worker.',
+                      module_name)
+
+
+def _run_executor_in_worker(executable_spec_b64: str, execution_info_b64: str,
+                            extra_flags: List[str]) -> bytes:
+  """Runs an executor in a worker process and returns serialized output."""
+  operator = _worker_operators.get(executable_spec_b64)
+  if operator is None:
+    executable_spec = python_execution_binary_utils.deserialize_executable_spec(
+        executable_spec_b64)
+    operator = python_executor_operator.PythonExecutorOperator(executable_spec)
+    _worker_operators[executable_spec_b64] = operator
+  # Flags are resolved by the caller, as the worker has its own sys.argv.
+  operator.extra_flags = list(extra_flags)
+  execution_info = python_execution_binary_utils.deserialize_execution_info(
+      execution_info_b64)
+  return operator.run_executor(execution_info).SerializeToString()
+
+
+class ExecutorWorkerPool:
+  """A pool of warm worker processes running python class executors.
+
+  Workers are started lazily on the first execution and are kept alive until
+  the pool is closed. A worker is replaced by a fresh process once it has run
+  `max_executions_per_worker` executions, which bounds the effect of executors
+  leaking memory or global state.
+  """
+
+  def __init__(self,
+               num_workers: Optional[int] = None,
+               max_executions_per_worker: Optional[int] = None,
+               preload_modules: Sequence[str] = (),
+               start_method: str = 'spawn'):
+    """Initializes an ExecutorWorkerPool.
+
+    Args:
+      num_workers: Number of worker processes. Defaults to the number of CPUs.
+      max_executions_per_worker: Number of executions after which a worker is
+        recycled. If unset, workers live as long as the pool.
+      preload_modules: Modules to import when a worker starts, e.g.
+        'tensorflow' or 'apache_beam'.
+      start_method: The multiprocessing start method of the workers. 'spawn' is
+        used by default as forking a process with TensorFlow or gRPC state is
+        not safe.
+
+    Raises:
+      ValueError: if num_workers or max_executions_per_worker is not positive.
+    """
+    if num_workers is not None and num_workers <= 0:
+      raise ValueError('num_workers must be positive, got %d.' % num_workers)
+    if max_executions_per_worker is not None and max_executions_per_worker <= 0:
+      raise ValueError('max_executions_per_worker must be positive, got %d.' %
+                       max_executions_per_worker)
+    self._num_workers = num_workers or multiprocessing.cpu_count()
+    self._max_executions_per_worker = max_executions_per_worker
+    self._preload_modules = tuple(preload_modules)
+    self._mp_context = multiprocessing.get_context(start_method)
+    self._pool = None
+
+  @property
+  def num_workers(self) -> int:
+    return self._num_workers
+
+  def _get_pool(self):
+    if self._pool is None:
+      logging.info('Starting executor worker pool with %d workers.',
+                   self._num_workers)
+      self._pool = self._mp_context.Pool(
+          processes=self._num_workers,
+          initializer=_initialize_worker,
+          initargs=(self._preload_modules,),
+          maxtasksperchild=self._max_executions_per_worker)
+    return self._pool
+
+  def run_executor(
+      self, executable_spec: executable_spec_pb2.PythonClassExecutableSpec,
+      execution_info: data_types.ExecutionInfo,
+      extra_flags: List[str]) -> execution_result_pb2.ExecutorOutput:
+    """Runs an executor in one of the workers and blocks until it finishes.
+
+    Args:
+      executable_spec: The executor to run.
+      execution_info: A wrapper of the details of this execution.
+      extra_flags: Flags passed to the executor as beam pipeline args.
+
+    Returns:
+      The output from executor.
+
+    Raises:
+      Any exception raised by the executor in the worker.
+    """
+    result = self._get_pool().apply(
+        _run_executor_in_worker,
+        (python_execution_binary_utils.serialize_executable_spec(
+            executable_spec),
+         python_execution_binary_utils.serialize_execution_info(execution_info),
+         list(extra_flags)))
+    return execution_result_pb2.ExecutorOutput.FromString(result)
+
+  def executor_operator_factory(
+      self
+  ) -> Callable[..., 'WorkerPoolPythonExecutorOperator']:
+    """Returns a factory usable in Launcher's `custom_executor_operators`."""
+    return functools.partial(WorkerPoolPythonExecutorOperator, worker_pool=self)
+
+  def close(self) -> None:
+    """Stops all workers after they finish their current execution."""
+    if self._pool is not None:
+      self._pool.close()
+      self._pool.join()
+      self._pool = None
+
+  def __enter__(self) -> 'ExecutorWorkerPool':
+    return self
+
+  def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+    self.close()
+
+
+class WorkerPoolPythonExecutorOperator(
+    python_executor_operator.PythonExecutorOperator):
+  """A PythonExecutorOperator which runs executors in an ExecutorWorkerPool.
+
+  Unlike PythonExecutorOperator, the executor class is not imported in the
+  calling process.
+  """
+
+  def __init__(self,
+               executor_spec: message.Message,
+               platform_config: Optional[message.Message] = None,
+               worker_pool: Optional[ExecutorWorkerPool] = None):
+    """Initializes a WorkerPoolPythonExecutorOperator.
+
+    Args:
+      executor_spec: The specification of how to initialize the executor.
+      platform_config: The specification of how to allocate resource for the
+        executor.
+      worker_pool: The pool to run executors in.
+
+    Raises:
+      ValueError: if worker_pool is not set.
+    """
+    if worker_pool is None:
+      raise ValueError('worker_pool is required.')
+    # Intentionally skip PythonExecutorOperator.__init__, which imports the
+    # executor class in this process.
+    del platform_config
+    super(python_executor_operator.PythonExecutorOperator,
+          self).__init__(executor_spec)
+    python_class_executor_spec = cast(
+        executable_spec_pb2.PythonClassExecutableSpec, self._executor_spec)
+    self._worker_pool = worker_pool
+    self.extra_flags = []
+    self.extra_flags.extend(python_class_executor_spec.extra_flags)
+    self.extra_flags.extend(sys.argv[1:])
+
+  def run_executor(
+      self, execution_info: data_types.ExecutionInfo
+  ) -> execution_result_pb2.ExecutorOutput:
+    """Invokes the executor in the worker pool.
+
+    Args:
+      execution_info: A wrapper of the details of this execution.
+
+    Returns:
+      The output from executor.
+    """
+    return self._worker_pool.run_executor(
+        cast(executable_spec_pb2.PythonClassExecutableSpec,
+             self._executor_spec), execution_info, self.extra_flags)
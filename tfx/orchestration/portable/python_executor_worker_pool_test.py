@@ -0,0 +1,127 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.orchestration.portable.python_executor_worker_pool."""
+
+import os
+from typing import Any, Dict, List, Text
+
+import tensorflow as tf
+from tfx import types
+from tfx.dsl.components.base import base_executor
+from tfx.orchestration.portable import data_types
+from tfx.orchestration.portable import python_executor_worker_pool
+from tfx.proto.orchestration import executable_spec_pb2
+from tfx.types import standard_artifacts
+from tfx.utils import test_case_utils
+
+from google.protobuf import text_format
+
+
+class PidExecutor(base_executor.BaseExecutor):
+  """A Fake executor which records the pid of the process it runs in."""
+
+  def Do(self, input_dict: Dict[Text, List[types.Artifact]],
+         output_dict: Dict[Text, List[types.Artifact]],
+         exec_properties: Dict[Text, Any]) -> None:
+    model = output_dict['output_key'][0]
+    model.set_int_custom_property('pid', os.getpid())
+    model.set_string_custom_property('flags',
+                                     ','.join(self._beam_pipeline_args))
+
+
+class FailingExecutor(base_executor.BaseExecutor):
+  """A Fake executor which always fails."""
+
+  def Do(self, input_dict: Dict[Text, List[types.Artifact]],
+         output_dict: Dict[Text, List[types.Artifact]],
+         exec_properties: Dict[Text, Any]) -> None:
+    raise ValueError('executor failed')
+
+
+class PythonExecutorWorkerPoolTest(test_case_utils.TfxTest):
+
+  def _make_execution_info(self, execution_id: int) -> data_types.ExecutionInfo:
+    return data_types.ExecutionInfo(
+        execution_id=execution_id,
+        input_dict={'input_key': [standard_artifacts.Examples()]},
+        output_dict={'output_key': [standard_artifacts.Model()]},
+        exec_properties={'key': 'value'},
+        stateful_working_dir=os.path.join(self.tmp_dir, 'stateful_working_dir'),
+        execution_output_uri=os.path.join(self.tmp_dir,
+                                          'executor_output_%d' % execution_id))
+
+  def _run(self, operator, execution_id: int):
+    executor_output = operator.run_executor(
+        self._make_execution_info(execution_id))
+    custom_properties = (
+        executor_output.output_artifacts['output_key'].artifacts[0]
+        .custom_properties)
+    return (custom_properties['pid'].int_value,
+            custom_properties['flags'].string_value)
+
+  def testRunExecutorInWarmWorker(self):
+    executor_spec = text_format.Parse(
+        """
+      class_path: "tfx.orchestration.portable.python_executor_worker_pool_test.PidExecutor"
+      extra_flags: "--runner=DirectRunner"
+    """, executable_spec_pb2.PythonClassExecutableSpec())
+    with python_executor_worker_pool.ExecutorWorkerPool(
+        num_workers=1) as pool:
+      operator = pool.executor_operator_factory()(executor_spec, None)
+      first_pid, flags = self._run(operator, 1)
+      second_pid, _ = self._run(operator, 2)
+
+    self.assertNotEqual(os.getpid(), first_pid)
+    self.assertEqual(first_pid, second_pid)
+    self.assertIn('--runner=DirectRunner', flags.split(','))
+
+  def testRecycleWorker(self):
+    executor_spec = text_format.Parse(
+        """
+      class_path: "tfx.orchestration.portable.python_executor_worker_pool_test.PidExecutor"
+    """, executable_spec_pb2.PythonClassExecutableSpec())
+    with python_executor_worker_pool.ExecutorWorkerPool(
+        num_workers=1, max_executions_per_worker=1) as pool:
+      operator = pool.executor_operator_factory()(executor_spec, None)
+      first_pid, _ = self._run(operator, 1)
+      second_pid, _ = self._run(operator, 2)
+
+    self.assertNotEqual(first_pid, second_pid)
+
+  def testExecutorErrorIsRaised(self):
+    executor_spec = text_format.Parse(
+        """
+      class_path: "tfx.orchestration.portable.python_executor_worker_pool_test.FailingExecutor"
+    """, executable_spec_pb2.PythonClassExecutableSpec())
+    with python_executor_worker_pool.ExecutorWorkerPool(
+        num_workers=1) as pool:
+      operator = pool.executor_operator_factory()(executor_spec, None)
+      with self.assertRaisesRegex(ValueError, 'executor failed'):
+        operator.run_executor(self._make_execution_info(1))
+
+  def testInvalidPoolSize(self):
+    with self.assertRaises(ValueError):
+      python_executor_worker_pool.ExecutorWorkerPool(num_workers=0)
+    with self.assertRaises(ValueError):
+      python_executor_worker_pool.ExecutorWorkerPool(
+          max_executions_per_worker=0)
+
+  def testWorkerPoolIsRequired(self):
+    with self.assertRaises(ValueError):
+      python_executor_worker_pool.WorkerPoolPythonExecutorOperator(
+          executable_spec_pb2.PythonClassExecutableSpec())
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -30,7 +30,6 @@ import click
 from six import with_metaclass
 
 
-from tfx.dsl.components.base import base_driver
 from tfx.dsl.io import fileio
 from tfx.tools.cli import labels
 from tfx.utils import io_utils
@@ -275,7 +274,9 @@ class BaseHandler(with_metaclass(abc.ABCMeta, object)):
     schemagen_outputs = fileio.listdir(schema_dir)
     latest_schema_folder = max(schemagen_outputs, key=int)
 
-    # Copy schema to current dir.
+    # Copy schema to current dir. base_driver is imported here as it depends on
+    # MLMD, which slows down startup of every CLI command.
+    from tfx.dsl.components.base import base_driver  # pylint: disable=g-import-not-at-top
     latest_schema_uri = base_driver._generate_output_uri(  # pylint: disable=protected-access
         component_output_dir, 'schema', int(latest_schema_folder))
     latest_schema_path = os.path.join(latest_schema_uri, 'schema.pbtxt')
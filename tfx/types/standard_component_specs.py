@@ -27,6 +27,7 @@ from tfx.proto import example_gen_pb2
 from tfx.proto import infra_validator_pb2
 from tfx.proto import pusher_pb2
 from tfx.proto import range_config_pb2
+from tfx.proto import statistics_gen_pb2
 from tfx.proto import trainer_pb2
 from tfx.proto import transform_pb2
 from tfx.proto import tuner_pb2
@@ -46,6 +47,7 @@ MODULE_FILE_KEY = 'module_file'
 EXCLUDE_SPLITS_KEY = 'exclude_splits'
 STATISTICS_KEY = 'statistics'
 ANOMALIES_KEY = 'anomalies'
+NUM_WORKERS_KEY = 'num_workers'
 # Key for evaluator
 EVAL_CONFIG_KEY = 'eval_config'
 FEATURE_SLICING_SPEC_KEY = 'feature_slicing_spec'
@@ -140,6 +142,7 @@ class ExampleValidatorSpec(ComponentSpec):
 
   PARAMETERS = {
       EXCLUDE_SPLITS_KEY: ExecutionParameter(type=(str, Text), optional=True),
+      NUM_WORKERS_KEY: ExecutionParameter(type=int, optional=True),
   }
   INPUTS = {
       STATISTICS_KEY:
@@ -296,10 +299,17 @@ class StatisticsGenSpec(ComponentSpec):
   PARAMETERS = {
       'stats_options_json': ExecutionParameter(type=(str, Text), optional=True),
       'exclude_splits': ExecutionParameter(type=(str, Text), optional=True),
+      'sampling_config':
+          ExecutionParameter(
+              type=statistics_gen_pb2.SamplingConfig, optional=True),
   }
   INPUTS = {
-      'examples': ChannelParameter(type=standard_artifacts.Examples),
+      'examples':
+          ChannelParameter(type=standard_artifacts.Examples, optional=True),
       'schema': ChannelParameter(type=standard_artifacts.Schema, optional=True),
+      'span_statistics':
+          ChannelParameter(
+              type=standard_artifacts.ExampleStatistics, optional=True),
   }
   OUTPUTS = {
       'statistics': ChannelParameter(type=standard_artifacts.ExampleStatistics),
@@ -413,6 +423,9 @@ class TransformSpec(ComponentSpec):
       'updated_analyzer_cache':
           ChannelParameter(
               type=standard_artifacts.TransformCache, optional=True),
+      'pre_transform_stats':
+          ChannelParameter(
+              type=standard_artifacts.ExampleStatistics, optional=True),
   }
   # TODO(b/139281215): these input / output names have recently been renamed.
   # These compatibility aliases are temporarily provided for backwards
@@ -0,0 +1,129 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Utilities for measuring the import time of TFX entry points.
+
+Startup-time budget
+-------------------
+
+Entry points listed in `STARTUP_TIME_BUDGETS` must be importable in a fresh
+interpreter within the given number of seconds, and must not import any module
+listed for them in `FORBIDDEN_MODULES`. Both are enforced by
+`import_time_utils_test`. The time budgets are deliberately loose so that the
+test is stable on slow machines; the forbidden modules catch most regressions,
+as they are usually caused by an eager import of TensorFlow or Beam. Use
+`tfx/benchmarks/import_time_benchmark.py` to track the actual numbers.
+"""
+
+import collections
+import re
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional, Set, Text
+
+STARTUP_TIME_BUDGETS = {
+    # CLI commands should not pay for TensorFlow, Beam or component imports.
+    'tfx.tools.cli.cli_main': 3.0,
+    # The launcher imports the executor operators and thus Beam.
+    'tfx.orchestration.portable.launcher': 15.0,
+}  # type: Dict[Text, float]
+
+FORBIDDEN_MODULES = {
+    'tfx.tools.cli.cli_main': [
+        'tensorflow', 'apache_beam', 'tfx.components.trainer.component'
+    ],
+}  # type: Dict[Text, List[Text]]
+
+# Matches a line of `python -X importtime` output, e.g.
+# "import time:       120 |        345 |   tfx.types".
+_IMPORT_TIME_LINE_RE = re.compile(
+    r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+
+class ModuleImportTime(NamedTuple):
+  """Import time of a single module as reported by `-X importtime`."""
+  name: Text
+  # Time spent importing the module itself, in microseconds.
+  self_us: int
+  # Time spent importing the module and all its dependencies, in microseconds.
+  cumulative_us: int
+  # Nesting level of the import.
+  depth: int
+
+
+class ImportTimeReport(NamedTuple):
+  """Import time of a module in a fresh interpreter."""
+  module_name: Text
+  # Wall time of the import statement, in seconds.
+  total_secs: float
+  modules: List[ModuleImportTime]
+
+  @property
+  def imported_modules(self) -> Set[Text]:
+    return {m.name for m in self.modules}
+
+  def top_level_packages(self) -> Dict[Text, int]:
+    """Returns the cumulative self import time per top level package in us."""
+    result = collections.defaultdict(int)
+    for m in self.modules:
+      result[m.name.split('.')[0]] += m.self_us
+    return dict(result)
+
+
+def parse_import_time(output: Text) -> List[ModuleImportTime]:
+  """Parses the stderr output of `python -X importtime`."""
+  result = []
+  for line in output.splitlines():
+    match = _IMPORT_TIME_LINE_RE.match(line)
+    if not match:
+      continue
+    self_us, cumulative_us, indent, name = match.groups()
+    result.append(
+        ModuleImportTime(
+            name=name,
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            # Each nesting level is indented by two spaces after one leading
+            # space.
+            depth=(len(indent) - 1) // 2))
+  return result
+
+
+def measure_import_time(module_name: Text,
+                        python: Optional[Text] = None) -> ImportTimeReport:
+  """Imports a module in a fresh interpreter and reports its import time.
+
+  Args:
+    module_name: Fully qualified name of the module to import.
+    python: Path of the python interpreter. Defaults to the current one.
+
+  Returns:
+    An ImportTimeReport of the import.
+
+  Raises:
+    subprocess.CalledProcessError: if the module could not be imported.
+  """
+  script = ('import time\n'
+            '_start = time.perf_counter()\n'
+            'import {}\n'
+            'print(time.perf_counter() - _start)\n').format(module_name)
+  process = subprocess.run([python or sys.executable, '-X', 'importtime',
+                            '-c', script],
+                           stdout=subprocess.PIPE,
+                           stderr=subprocess.PIPE,
+                           universal_newlines=True,
+                           check=True)
+  return ImportTimeReport(
+      module_name=module_name,
+      total_secs=float(process.stdout.strip().splitlines()[-1]),
+      modules=parse_import_time(process.stderr))
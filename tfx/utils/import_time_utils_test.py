@@ -0,0 +1,65 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for tfx.utils.import_time_utils."""
+
+import tensorflow as tf
+from tfx.utils import import_time_utils
+
+_IMPORT_TIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     tfx.version
+import time:        50 |        150 |   tfx
+import time:       300 |        300 |     click.core
+import time:        20 |        320 |   click
+import time:        10 |        480 | tfx.tools.cli.cli_main
+"""
+
+
+class ImportTimeUtilsTest(tf.test.TestCase):
+
+  def testParseImportTime(self):
+    modules = import_time_utils.parse_import_time(_IMPORT_TIME_OUTPUT)
+    self.assertEqual([
+        import_time_utils.ModuleImportTime('tfx.version', 100, 100, 2),
+        import_time_utils.ModuleImportTime('tfx', 50, 150, 1),
+        import_time_utils.ModuleImportTime('click.core', 300, 300, 2),
+        import_time_utils.ModuleImportTime('click', 20, 320, 1),
+        import_time_utils.ModuleImportTime('tfx.tools.cli.cli_main', 10, 480,
+                                           0),
+    ], modules)
+
+  def testTopLevelPackages(self):
+    report = import_time_utils.ImportTimeReport(
+        module_name='tfx.tools.cli.cli_main',
+        total_secs=0.1,
+        modules=import_time_utils.parse_import_time(_IMPORT_TIME_OUTPUT))
+    self.assertEqual({'tfx': 160, 'click': 320}, report.top_level_packages())
+    self.assertIn('click.core', report.imported_modules)
+
+  def testStartupTimeBudget(self):
+    for module_name, budget in import_time_utils.STARTUP_TIME_BUDGETS.items():
+      report = import_time_utils.measure_import_time(module_name)
+      self.assertLess(
+          report.total_secs, budget,
+          'Importing %s took %.2fs, over its budget of %.2fs.' %
+          (module_name, report.total_secs, budget))
+      for forbidden in import_time_utils.FORBIDDEN_MODULES.get(
+          module_name, []):
+        self.assertNotIn(
+            forbidden, report.imported_modules,
+            '%s must not be imported by %s.' % (forbidden, module_name))
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -21,7 +21,8 @@ from __future__ import print_function
 import importlib
 import sys
 import threading
-from typing import Any, Callable, Text, Type
+import types
+from typing import Any, Callable, Dict, Text, Type
 
 from absl import logging
 from tfx.utils import io_utils
@@ -84,3 +85,40 @@ def import_func_from_module(module_path: Text, fn_name: Text) -> Callable:  # py
   """Imports a function from a module provided as source file or module path."""
   user_module = importlib.import_module(module_path)
   return getattr(user_module, fn_name)
+
+
+class _LazyAttributeModule(types.ModuleType):
+  """Module type which imports some of its attributes on first access."""
+
+  def __getattr__(self, name: Text) -> Any:
+    # Only called when regular attribute lookup fails.
+    lazy_attributes = self.__dict__.get('_lazy_attributes', {})
+    if name not in lazy_attributes:
+      raise AttributeError('module %r has no attribute %r' %
+                           (self.__name__, name))
+    value = getattr(importlib.import_module(lazy_attributes[name]), name)
+    setattr(self, name, value)
+    return value
+
+  def __dir__(self):
+    return sorted(
+        set(super().__dir__()) | set(self.__dict__.get('_lazy_attributes', {})))
+
+
+def install_lazy_attributes(module_name: Text,
+                            attribute_modules: Dict[Text, Text]) -> None:
+  """Makes attributes of a module be imported from other modules on access.
+
+  This is used by package `__init__` modules re-exporting symbols whose
+  defining modules are expensive to import, so that importing the package does
+  not import all of them.
+
+  Args:
+    module_name: Name of the module to add lazy attributes to, usually
+      `__name__` of the calling module.
+    attribute_modules: A map from attribute name to the fully qualified name of
+      the module defining an attribute with the same name.
+  """
+  module = sys.modules[module_name]
+  module.__class__ = _LazyAttributeModule
+  module._lazy_attributes = dict(attribute_modules)  # pylint: disable=protected-access
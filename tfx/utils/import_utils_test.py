@@ -20,8 +20,11 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import os
+import sys
+import types
 # Standard Imports
 
+import mock
 import tensorflow as tf
 from tfx.utils import import_utils
 from tfx.utils.testdata import test_fn
@@ -69,6 +72,19 @@ class ImportUtilsTest(tf.test.TestCase):
       _ = import_utils.import_func_from_module(test_fn.test_fn.__module__,
                                                'non_existing_fn')
 
+  def testInstallLazyAttributes(self):
+    module = types.ModuleType('fake_lazy_module')
+    with mock.patch.dict(sys.modules, {'fake_lazy_module': module}):
+      import_utils.install_lazy_attributes(
+          'fake_lazy_module', {'TestClass': test_fn.__name__})
+    self.assertNotIn('TestClass', vars(module))
+    self.assertIn('TestClass', dir(module))
+    self.assertIs(test_fn.TestClass, module.TestClass)
+    # The attribute is cached on the module after the first access.
+    self.assertIs(test_fn.TestClass, vars(module)['TestClass'])
+    with self.assertRaises(AttributeError):
+      _ = module.NonExisting
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -50,10 +50,20 @@ def topsorted_layers(
   if len(set(get_node_id_fn(n) for n in nodes)) != len(nodes):
     raise ValueError('Nodes must have unique ids.')
 
+  # Number of parents not yet visited of each node, keyed by node id. Counting
+  # the visited parents keeps sorting linear in the number of edges.
+  num_unvisited_parents = {}
+
+  def _num_unvisited_parents(node: NodeT) -> int:
+    node_id = get_node_id_fn(node)
+    if node_id not in num_unvisited_parents:
+      num_unvisited_parents[node_id] = len(
+          set(get_node_id_fn(p) for p in get_parent_nodes(node)))
+    return num_unvisited_parents[node_id]
+
   # The first layer contains nodes with no incoming edges.
-  layer = [node for node in nodes if not get_parent_nodes(node)]
+  layer = [node for node in nodes if not _num_unvisited_parents(node)]
 
-  visited = set()
   layers = []
   while layer:
     layer = sorted(layer, key=get_node_id_fn)
@@ -61,14 +71,14 @@ def topsorted_layers(
 
     next_layer = []
     for node in layer:
-      visited.add(get_node_id_fn(node))
-      for child_node in get_child_nodes(node):
-        # Include the child node if all its parents are visited. If the child
+      child_nodes = {get_node_id_fn(c): c for c in get_child_nodes(node)}
+      for child_id, child_node in child_nodes.items():
+        # Include the child node once all its parents are visited. If the child
         # node is part of a cycle, it will never be included since it will have
         # at least one unvisited parent node which is also part of the cycle.
-        parent_node_ids = set(
-            get_node_id_fn(p) for p in get_parent_nodes(child_node))
-        if parent_node_ids.issubset(visited):
+        num_unvisited_parents[child_id] = (
+            _num_unvisited_parents(child_node) - 1)
+        if not num_unvisited_parents[child_id]:
           next_layer.append(child_node)
     layer = next_layer
 